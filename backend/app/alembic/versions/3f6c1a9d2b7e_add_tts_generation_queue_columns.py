@@ -0,0 +1,41 @@
+"""Add job queue columns to TTSGeneration
+
+Revision ID: 3f6c1a9d2b7e
+Revises: 797199376b8e
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6c1a9d2b7e'
+down_revision: Union[str, None] = '797199376b8e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('ttsgeneration', sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('ttsgeneration', sa.Column('max_attempts', sa.Integer(), nullable=False, server_default='3'))
+    op.add_column('ttsgeneration', sa.Column('next_attempt_at', sa.DateTime(), nullable=True))
+    op.add_column('ttsgeneration', sa.Column('claimed_by', sa.String(length=100), nullable=True))
+    op.add_column('ttsgeneration', sa.Column('lease_expires_at', sa.DateTime(), nullable=True))
+    op.create_index(
+        'ix_ttsgeneration_queue',
+        'ttsgeneration',
+        ['status', 'next_attempt_at', 'created_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ttsgeneration_queue', table_name='ttsgeneration')
+    op.drop_column('ttsgeneration', 'lease_expires_at')
+    op.drop_column('ttsgeneration', 'claimed_by')
+    op.drop_column('ttsgeneration', 'next_attempt_at')
+    op.drop_column('ttsgeneration', 'max_attempts')
+    op.drop_column('ttsgeneration', 'attempts')
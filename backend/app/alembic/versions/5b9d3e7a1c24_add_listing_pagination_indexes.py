@@ -0,0 +1,37 @@
+"""Add (sort column, id) indexes for cursor pagination of listings
+
+Revision ID: 5b9d3e7a1c24
+Revises: c4a7e2d91f58
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b9d3e7a1c24'
+down_revision: Union[str, None] = 'c4a7e2d91f58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_scenario_updated_id', 'scenario', ['updated_at', 'id']),
+    ('ix_ttsscript_owner_created', 'ttsscript', ['created_by', 'created_at', 'id']),
+    ('ix_ttsgeneration_requester_created', 'ttsgeneration', ['requested_by', 'created_at', 'id']),
+    ('ix_voiceactor_created_id', 'voiceactor', ['created_at', 'id']),
+    ('ix_ttslibrary_usage_id', 'ttslibrary', ['usage_count', 'id']),
+    ('ix_ment_user_created', 'ment', ['user_id', 'created_dt', 'id']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,58 @@
+"""Add TTS audio cache table and cache keys
+
+Revision ID: 8d2e4b6f0a13
+Revises: 3f6c1a9d2b7e
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2e4b6f0a13'
+down_revision: Union[str, None] = '3f6c1a9d2b7e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ttsaudiocache',
+        sa.Column('cache_key', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+        sa.Column('audio_file_path', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=False),
+        sa.Column('file_size', sa.Integer(), nullable=False),
+        sa.Column('duration', sa.Float(), nullable=True),
+        sa.Column('quality_score', sa.Float(), nullable=True),
+        sa.Column('voice_actor_id', sa.Uuid(), nullable=True),
+        sa.Column('text_preview', sqlmodel.sql.sqltypes.AutoString(length=200), nullable=True),
+        sa.Column('source_generation_id', sa.Uuid(), nullable=True),
+        sa.Column('hit_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('last_used_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['voice_actor_id'], ['voiceactor.id'], ),
+        sa.PrimaryKeyConstraint('cache_key')
+    )
+    op.create_index(op.f('ix_ttsaudiocache_last_used_at'), 'ttsaudiocache', ['last_used_at'], unique=False)
+
+    op.add_column('ttsgeneration', sa.Column('cache_key', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=True))
+    op.add_column('ttsgeneration', sa.Column('cache_hit', sa.Boolean(), nullable=False, server_default='false'))
+    op.create_index(op.f('ix_ttsgeneration_cache_key'), 'ttsgeneration', ['cache_key'], unique=False)
+
+    op.add_column('ttslibrary', sa.Column('cache_key', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=True))
+    op.create_index(op.f('ix_ttslibrary_cache_key'), 'ttslibrary', ['cache_key'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_ttslibrary_cache_key'), table_name='ttslibrary')
+    op.drop_column('ttslibrary', 'cache_key')
+
+    op.drop_index(op.f('ix_ttsgeneration_cache_key'), table_name='ttsgeneration')
+    op.drop_column('ttsgeneration', 'cache_hit')
+    op.drop_column('ttsgeneration', 'cache_key')
+
+    op.drop_index(op.f('ix_ttsaudiocache_last_used_at'), table_name='ttsaudiocache')
+    op.drop_table('ttsaudiocache')
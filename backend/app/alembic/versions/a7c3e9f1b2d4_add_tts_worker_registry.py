@@ -0,0 +1,44 @@
+"""Add TTS worker registry table
+
+Revision ID: a7c3e9f1b2d4
+Revises: f2a9c4d7e8b1
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e9f1b2d4'
+down_revision: Union[str, None] = 'f2a9c4d7e8b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 성우 친화 스케줄링용 워커 등록 정보 - app/services/tts_scheduler.py
+    op.create_table(
+        'ttsworker',
+        sa.Column('id', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+        sa.Column('hostname', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+        sa.Column('capacity', sa.Integer(), nullable=False),
+        sa.Column('running', sa.Integer(), nullable=False),
+        sa.Column('warm_voices', sa.JSON(), nullable=True),
+        sa.Column('jobs_claimed', sa.Integer(), nullable=False),
+        sa.Column('warm_hits', sa.Integer(), nullable=False),
+        sa.Column('warm_misses', sa.Integer(), nullable=False),
+        sa.Column('stolen_jobs', sa.Integer(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('last_heartbeat', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_ttsworker_last_heartbeat'), 'ttsworker', ['last_heartbeat'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_ttsworker_last_heartbeat'), table_name='ttsworker')
+    op.drop_table('ttsworker')
@@ -0,0 +1,58 @@
+"""Add priority and fair queuing tags to ttsgeneration
+
+Revision ID: b8d4f0a2c3e5
+Revises: a7c3e9f1b2d4
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d4f0a2c3e5'
+down_revision: Union[str, None] = 'a7c3e9f1b2d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ttspriority = sa.Enum('INTERACTIVE', 'BATCH', 'BACKGROUND', name='ttspriority')
+
+
+def upgrade() -> None:
+    # 우선순위 클래스 + 가중 공정 큐잉 태그 - app/services/tts_queue.py
+    ttspriority.create(op.get_bind(), checkfirst=True)
+    op.add_column('ttsgeneration', sa.Column('priority', ttspriority, nullable=False, server_default='INTERACTIVE'))
+    op.add_column('ttsgeneration', sa.Column('virtual_start', sa.Float(), nullable=False, server_default='0'))
+    op.add_column('ttsgeneration', sa.Column('virtual_finish', sa.Float(), nullable=False, server_default='0'))
+
+    # 기존 일괄 생성 작업은 batch 클래스로
+    op.execute(
+        """
+        UPDATE ttsgeneration SET priority = 'BATCH'
+        WHERE generation_params ->> 'batch_mode' = 'true'
+        """
+    )
+
+    op.drop_index('ix_ttsgeneration_queue', table_name='ttsgeneration')
+    op.create_index(
+        'ix_ttsgeneration_queue',
+        'ttsgeneration',
+        ['status', 'virtual_finish', 'created_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ttsgeneration_queue', table_name='ttsgeneration')
+    op.create_index(
+        'ix_ttsgeneration_queue',
+        'ttsgeneration',
+        ['status', 'next_attempt_at', 'created_at'],
+        unique=False,
+    )
+    op.drop_column('ttsgeneration', 'virtual_finish')
+    op.drop_column('ttsgeneration', 'virtual_start')
+    op.drop_column('ttsgeneration', 'priority')
+    ttspriority.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,31 @@
+"""Add (script_id, created_at desc) index to TTSGeneration
+
+Revision ID: c4a7e2d91f58
+Revises: 8d2e4b6f0a13
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a7e2d91f58'
+down_revision: Union[str, None] = '8d2e4b6f0a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_ttsgeneration_script_created',
+        'ttsgeneration',
+        ['script_id', sa.text('created_at DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ttsgeneration_script_created', table_name='ttsgeneration')
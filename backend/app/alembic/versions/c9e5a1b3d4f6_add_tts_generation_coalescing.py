@@ -0,0 +1,31 @@
+"""Add single-flight coalescing link to ttsgeneration
+
+Revision ID: c9e5a1b3d4f6
+Revises: b8d4f0a2c3e5
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e5a1b3d4f6'
+down_revision: Union[str, None] = 'b8d4f0a2c3e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 같은 합성 결과를 기다리는 작업 → 대표 작업 (app/services/tts_queue.py)
+    op.add_column('ttsgeneration', sa.Column('coalesced_into', sa.Uuid(), nullable=True))
+    op.create_index(
+        op.f('ix_ttsgeneration_coalesced_into'), 'ttsgeneration', ['coalesced_into'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_ttsgeneration_coalesced_into'), table_name='ttsgeneration')
+    op.drop_column('ttsgeneration', 'coalesced_into')
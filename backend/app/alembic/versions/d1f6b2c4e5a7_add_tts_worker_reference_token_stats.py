@@ -0,0 +1,35 @@
+"""Add reference token cache counters to ttsworker
+
+Revision ID: d1f6b2c4e5a7
+Revises: c9e5a1b3d4f6
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1f6b2c4e5a7'
+down_revision: Union[str, None] = 'c9e5a1b3d4f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 워커 프로세스의 참조 토큰 캐시 적중/미스 (app/worker.py 하트비트에서 기록)
+    op.add_column(
+        'ttsworker',
+        sa.Column('reference_token_hits', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.add_column(
+        'ttsworker',
+        sa.Column('reference_token_misses', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('ttsworker', 'reference_token_misses')
+    op.drop_column('ttsworker', 'reference_token_hits')
@@ -0,0 +1,60 @@
+"""Add TTS daily stats rollup table
+
+Revision ID: e1f08b3c6d52
+Revises: 5b9d3e7a1c24
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f08b3c6d52'
+down_revision: Union[str, None] = '5b9d3e7a1c24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ttsdailystats',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('completed_count', sa.Integer(), nullable=False),
+        sa.Column('failed_count', sa.Integer(), nullable=False),
+        sa.Column('cache_hit_count', sa.Integer(), nullable=False),
+        sa.Column('quality_sum', sa.Float(), nullable=False),
+        sa.Column('quality_count', sa.Integer(), nullable=False),
+        sa.Column('duration_sum', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('day')
+    )
+
+    # 기존 생성 이력으로 일별 집계 채우기 (이후에는 완료/실패 시점에 증분 갱신)
+    op.execute(
+        """
+        INSERT INTO ttsdailystats (
+            day, completed_count, failed_count, cache_hit_count,
+            quality_sum, quality_count, duration_sum, updated_at
+        )
+        SELECT
+            CAST(completed_at AS DATE),
+            COUNT(*) FILTER (WHERE status = 'COMPLETED'),
+            COUNT(*) FILTER (WHERE status = 'FAILED'),
+            COUNT(*) FILTER (WHERE status = 'COMPLETED' AND cache_hit),
+            COALESCE(SUM(quality_score) FILTER (WHERE status = 'COMPLETED'), 0),
+            COUNT(quality_score) FILTER (WHERE status = 'COMPLETED'),
+            COALESCE(SUM(duration) FILTER (WHERE status = 'COMPLETED'), 0),
+            CURRENT_TIMESTAMP
+        FROM ttsgeneration
+        WHERE completed_at IS NOT NULL
+          AND status IN ('COMPLETED', 'FAILED')
+        GROUP BY CAST(completed_at AS DATE)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('ttsdailystats')
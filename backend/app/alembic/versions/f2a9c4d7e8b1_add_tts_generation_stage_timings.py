@@ -0,0 +1,27 @@
+"""Add stage_timings to ttsgeneration
+
+Revision ID: f2a9c4d7e8b1
+Revises: e1f08b3c6d52
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a9c4d7e8b1'
+down_revision: Union[str, None] = 'e1f08b3c6d52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 생성 단계별 소요 시간 (초) - app/services/tts_timing.py
+    op.add_column('ttsgeneration', sa.Column('stage_timings', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('ttsgeneration', 'stage_timings')
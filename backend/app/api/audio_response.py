@@ -0,0 +1,100 @@
+"""
+오디오 파일 응답 공통 처리
+
+스트리밍 엔드포인트(생성 결과, 라이브러리, 음성 샘플, 전처리 결과)가 함께 사용한다.
+- Range 요청(206/416) 지원: 브라우저에서 재생 위치를 옮겨도 파일 전체를 다시 받지 않음
+- ETag / Last-Modified 검증 후 바뀌지 않았으면 304
+- AUDIO_X_ACCEL_REDIRECT를 켜면 권한 확인만 하고 파일 전송은 nginx(internal location)가 담당
+"""
+import email.utils
+import os
+from pathlib import Path
+from typing import Optional
+
+from fastapi import HTTPException, Request
+from fastapi.responses import FileResponse, Response
+
+from app.core.config import settings
+
+# nginx가 같은 경로로 마운트하는 디렉토리 (nginx.conf의 /_protected/<dir>/ internal location)
+ACCEL_DIRS = {
+    "audio_files": settings.AUDIO_FILES_DIR,
+    "voice_samples": settings.VOICE_SAMPLES_DIR,
+}
+
+
+def _etag(stat: os.stat_result) -> str:
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def _not_modified(request: Request, etag: str, stat: os.stat_result) -> bool:
+    """조건부 GET 판단 (If-None-Match가 있으면 If-Modified-Since보다 우선)"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(stat.st_mtime) <= since
+    return False
+
+
+def _accel_path(file_path: Path) -> Optional[str]:
+    """nginx가 직접 보낼 수 있는 파일이면 internal location 경로 반환"""
+    resolved = file_path.resolve()
+    for name, root in ACCEL_DIRS.items():
+        try:
+            relative = resolved.relative_to(Path(root).resolve())
+        except ValueError:
+            continue
+        return f"{settings.AUDIO_X_ACCEL_PREFIX.rstrip('/')}/{name}/{relative.as_posix()}"
+    return None
+
+
+def audio_file_response(
+    request: Request,
+    file_path: Path,
+    media_type: str = "audio/wav",
+    download_name: Optional[str] = None,
+) -> Response:
+    """오디오 파일 응답 생성 (Range/조건부 GET/X-Accel-Redirect 처리)
+
+    Args:
+        download_name: 지정하면 첨부 파일(Content-Disposition: attachment)로 내려줌
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        raise HTTPException(status_code=404, detail="오디오 파일을 찾을 수 없습니다.")
+
+    # 인증이 필요한 응답이므로 브라우저에만 캐시하고 매번 ETag로 재검증
+    headers = {"Cache-Control": "private, no-cache"}
+
+    if settings.AUDIO_X_ACCEL_REDIRECT:
+        accel_path = _accel_path(Path(file_path))
+        if accel_path:
+            # Range/ETag/sendfile은 nginx가 처리
+            headers["X-Accel-Redirect"] = accel_path
+            if download_name:
+                headers["Content-Disposition"] = f'attachment; filename="{download_name}"'
+            return Response(media_type=media_type, headers=headers)
+
+    etag = _etag(stat)
+    if _not_modified(request, etag, stat):
+        headers["ETag"] = etag
+        headers["Last-Modified"] = email.utils.formatdate(stat.st_mtime, usegmt=True)
+        return Response(status_code=304, headers=headers)
+
+    # FileResponse가 Range(206/416), If-Range, ETag/Last-Modified 헤더를 처리
+    return FileResponse(
+        file_path,
+        media_type=media_type,
+        filename=download_name,
+        stat_result=stat,
+        headers={**headers, "ETag": etag},
+    )
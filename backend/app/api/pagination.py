@@ -0,0 +1,153 @@
+"""
+목록 API 커서(keyset) 페이지네이션
+
+offset 방식은 뒤 페이지로 갈수록 앞의 행을 모두 읽고 버려야 해서 느려지므로,
+(정렬 컬럼, id) 기준으로 "마지막으로 받은 행 다음부터" 조회한다.
+
+- 응답 본문은 기존과 같은 목록이고, 다음 페이지 커서는 X-Next-Cursor 헤더로 내려준다.
+  (마지막 페이지면 헤더 없음)
+- 커서는 (정렬 키, 마지막 행의 정렬 값, id)를 담은 불투명 문자열이며, 정렬 키가 다르면 거부한다.
+- cursor 없이 skip만 보내는 기존 클라이언트도 그대로 동작한다.
+- total=exact|estimated 를 지정하면 X-Total-Count 헤더로 전체 개수를 알려준다.
+  estimated는 Postgres 실행 계획의 예상 행 수를 사용한다 (COUNT(*) 없이 즉시 응답).
+"""
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+from enum import Enum
+from typing import Any, Optional, Tuple
+
+from fastapi import HTTPException, Response
+from sqlalchemy import func, tuple_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from sqlmodel import Session, select
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+TOTAL_ESTIMATED_HEADER = "X-Total-Count-Estimated"
+PAGINATION_HEADERS = [NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, TOTAL_ESTIMATED_HEADER]
+
+
+class TotalCountMode(str, Enum):
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _load_value(value: Any) -> Any:
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(sort_key: str, sort_value: Any, row_id: uuid.UUID) -> str:
+    payload = json.dumps(
+        {"k": sort_key, "v": _dump_value(sort_value), "id": str(row_id)},
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key: str) -> Tuple[Any, uuid.UUID]:
+    """커서 해석 (잘못된 커서이거나 다른 정렬 기준의 커서면 400)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if payload["k"] != sort_key:
+            raise ValueError("sort key mismatch")
+        return _load_value(payload["v"]), uuid.UUID(payload["id"])
+    except (ValueError, KeyError, TypeError, binascii.Error, UnicodeError):
+        raise HTTPException(status_code=400, detail="잘못된 페이지 커서입니다.")
+
+
+def paginate(
+    statement,
+    *,
+    sort_column,
+    id_column,
+    descending: bool,
+    sort_key: str,
+    cursor: Optional[str],
+    skip: int,
+    limit: int,
+):
+    """(정렬 컬럼, id) 순 정렬 + 커서 조건(없으면 offset) + limit 적용
+
+    정렬 컬럼과 id의 방향을 같게 두어 (sort_column, id) 복합 인덱스를 그대로 탈 수 있게 한다.
+    """
+    if cursor:
+        last_value, last_id = decode_cursor(cursor, sort_key)
+        position = tuple_(sort_column, id_column)
+        boundary = tuple_(last_value, last_id)
+        statement = statement.where(position < boundary if descending else position > boundary)
+    elif skip:
+        statement = statement.offset(skip)
+
+    if descending:
+        statement = statement.order_by(sort_column.desc(), id_column.desc())
+    else:
+        statement = statement.order_by(sort_column.asc(), id_column.asc())
+    return statement.limit(limit)
+
+
+def set_next_cursor(
+    response: Response, sort_key: str, last_value: Any, last_id: Optional[uuid.UUID], count: int, limit: int
+) -> None:
+    """페이지가 가득 찼으면 다음 페이지 커서를 헤더에 설정"""
+    if last_id is not None and count >= limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(sort_key, last_value, last_id)
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) <statement> - 바인드 파라미터 처리를 SQLAlchemy에 맡기기 위한 구문"""
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def count_total(session: Session, statement, mode: TotalCountMode) -> Tuple[int, bool]:
+    """필터가 적용된(정렬/페이지네이션 전) statement의 전체 행 수
+
+    Returns:
+        (개수, 추정값 여부)
+    """
+    statement = statement.order_by(None)
+    if mode == TotalCountMode.ESTIMATED and session.get_bind().dialect.name == "postgresql":
+        plan = session.execute(_Explain(statement)).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"]), True
+
+    total = session.exec(select(func.count()).select_from(statement.subquery())).one()
+    return int(total), False
+
+
+def set_total_count(
+    response: Response, session: Session, statement, mode: Optional[TotalCountMode]
+) -> None:
+    if not mode:
+        return
+    total, estimated = count_total(session, statement, mode)
+    response.headers[TOTAL_COUNT_HEADER] = str(total)
+    if estimated:
+        response.headers[TOTAL_ESTIMATED_HEADER] = "true"
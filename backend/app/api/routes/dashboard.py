@@ -3,69 +3,62 @@ import uuid
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select, func, and_, or_
-from ..deps import get_current_user, get_db
+from sqlmodel import select, func, and_, or_
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..deps import get_async_db, get_current_user
+from ...core.config import settings
 from ...models.users import User
 from ...models.scenario import Scenario, ScenarioStatus
 from ...models.ment import Ment
-from ...models.tts import TTSGeneration, GenerationStatus, TTSScript
+from ...models.tts import TTSGeneration, GenerationStatus, TTSScript, TTSDailyStats
 from ...models.voice_actor import VoiceActor
+from ...services import tts_scheduler, tts_stats, tts_timing
 
 router = APIRouter()
 
 
 @router.get("/stats")
 async def get_dashboard_stats(
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ) -> Dict[str, Any]:
     """대시보드 주요 통계 데이터를 반환합니다."""
     
     try:
-        # 시나리오 통계
-        total_scenarios_result = session.exec(select(func.count(Scenario.id))).first()
-        total_scenarios = total_scenarios_result if total_scenarios_result is not None else 0
-        
-        active_scenarios_result = session.exec(
-            select(func.count(Scenario.id)).where(Scenario.status == ScenarioStatus.ACTIVE)
-        ).first()
-        active_scenarios = active_scenarios_result if active_scenarios_result is not None else 0
-        
-        # TTS 통계
-        tts_in_progress_result = session.exec(
-            select(func.count(TTSGeneration.id)).where(
-                or_(
-                    TTSGeneration.status == GenerationStatus.PENDING,
-                    TTSGeneration.status == GenerationStatus.PROCESSING
-                )
-            )
-        ).first()
-        tts_in_progress = tts_in_progress_result if tts_in_progress_result is not None else 0
-        
-        # 오늘 완료된 TTS
         today = datetime.now().date()
-        tts_completed_today_result = session.exec(
-            select(func.count(TTSGeneration.id)).where(
-                and_(
-                    TTSGeneration.status == GenerationStatus.COMPLETED,
-                    func.date(TTSGeneration.completed_at) == today
-                )
+
+        def count(model, *conditions):
+            return select(func.count(model.id)).where(*conditions).scalar_subquery()
+
+        # 모든 카운트를 한 번의 쿼리로 조회 (오늘 완료 수는 일별 집계 테이블 사용)
+        row = (await session.exec(
+            select(
+                count(Scenario),
+                count(Scenario, Scenario.status == ScenarioStatus.ACTIVE),
+                count(
+                    TTSGeneration,
+                    TTSGeneration.status.in_([GenerationStatus.PENDING, GenerationStatus.PROCESSING]),
+                ),
+                func.coalesce(
+                    select(TTSDailyStats.completed_count)
+                    .where(TTSDailyStats.day == today)
+                    .scalar_subquery(),
+                    0,
+                ),
+                count(VoiceActor),
+                count(VoiceActor, VoiceActor.is_active == True),
+                count(Ment),
             )
-        ).first()
-        tts_completed_today = tts_completed_today_result if tts_completed_today_result is not None else 0
-        
-        # 성우 모델 통계
-        total_voice_models_result = session.exec(select(func.count(VoiceActor.id))).first()
-        total_voice_models = total_voice_models_result if total_voice_models_result is not None else 0
-        
-        active_voice_models_result = session.exec(
-            select(func.count(VoiceActor.id)).where(VoiceActor.is_active == True)
-        ).first()
-        active_voice_models = active_voice_models_result if active_voice_models_result is not None else 0
-        
-        # 멘트 통계
-        total_ments_result = session.exec(select(func.count(Ment.id))).first()
-        total_ments = total_ments_result if total_ments_result is not None else 0
+        )).one()
+        (
+            total_scenarios,
+            active_scenarios,
+            tts_in_progress,
+            tts_completed_today,
+            total_voice_models,
+            active_voice_models,
+            total_ments,
+        ) = (value or 0 for value in row)
         
         # 시스템 상태 판단 (간단한 헬스체크)
         system_status = "정상"
@@ -93,17 +86,17 @@ async def get_dashboard_stats(
 @router.get("/recent-scenarios")
 async def get_recent_scenarios(
     limit: int = 5,
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ) -> List[Dict[str, Any]]:
     """최근 수정된 시나리오 목록을 반환합니다."""
     
     try:
-        recent_scenarios = session.exec(
+        recent_scenarios = (await session.exec(
             select(Scenario)
             .order_by(Scenario.updated_at.desc())
             .limit(limit)
-        ).all()
+        )).all()
         
         result = []
         for scenario in recent_scenarios:
@@ -127,45 +120,27 @@ async def get_recent_scenarios(
 @router.get("/tts-stats")
 async def get_tts_stats(
     days: int = 7,
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ) -> List[Dict[str, Any]]:
     """TTS 생성 통계를 반환합니다."""
     
     try:
-        # 지난 N일간의 데이터
+        # 지난 N일간의 데이터 (일별 집계 테이블에서 한 번에 조회)
         start_date = datetime.now() - timedelta(days=days)
-        
+        dates = [(start_date + timedelta(days=i)).date() for i in range(days)]
+        daily = (
+            await session.run_sync(tts_stats.get_daily_stats, dates[0], dates[-1]) if dates else {}
+        )
+
         stats = []
-        for i in range(days):
-            date = start_date + timedelta(days=i)
-            date_str = date.strftime("%m/%d")
-            
-            # 해당 날짜의 완료된 TTS 수
-            completed_count_result = session.exec(
-                select(func.count(TTSGeneration.id)).where(
-                    and_(
-                        TTSGeneration.status == GenerationStatus.COMPLETED,
-                        func.date(TTSGeneration.completed_at) == date.date()
-                    )
-                )
-            ).first()
-            completed_count = completed_count_result if completed_count_result is not None else 0
-            
-            # 해당 날짜의 평균 품질 점수
-            avg_quality_result = session.exec(
-                select(func.avg(TTSGeneration.quality_score)).where(
-                    and_(
-                        TTSGeneration.status == GenerationStatus.COMPLETED,
-                        TTSGeneration.quality_score.is_not(None),
-                        func.date(TTSGeneration.completed_at) == date.date()
-                    )
-                )
-            ).first()
-            avg_quality = avg_quality_result if avg_quality_result is not None else 0
-            
+        for date in dates:
+            row = daily.get(date)
+            completed_count = row.completed_count if row else 0
+            avg_quality = row.quality_sum / row.quality_count if row and row.quality_count else 0
+
             stats.append({
-                "date": date_str,
+                "date": date.strftime("%m/%d"),
                 "count": completed_count,
                 "quality": round(avg_quality, 1) if avg_quality else 0
             })
@@ -179,22 +154,90 @@ async def get_tts_stats(
         )
 
 
+@router.get("/tts-timings")
+async def get_tts_timings(
+    days: int = 7,
+    limit: int = 2000,
+    session: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+) -> Dict[str, Any]:
+    """최근 완료된 TTS 생성의 단계별 소요 시간 백분위 (p50/p95/p99, ms)를 반환합니다."""
+    
+    try:
+        since = datetime.now() - timedelta(days=days)
+        # 최근 완료 작업 limit개만 집계 (캐시 적중으로 즉시 완료된 작업 제외)
+        rows = (await session.exec(
+            select(TTSGeneration.stage_timings)
+            .where(
+                TTSGeneration.status == GenerationStatus.COMPLETED,
+                TTSGeneration.completed_at >= since,
+                TTSGeneration.cache_hit == False,
+                TTSGeneration.stage_timings.is_not(None),
+            )
+            .order_by(TTSGeneration.completed_at.desc())
+            .limit(min(max(limit, 1), 10000))
+        )).all()
+        # JSON 컬럼의 None은 JSON null로 저장될 수 있어 한 번 더 거름
+        rows = [timings for timings in rows if timings]
+
+        return {
+            "days": days,
+            "samples": len(rows),
+            "stages": tts_timing.aggregate(rows),
+        }
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"TTS 단계별 소요 시간 조회 중 오류가 발생했습니다: {str(e)}"
+        )
+
+
+@router.get("/tts-workers")
+async def get_tts_workers(
+    session: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+) -> Dict[str, Any]:
+    """TTS 큐 워커별 상태와 성우 warm 적중률 (성우 친화 스케줄링)을 반환합니다."""
+    
+    try:
+        workers = await session.run_sync(tts_scheduler.worker_stats)
+        live = [worker for worker in workers if worker["alive"]]
+        hits = sum(worker["warm_hits"] for worker in live)
+        judged = hits + sum(worker["warm_misses"] for worker in live)
+
+        return {
+            "affinity_enabled": settings.TTS_AFFINITY_ENABLED,
+            "live_workers": len(live),
+            "warm_hit_rate": round(hits / judged, 3) if judged else None,
+            "workers": workers,
+        }
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"TTS 워커 상태 조회 중 오류가 발생했습니다: {str(e)}"
+        )
+
+
 @router.get("/scenario-status-distribution")
 async def get_scenario_status_distribution(
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ) -> List[Dict[str, Any]]:
     """시나리오 상태별 분포를 반환합니다."""
     
     try:
-        # 각 상태별 시나리오 수 조회
-        status_counts = {}
-        for status in ScenarioStatus:
-            count_result = session.exec(
-                select(func.count(Scenario.id)).where(Scenario.status == status)
-            ).first()
-            count = count_result if count_result is not None else 0
-            status_counts[status.value] = count
+        # 상태별 시나리오 수 조회 (GROUP BY 한 번)
+        grouped = dict(
+            (await session.exec(
+                select(Scenario.status, func.count(Scenario.id)).group_by(Scenario.status)
+            )).all()
+        )
+        status_counts = {
+            scenario_status.value: grouped.get(scenario_status, 0)
+            for scenario_status in ScenarioStatus
+        }
         
         # 차트용 데이터 형식으로 변환
         colors = {
@@ -234,7 +277,7 @@ async def get_scenario_status_distribution(
 @router.get("/work-statuses")
 async def get_work_statuses(
     limit: int = 5,
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ) -> List[Dict[str, Any]]:
     """진행 중인 작업 상태를 반환합니다."""
@@ -243,7 +286,7 @@ async def get_work_statuses(
         work_statuses = []
         
         # 진행 중인 TTS 작업들
-        processing_tts = session.exec(
+        processing_tts = (await session.exec(
             select(TTSGeneration, TTSScript)
             .join(TTSScript, TTSGeneration.script_id == TTSScript.id)
             .where(
@@ -254,7 +297,7 @@ async def get_work_statuses(
             )
             .order_by(TTSGeneration.created_at.desc())
             .limit(limit)
-        ).all()
+        )).all()
         
         for tts_gen, script in processing_tts:
             progress = None
@@ -275,13 +318,13 @@ async def get_work_statuses(
         # 최근 완료된 작업들
         remaining_slots = max(0, limit - len(work_statuses))
         if remaining_slots > 0:
-            completed_tts = session.exec(
+            completed_tts = (await session.exec(
                 select(TTSGeneration, TTSScript)
                 .join(TTSScript, TTSGeneration.script_id == TTSScript.id)
                 .where(TTSGeneration.status == GenerationStatus.COMPLETED)
                 .order_by(TTSGeneration.completed_at.desc())
                 .limit(remaining_slots)
-            ).all()
+            )).all()
             
             for tts_gen, script in completed_tts:
                 work_statuses.append({
@@ -1,9 +1,10 @@
 import uuid
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 
 from app.api.deps import CurrentUser, SessionDep
+from app.api.pagination import set_next_cursor
 from app.models.ment import Ment, MentCreate, MentUpdate
 from app.crud import ment as crud
 
@@ -56,10 +57,21 @@ def delete_ment(
 
 @router.get("/", response_model=List[Ment])
 def read_ments(
-    *, session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 5
+    *,
+    session: SessionDep,
+    current_user: CurrentUser,
+    response: Response,
+    skip: int = 0,
+    limit: int = 5,
+    cursor: Optional[str] = None,
 ) -> Any:
     """
-    Retrieve ments created by the current user.
+    Retrieve ments created by the current user (newest first).
+    The cursor for the next page is returned in the X-Next-Cursor header.
     """
-    ments = crud.get_ments_by_user_id(session=session, user_id=current_user.id, skip=skip, limit=limit)
+    ments = crud.get_ments_by_user_id(
+        session=session, user_id=current_user.id, skip=skip, limit=limit, cursor=cursor
+    )
+    if ments:
+        set_next_cursor(response, "created_dt", ments[-1].created_dt, ments[-1].id, len(ments), limit)
     return ments
@@ -3,7 +3,7 @@ import uuid
 from typing import List, Optional
 from datetime import datetime
 
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends
 from sqlmodel import select, and_
 
 from app.api.deps import CurrentUser, SessionDep
@@ -11,8 +11,8 @@ from app.models.scenario_tts import (
     ScenarioTTS, ScenarioTTSCreate, ScenarioTTSUpdate, ScenarioTTSPublic, ScenarioTTSStatus
 )
 from app.models.scenario import Scenario, ScenarioNode
-from app.models.tts import TTSGeneration, TTSScript, TTSScriptCreate, TTSGenerateRequest
-from app.services.tts_service import tts_service
+from app.models.tts import TTSGeneration, TTSScript, TTSScriptCreate, TTSGenerateRequest, TTSPriority
+from app.services.tts_queue import enqueue_generation, queue_estimates
 
 router = APIRouter(prefix="/scenario-tts", tags=["scenario-tts"])
 
@@ -108,14 +108,13 @@ def get_node_tts(
     return tts
 
 @router.post("/scenario/{scenario_id}/node/{node_id}/generate")
-async def generate_node_tts(
+def generate_node_tts(
     *,
     session: SessionDep,
     scenario_id: uuid.UUID,
     node_id: str,
     tts_data: ScenarioTTSCreate,
     current_user: CurrentUser,
-    background_tasks: BackgroundTasks
 ):
     """노드용 TTS 생성 및 연결"""
     # 1. ScenarioTTS 생성
@@ -128,8 +127,6 @@ async def generate_node_tts(
         created_by=current_user.id
     )
     session.add(scenario_tts)
-    session.commit()
-    session.refresh(scenario_tts)
     
     # 2. TTS 스크립트 생성
     script = TTSScript(
@@ -139,35 +136,31 @@ async def generate_node_tts(
         created_by=current_user.id
     )
     session.add(script)
-    session.commit()
-    session.refresh(script)
     
-    # 3. TTS 생성 요청
+    # 3. TTS 생성 요청 (큐 등록 전에는 commit하지 않음: 태그/캐시 키 없이 워커가 가져가지 않도록)
     generation = TTSGeneration(
         script_id=script.id,
-        voice_model_id=None,  # voice_actor로부터 자동 선택
-        requested_by=current_user.id
+        requested_by=current_user.id,
+        priority=TTSPriority.INTERACTIVE
     )
     session.add(generation)
-    session.commit()
-    session.refresh(generation)
+    session.flush()
     
-    # 4. ScenarioTTS에 generation_id 연결
+    # 4. ScenarioTTS에 generation_id 연결 (완료 시 큐 워커가 audio_file_path를 반영)
     scenario_tts.tts_generation_id = generation.id
     session.add(scenario_tts)
-    session.commit()
     
-    # 5. 백그라운드에서 TTS 생성 처리
-    background_tasks.add_task(
-        tts_service.process_scenario_tts_generation,
-        generation.id,
-        scenario_tts.id
-    )
+    # 5. 작업 큐에 등록하면서 한 번에 commit (에디터 단건 생성이므로 interactive 우선순위)
+    enqueue_generation(session, generation)
+    estimate = queue_estimates(session, [generation]).get(generation.id, {})
     
     return {
         "scenario_tts_id": scenario_tts.id,
         "generation_id": generation.id,
-        "status": "processing"
+        "status": generation.status,
+        "priority": generation.priority,
+        "queue_position": estimate.get("queue_position"),
+        "eta_seconds": estimate.get("eta_seconds"),
     }
 
 @router.get("/scenario/{scenario_id}/status", response_model=ScenarioTTSStatus)
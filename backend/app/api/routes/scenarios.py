@@ -2,11 +2,12 @@ import uuid
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from sqlmodel import select, and_
 from pydantic import BaseModel
 
 from app.api.deps import CurrentUser, SessionDep
+from app.api.pagination import TotalCountMode, paginate, set_next_cursor, set_total_count
 from app.models.scenario import (
     Scenario, ScenarioCreate, ScenarioUpdate, ScenarioPublic, ScenarioWithDetails,
     ScenarioNode, ScenarioNodeCreate, ScenarioNodeUpdate, ScenarioNodePublic,
@@ -46,14 +47,17 @@ def get_scenarios(
     *,
     session: SessionDep,
     current_user: CurrentUser,
+    response: Response,
     skip: int = 0,
     limit: int = 20,
+    cursor: Optional[str] = None,
+    total: Optional[TotalCountMode] = None,
     status: Optional[ScenarioStatus] = None,
     category: Optional[str] = None,
     search: Optional[str] = None,
     created_by: Optional[uuid.UUID] = None
 ) -> List[Scenario]:
-    """시나리오 목록 조회"""
+    """시나리오 목록 조회 (다음 페이지 커서는 X-Next-Cursor 헤더)"""
     statement = select(Scenario)
     
     # 필터 적용
@@ -69,8 +73,22 @@ def get_scenarios(
     if created_by:
         statement = statement.where(Scenario.created_by == created_by)
     
-    statement = statement.offset(skip).limit(limit).order_by(Scenario.updated_at.desc())
+    set_total_count(response, session, statement, total)
+
+    statement = paginate(
+        statement,
+        sort_column=Scenario.updated_at,
+        id_column=Scenario.id,
+        descending=True,
+        sort_key="updated_at",
+        cursor=cursor,
+        skip=skip,
+        limit=limit,
+    )
     scenarios = session.exec(statement).all()
+    if scenarios:
+        last = scenarios[-1]
+        set_next_cursor(response, "updated_at", last.updated_at, last.id, len(scenarios), limit)
     return scenarios
 
 @router.get("/{scenario_id}", response_model=ScenarioWithDetails)
@@ -6,7 +6,7 @@ import uuid
 import logging
 from datetime import datetime
 from typing import Dict, List, Optional
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 
 from app.api.deps import CurrentUser, SessionDep
 from app.services.tts_factory import (
@@ -112,13 +112,14 @@ async def test_engine(
 @router.post("/benchmark")
 async def benchmark_engines(
     *,
-    current_user: CurrentUser
+    current_user: CurrentUser,
+    repeats: int = Query(3, ge=1, le=10, description="엔진별 테스트 합성 반복 횟수")
 ):
-    """모든 TTS 엔진 성능 비교"""
+    """모든 TTS 엔진 성능 비교 (반복 측정한 생성 시간/실시간 배율 기준)"""
     logger.info(f"⚡ TTS 엔진 벤치마크 시작 (사용자: {current_user.id})")
     
     try:
-        benchmark_results = await tts_factory.benchmark_engines()
+        benchmark_results = await tts_factory.benchmark_engines(repeats)
         
         logger.info(f"✅ TTS 엔진 벤치마크 완료. 추천 엔진: {benchmark_results.get('recommendation', {}).get('best_engine')}")
         
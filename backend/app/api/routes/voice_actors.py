@@ -1,3 +1,4 @@
+import asyncio
 import uuid
 import logging
 from datetime import datetime
@@ -16,11 +17,17 @@ from fastapi import (
     Form,
     BackgroundTasks,
     Query,
+    Request,
 )
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import and_, func
+from sqlalchemy.orm import aliased
 from sqlmodel import select
 
-from app.api.deps import CurrentUser, SessionDep
+from app.api.audio_response import audio_file_response
+from app.api.deps import AsyncSessionDep, CurrentUser, SessionDep
+from app.api.pagination import TotalCountMode, paginate, set_next_cursor, set_total_count
+from app.core.config import settings
 from app.models.voice_actor import (
     VoiceActor,
     VoiceActorCreate,
@@ -40,18 +47,33 @@ from app.models.tts import (
     TTSGeneration,
     TTSGenerateRequest,
     TTSGenerationPublic,
+    TTSGenerationTimings,
     TTSLibrary,
     TTSLibraryCreate,
     TTSLibraryUpdate,
     TTSLibraryPublic,
     GenerationStatus,
+    TTSPriority,
 )
 
 # 🔄 TTS 서비스를 팩토리 패턴으로 교체
 from app.services.tts_factory import get_tts_service
+from app.services import tts_cache
+from app.services.tts_cache import DEFAULT_GENERATION_PARAMS
+from app.services import tts_queue
+from app.services import tts_scheduler
+from app.services.tts_queue import enqueue_generation
 
 # 🎤 오디오 전처리 서비스 추가
+from app.services.audio.audio_executor import AudioPoolBusyError, get_audio_pool
+from app.services.audio.batch_preprocessing import (
+    BatchPreprocessJob,
+    find_active_job,
+    get_batch_job,
+    start_batch_job,
+)
 from app.services.audio.audio_preprocessor import audio_preprocessor
+from app.services.audio.audio_probe import probe_audio
 
 
 # TTS Generation with Script info
@@ -68,6 +90,54 @@ class TTSScriptWithVoiceActor(TTSScriptPublic):
 
 router = APIRouter(prefix="/voice-actors", tags=["voice-actors"])
 
+
+def _script_listing_statement(script_ids):
+    """스크립트 + 성우 이름 + 최신 생성 결과를 한 번의 쿼리로 조회하는 statement
+
+    스크립트별 최신 생성 결과는 row_number() 윈도 함수로 고르고
+    (ix_ttsgeneration_script_created 인덱스 사용), 대상 스크립트의 생성 결과만 읽는다.
+    """
+    ranked = (
+        select(
+            TTSGeneration,
+            func.row_number()
+            .over(
+                partition_by=TTSGeneration.script_id,
+                order_by=TTSGeneration.created_at.desc(),
+            )
+            .label("generation_rank"),
+        )
+        .where(TTSGeneration.script_id.in_(script_ids))
+        .subquery()
+    )
+    latest_generation = aliased(TTSGeneration, ranked)
+
+    return (
+        select(TTSScript, VoiceActor.name.label("voice_actor_name"), latest_generation)
+        .outerjoin(VoiceActor, TTSScript.voice_actor_id == VoiceActor.id)
+        .outerjoin(
+            latest_generation,
+            and_(
+                latest_generation.script_id == TTSScript.id,
+                ranked.c.generation_rank == 1,
+            ),
+        )
+        .where(TTSScript.id.in_(script_ids))
+    )
+
+
+def _script_with_info(
+    script: TTSScript,
+    voice_actor_name: Optional[str],
+    latest_generation: Optional[TTSGeneration],
+) -> TTSScriptWithVoiceActor:
+    script_dict = script.model_dump()
+    script_dict["voice_actor_name"] = voice_actor_name
+    script_dict["latest_generation"] = (
+        latest_generation.model_dump() if latest_generation else None
+    )
+    return TTSScriptWithVoiceActor(**script_dict)
+
 # === 테스트 및 고정 경로 (path parameter보다 먼저 정의) ===
 
 
@@ -326,78 +396,76 @@ def get_tts_scripts(
     *,
     session: SessionDep,
     current_user: CurrentUser,
+    response: Response,
     skip: int = 0,
     limit: int = 20,
+    cursor: Optional[str] = None,
+    total: Optional[TotalCountMode] = None,
     voice_actor_id: Optional[uuid.UUID] = None,
     search: Optional[str] = None,
     sort_by: str = "created_at",
     sort_order: str = "desc",
 ) -> List[TTSScriptWithVoiceActor]:
-    """TTS 스크립트 목록 조회 (성우 정보 및 최신 생성 결과 포함)"""
+    """TTS 스크립트 목록 조회 (성우 정보 및 최신 생성 결과 포함, 다음 페이지 커서는 X-Next-Cursor 헤더)"""
     logger.info(
         f"🎯 GET /tts-scripts called with filters: voice_actor_id={voice_actor_id}, search={search}"
     )
 
     try:
-        # 스크립트와 성우 정보를 함께 조회
-        statement = (
-            select(TTSScript, VoiceActor.name.label("voice_actor_name"))
-            .outerjoin(VoiceActor, TTSScript.voice_actor_id == VoiceActor.id)
-            .where(TTSScript.created_by == current_user.id)
-        )
+        # 페이지에 해당하는 스크립트 ID (필터/정렬/페이지네이션)
+        page_ids = select(TTSScript.id).where(TTSScript.created_by == current_user.id)
 
         # 필터 적용
         if voice_actor_id:
-            statement = statement.where(TTSScript.voice_actor_id == voice_actor_id)
+            page_ids = page_ids.where(TTSScript.voice_actor_id == voice_actor_id)
 
         if search:
             search_term = f"%{search}%"
-            statement = statement.where(TTSScript.text_content.ilike(search_term))
+            page_ids = page_ids.where(TTSScript.text_content.ilike(search_term))
+
+        set_total_count(response, session, page_ids, total)
 
         # 정렬
-        if sort_by == "created_at":
-            order_column = TTSScript.created_at
-        elif sort_by == "updated_at":
-            order_column = TTSScript.updated_at
-        elif sort_by == "text_content":
-            order_column = TTSScript.text_content
-        else:
-            order_column = TTSScript.created_at
+        if sort_by not in ("created_at", "updated_at", "text_content"):
+            sort_by = "created_at"
+        order_column = getattr(TTSScript, sort_by)
+        descending = sort_order == "desc"
+
+        page_ids = paginate(
+            page_ids,
+            sort_column=order_column,
+            id_column=TTSScript.id,
+            descending=descending,
+            sort_key=f"{sort_by}:{sort_order}",
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+        )
 
-        if sort_order == "desc":
-            order_column = order_column.desc()
+        # 스크립트, 성우 이름, 최신 생성 결과를 한 번에 조회 (스크립트마다 추가 쿼리 없음)
+        if descending:
+            ordering = (order_column.desc(), TTSScript.id.desc())
         else:
-            order_column = order_column.asc()
-
-        statement = statement.order_by(order_column).offset(skip).limit(limit)
-
+            ordering = (order_column.asc(), TTSScript.id.asc())
+        statement = _script_listing_statement(page_ids).order_by(*ordering)
         results = session.exec(statement).all()
 
-        # 각 스크립트에 대해 최신 생성 결과 조회
-        scripts_with_info = []
-        for script, voice_actor_name in results:
-            script_dict = script.model_dump()
-            script_dict["voice_actor_name"] = voice_actor_name
-
-            # 최신 생성 결과 조회
-            latest_generation_stmt = (
-                select(TTSGeneration)
-                .where(TTSGeneration.script_id == script.id)
-                .order_by(TTSGeneration.created_at.desc())
-                .limit(1)
+        scripts_with_info = [
+            _script_with_info(script, voice_actor_name, latest_generation)
+            for script, voice_actor_name, latest_generation in results
+        ]
+        if results:
+            last = results[-1][0]
+            set_next_cursor(
+                response, f"{sort_by}:{sort_order}", getattr(last, sort_by), last.id,
+                len(results), limit,
             )
-            latest_generation = session.exec(latest_generation_stmt).first()
-
-            if latest_generation:
-                script_dict["latest_generation"] = latest_generation.model_dump()
-            else:
-                script_dict["latest_generation"] = None
-
-            scripts_with_info.append(TTSScriptWithVoiceActor(**script_dict))
 
         logger.info(f"✅ Successfully retrieved {len(scripts_with_info)} TTS scripts")
         return scripts_with_info
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"💥 ERROR in get_tts_scripts: {e}")
         raise HTTPException(
@@ -410,36 +478,15 @@ def get_tts_script(
     *, session: SessionDep, script_id: uuid.UUID, current_user: CurrentUser
 ) -> TTSScriptWithVoiceActor:
     """특정 TTS 스크립트 조회"""
-    script = session.get(TTSScript, script_id)
-    if not script:
+    result = session.exec(_script_listing_statement([script_id])).first()
+    if not result:
         raise HTTPException(status_code=404, detail="스크립트를 찾을 수 없습니다.")
 
+    script, voice_actor_name, latest_generation = result
     if script.created_by != current_user.id:
         raise HTTPException(status_code=403, detail="접근 권한이 없습니다.")
 
-    # 성우 정보 조회
-    voice_actor_name = None
-    if script.voice_actor_id:
-        voice_actor = session.get(VoiceActor, script.voice_actor_id)
-        if voice_actor:
-            voice_actor_name = voice_actor.name
-
-    # 최신 생성 결과 조회
-    latest_generation_stmt = (
-        select(TTSGeneration)
-        .where(TTSGeneration.script_id == script.id)
-        .order_by(TTSGeneration.created_at.desc())
-        .limit(1)
-    )
-    latest_generation = session.exec(latest_generation_stmt).first()
-
-    script_dict = script.model_dump()
-    script_dict["voice_actor_name"] = voice_actor_name
-    script_dict["latest_generation"] = (
-        latest_generation.model_dump() if latest_generation else None
-    )
-
-    return TTSScriptWithVoiceActor(**script_dict)
+    return _script_with_info(script, voice_actor_name, latest_generation)
 
 
 @router.put("/tts-scripts/{script_id}", response_model=TTSScriptPublic)
@@ -521,26 +568,23 @@ def delete_tts_script(
 @router.post("/tts-scripts/{script_id}/generate", response_model=TTSGenerationPublic)
 async def generate_tts(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     script_id: uuid.UUID,
     generate_request: TTSGenerateRequest,
     current_user: CurrentUser,
-    background_tasks: BackgroundTasks,
 ) -> TTSGenerationPublic:
-    """TTS 생성 요청 (팩토리 패턴 사용)"""
+    """TTS 생성 요청 (작업 큐에 등록, 큐 워커가 처리)
+
+    에디터에서의 단건 생성은 기본적으로 interactive 우선순위로 일괄 생성보다 먼저 처리된다.
+    응답의 queue_position/eta_seconds로 대기 순번과 예상 시간을 확인할 수 있다.
+    """
     # 스크립트 확인
-    script = session.get(TTSScript, script_id)
+    script = await session.get(TTSScript, script_id)
     if not script:
         raise HTTPException(status_code=404, detail="스크립트를 찾을 수 없습니다.")
 
     # 한국어 최적화 기본 파라미터 병합
-    korean_optimized_params = {
-        "temperature": 0.65,
-        "top_k": 40,
-        "top_p": 0.85,
-        "repetition_penalty": 1.1,
-        "do_sample": True,
-    }
+    korean_optimized_params = dict(DEFAULT_GENERATION_PARAMS)
 
     # 사용자 지정 파라미터와 병합
     if generate_request.generation_params:
@@ -553,30 +597,15 @@ async def generate_tts(
         script_id=script_id,
         generation_params=korean_optimized_params,
         requested_by=current_user.id,
+        priority=generate_request.priority,
     )
 
-    session.add(generation)
-    session.commit()
-    session.refresh(generation)
-
-    # 🔄 팩토리에서 현재 TTS 서비스 가져오기
-    tts_service = get_tts_service()
-
-    # 백그라운드에서 TTS 생성 처리 (에러 로깅 래퍼 포함)
-    async def tts_generation_wrapper():
-        try:
-            await tts_service.process_tts_generation(generation.id)
-        except Exception as e:
-            logger.error(f"🚨 백그라운드 TTS 작업 래퍼에서 예외 발생: {e}")
-            logger.error(f"🚨 예외 타입: {type(e).__name__}")
-            import traceback
-
-            logger.error(f"🚨 스택 트레이스: {traceback.format_exc()}")
-
-    background_tasks.add_task(tts_generation_wrapper)
+    # 작업 큐에 등록 (API 프로세스가 재시작되어도 작업이 유실되지 않음)
+    # 같은 텍스트/성우/파라미터로 생성된 음성이 캐시에 있으면 즉시 완료됨
+    await session.run_sync(enqueue_generation, generation)
 
     try:
-        return TTSGenerationPublic.model_validate(generation)
+        return (await session.run_sync(tts_queue.to_public, [generation]))[0]
     except Exception as e:
         logger.error(f"❌ Failed to convert TTS generation {generation.id}: {e}")
         raise HTTPException(
@@ -586,10 +615,56 @@ async def generate_tts(
 
 
 
+@router.get("/tts-scripts/{script_id}/stream")
+async def stream_tts_script(
+    *,
+    session: AsyncSessionDep,
+    request: Request,
+    script_id: uuid.UUID,
+    current_user: CurrentUser,
+) -> Response:
+    """TTS 스크립트 미리듣기 (문장 단위로 합성하며 첫 문장부터 바로 재생)
+
+    같은 합성 결과가 캐시에 있으면 해당 파일을 그대로 보낸다.
+    스트리밍 결과는 저장되지 않으므로 보관하려면 /generate로 생성 작업을 등록한다.
+    """
+    script = await session.get(TTSScript, script_id)
+    if not script:
+        raise HTTPException(status_code=404, detail="스크립트를 찾을 수 없습니다.")
+
+    # 미리듣기는 대화형 요청이므로 추론 워커에서 일괄 생성보다 먼저 처리 (캐시 키에는 영향 없음)
+    params = {**DEFAULT_GENERATION_PARAMS, "priority": TTSPriority.INTERACTIVE.value}
+    cache_key = await session.run_sync(
+        tts_cache.compute_cache_key, script.text_content, script.voice_actor_id, params
+    )
+    entry = (
+        await session.run_sync(tts_cache.lookup, cache_key) if settings.TTS_CACHE_ENABLED else None
+    )
+    if entry:
+        return audio_file_response(request, Path(entry.audio_file_path))
+
+    voice_actor = (
+        await session.get(VoiceActor, script.voice_actor_id) if script.voice_actor_id else None
+    )
+
+    tts_service = get_tts_service()
+    try:
+        stream = await tts_service.open_stream(
+            script.text_content, voice_actor, session, params
+        )
+    except Exception as e:
+        logger.error(f"❌ TTS 스트리밍 준비 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"TTS 스트리밍을 시작할 수 없습니다: {str(e)}")
+
+    return StreamingResponse(
+        stream, media_type="audio/wav", headers={"Cache-Control": "no-store"}
+    )
+
+
 @router.post("/tts-scripts/batch-generate")
 async def batch_generate_tts(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     batch_request: "BatchTTSRequest",
     current_user: CurrentUser,
     background_tasks: BackgroundTasks,
@@ -605,7 +680,7 @@ async def batch_generate_tts(
 
     # 스크립트 소유권 확인
     for script_id in batch_request.script_ids:
-        script = session.get(TTSScript, script_id)
+        script = await session.get(TTSScript, script_id)
         if not script:
             raise HTTPException(
                 status_code=404, detail=f"스크립트 {script_id}를 찾을 수 없습니다."
@@ -618,10 +693,15 @@ async def batch_generate_tts(
     # 🔄 팩토리에서 현재 TTS 서비스 가져오기
     tts_service = get_tts_service()
 
+    if batch_request.priority == TTSPriority.INTERACTIVE:
+        raise HTTPException(
+            status_code=400, detail="일괄 생성은 batch 또는 background 우선순위만 사용할 수 있습니다."
+        )
+
     # 배치 생성 시작
     try:
         results = await tts_service.batch_generate_tts(
-            batch_request.script_ids, batch_request.force_regenerate
+            batch_request.script_ids, batch_request.force_regenerate, batch_request.priority
         )
 
         return {"message": "배치 TTS 생성이 시작되었습니다.", "results": results}
@@ -637,8 +717,8 @@ async def batch_generate_tts(
 @router.get("/tts-generations/{generation_id}", response_model=TTSGenerationPublic)
 def get_tts_generation(
     *, session: SessionDep, generation_id: uuid.UUID, current_user: CurrentUser
-) -> TTSGeneration:
-    """TTS 생성 상태 조회"""
+) -> TTSGenerationPublic:
+    """TTS 생성 상태 조회 (대기/처리 중이면 큐 순번과 예상 시간 포함)"""
     generation = session.get(TTSGeneration, generation_id)
     if not generation:
         raise HTTPException(status_code=404, detail="생성 작업을 찾을 수 없습니다.")
@@ -646,14 +726,42 @@ def get_tts_generation(
     if generation.requested_by != current_user.id:
         raise HTTPException(status_code=403, detail="접근 권한이 없습니다.")
 
-    return generation
+    return tts_queue.to_public(session, [generation])[0]
+
+
+@router.get("/tts-generations/{generation_id}/timings", response_model=TTSGenerationTimings)
+def get_tts_generation_timings(
+    *, session: SessionDep, generation_id: uuid.UUID, current_user: CurrentUser
+) -> TTSGenerationTimings:
+    """TTS 생성 단계별 소요 시간 조회 (대기, 준비, 참조 인코딩, 합성, 디코딩, 후처리, DB 반영)"""
+    generation = session.get(TTSGeneration, generation_id)
+    if not generation:
+        raise HTTPException(status_code=404, detail="생성 작업을 찾을 수 없습니다.")
+
+    if generation.requested_by != current_user.id and not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="접근 권한이 없습니다.")
+
+    return TTSGenerationTimings(
+        generation_id=generation.id,
+        status=generation.status,
+        cache_hit=generation.cache_hit,
+        attempts=generation.attempts,
+        created_at=generation.created_at,
+        started_at=generation.started_at,
+        completed_at=generation.completed_at,
+        stage_timings=generation.stage_timings or {},
+    )
 
 
 @router.get("/tts-generations/{generation_id}/audio")
 def stream_generated_audio(
-    *, session: SessionDep, generation_id: uuid.UUID, current_user: CurrentUser
-) -> StreamingResponse:
-    """생성된 TTS 오디오 스트리밍"""
+    *,
+    session: SessionDep,
+    request: Request,
+    generation_id: uuid.UUID,
+    current_user: CurrentUser,
+) -> Response:
+    """생성된 TTS 오디오 스트리밍 (Range 요청 지원)"""
     generation = session.get(TTSGeneration, generation_id)
     if not generation:
         raise HTTPException(status_code=404, detail="생성 작업을 찾을 수 없습니다.")
@@ -668,12 +776,7 @@ def stream_generated_audio(
     if not file_path.exists():
         raise HTTPException(status_code=404, detail="오디오 파일을 찾을 수 없습니다.")
 
-    def iterfile():
-        with open(file_path, "rb") as file:
-            while chunk := file.read(1024):
-                yield chunk
-
-    return StreamingResponse(iterfile(), media_type="audio/wav")
+    return audio_file_response(request, file_path)
 
 
 @router.get("/tts-generations", response_model=List[TTSGenerationWithScript])
@@ -681,15 +784,18 @@ def get_tts_generations(
     *,
     session: SessionDep,
     current_user: CurrentUser,
+    response: Response,
     skip: int = 0,
     limit: int = 20,
+    cursor: Optional[str] = None,
+    total: Optional[TotalCountMode] = None,
     status: Optional[GenerationStatus] = None,
     voice_actor_id: Optional[uuid.UUID] = None,
     search: Optional[str] = None,
     sort_by: str = "created_at",
     sort_order: str = "desc",
 ) -> List[TTSGenerationWithScript]:
-    """TTS 생성 목록 조회 (스크립트 정보 포함)"""
+    """TTS 생성 목록 조회 (스크립트 정보 포함, 다음 페이지 커서는 X-Next-Cursor 헤더)"""
     # 스크립트와 성우 정보를 함께 조회
     statement = (
         select(TTSGeneration, TTSScript, VoiceActor.name.label("voice_actor_name"))
@@ -709,24 +815,35 @@ def get_tts_generations(
         search_term = f"%{search}%"
         statement = statement.where(TTSScript.text_content.ilike(search_term))
 
-    # 정렬
+    set_total_count(response, session, statement, total)
+
+    # 정렬 (값이 없는 품질 점수/길이는 -1로 취급해 커서 비교가 가능하도록 함)
+    if sort_by not in ("created_at", "quality_score", "duration"):
+        sort_by = "created_at"
     if sort_by == "created_at":
         order_column = TTSGeneration.created_at
-    elif sort_by == "quality_score":
-        order_column = TTSGeneration.quality_score
-    elif sort_by == "duration":
-        order_column = TTSGeneration.duration
-    else:
-        order_column = TTSGeneration.created_at
-
-    if sort_order == "desc":
-        order_column = order_column.desc()
     else:
-        order_column = order_column.asc()
-
-    statement = statement.order_by(order_column).offset(skip).limit(limit)
+        order_column = func.coalesce(getattr(TTSGeneration, sort_by), -1.0)
+
+    statement = paginate(
+        statement,
+        sort_column=order_column,
+        id_column=TTSGeneration.id,
+        descending=sort_order == "desc",
+        sort_key=f"{sort_by}:{sort_order}",
+        cursor=cursor,
+        skip=skip,
+        limit=limit,
+    )
 
     results = session.exec(statement).all()
+    if results:
+        last = results[-1][0]
+        last_value = getattr(last, sort_by)
+        set_next_cursor(
+            response, f"{sort_by}:{sort_order}",
+            last_value if last_value is not None else -1.0, last.id, len(results), limit,
+        )
 
     # 결과를 TTSGenerationWithScript 형태로 변환
     generations = []
@@ -780,17 +897,17 @@ def get_batch_generation_status(
     }
 
     return {
-        "generations": [TTSGenerationPublic.model_validate(g) for g in generations],
+        "generations": tts_queue.to_public(session, generations),
         "summary": status_summary,
     }
 
 
 @router.delete("/tts-generations/{generation_id}")
 async def cancel_tts_generation(
-    *, session: SessionDep, generation_id: uuid.UUID, current_user: CurrentUser
+    *, session: AsyncSessionDep, generation_id: uuid.UUID, current_user: CurrentUser
 ):
     """TTS 생성 취소 (팩토리 패턴 사용)"""
-    generation = session.get(TTSGeneration, generation_id)
+    generation = await session.get(TTSGeneration, generation_id)
     if not generation:
         raise HTTPException(status_code=404, detail="생성 작업을 찾을 수 없습니다.")
 
@@ -824,6 +941,10 @@ def create_tts_library(
     library_item = TTSLibrary(**library_in.model_dump(), created_by=current_user.id)
     session.add(library_item)
     session.commit()
+
+    # 같은 멘트가 이미 생성되어 있으면 캐시된 음성을 바로 연결
+    tts_cache.link_library_audio(session, library_item)
+    session.commit()
     session.refresh(library_item)
     return library_item
 
@@ -833,13 +954,16 @@ def get_tts_library(
     *,
     session: SessionDep,
     current_user: CurrentUser,
+    response: Response,
     skip: int = 0,
     limit: int = 50,
+    cursor: Optional[str] = None,
+    total: Optional[TotalCountMode] = None,
     category: Optional[str] = None,
     is_public: Optional[bool] = None,
     search: Optional[str] = None,
 ) -> List[TTSLibrary]:
-    """TTS 라이브러리 목록 조회"""
+    """TTS 라이브러리 목록 조회 (사용 횟수 순, 다음 페이지 커서는 X-Next-Cursor 헤더)"""
     statement = select(TTSLibrary)
 
     # 필터 적용
@@ -860,10 +984,22 @@ def get_tts_library(
         (TTSLibrary.is_public == True) | (TTSLibrary.created_by == current_user.id)
     )
 
-    statement = (
-        statement.offset(skip).limit(limit).order_by(TTSLibrary.usage_count.desc())
+    set_total_count(response, session, statement, total)
+
+    statement = paginate(
+        statement,
+        sort_column=TTSLibrary.usage_count,
+        id_column=TTSLibrary.id,
+        descending=True,
+        sort_key="usage_count",
+        cursor=cursor,
+        skip=skip,
+        limit=limit,
     )
     library_items = session.exec(statement).all()
+    if library_items:
+        last = library_items[-1]
+        set_next_cursor(response, "usage_count", last.usage_count, last.id, len(library_items), limit)
     return library_items
 
 
@@ -907,6 +1043,11 @@ def update_tts_library_item(
     update_data = library_in.model_dump(exclude_unset=True)
     library_item.sqlmodel_update(update_data)
 
+    # 텍스트/성우가 바뀌었으면 기존 음성은 더 이상 맞지 않으므로 캐시 기준으로 다시 연결
+    if "text_content" in update_data or "voice_actor_id" in update_data:
+        library_item.audio_file_path = None
+        tts_cache.link_library_audio(session, library_item)
+
     session.add(library_item)
     session.commit()
     session.refresh(library_item)
@@ -960,11 +1101,28 @@ def use_tts_library_item(
     }
 
 
+@router.get("/tts-cache/stats")
+def get_tts_cache_stats(*, session: SessionDep, current_user: CurrentUser):
+    """TTS 합성 결과 캐시 / 참조 토큰 캐시 통계 (적중률, 크기)
+
+    참조 토큰 적중/미스는 인코딩을 수행하는 큐 워커들이 하트비트로 기록한 값의 합이다.
+    """
+    stats = tts_cache.get_stats(session)
+    reference_tokens = get_tts_service().reference_cache.stats()
+    reference_tokens.update(tts_scheduler.reference_token_counts(session))
+    stats["reference_tokens"] = reference_tokens
+    return stats
+
+
 @router.get("/tts-library/{library_id}/audio")
 def stream_library_audio(
-    *, session: SessionDep, library_id: uuid.UUID, current_user: CurrentUser
-) -> StreamingResponse:
-    """TTS 라이브러리 오디오 스트리밍"""
+    *,
+    session: SessionDep,
+    request: Request,
+    library_id: uuid.UUID,
+    current_user: CurrentUser,
+) -> Response:
+    """TTS 라이브러리 오디오 스트리밍 (Range 요청 지원)"""
     library_item = session.get(TTSLibrary, library_id)
     if not library_item:
         raise HTTPException(
@@ -982,12 +1140,7 @@ def stream_library_audio(
     if not file_path.exists():
         raise HTTPException(status_code=404, detail="오디오 파일을 찾을 수 없습니다.")
 
-    def iterfile():
-        with open(file_path, "rb") as file:
-            while chunk := file.read(1024):
-                yield chunk
-
-    return StreamingResponse(iterfile(), media_type="audio/wav")
+    return audio_file_response(request, file_path)
 
 
 @router.get("/tts-library/categories", response_model=List[str])
@@ -1011,6 +1164,21 @@ def get_tts_library_categories(
 # === 오디오 전처리 엔드포인트 ===
 
 
+async def _run_audio_task(method: str, *args, **kwargs):
+    """AudioPreprocessor 작업을 공유 프로세스 풀에서 실행 (포화 시 429, 시간 초과 시 504)"""
+    try:
+        return await get_audio_pool().run(method, *args, **kwargs)
+    except AudioPoolBusyError as e:
+        logger.warning(f"⚠️ {e}")
+        raise HTTPException(
+            status_code=429,
+            detail="오디오 처리 요청이 많습니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "10"},
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="오디오 처리 시간이 초과되었습니다.")
+
+
 @router.post("/audio/preprocess")
 async def preprocess_audio(
     *,
@@ -1049,18 +1217,14 @@ async def preprocess_audio(
             and apply_voice_enhancement
         )
 
-        # 전처리 수행
-        processed_path, processing_info = (
-            audio_preprocessor.preprocess_for_voice_cloning(
-                str(temp_input), apply_all=apply_all
-            )
+        # 전처리 수행 (프로세스 풀)
+        processed_path, processing_info = await _run_audio_task(
+            "preprocess_for_voice_cloning", str(temp_input), apply_all=apply_all
         )
 
-        # 원본 파일 분석
-        original_analysis = audio_preprocessor.analyze_audio(str(temp_input))
-
-        # 처리된 파일 분석
-        processed_analysis = audio_preprocessor.analyze_audio(processed_path)
+        # 원본/처리 결과 분석 (전처리 중 메모리에서 계산된 값 사용)
+        original_analysis = processing_info["original_analysis"]
+        processed_analysis = processing_info["processed_analysis"]
 
         # 개선 사항 추천
         recommendations = audio_preprocessor.recommend_improvements(original_analysis)
@@ -1090,6 +1254,8 @@ async def preprocess_audio(
             },
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Audio preprocessing failed: {e}")
         raise HTTPException(
@@ -1124,8 +1290,8 @@ async def analyze_audio(
             content = await audio_file.read()
             buffer.write(content)
 
-        # 분석 수행
-        analysis = audio_preprocessor.analyze_audio(str(temp_file))
+        # 분석 수행 (프로세스 풀)
+        analysis = await _run_audio_task("analyze_audio", str(temp_file))
 
         # 개선 사항 추천
         recommendations = audio_preprocessor.recommend_improvements(analysis)
@@ -1147,6 +1313,8 @@ async def analyze_audio(
             "voice_cloning_ready": analysis["quality_score"] >= 70,
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Audio analysis failed: {e}")
         raise HTTPException(
@@ -1160,49 +1328,46 @@ async def analyze_audio(
 
 @router.get("/audio/download/{filename}")
 def download_preprocessed_audio(
-    *, filename: str, current_user: CurrentUser
-) -> StreamingResponse:
+    *, filename: str, request: Request, current_user: CurrentUser
+) -> Response:
     """전처리된 오디오 파일 다운로드"""
-    file_path = Path("preprocessed_audio") / filename
-
-    if not file_path.exists():
-        raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
-
     # 보안을 위해 파일명 검증
     if ".." in filename or "/" in filename:
         raise HTTPException(status_code=400, detail="잘못된 파일명입니다.")
 
-    def iterfile():
-        with open(file_path, "rb") as file:
-            while chunk := file.read(1024):
-                yield chunk
+    file_path = Path("preprocessed_audio") / filename
 
-    return StreamingResponse(
-        iterfile(),
-        media_type="audio/wav",
-        headers={"Content-Disposition": f"attachment; filename={filename}"},
-    )
+    if not file_path.exists():
+        raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
+
+    return audio_file_response(request, file_path, download_name=filename)
 
 
-@router.post("/audio/batch-preprocess")
+@router.post("/audio/batch-preprocess", status_code=202)
 async def batch_preprocess_audio(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     current_user: CurrentUser,
     voice_actor_id: uuid.UUID = Form(...),
     process_all_samples: bool = Form(False),
+    resume: bool = Form(True),
 ):
-    """성우의 모든 음성 샘플 일괄 전처리"""
+    """성우의 모든 음성 샘플 일괄 전처리 (백그라운드 작업, 진행 상황은 상태 엔드포인트로 조회)
+
+    resume=true면 이전 결과(preprocessing_results.json)에 기록된 파일 중 내용이 바뀌지 않은 파일은 건너뜀
+    """
     logger.info(f"🎤 Batch audio preprocessing for voice actor {voice_actor_id}")
 
     # 성우 확인
-    voice_actor = session.get(VoiceActor, voice_actor_id)
+    voice_actor = await session.get(VoiceActor, voice_actor_id)
     if not voice_actor:
         raise HTTPException(status_code=404, detail="성우를 찾을 수 없습니다.")
 
     # 음성 샘플 조회
-    samples = session.exec(
-        select(VoiceSample).where(VoiceSample.voice_actor_id == voice_actor_id)
+    samples = (
+        await session.exec(
+            select(VoiceSample).where(VoiceSample.voice_actor_id == voice_actor_id)
+        )
     ).all()
 
     if not samples:
@@ -1217,79 +1382,69 @@ async def batch_preprocess_audio(
     if not input_files:
         raise HTTPException(status_code=404, detail="유효한 음성 파일이 없습니다.")
 
-    try:
-        # 일괄 전처리
-        output_dir = Path("preprocessed_audio") / str(voice_actor_id)
-        results = audio_preprocessor.batch_preprocess(input_files, str(output_dir))
-
-        # 결과 정리
-        processed_count = 0
-        failed_count = 0
-        total_quality_improvement = 0
-
-        for i, (processed_path, info) in enumerate(results):
-            if processed_path and "error" not in info:
-                processed_count += 1
-
-                # 품질 향상도 계산
-                original_analysis = audio_preprocessor.analyze_audio(input_files[i])
-                processed_analysis = audio_preprocessor.analyze_audio(processed_path)
-                quality_improvement = (
-                    processed_analysis["quality_score"]
-                    - original_analysis["quality_score"]
-                )
-                total_quality_improvement += quality_improvement
+    active_job = find_active_job(voice_actor_id)
+    if active_job:
+        raise HTTPException(
+            status_code=409,
+            detail=f"이미 진행 중인 일괄 전처리 작업이 있습니다: {active_job.id}",
+        )
 
-                # 선택적으로 원본 파일 교체
-                if process_all_samples:
-                    # 백업 생성
-                    backup_path = Path(input_files[i]).with_suffix(".bak")
-                    Path(input_files[i]).rename(backup_path)
+    async def on_replaced(path: str) -> None:
+        # 내용이 바뀌었으므로 캐시된 참조 토큰을 버리고 다시 예열
+        tts_service = get_tts_service()
+        tts_service.invalidate_reference_tokens(path)
+        await tts_service.warm_reference_tokens(path)
 
-                    # 전처리된 파일로 교체
-                    Path(processed_path).rename(input_files[i])
+    job = start_batch_job(
+        BatchPreprocessJob(
+            voice_actor_id=voice_actor_id,
+            user_id=current_user.id,
+            input_files=input_files,
+            output_dir=Path("preprocessed_audio") / str(voice_actor_id),
+            replace_originals=process_all_samples,
+            resume=resume,
+        ),
+        get_audio_pool(),
+        on_replaced=on_replaced if process_all_samples else None,
+    )
 
-                    logger.info(f"Replaced original file: {input_files[i]}")
-            else:
-                failed_count += 1
+    return {
+        "message": "일괄 전처리 작업이 시작되었습니다",
+        "job_id": str(job.id),
+        "voice_actor": voice_actor.name,
+        "total_samples": len(samples),
+        "queued_files": len(input_files),
+        "status_url": f"/api/v1/voice-actors/audio/batch-preprocess/{job.id}",
+    }
 
-        avg_quality_improvement = (
-            total_quality_improvement / processed_count if processed_count > 0 else 0
-        )
 
-        return {
-            "message": "일괄 전처리 완료",
-            "voice_actor": voice_actor.name,
-            "results": {
-                "total_samples": len(samples),
-                "processed": processed_count,
-                "failed": failed_count,
-                "average_quality_improvement": f"+{avg_quality_improvement:.1f}점",
-                "files_replaced": process_all_samples,
-            },
-        }
-
-    except Exception as e:
-        logger.error(f"Batch preprocessing failed: {e}")
-        raise HTTPException(
-            status_code=500, detail=f"일괄 전처리 중 오류 발생: {str(e)}"
-        )
+@router.get("/audio/batch-preprocess/{job_id}")
+def get_batch_preprocess_status(*, job_id: uuid.UUID, current_user: CurrentUser):
+    """일괄 전처리 작업 진행 상황 및 파일별 결과"""
+    job = get_batch_job(job_id)
+    if not job or (job.user_id != current_user.id and not current_user.is_superuser):
+        raise HTTPException(status_code=404, detail="일괄 전처리 작업을 찾을 수 없습니다.")
+    return job.to_dict()
 
 
 # === 디버깅 엔드포인트 ===
 
 
 @router.get("/debug/diagnosis")
-async def diagnose_tts_environment(*, current_user: CurrentUser):
-    """TTS 환경 전체 진단 (팩토리 패턴 사용)"""
+async def diagnose_tts_environment(
+    *, current_user: CurrentUser, refresh: bool = Query(False, description="캐시를 무시하고 다시 확인")
+):
+    """TTS 환경 전체 진단 (팩토리 패턴 사용, 환경 확인 결과는 캐시 사용)"""
     logger.info(f"TTS diagnosis requested by user {current_user.id}")
 
     try:
         # 🔄 팩토리에서 현재 TTS 서비스 가져오기
         tts_service = get_tts_service()
 
-        # 기본 TTS 진단 수행
-        await tts_service.initialize_tts_model()
+        # 컨테이너/체크포인트 상태 (캐시가 만료됐거나 refresh일 때만 다시 확인)
+        if refresh:
+            tts_service.environment.invalidate("진단 요청")
+        environment = await tts_service.environment.get()
 
         diagnosis = {
             "tts_mode": "Real TTS"
@@ -1297,7 +1452,8 @@ async def diagnose_tts_environment(*, current_user: CurrentUser):
             else "Mock TTS",
             "model_loaded": getattr(tts_service, "model_loaded", False),
             "gpu_enabled": getattr(tts_service, "use_gpu", False),
-            "status": "healthy",
+            "status": "healthy" if environment["healthy"] else "unhealthy",
+            "environment": tts_service.environment.snapshot(),
         }
 
         return {"message": "TTS 환경 진단 완료", "diagnosis": diagnosis}
@@ -1340,8 +1496,9 @@ async def fix_common_tts_issues(*, current_user: CurrentUser):
         # 🔄 팩토리에서 현재 TTS 서비스 가져오기
         tts_service = get_tts_service()
 
-        # TTS 모델 재로드
+        # TTS 모델 재로드 (캐시된 환경 확인 결과도 버리고 다시 확인)
         try:
+            tts_service.environment.invalidate("자동 수정 요청")
             await tts_service.initialize_tts_model()
             results["tts_model_reloaded"] = True
         except Exception as e:
@@ -1386,9 +1543,8 @@ async def test_tts_functionality(*, current_user: CurrentUser):
 @router.post("/generate-test-tts")
 async def generate_test_tts(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     current_user: CurrentUser,
-    background_tasks: BackgroundTasks,
     test_text: str = "안녕하세요. 이것은 TTS 테스트 음성입니다. 개선된 음성 품질을 확인해보세요.",
     voice_actor_id: Optional[uuid.UUID] = None,
 ):
@@ -1411,8 +1567,6 @@ async def generate_test_tts(
         )
 
         session.add(test_script)
-        session.commit()
-        session.refresh(test_script)
 
         # TTS 생성 작업 생성
         test_generation = TTSGeneration(
@@ -1425,22 +1579,13 @@ async def generate_test_tts(
             requested_by=current_user.id,
         )
 
-        session.add(test_generation)
-        session.commit()
-        session.refresh(test_generation)
-
-        # 🔄 팩토리에서 현재 TTS 서비스 가져오기
-        tts_service = get_tts_service()
-
-        # 백그라운드에서 즉시 처리
-        background_tasks.add_task(
-            tts_service.process_tts_generation, test_generation.id
-        )
+        # 작업 큐에 등록 (스크립트와 함께 commit)
+        await session.run_sync(enqueue_generation, test_generation)
 
         # 성우 정보 추가
         voice_actor_name = None
         if voice_actor_id:
-            voice_actor = session.get(VoiceActor, voice_actor_id)
+            voice_actor = await session.get(VoiceActor, voice_actor_id)
             if voice_actor:
                 voice_actor_name = voice_actor.name
 
@@ -1477,8 +1622,8 @@ async def get_tts_service_status(*, current_user: CurrentUser):
         # 🔄 팩토리에서 현재 TTS 서비스 가져오기
         tts_service = get_tts_service()
 
-        # TTS 모델 초기화 상태 확인
-        await tts_service.initialize_tts_model()
+        # 컨테이너/체크포인트 상태 (캐시된 확인 결과 사용)
+        environment = await tts_service.environment.get()
 
         # 디렉토리 상태 확인
         audio_files_dir = Path("audio_files")
@@ -1517,7 +1662,8 @@ async def get_tts_service_status(*, current_user: CurrentUser):
 
         return {
             "timestamp": datetime.now().isoformat(),
-            "service_status": "healthy",
+            "service_status": "healthy" if environment["healthy"] else "unhealthy",
+            "environment": tts_service.environment.snapshot(),
             "tts_mode": tts_mode,
             "model_status": model_status,
             "gpu_status": gpu_status,
@@ -1583,14 +1729,17 @@ def get_voice_actors(
     *,
     session: SessionDep,
     current_user: CurrentUser,
+    response: Response,
     skip: int = 0,
     limit: int = 20,
+    cursor: Optional[str] = None,
+    total: Optional[TotalCountMode] = None,
     gender: Optional[GenderType] = None,
     age_range: Optional[AgeRangeType] = None,
     language: Optional[str] = None,
     is_active: Optional[bool] = None,
 ) -> List[VoiceActorPublic]:
-    """성우 목록 조회"""
+    """성우 목록 조회 (등록 순, 다음 페이지 커서는 X-Next-Cursor 헤더)"""
     logger.info(
         f"🎯 GET /voice-actors called with filters: gender={gender}, age_range={age_range}, language={language}, is_active={is_active}"
     )
@@ -1608,8 +1757,22 @@ def get_voice_actors(
         if is_active is not None:
             statement = statement.where(VoiceActor.is_active == is_active)
 
-        statement = statement.offset(skip).limit(limit)
+        set_total_count(response, session, statement, total)
+
+        statement = paginate(
+            statement,
+            sort_column=VoiceActor.created_at,
+            id_column=VoiceActor.id,
+            descending=False,
+            sort_key="created_at",
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+        )
         voice_actors = session.exec(statement).all()
+        if voice_actors:
+            last = voice_actors[-1]
+            set_next_cursor(response, "created_at", last.created_at, last.id, len(voice_actors), limit)
 
         logger.info(f"📊 Found {len(voice_actors)} voice actors")
 
@@ -1628,6 +1791,8 @@ def get_voice_actors(
         )
         return public_actors
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"💥 ERROR in get_voice_actors: {e}")
         raise HTTPException(status_code=500, detail=f"성우 목록 조회 중 오류: {str(e)}")
@@ -1697,11 +1862,13 @@ def delete_voice_actor(
         select(VoiceSample).where(VoiceSample.voice_actor_id == voice_actor_id)
     ).all()
 
+    tts_service = get_tts_service()
     deleted_sample_count = 0
     for sample in samples:
         if sample.audio_file_path:
             try:
                 file_path = Path(sample.audio_file_path)
+                tts_service.invalidate_reference_tokens(str(file_path))
                 if file_path.exists():
                     file_path.unlink()
                     deleted_sample_count += 1
@@ -1772,15 +1939,16 @@ def delete_voice_actor(
 @router.post("/{voice_actor_id}/samples", response_model=VoiceSamplePublic)
 async def upload_voice_sample(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     voice_actor_id: uuid.UUID,
     current_user: CurrentUser,
+    background_tasks: BackgroundTasks,
     audio_file: UploadFile = File(...),
     text_content: str = Form(...),
 ) -> VoiceSamplePublic:
     """음성 샘플 업로드"""
     # 성우 존재 확인
-    voice_actor = session.get(VoiceActor, voice_actor_id)
+    voice_actor = await session.get(VoiceActor, voice_actor_id)
     if not voice_actor:
         raise HTTPException(status_code=404, detail="성우를 찾을 수 없습니다.")
 
@@ -1801,6 +1969,13 @@ async def upload_voice_sample(
         content = await audio_file.read()
         buffer.write(content)
 
+    # 길이/샘플레이트는 헤더에서 읽음 (헤더가 없는 포맷만 디코딩)
+    try:
+        audio_info = await asyncio.to_thread(probe_audio, file_path)
+    except Exception as e:
+        logger.warning(f"⚠️ 업로드된 음성 샘플 정보 확인 실패: {file_path}: {e}")
+        audio_info = None
+
     # 데이터베이스에 정보 저장
     voice_sample = VoiceSample(
         voice_actor_id=voice_actor_id,
@@ -1809,10 +1984,18 @@ async def upload_voice_sample(
         file_size=len(content),
         uploaded_by=current_user.id,
     )
+    if audio_info:
+        voice_sample.duration = audio_info.duration
+        voice_sample.sample_rate = audio_info.sample_rate
 
     session.add(voice_sample)
-    session.commit()
-    session.refresh(voice_sample)
+    await session.commit()
+    await session.refresh(voice_sample)
+
+    # 참조 토큰을 미리 만들어 두어 첫 Voice Cloning 요청의 인코딩 단계를 생략
+    tts_service = get_tts_service()
+    tts_service.invalidate_reference_tokens(str(file_path))
+    background_tasks.add_task(tts_service.warm_reference_tokens, str(file_path))
 
     try:
         return VoiceSamplePublic.model_validate(voice_sample)
@@ -1868,9 +2051,10 @@ def stream_voice_sample(
     session: SessionDep,
     voice_actor_id: uuid.UUID,
     sample_id: uuid.UUID,
+    request: Request,
     current_user: CurrentUser,
-) -> StreamingResponse:
-    """음성 샘플 스트리밍"""
+) -> Response:
+    """음성 샘플 스트리밍 (Range 요청 지원)"""
     sample = session.get(VoiceSample, sample_id)
     if not sample or sample.voice_actor_id != voice_actor_id:
         raise HTTPException(status_code=404, detail="음성 샘플을 찾을 수 없습니다.")
@@ -1879,12 +2063,7 @@ def stream_voice_sample(
     if not file_path.exists():
         raise HTTPException(status_code=404, detail="오디오 파일을 찾을 수 없습니다.")
 
-    def iterfile():
-        with open(file_path, "rb") as file:
-            while chunk := file.read(1024):
-                yield chunk
-
-    return StreamingResponse(iterfile(), media_type="audio/wav")
+    return audio_file_response(request, file_path)
 
 
 # === 배치 TTS 생성 클래스 ===
@@ -1893,3 +2072,4 @@ def stream_voice_sample(
 class BatchTTSRequest(SQLModel):
     script_ids: List[uuid.UUID]
     force_regenerate: bool = False
+    priority: TTSPriority = TTSPriority.BATCH  # background: 미리 만들어두는 사전 렌더링
@@ -77,6 +77,13 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    # DB 커넥션 풀 (동기/비동기 엔진 각각에 적용, 프로세스당 최대 POOL_SIZE + MAX_OVERFLOW 연결)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # 연결을 얻을 때까지 최대 대기 시간 (초)
+    DB_POOL_RECYCLE: int = 1800  # 이 시간(초)보다 오래된 연결은 재생성 (-1이면 사용 안 함)
+    DB_POOL_PRE_PING: bool = True  # 풀에서 꺼낼 때 연결이 살아 있는지 확인
+
     FIRST_SUPERUSER: str
     FIRST_SUPERUSER_PASSWORD: str
 
@@ -84,7 +91,70 @@ class Settings(BaseSettings):
     TTS_MODEL_CACHE_DIR: str = "/tmp/tts_models"
     AUDIO_FILES_DIR: str = "/app/audio_files"
     VOICE_SAMPLES_DIR: str = "/app/voice_samples"
+    # 오디오 파일 전송을 nginx에 위임 (권한 확인 후 X-Accel-Redirect 헤더만 응답)
+    AUDIO_X_ACCEL_REDIRECT: bool = False
+    AUDIO_X_ACCEL_PREFIX: str = "/_protected"  # nginx internal location 경로
     TTS_GPU_ENABLED: bool = False
+    TTS_TEMP_DIR: str = "/app/temp_processing"  # 생성 작업별 임시 디렉토리 상위 경로
+    TTS_MAX_CONCURRENT_JOBS: int = 2  # 동시에 처리할 TTS 생성 작업 수
+
+    # TTS 작업 큐 (DB 기반, `python -m app.worker`로 처리)
+    TTS_QUEUE_POLL_INTERVAL: float = 1.0  # 대기 작업이 없을 때 조회 간격 (초)
+    TTS_QUEUE_LEASE_SECONDS: int = 300  # 하트비트 없이 이 시간이 지나면 작업을 회수
+    TTS_QUEUE_HEARTBEAT_SECONDS: int = 30
+    TTS_QUEUE_CANCEL_POLL_SECONDS: float = 1.0  # 처리 중인 작업의 취소 여부 확인 간격
+    TTS_QUEUE_MAX_ATTEMPTS: int = 3
+    TTS_QUEUE_RETRY_BACKOFF_SECONDS: int = 10  # 재시도 대기 시간 = 기본값 * 2^(시도-1)
+    TTS_QUEUE_RETRY_BACKOFF_MAX: int = 300
+    TTS_QUEUE_EMBEDDED_WORKER: bool = False  # 별도 워커 없이 API 프로세스 안에서 처리 (개발용)
+    # 우선순위 클래스별 가중 공정 큐잉 가중치 (요청자+클래스 흐름마다 가중치에 비례해 처리 순서 배분)
+    TTS_QUEUE_WEIGHT_INTERACTIVE: float = 16.0
+    TTS_QUEUE_WEIGHT_BATCH: float = 4.0
+    TTS_QUEUE_WEIGHT_BACKGROUND: float = 1.0
+    TTS_QUEUE_INTERACTIVE_SLOTS: int = 1  # 동시 처리 수가 다 차도 대화형(interactive) 작업용으로 남겨두는 슬롯
+    # 배치 생성(batch_mode) 작업은 같은 성우/파라미터끼리 묶어 워커 호출 한 번으로 합성 (1이면 사용 안 함)
+    TTS_BATCH_MAX_SIZE: int = 8
+    TTS_BATCH_DECODE_SIZE: int = 8  # DAC 디코딩 한 번에 묶는 청크 수 (GPU 메모리에 맞춰 조절)
+    # 성우 친화 스케줄링: 워커가 여러 개면 같은 성우의 작업을 같은 워커로 보냄 (app/services/tts_scheduler.py)
+    TTS_AFFINITY_ENABLED: bool = True
+    TTS_AFFINITY_SCAN_LIMIT: int = 100  # 담당 성우 작업을 찾을 대기 작업 후보 수 (오래된 순)
+    TTS_AFFINITY_STEAL_AFTER_SECONDS: float = 10.0  # 처리 중인 워커도 이 시간 이상 밀린 작업은 가져감
+    TTS_AFFINITY_WARM_VOICES: int = 16  # 워커별 warm 성우 수 (추론 워커 --prompt-cache-size와 맞춤)
+
+    # TTS 합성 결과 캐시 (같은 텍스트/성우/파라미터 요청은 기존 음성 재사용)
+    TTS_CACHE_ENABLED: bool = True
+    TTS_CACHE_MAX_BYTES: int = 2 * 1024 * 1024 * 1024  # audio_files/tts_cache 최대 크기 (LRU 제거)
+    # 처리 중인 작업과 같은 합성 결과를 요청하면 새로 합성하지 않고 그 작업에 합류 (single-flight)
+    TTS_COALESCE_ENABLED: bool = True
+
+    # 문장 단위 분할 합성 (긴 멘트를 청크로 나눠 병렬 합성 후 크로스페이드로 연결)
+    TTS_CHUNK_MAX_CHARS: int = 80  # 청크 최대 글자 수 (이보다 짧은 멘트는 한 번에 합성)
+    TTS_CHUNK_FIRST_MAX_CHARS: int = 40  # 스트리밍 재생 시 첫 청크 최대 글자 수 (첫 음성까지의 지연)
+    TTS_CHUNK_CONCURRENCY: int = 2  # 추론 워커에 동시에 보낼 청크 수 (서비스 전체)
+    TTS_CHUNK_CROSSFADE_MS: int = 40
+
+    # 오디오 전처리 프로세스 풀 (API 이벤트 루프를 막지 않도록 별도 프로세스에서 실행)
+    AUDIO_POOL_WORKERS: int = 2
+    AUDIO_POOL_MAX_PENDING: int = 8  # 실행 중 + 대기 중 작업 최대 수 (초과 시 429)
+    AUDIO_POOL_TASK_TIMEOUT: int = 120  # 작업당 최대 대기 시간 (초)
+    AUDIO_POOL_MAX_TASKS_PER_CHILD: int = 50  # 워커 프로세스를 주기적으로 교체해 메모리 누적 방지
+
+    # Fish-Speech 상주 추론 워커 설정
+    FISH_SPEECH_CONTAINER_NAME: str = "fish-speech-tts"
+    FISH_SPEECH_DIR: str = "/opt/fish-speech"
+    FISH_SPEECH_MODEL_PATH: str = "/opt/fish-speech/checkpoints/openaudio-s1-mini"
+    FISH_SPEECH_DEVICE: str = "cuda"
+    FISH_SPEECH_WORKER_HOST: str = "localhost"
+    FISH_SPEECH_WORKER_PORT: int = 8765
+    FISH_SPEECH_WORKER_TIMEOUT: int = 180  # 요청당 최대 대기 시간 (초)
+    FISH_SPEECH_WORKER_STARTUP_TIMEOUT: int = 300  # 모델 로드 + compile 대기 시간 (초)
+    FISH_SPEECH_WORKER_AUTOSTART: bool = True  # 워커가 없으면 컨테이너 안에서 기동
+    FISH_SPEECH_WORKER_COMPILE: bool = True
+    # 워커가 보는 작업 공간 경로 (audio_files, voice_samples가 마운트된 위치)
+    FISH_SPEECH_WORKSPACE_DIR: str = "/workspace"
+    # 컨테이너/체크포인트 확인 결과 캐시 시간 (초, 실패 결과는 FAILURE_TTL 동안만 유지)
+    FISH_SPEECH_HEALTH_TTL: int = 300
+    FISH_SPEECH_HEALTH_FAILURE_TTL: int = 10
 
     def _check_default_secret(self, var_name: str, value: str | None) -> None:
         if value == "changethis":
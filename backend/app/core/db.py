@@ -1,3 +1,4 @@
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import Session, create_engine, select
 from datetime import datetime
 from app.crud import users as crud
@@ -8,7 +9,22 @@ import app.models  # This imports all models from __init__.py
 from app.models.users import User, UserCreate
 from app.models.ment import Ment
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+
+def pool_options() -> dict:
+    """동기/비동기 엔진 공용 커넥션 풀 설정"""
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI), **pool_options())
+
+# async 라우트와 TTS 생성 파이프라인용 (psycopg async 드라이버, 이벤트 루프를 막지 않음)
+async_engine = create_async_engine(str(settings.SQLALCHEMY_DATABASE_URI), **pool_options())
 
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
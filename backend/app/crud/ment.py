@@ -4,6 +4,7 @@ from datetime import datetime
 
 from sqlmodel import Session, select
 
+from app.api.pagination import paginate
 from app.models.ment import Ment, MentCreate, MentUpdate
 
 
@@ -44,6 +45,18 @@ def get_ment_by_id(*, session: Session, ment_id: UUID) -> Optional[Ment]:
     return session.get(Ment, ment_id)
 
 
-def get_ments_by_user_id(*, session: Session, user_id: UUID, skip: int = 0, limit: int = 5) -> List[Ment]:
-    statement = select(Ment).where(Ment.user_id == user_id).offset(skip).limit(limit)
+def get_ments_by_user_id(
+    *, session: Session, user_id: UUID, skip: int = 0, limit: int = 5, cursor: Optional[str] = None
+) -> List[Ment]:
+    """최근 생성 순 멘트 목록 (cursor가 있으면 skip 대신 keyset 조회)"""
+    statement = paginate(
+        select(Ment).where(Ment.user_id == user_id),
+        sort_column=Ment.created_dt,
+        id_column=Ment.id,
+        descending=True,
+        sort_key="created_dt",
+        cursor=cursor,
+        skip=skip,
+        limit=limit,
+    )
     return session.exec(statement).all()
@@ -1,4 +1,5 @@
 import sentry_sdk
+import asyncio
 import logging
 from fastapi import FastAPI, APIRouter, Depends, Request
 from fastapi.routing import APIRoute
@@ -8,6 +9,7 @@ from contextlib import asynccontextmanager
 from typing import List
 
 from app.api.main import api_router
+from app.api.pagination import PAGINATION_HEADERS
 from app.core.config import settings
 from app.api.deps import CurrentUser, SessionDep
 from app.models.voice_actor import VoiceActor
@@ -55,9 +57,37 @@ async def lifespan(app: FastAPI):
     
     # This ensures all relationships are properly configured
     configure_mappers()
+
+    # 개발용: 별도 워커 프로세스 없이 API 프로세스 안에서 TTS 작업 큐 처리
+    queue_worker = None
+    queue_worker_task = None
+    if settings.TTS_QUEUE_EMBEDDED_WORKER:
+        from app.worker import TTSQueueWorker
+
+        queue_worker = TTSQueueWorker()
+        queue_worker_task = asyncio.create_task(queue_worker.run())
+
+    # 오디오 전처리용 프로세스 풀 (요청 간 공유)
+    from app.services.audio.audio_executor import start_audio_pool, shutdown_audio_pool
+
+    start_audio_pool(
+        max_workers=settings.AUDIO_POOL_WORKERS,
+        max_pending=settings.AUDIO_POOL_MAX_PENDING,
+        task_timeout=settings.AUDIO_POOL_TASK_TIMEOUT,
+        max_tasks_per_child=settings.AUDIO_POOL_MAX_TASKS_PER_CHILD,
+    )
     
     yield
     # Shutdown: cleanup if needed
+    if queue_worker and queue_worker_task:
+        queue_worker.stop()
+        await queue_worker_task
+    shutdown_audio_pool()
+
+    # 비동기 엔진의 풀 연결은 이벤트 루프가 살아 있을 때 정리
+    from app.core.db import async_engine
+
+    await async_engine.dispose()
 
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
     sentry_sdk.init(
@@ -92,6 +122,7 @@ if settings.all_cors_origins:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=PAGINATION_HEADERS,
     )
 
 # Add OpenAI-compatible models endpoint (외부 라이브러리 호환성을 위해 유지)
@@ -7,9 +7,9 @@ from .voice_actor import (
 )
 from .tts import (
     TTSScript, TTSScriptCreate, TTSScriptUpdate, TTSScriptPublic,
-    TTSGeneration, TTSGenerateRequest, TTSGenerationPublic,
+    TTSGeneration, TTSGenerateRequest, TTSGenerationPublic, TTSGenerationTimings,
     TTSLibrary, TTSLibraryCreate, TTSLibraryUpdate, TTSLibraryPublic,
-    GenerationStatus
+    TTSAudioCache, TTSDailyStats, TTSWorker, GenerationStatus, TTSPriority
 )
 from .scenario import (
     Scenario, ScenarioCreate, ScenarioUpdate, ScenarioPublic, ScenarioWithDetails,
@@ -36,9 +36,9 @@ __all__ = [
     "GenderType", "AgeRangeType",
     # TTS
     "TTSScript", "TTSScriptCreate", "TTSScriptUpdate", "TTSScriptPublic",
-    "TTSGeneration", "TTSGenerateRequest", "TTSGenerationPublic",
+    "TTSGeneration", "TTSGenerateRequest", "TTSGenerationPublic", "TTSGenerationTimings",
     "TTSLibrary", "TTSLibraryCreate", "TTSLibraryUpdate", "TTSLibraryPublic",
-    "GenerationStatus",
+    "TTSAudioCache", "TTSDailyStats", "TTSWorker", "GenerationStatus", "TTSPriority",
     # Scenarios
     "Scenario", "ScenarioCreate", "ScenarioUpdate", "ScenarioPublic", "ScenarioWithDetails",
     "ScenarioNode", "ScenarioNodeCreate", "ScenarioNodeUpdate", "ScenarioNodePublic",
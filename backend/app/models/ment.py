@@ -1,5 +1,6 @@
 import uuid
 from datetime import datetime
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel, Relationship
 from typing import Optional
 
@@ -21,6 +22,11 @@ class MentUpdate(MentBase):
 
 
 class Ment(MentBase, table=True):
+    __table_args__ = (
+        # 목록 커서 페이지네이션 (사용자별 최근 생성 순)
+        Index("ix_ment_user_created", "user_id", "created_dt", "id"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: uuid.UUID = Field(foreign_key="user.id")
     created_dt: datetime = Field(default_factory=datetime.now)
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from sqlmodel import Field, SQLModel, Relationship, Column
-from sqlalchemy import JSON
+from sqlalchemy import JSON, Index
 from enum import Enum
 from typing import Union
 
@@ -56,6 +56,11 @@ class ScenarioUpdate(ScenarioBase):
     is_template: Optional[bool] = None
 
 class Scenario(ScenarioBase, table=True):
+    __table_args__ = (
+        # 목록 커서 페이지네이션 (최근 수정 순)
+        Index("ix_scenario_updated_id", "updated_at", "id"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     created_by: uuid.UUID = Field(foreign_key="user.id")
     updated_by: Optional[uuid.UUID] = Field(foreign_key="user.id")
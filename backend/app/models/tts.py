@@ -1,9 +1,9 @@
 # backend/app/models/tts.py
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional, List, Dict, Any
 from sqlmodel import Field, SQLModel, Relationship, Column
-from sqlalchemy import JSON
+from sqlalchemy import JSON, Index, text
 from enum import Enum
 
 
@@ -15,6 +15,13 @@ class GenerationStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+# 생성 작업 우선순위 클래스 (큐에서 가중 공정 큐잉 가중치로 사용, app/services/tts_queue.py)
+class TTSPriority(str, Enum):
+    INTERACTIVE = "interactive"  # 에디터 단건 생성/미리듣기
+    BATCH = "batch"  # batch-generate 일괄 생성
+    BACKGROUND = "background"  # 미리 만들어두는 사전 렌더링
+
+
 # TTS 스크립트 (멘트 내용 + 설정)
 class TTSScriptBase(SQLModel):
     text_content: str
@@ -33,6 +40,11 @@ class TTSScriptUpdate(TTSScriptBase):
 
 
 class TTSScript(TTSScriptBase, table=True):
+    __table_args__ = (
+        # 목록 커서 페이지네이션 (작성자별 생성 순)
+        Index("ix_ttsscript_owner_created", "created_by", "created_at", "id"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     voice_actor_id: Optional[uuid.UUID] = Field(foreign_key="voiceactor.id")
     created_by: uuid.UUID = Field(foreign_key="user.id")
@@ -64,6 +76,7 @@ class TTSGenerationBase(SQLModel):
 class TTSGenerateRequest(SQLModel):
     script_id: uuid.UUID
     generation_params: Optional[Dict[str, Any]] = None
+    priority: TTSPriority = TTSPriority.INTERACTIVE
 
 
 class TTSMultipleGenerateRequest(SQLModel):
@@ -73,6 +86,15 @@ class TTSMultipleGenerateRequest(SQLModel):
 
 
 class TTSGeneration(TTSGenerationBase, table=True):
+    __table_args__ = (
+        # 작업 큐 조회: status=PENDING, 가중 공정 큐잉 종료 태그(virtual_finish) 순
+        Index("ix_ttsgeneration_queue", "status", "virtual_finish", "created_at"),
+        # 스크립트별 최신 생성 결과 조회 (스크립트 목록의 latest_generation)
+        Index("ix_ttsgeneration_script_created", "script_id", text("created_at DESC")),
+        # 생성 이력 커서 페이지네이션 (요청자별 생성 순)
+        Index("ix_ttsgeneration_requester_created", "requested_by", "created_at", "id"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     script_id: uuid.UUID = Field(foreign_key="ttsscript.id")
     audio_file_path: Optional[str] = Field(default=None, max_length=500)
@@ -86,6 +108,26 @@ class TTSGeneration(TTSGenerationBase, table=True):
     completed_at: Optional[datetime] = None
     created_at: datetime = Field(default_factory=datetime.now)
 
+    # 작업 큐 상태 (app/services/tts_queue.py)
+    attempts: int = Field(default=0)  # 지금까지 처리를 시도한 횟수
+    max_attempts: int = Field(default=3)
+    next_attempt_at: Optional[datetime] = None  # 재시도 대기 중이면 이 시각 이후에 다시 처리
+    claimed_by: Optional[str] = Field(default=None, max_length=100)  # 처리 중인 워커 ID
+    lease_expires_at: Optional[datetime] = None  # 이 시각까지 하트비트가 없으면 다른 워커가 회수
+    priority: TTSPriority = Field(default=TTSPriority.INTERACTIVE)
+    # 가중 공정 큐잉 태그 (요청자+우선순위 흐름별 가상 시작/종료 시각, 등록 시 계산)
+    virtual_start: float = Field(default=0.0)
+    virtual_finish: float = Field(default=0.0)
+    # 같은 합성 결과(cache_key)를 만드는 처리 중 작업에 합류한 경우 그 작업 ID (대표 작업이 끝나면 함께 완료)
+    coalesced_into: Optional[uuid.UUID] = Field(default=None, index=True)
+
+    # 합성 결과 캐시 (app/services/tts_cache.py)
+    cache_key: Optional[str] = Field(default=None, max_length=64, index=True)
+    cache_hit: bool = Field(default=False)  # 캐시된 음성을 재사용해 즉시 완료된 작업
+
+    # 단계별 소요 시간 (초, app/services/tts_timing.py)
+    stage_timings: Optional[Dict[str, float]] = Field(default=None, sa_column=Column(JSON))
+
     # 관계 정의
     script: Optional[TTSScript] = Relationship(back_populates="generations")
     requested_by_user: Optional["User"] = Relationship(
@@ -105,6 +147,25 @@ class TTSGenerationPublic(TTSGenerationBase):
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     created_at: datetime
+    attempts: int = 0
+    next_attempt_at: Optional[datetime] = None
+    cache_hit: bool = False
+    priority: TTSPriority = TTSPriority.INTERACTIVE
+    coalesced_into: Optional[uuid.UUID] = None
+    # 대기 중인 작업의 큐 순번 (1이면 다음 차례)과 예상 완료까지 남은 시간 (처리 중이면 남은 시간만)
+    queue_position: Optional[int] = None
+    eta_seconds: Optional[float] = None
+
+
+class TTSGenerationTimings(SQLModel):
+    generation_id: uuid.UUID
+    status: GenerationStatus
+    cache_hit: bool = False
+    attempts: int = 0
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    stage_timings: Dict[str, float] = {}
 
 
 # TTS 라이브러리 (재사용 가능한 멘트)
@@ -129,9 +190,15 @@ class TTSLibraryUpdate(TTSLibraryBase):
 
 
 class TTSLibrary(TTSLibraryBase, table=True):
+    __table_args__ = (
+        # 목록 커서 페이지네이션 (사용 횟수 순)
+        Index("ix_ttslibrary_usage_id", "usage_count", "id"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     voice_actor_id: Optional[uuid.UUID] = Field(foreign_key="voiceactor.id")
     audio_file_path: Optional[str] = Field(default=None, max_length=500)
+    cache_key: Optional[str] = Field(default=None, max_length=64, index=True)
     usage_count: int = Field(default=0)
     created_by: uuid.UUID = Field(foreign_key="user.id")
     created_at: datetime = Field(default_factory=datetime.now)
@@ -153,6 +220,51 @@ class TTSLibraryPublic(TTSLibraryBase):
     updated_at: datetime
 
 
+# TTS 합성 결과 캐시 (정규화 텍스트 + 성우 + 샘플 구성 + 파라미터 + 모델 → 음성 파일)
+class TTSAudioCache(SQLModel, table=True):
+    cache_key: str = Field(primary_key=True, max_length=64)
+    audio_file_path: str = Field(max_length=500)
+    file_size: int = 0  # bytes
+    duration: Optional[float] = None  # 초 단위
+    quality_score: Optional[float] = None
+    voice_actor_id: Optional[uuid.UUID] = Field(default=None, foreign_key="voiceactor.id")
+    text_preview: Optional[str] = Field(default=None, max_length=200)
+    source_generation_id: Optional[uuid.UUID] = None
+    hit_count: int = Field(default=0)
+    created_at: datetime = Field(default_factory=datetime.now)
+    last_used_at: datetime = Field(default_factory=datetime.now, index=True)  # LRU 제거 기준
+
+
+# 일별 TTS 생성 집계 (대시보드용, 생성 완료/최종 실패 시점에 증분 갱신)
+class TTSDailyStats(SQLModel, table=True):
+    day: date = Field(primary_key=True)
+    completed_count: int = Field(default=0)
+    failed_count: int = Field(default=0)
+    cache_hit_count: int = Field(default=0)
+    quality_sum: float = Field(default=0.0)  # 평균 품질 = quality_sum / quality_count
+    quality_count: int = Field(default=0)
+    duration_sum: float = Field(default=0.0)  # 생성된 음성 길이 합 (초)
+    updated_at: datetime = Field(default_factory=datetime.now)
+
+
+# TTS 큐 워커 등록 정보 (성우 친화 스케줄링의 해시 링 구성 + 워커별 warm 적중률)
+class TTSWorker(SQLModel, table=True):
+    id: str = Field(primary_key=True, max_length=255)  # TTSQueueWorker.worker_id
+    hostname: Optional[str] = Field(default=None, max_length=255)
+    capacity: int = Field(default=1)  # 동시 처리 수
+    running: int = Field(default=0)
+    warm_voices: Optional[List[str]] = Field(default=None, sa_column=Column(JSON))  # 최근 처리한 성우 (LRU 순)
+    jobs_claimed: int = Field(default=0)
+    warm_hits: int = Field(default=0)  # 이미 warm 상태인 성우의 작업을 처리한 횟수
+    warm_misses: int = Field(default=0)
+    stolen_jobs: int = Field(default=0)  # 다른 워커 담당 성우의 작업을 유휴 상태에서 가져온 횟수
+    # 참조 토큰 캐시(ReferenceTokenCache) 적중/미스 - 프로세스 메모리 카운터라 API 프로세스에서 보이도록 기록
+    reference_token_hits: int = Field(default=0)
+    reference_token_misses: int = Field(default=0)
+    started_at: datetime = Field(default_factory=datetime.now)
+    last_heartbeat: datetime = Field(default_factory=datetime.now, index=True)
+
+
 # 기존 Ment 모델 확장 (TTS 연동을 위해)
 class MentUpdate(SQLModel):
     title: Optional[str] = None
@@ -163,3 +275,4 @@ class MentUpdate(SQLModel):
         default=None, sa_column=Column(JSON)
     )  # 추가
     modified_dt: datetime = Field(default_factory=datetime.now)
+
@@ -3,7 +3,7 @@ import uuid
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from sqlmodel import Field, SQLModel, Relationship, Column
-from sqlalchemy import JSON
+from sqlalchemy import JSON, Index
 from enum import Enum
 
 class GenderType(str, Enum):
@@ -42,6 +42,11 @@ class VoiceActorUpdate(VoiceActorBase):
     is_active: Optional[bool] = None
 
 class VoiceActor(VoiceActorBase, table=True):
+    __table_args__ = (
+        # 목록 커서 페이지네이션 (등록 순)
+        Index("ix_voiceactor_created_id", "created_at", "id"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     sample_audio_path: Optional[str] = Field(default=None, max_length=500)
     created_by: uuid.UUID = Field(foreign_key="user.id")
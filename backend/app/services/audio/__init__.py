@@ -1,5 +1,15 @@
 """Audio preprocessing services for voice cloning optimization"""
 
-from .audio_preprocessor import AudioPreprocessor
+from .audio_probe import AudioInfo, probe_audio
 
-__all__ = ["AudioPreprocessor"]
+
+def __getattr__(name):
+    # 전처리기는 librosa/noisereduce 등 무거운 의존성을 불러오므로 필요할 때만 import
+    if name == "AudioPreprocessor":
+        from .audio_preprocessor import AudioPreprocessor
+
+        return AudioPreprocessor
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["AudioPreprocessor", "AudioInfo", "probe_audio"]
@@ -0,0 +1,277 @@
+"""
+메모리 버퍼 기반 오디오 분석
+
+전처리 전/후 비교 리포트를 만들 때 파일을 다시 읽고 지표마다 STFT/퍼센타일을 따로 계산하지 않도록,
+이미 메모리에 있는 버퍼에서 한 번의 프레임 행렬/STFT로 모든 지표를 벡터 연산으로 구한다.
+
+긴 녹음은 StreamingMetrics로 블록 단위로 같은 지표를 누적한다 (메모리는 블록 크기에 비례).
+퍼센타일은 0.1dB 히스토그램, 센트로이드는 중심 정렬 없는 프레임 기준이라 compute_metrics와 약간 다를 수 있다.
+"""
+import logging
+from dataclasses import dataclass
+from typing import List, Optional
+
+import librosa
+import numpy as np
+import pyloudnorm as pyln
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter, lfilter_zi
+
+logger = logging.getLogger(__name__)
+
+N_FFT = 2048
+HOP_LENGTH = 512
+CLIPPING_THRESHOLD = 0.99
+SILENCE_THRESHOLD = 0.01
+# pyloudnorm 절대 게이트 (-70 LUFS), 측정 불가(너무 짧거나 무음)인 경우의 하한값
+LOUDNESS_FLOOR = -70.0
+
+
+@dataclass(frozen=True)
+class AudioMetrics:
+    duration: float  # 초
+    sample_rate: int
+    peak_amplitude: float
+    rms_level: float
+    db_level: float
+    clipping_samples: int
+    silence_ratio: float
+    spectral_centroid: float  # Hz
+    snr_estimate_db: float
+    loudness_lufs: float
+
+
+def to_mono(audio: np.ndarray) -> np.ndarray:
+    """(channels, samples) 또는 (samples,) → float32 모노"""
+    audio = np.asarray(audio, dtype=np.float32)
+    if audio.ndim > 1:
+        audio = audio.mean(axis=0)
+    return audio
+
+
+def _spectral_centroid(audio: np.ndarray, sr: int) -> float:
+    """STFT 크기 행렬 한 번으로 프레임별 센트로이드 평균 계산 (librosa.feature.spectral_centroid와 동일한 정의)"""
+    if len(audio) == 0:
+        return 0.0
+    magnitude = np.abs(librosa.stft(audio, n_fft=N_FFT, hop_length=HOP_LENGTH))
+    freqs = librosa.fft_frequencies(sr=sr, n_fft=N_FFT)
+    frame_energy = magnitude.sum(axis=0)
+    centroids = freqs @ magnitude / np.maximum(frame_energy, 1e-10)
+    return float(centroids.mean())
+
+
+def _loudness(audio: np.ndarray, meter: pyln.Meter) -> float:
+    # Meter.integrated_loudness는 게이팅 블록마다 파이썬 루프를 돌므로 벡터화된 StreamingLoudness 사용 (결과 동일)
+    loudness = StreamingLoudness(meter)
+    loudness.push(audio)
+    return loudness.integrated_loudness()
+
+
+def compute_metrics(audio: np.ndarray, sr: int, meter: Optional[pyln.Meter] = None) -> AudioMetrics:
+    """모노 버퍼의 모든 분석 지표 계산
+
+    Args:
+        meter: sr에 맞는 라우드니스 미터 (재사용 시 필터 설계 비용 절약)
+    """
+    audio = to_mono(audio)
+    n_samples = len(audio)
+    if meter is None or meter.rate != sr:
+        meter = pyln.Meter(sr)
+
+    if n_samples == 0:
+        return AudioMetrics(0.0, int(sr), 0.0, 0.0, -200.0, 0, 1.0, 0.0, 0.0, LOUDNESS_FLOOR)
+
+    # 샘플 절대값 한 번으로 피크/클리핑/침묵/SNR 퍼센타일 계산
+    magnitude = np.abs(audio)
+    peak = float(magnitude.max())
+    clipping_samples = int(np.count_nonzero(magnitude >= CLIPPING_THRESHOLD))
+    silence_ratio = float(np.count_nonzero(magnitude < SILENCE_THRESHOLD)) / n_samples
+    noise_floor, signal_peak = np.percentile(magnitude, [10, 90])
+
+    rms = float(np.sqrt(np.dot(audio, audio) / n_samples))
+
+    return AudioMetrics(
+        duration=n_samples / sr,
+        sample_rate=int(sr),
+        peak_amplitude=peak,
+        rms_level=rms,
+        db_level=float(20 * np.log10(rms + 1e-10)),
+        clipping_samples=clipping_samples,
+        silence_ratio=silence_ratio,
+        spectral_centroid=_spectral_centroid(audio, sr),
+        snr_estimate_db=float(20 * np.log10((signal_peak + 1e-10) / (noise_floor + 1e-10))),
+        loudness_lufs=_loudness(audio, meter),
+    )
+
+
+class FrameBuffer:
+    """블록 경계를 넘어 이어지는 (n_fft, hop) 프레임 생성기"""
+
+    def __init__(self, frame_length: int, hop_length: int):
+        self.frame_length = frame_length
+        self.hop_length = hop_length
+        self._carry = np.zeros(0, dtype=np.float32)
+
+    def push(self, block: np.ndarray) -> np.ndarray:
+        """완성된 프레임 행렬 (frames, frame_length) 반환, 나머지는 다음 블록으로 이월"""
+        buffer = np.concatenate([self._carry, np.asarray(block, dtype=np.float32)])
+        if len(buffer) < self.frame_length:
+            self._carry = buffer
+            return np.zeros((0, self.frame_length), dtype=np.float32)
+        n_frames = 1 + (len(buffer) - self.frame_length) // self.hop_length
+        frames = sliding_window_view(buffer, self.frame_length)[:: self.hop_length][:n_frames]
+        self._carry = buffer[n_frames * self.hop_length:]
+        return frames
+
+
+class LevelHistogram:
+    """진폭(dB) 히스토그램 - 전체 샘플을 보관하지 않고 퍼센타일 계산"""
+
+    MIN_DB = -160.0
+    MAX_DB = 20.0
+    RESOLUTION_DB = 0.1
+
+    def __init__(self):
+        self.counts = np.zeros(int((self.MAX_DB - self.MIN_DB) / self.RESOLUTION_DB) + 1, dtype=np.int64)
+
+    def add(self, magnitude: np.ndarray) -> None:
+        level_db = 20 * np.log10(np.maximum(magnitude, 1e-8))
+        index = np.clip(((level_db - self.MIN_DB) / self.RESOLUTION_DB).astype(np.int64), 0, len(self.counts) - 1)
+        self.counts += np.bincount(index, minlength=len(self.counts))
+
+    def percentile(self, q: float) -> float:
+        """q(0~100) 퍼센타일 진폭 (선형 값)"""
+        total = self.counts.sum()
+        if total == 0:
+            return 0.0
+        index = int(np.searchsorted(np.cumsum(self.counts), q / 100 * total))
+        if index == 0:
+            return 0.0
+        level_db = self.MIN_DB + (index + 0.5) * self.RESOLUTION_DB
+        return float(10 ** (level_db / 20))
+
+
+class StreamingLoudness:
+    """ITU-R BS.1770 통합 라우드니스를 블록 단위로 측정 (pyloudnorm Meter와 같은 필터/게이팅)
+
+    K-weighting 필터 상태를 이어가며 100ms(게이팅 블록의 1/4) 단위 에너지만 보관한다.
+    """
+
+    def __init__(self, meter: pyln.Meter):
+        self.rate = meter.rate
+        self._filters = [
+            (stage.b, stage.a, stage.passband_gain, lfilter_zi(stage.b, stage.a) * 0.0)
+            for stage in meter._filters.values()
+        ]
+        self._step_samples = meter.block_size * (1.0 - meter.overlap) * meter.rate
+        self._block_steps = int(round(1.0 / (1.0 - meter.overlap)))
+        self._step_energies: List[float] = []
+        self._current_energy = 0.0
+        self._position = 0  # 현재 100ms 구간 안에서의 위치
+        self._total_samples = 0
+
+    def push(self, block: np.ndarray) -> None:
+        filtered = np.asarray(block, dtype=np.float64)
+        for index, (b, a, gain, zi) in enumerate(self._filters):
+            filtered, zi = lfilter(b, a, filtered, zi=zi)
+            filtered = filtered * gain
+            self._filters[index] = (b, a, gain, zi)
+
+        squared = filtered ** 2
+        self._total_samples += len(squared)
+        offset = 0
+        while offset < len(squared):
+            boundary = int(self._step_samples * (len(self._step_energies) + 1)) - int(
+                self._step_samples * len(self._step_energies)
+            )
+            take = min(boundary - self._position, len(squared) - offset)
+            self._current_energy += float(squared[offset:offset + take].sum())
+            self._position += take
+            offset += take
+            if self._position >= boundary:
+                self._step_energies.append(self._current_energy)
+                self._current_energy = 0.0
+                self._position = 0
+
+    def integrated_loudness(self) -> float:
+        block_seconds = self._step_samples * self._block_steps / self.rate
+        duration = self._total_samples / self.rate
+        if duration < block_seconds:
+            return LOUDNESS_FLOOR
+
+        steps = np.asarray(self._step_energies + [self._current_energy])
+        n_blocks = int(np.round((duration - block_seconds) / (block_seconds / self._block_steps))) + 1
+        n_blocks = min(n_blocks, len(steps) - self._block_steps + 1)
+        if n_blocks <= 0:
+            return LOUDNESS_FLOOR
+        windows = sliding_window_view(steps, self._block_steps)[:n_blocks]
+        z = windows.sum(axis=1) / (block_seconds * self.rate)
+
+        with np.errstate(divide="ignore"):
+            block_loudness = -0.691 + 10.0 * np.log10(z)
+        gated = z[block_loudness >= LOUDNESS_FLOOR]
+        if len(gated) == 0:
+            return LOUDNESS_FLOOR
+        relative_gate = -0.691 + 10.0 * np.log10(gated.mean()) - 10.0
+        gated = z[(block_loudness > relative_gate) & (block_loudness > LOUDNESS_FLOOR)]
+        if len(gated) == 0:
+            return LOUDNESS_FLOOR
+        return float(-0.691 + 10.0 * np.log10(gated.mean()))
+
+
+class StreamingMetrics:
+    """블록 단위로 compute_metrics와 같은 지표 누적"""
+
+    def __init__(self, sr: int, meter: Optional[pyln.Meter] = None):
+        self.sr = sr
+        self._loudness = StreamingLoudness(meter if meter is not None and meter.rate == sr else pyln.Meter(sr))
+        self._frames = FrameBuffer(N_FFT, HOP_LENGTH)
+        self._window = np.hanning(N_FFT + 1)[:-1].astype(np.float32)
+        self._freqs = librosa.fft_frequencies(sr=sr, n_fft=N_FFT)
+        self._histogram = LevelHistogram()
+        self._n_samples = 0
+        self._sum_squares = 0.0
+        self._peak = 0.0
+        self._clipping = 0
+        self._silent = 0
+        self._centroid_sum = 0.0
+        self._n_frames = 0
+
+    def push(self, block: np.ndarray) -> None:
+        block = to_mono(block)
+        if len(block) == 0:
+            return
+        magnitude = np.abs(block)
+        self._n_samples += len(block)
+        self._sum_squares += float(np.dot(block, block))
+        self._peak = max(self._peak, float(magnitude.max()))
+        self._clipping += int(np.count_nonzero(magnitude >= CLIPPING_THRESHOLD))
+        self._silent += int(np.count_nonzero(magnitude < SILENCE_THRESHOLD))
+        self._histogram.add(magnitude)
+        self._loudness.push(block)
+
+        frames = self._frames.push(block)
+        if len(frames):
+            spectrum = np.abs(np.fft.rfft(frames * self._window, axis=1))
+            centroids = spectrum @ self._freqs / np.maximum(spectrum.sum(axis=1), 1e-10)
+            self._centroid_sum += float(centroids.sum())
+            self._n_frames += len(frames)
+
+    def result(self) -> AudioMetrics:
+        if self._n_samples == 0:
+            return AudioMetrics(0.0, int(self.sr), 0.0, 0.0, -200.0, 0, 1.0, 0.0, 0.0, LOUDNESS_FLOOR)
+        rms = float(np.sqrt(self._sum_squares / self._n_samples))
+        noise_floor = self._histogram.percentile(10)
+        signal_peak = self._histogram.percentile(90)
+        return AudioMetrics(
+            duration=self._n_samples / self.sr,
+            sample_rate=int(self.sr),
+            peak_amplitude=self._peak,
+            rms_level=rms,
+            db_level=float(20 * np.log10(rms + 1e-10)),
+            clipping_samples=self._clipping,
+            silence_ratio=self._silent / self._n_samples,
+            spectral_centroid=self._centroid_sum / self._n_frames if self._n_frames else 0.0,
+            snr_estimate_db=float(20 * np.log10((signal_peak + 1e-10) / (noise_floor + 1e-10))),
+            loudness_lufs=self._loudness.integrated_loudness(),
+        )
@@ -0,0 +1,173 @@
+"""
+오디오 전처리 전용 프로세스 풀
+
+노이즈 제거/HPSS/리샘플링은 파일 하나에 수 초씩 CPU를 점유하므로, API 이벤트 루프에서 직접 호출하면
+그동안 다른 요청이 모두 멈춘다. AudioPreprocessor 작업은 이 풀의 별도 프로세스에서 실행한다.
+
+- 풀은 FastAPI lifespan에서 한 번 만들고 모든 요청이 공유한다 (start_audio_pool / get_audio_pool)
+- 실행 중 + 대기 중 작업 수가 max_pending을 넘으면 즉시 AudioPoolBusyError (API는 429로 응답)
+- 작업별 timeout을 넘기면 asyncio.TimeoutError. 이미 시작된 작업은 프로세스에서 끝까지 실행되므로
+  실제로 끝날 때까지 슬롯을 반환하지 않는다 (과부하 판단이 실제 CPU 사용량과 어긋나지 않도록)
+- 워커 프로세스가 비정상 종료(OOM 등)되면 풀을 새로 만든다
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# 워커 프로세스 안에서만 사용하는 전처리기 (프로세스당 1개)
+_worker_preprocessor = None
+
+
+def _init_worker() -> None:
+    """워커 프로세스 시작 시 무거운 의존성(librosa, noisereduce)을 미리 import"""
+    global _worker_preprocessor
+    from .audio_preprocessor import AudioPreprocessor
+
+    _worker_preprocessor = AudioPreprocessor()
+
+
+def _run_in_worker(method: str, args: tuple, kwargs: dict) -> Any:
+    if _worker_preprocessor is None:
+        _init_worker()
+    return getattr(_worker_preprocessor, method)(*args, **kwargs)
+
+
+class AudioPoolBusyError(Exception):
+    """대기열이 가득 차 새 작업을 받을 수 없음"""
+
+    def __init__(self, pending: int, max_pending: int):
+        super().__init__(f"오디오 처리 대기열이 가득 찼습니다 ({pending}/{max_pending})")
+        self.pending = pending
+        self.max_pending = max_pending
+
+
+class AudioProcessPool:
+    """AudioPreprocessor 메서드를 별도 프로세스에서 실행하는 풀"""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        task_timeout: float = 120.0,
+        max_tasks_per_child: Optional[int] = None,
+    ):
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self.max_pending = max_pending or self.max_workers * 4
+        self.task_timeout = task_timeout
+        self.max_tasks_per_child = max_tasks_per_child
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def start(self) -> None:
+        if self._executor is None:
+            # fork는 API 프로세스의 스레드/이벤트 루프 상태를 복제하므로 spawn 사용
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                max_tasks_per_child=self.max_tasks_per_child,
+            )
+            logger.info(
+                f"🎛️ 오디오 처리 프로세스 풀 시작: workers={self.max_workers}, max_pending={self.max_pending}"
+            )
+
+    def shutdown(self, wait: bool = True) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+            logger.info("🎛️ 오디오 처리 프로세스 풀 종료")
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "task_timeout": self.task_timeout,
+        }
+
+    def _release(self, _future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def _submit(self, method: str, args: tuple, kwargs: dict) -> Future:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise AudioPoolBusyError(self._pending, self.max_pending)
+            self.start()
+            try:
+                future = self._executor.submit(_run_in_worker, method, args, kwargs)
+            except BrokenProcessPool:
+                logger.warning("⚠️ 오디오 처리 프로세스 풀이 손상되어 다시 생성합니다")
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+                self.start()
+                future = self._executor.submit(_run_in_worker, method, args, kwargs)
+            self._pending += 1
+        future.add_done_callback(self._release)
+        return future
+
+    async def run(self, method: str, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """AudioPreprocessor.<method>(*args, **kwargs)를 워커 프로세스에서 실행
+
+        Raises:
+            AudioPoolBusyError: 대기열이 가득 찬 경우
+            asyncio.TimeoutError: timeout(기본 task_timeout) 초과
+        """
+        future = self._submit(method, args, kwargs)
+        try:
+            # shield: 타임아웃/요청 취소 시 대기 중인 작업만 취소하고, 실행 중인 작업은 슬롯을 쥔 채 끝까지 실행
+            return await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(future)),
+                timeout=timeout or self.task_timeout,
+            )
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            if future.cancel():
+                logger.info(f"대기 중이던 오디오 작업 취소: {method}")
+            else:
+                logger.warning(f"⏱️ 오디오 작업 응답 시간 초과 (백그라운드에서 계속 실행): {method}")
+            raise
+
+
+_audio_pool: Optional[AudioProcessPool] = None
+
+
+def start_audio_pool(**kwargs) -> AudioProcessPool:
+    """공유 풀 생성 (lifespan 시작 시)"""
+    global _audio_pool
+    if _audio_pool is None:
+        _audio_pool = AudioProcessPool(**kwargs)
+        _audio_pool.start()
+    return _audio_pool
+
+
+def shutdown_audio_pool() -> None:
+    global _audio_pool
+    pool, _audio_pool = _audio_pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+def get_audio_pool() -> AudioProcessPool:
+    """공유 풀 조회 (lifespan 없이 실행된 경우 기본 설정으로 생성)"""
+    if _audio_pool is None:
+        from app.core.config import settings
+
+        return start_audio_pool(
+            max_workers=settings.AUDIO_POOL_WORKERS,
+            max_pending=settings.AUDIO_POOL_MAX_PENDING,
+            task_timeout=settings.AUDIO_POOL_TASK_TIMEOUT,
+            max_tasks_per_child=settings.AUDIO_POOL_MAX_TASKS_PER_CHILD,
+        )
+    return _audio_pool
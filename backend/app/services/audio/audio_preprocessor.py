@@ -7,7 +7,6 @@ import numpy as np
 import librosa
 import soundfile as sf
 import noisereduce as nr
-from scipy.signal import butter, lfilter, savgol_filter
 from scipy.ndimage import median_filter
 import pyloudnorm as pyln
 from typing import Optional, Tuple, Dict, Any, List
@@ -15,21 +14,44 @@ import logging
 from pathlib import Path
 import json
 
+from .audio_analysis import AudioMetrics, compute_metrics
+from .audio_probe import AudioInfo, probe_audio
+from .filter_chain import EnvelopeCompressor, zero_phase_filter
+from .streaming_preprocessor import DEFAULT_BLOCK_SECONDS, process_streaming
+
 logger = logging.getLogger(__name__)
 
 
 class AudioPreprocessor:
     """Voice Cloning을 위한 오디오 전처리 클래스"""
     
-    def __init__(self, target_sr: int = 22050, target_lufs: float = -23.0):
+    def __init__(
+        self,
+        target_sr: int = 22050,
+        target_lufs: float = -23.0,
+        streaming_threshold_seconds: float = 300.0,
+        stream_block_seconds: float = DEFAULT_BLOCK_SECONDS
+    ):
         """
         Args:
             target_sr: 목표 샘플링 레이트 (기본값: 22050Hz - Coqui TTS 권장)
             target_lufs: 목표 LUFS (Loudness Units relative to Full Scale) 값
+            streaming_threshold_seconds: 이보다 긴 파일은 블록 스트리밍으로 전처리 (메모리 사용량 제한)
+            stream_block_seconds: 스트리밍 전처리 블록 길이
         """
         self.target_sr = target_sr
         self.target_lufs = target_lufs
+        self.streaming_threshold_seconds = streaming_threshold_seconds
+        self.stream_block_seconds = stream_block_seconds
         self.meter = pyln.Meter(target_sr)  # 라우드니스 미터
+        self._meters: Dict[int, pyln.Meter] = {target_sr: self.meter}
+
+    def _meter_for(self, sr: int) -> pyln.Meter:
+        """샘플레이트별 라우드니스 미터 (K-weighting 필터 설계 재사용)"""
+        meter = self._meters.get(sr)
+        if meter is None:
+            meter = self._meters[sr] = pyln.Meter(sr)
+        return meter
         
     def process_audio(
         self,
@@ -46,7 +68,7 @@ class AudioPreprocessor:
             config: 전처리 설정 (선택사항)
             
         Returns:
-            전처리 결과 정보
+            전처리 결과 정보 (원본/처리 결과 분석 포함 - original_analysis, processed_analysis)
         """
         # 기본 설정
         default_config = {
@@ -61,7 +83,9 @@ class AudioPreprocessor:
             "high_freq_cutoff": 8000,  # Hz
             "apply_compression": True,
             "compression_ratio": 0.8,
-            "enhance_clarity": True
+            "enhance_clarity": True,
+            "harmonic_enhance": False,  # 명료도 향상 시 HPSS 하모닉 강조 (전체 STFT + 미디언 필터라 비용이 큼)
+            "streaming": None  # None이면 파일 길이로 자동 선택
         }
         
         if config:
@@ -69,9 +93,23 @@ class AudioPreprocessor:
         config = default_config
         
         try:
+            # 긴 녹음은 전체를 메모리에 올리지 않고 블록 단위로 처리
+            if self._should_stream(input_path, config["streaming"]):
+                logger.info(f"블록 스트리밍 전처리: {input_path}")
+                result = process_streaming(
+                    self, input_path, output_path, config, self.stream_block_seconds
+                )
+                result["config"] = config
+                result["input_file"] = input_path
+                result["output_file"] = output_path
+                return result
+
             # 1. 오디오 파일 로드
             audio, sr = librosa.load(input_path, sr=None, mono=True)
             logger.info(f"로드된 오디오: {len(audio)} 샘플, {sr}Hz")
+
+            # 원본 분석은 이미 읽은 버퍼로 (파일을 다시 읽지 않음)
+            original_analysis = self.analyze_buffer(audio, sr, probe_audio(input_path))
             
             # 2. 리샘플링 (필요한 경우)
             if sr != self.target_sr:
@@ -100,12 +138,12 @@ class AudioPreprocessor:
             
             # 6. 다이나믹 레인지 압축
             if config["apply_compression"]:
-                audio = self._apply_compression(audio, config["compression_ratio"])
+                audio = self._apply_compression(audio, config["compression_ratio"], sr)
                 logger.info("다이나믹 레인지 압축 완료")
             
             # 7. 음성 명료도 향상
             if config["enhance_clarity"]:
-                audio = self._enhance_clarity(audio, sr)
+                audio = self._enhance_clarity(audio, sr, config["harmonic_enhance"])
                 logger.info("음성 명료도 향상 완료")
             
             # 8. 라우드니스 정규화 (LUFS 기준)
@@ -120,8 +158,13 @@ class AudioPreprocessor:
             sf.write(output_path, audio, sr, subtype='PCM_16')
             logger.info(f"전처리된 오디오 저장 완료: {output_path}")
             
-            # 결과 분석
-            result = self._analyze_audio(audio, sr)
+            # 결과 분석 (처리된 버퍼의 지표 한 번으로 두 형식 모두 생성)
+            metrics = compute_metrics(audio, sr, self._meter_for(sr))
+            result = self._summarize_metrics(metrics)
+            result["original_analysis"] = original_analysis
+            result["processed_analysis"] = self._analysis_from_metrics(
+                metrics, channels=1, bit_depth=16, audio_format="WAV"
+            )
             result["config"] = config
             result["input_file"] = input_path
             result["output_file"] = output_path
@@ -132,6 +175,16 @@ class AudioPreprocessor:
             logger.error(f"오디오 전처리 중 오류 발생: {str(e)}")
             raise
     
+    def _should_stream(self, input_path: str, streaming: Optional[bool]) -> bool:
+        if streaming is not None:
+            return bool(streaming)
+        try:
+            # soundfile로 블록 단위로 읽을 수 있는 포맷만 (그 외는 librosa로 전체 디코딩)
+            info = probe_audio(input_path, allow_decode=False)
+        except Exception:
+            return False
+        return info.duration > self.streaming_threshold_seconds
+
     def _denoise_audio(
         self,
         audio: np.ndarray,
@@ -194,94 +247,38 @@ class AudioPreprocessor:
         low_cutoff: Optional[float] = None,
         high_cutoff: Optional[float] = None
     ) -> np.ndarray:
-        """주파수 대역 필터링"""
-        nyquist = sr / 2
-        
-        if low_cutoff and high_cutoff:
-            # 밴드패스 필터
-            low = low_cutoff / nyquist
-            high = high_cutoff / nyquist
-            b, a = butter(4, [low, high], btype='band')
-        elif low_cutoff:
-            # 하이패스 필터
-            low = low_cutoff / nyquist
-            b, a = butter(4, low, btype='high')
-        elif high_cutoff:
-            # 로우패스 필터
-            high = high_cutoff / nyquist
-            b, a = butter(4, high, btype='low')
-        else:
-            return audio
-        
-        # 필터 적용
-        filtered = lfilter(b, a, audio)
-        
-        # 위상 왜곡 보정을 위해 역방향 필터링도 적용
-        filtered = lfilter(b, a, filtered[::-1])[::-1]
-        
-        return filtered
+        """주파수 대역 필터링 (캐시된 SOS 설계, 위상 왜곡 없는 정방향 + 역방향 적용)"""
+        return zero_phase_filter(audio, sr, low_cutoff, high_cutoff)
     
     def _apply_compression(
         self,
         audio: np.ndarray,
-        ratio: float = 0.8
+        ratio: float = 0.8,
+        sr: Optional[int] = None
     ) -> np.ndarray:
-        """다이나믹 레인지 압축"""
-        # RMS 계산
-        frame_length = 2048
-        hop_length = 512
-        rms = librosa.feature.rms(
-            y=audio,
-            frame_length=frame_length,
-            hop_length=hop_length
-        )[0]
-        
-        # 스무딩
-        rms_smooth = savgol_filter(rms, 31, 3)
-        
-        # 압축 커브 적용
-        threshold = np.percentile(rms_smooth, 70)
-        gain = np.ones_like(rms_smooth)
-        
-        above_threshold = rms_smooth > threshold
-        gain[above_threshold] = (
-            threshold / rms_smooth[above_threshold]
-        ) ** (1 - ratio)
-        
-        # 게인 적용
-        gain_interp = np.interp(
-            np.arange(len(audio)),
-            np.arange(len(gain)) * hop_length,
-            gain
-        )
-        
-        compressed = audio * gain_interp
-        
-        return compressed
+        """다이나믹 레인지 압축 (RMS 엔벨로프 상위 30% 구간)"""
+        return EnvelopeCompressor(ratio, sr or self.target_sr).compress(audio, threshold_percentile=70)
     
     def _enhance_clarity(
         self,
         audio: np.ndarray,
-        sr: int
+        sr: int,
+        harmonic: bool = False
     ) -> np.ndarray:
         """음성 명료도 향상"""
-        # 1. 스펙트럴 센트로이드 기반 향상
-        spectral_centroids = librosa.feature.spectral_centroid(
-            y=audio, sr=sr
-        )[0]
-        
-        # 2. 포먼트 강조 (2-4kHz 대역)
+        # 1. 포먼트 강조 (2-4kHz 대역)
         formant_enhanced = self._apply_frequency_filter(
             audio, sr, 2000, 4000
         )
         
-        # 3. 원본과 블렌딩
+        # 2. 원본과 블렌딩
         blend_ratio = 0.3
         enhanced = audio * (1 - blend_ratio) + formant_enhanced * blend_ratio
         
-        # 4. 미세한 하모닉 향상
-        harmonic, percussive = librosa.effects.hpss(enhanced)
-        enhanced = harmonic * 1.1 + percussive * 0.9
+        # 3. 미세한 하모닉 향상 (요청 시에만)
+        if harmonic:
+            harmonic_part, percussive = librosa.effects.hpss(enhanced)
+            enhanced = harmonic_part * 1.1 + percussive * 0.9
         
         return enhanced
     
@@ -329,35 +326,20 @@ class AudioPreprocessor:
         sr: int
     ) -> Dict[str, Any]:
         """오디오 분석 정보 생성"""
-        # 기본 정보
-        duration = len(audio) / sr
-        
-        # 라우드니스 분석
-        loudness = self.meter.integrated_loudness(audio)
-        
-        # 주파수 분석
-        spectral_centroid = np.mean(
-            librosa.feature.spectral_centroid(y=audio, sr=sr)
-        )
-        
-        # RMS 에너지
-        rms = np.sqrt(np.mean(audio ** 2))
-        
-        # 신호 대 잡음비 추정
-        noise_floor = np.percentile(np.abs(audio), 10)
-        signal_peak = np.percentile(np.abs(audio), 90)
-        snr_estimate = 20 * np.log10(signal_peak / (noise_floor + 1e-10))
-        
+        return self._summarize_metrics(compute_metrics(audio, sr, self._meter_for(sr)))
+
+    def _summarize_metrics(self, metrics: AudioMetrics) -> Dict[str, Any]:
+        """전처리 결과 요약 (process_audio 결과 형식)"""
         return {
-            "duration_seconds": round(duration, 2),
-            "sample_rate": sr,
-            "loudness_lufs": round(loudness, 2),
-            "spectral_centroid_hz": round(spectral_centroid, 2),
-            "rms_energy": round(float(rms), 4),
-            "snr_estimate_db": round(snr_estimate, 2),
-            "peak_level": round(float(np.max(np.abs(audio))), 4),
+            "duration_seconds": round(metrics.duration, 2),
+            "sample_rate": metrics.sample_rate,
+            "loudness_lufs": round(metrics.loudness_lufs, 2),
+            "spectral_centroid_hz": round(metrics.spectral_centroid, 2),
+            "rms_energy": round(metrics.rms_level, 4),
+            "snr_estimate_db": round(metrics.snr_estimate_db, 2),
+            "peak_level": round(metrics.peak_amplitude, 4),
             "quality_score": self._calculate_quality_score(
-                loudness, snr_estimate, duration
+                metrics.loudness_lufs, metrics.snr_estimate_db, metrics.duration
             )
         }
     
@@ -469,7 +451,9 @@ class AudioPreprocessor:
             ],
             "quality_score": result.get("quality_score", 0),
             "duration": result.get("duration_seconds", 0),
-            "sample_rate": result.get("sample_rate", self.target_sr)
+            "sample_rate": result.get("sample_rate", self.target_sr),
+            "original_analysis": result["original_analysis"],
+            "processed_analysis": result["processed_analysis"],
         }
         
         return output_path, processing_info
@@ -477,59 +461,70 @@ class AudioPreprocessor:
     def analyze_audio(self, file_path: str) -> Dict[str, Any]:
         """오디오 파일을 분석합니다."""
         try:
-            # 오디오 로드
-            audio, sr = librosa.load(file_path, sr=None, mono=False)
-            
-            # 모노로 변환 (스테레오인 경우)
-            if audio.ndim > 1:
-                audio_mono = librosa.to_mono(audio)
-                channels = audio.shape[0]
-            else:
-                audio_mono = audio
-                channels = 1
-            
-            # 기본 정보
-            duration = len(audio_mono) / sr
-            
-            # 진폭 분석
-            peak_amplitude = np.max(np.abs(audio_mono))
-            rms_level = np.sqrt(np.mean(audio_mono ** 2))
-            db_level = 20 * np.log10(rms_level + 1e-10)
-            
-            # 클리핑 검사
-            clipping_samples = np.sum(np.abs(audio_mono) >= 0.99)
-            
-            # 침묵 비율 계산
-            silence_threshold = 0.01
-            silence_samples = np.sum(np.abs(audio_mono) < silence_threshold)
-            silence_ratio = silence_samples / len(audio_mono)
-            
-            # 주파수 분석
-            spectral_centroid = np.mean(
-                librosa.feature.spectral_centroid(y=audio_mono, sr=sr)
-            )
-            
-            # 품질 점수 계산
-            quality_score = self._calculate_quality_score_from_analysis(
-                db_level, silence_ratio, duration, clipping_samples, peak_amplitude
-            )
-            
-            return {
-                "sample_rate": sr,
-                "duration": duration,
-                "channels": channels,
-                "peak_amplitude": float(peak_amplitude),
-                "rms_level": float(rms_level),
-                "db_level": float(db_level),
-                "clipping_samples": int(clipping_samples),
-                "silence_ratio": float(silence_ratio),
-                "spectral_centroid": float(spectral_centroid),
-                "quality_score": quality_score
-            }
+            # 기본 정보는 헤더에서 읽음
+            info = probe_audio(file_path)
+
+            # 오디오 로드 (모노로 변환)
+            audio, sr = librosa.load(file_path, sr=None, mono=True)
+
+            return self.analyze_buffer(audio, sr, info)
             
         except Exception as e:
             logger.error(f"Audio analysis failed: {e}")
             raise
+
+    def analyze_buffer(
+        self,
+        audio: np.ndarray,
+        sr: int,
+        info: Optional[AudioInfo] = None
+    ) -> Dict[str, Any]:
+        """메모리에 있는 오디오를 분석합니다.
+
+        Args:
+            info: 원본 파일 헤더 정보 (채널/비트 수/포맷 표시용, 없으면 버퍼 기준)
+        """
+        metrics = compute_metrics(audio, sr, self._meter_for(sr))
+        return self._analysis_from_metrics(
+            metrics,
+            channels=info.channels if info else (1 if np.ndim(audio) == 1 else np.shape(audio)[0]),
+            bit_depth=info.bit_depth if info else None,
+            audio_format=info.format if info else None,
+            duration=info.duration if info else None,
+        )
+
+    def _analysis_from_metrics(
+        self,
+        metrics: AudioMetrics,
+        channels: int,
+        bit_depth: Optional[int] = None,
+        audio_format: Optional[str] = None,
+        duration: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """분석 결과 (analyze_audio 결과 형식)"""
+        duration = metrics.duration if duration is None else duration
+        return {
+            "sample_rate": metrics.sample_rate,
+            "duration": duration,
+            "channels": channels,
+            "bit_depth": bit_depth,
+            "format": audio_format,
+            "peak_amplitude": metrics.peak_amplitude,
+            "rms_level": metrics.rms_level,
+            "db_level": metrics.db_level,
+            "clipping_samples": metrics.clipping_samples,
+            "silence_ratio": metrics.silence_ratio,
+            "spectral_centroid": metrics.spectral_centroid,
+            "snr_estimate_db": metrics.snr_estimate_db,
+            "loudness_lufs": metrics.loudness_lufs,
+            "quality_score": self._calculate_quality_score_from_analysis(
+                metrics.db_level,
+                metrics.silence_ratio,
+                duration,
+                metrics.clipping_samples,
+                metrics.peak_amplitude,
+            )
+        }
     
     def recommend_improvements(self, analysis: Dict[str, Any]) -> List[str]:
         """분석 결과를 바탕으로 개선 사항을 추천합니다."""
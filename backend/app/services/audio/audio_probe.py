@@ -0,0 +1,129 @@
+"""
+오디오 메타데이터 조회 (헤더만 읽음)
+
+길이/샘플레이트/채널/비트 수를 알기 위해 전체 파일을 디코딩하지 않도록
+soundfile(libsndfile) 헤더 → wave 헤더 순으로 읽고, 둘 다 실패한 경우에만 디코딩한다.
+WAV/FLAC/OGG 모두 헤더 조회는 파일 크기와 관계없이 수십 μs 수준이다.
+"""
+import logging
+import wave
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+import soundfile as sf
+
+logger = logging.getLogger(__name__)
+
+# libsndfile subtype → 샘플당 비트 수
+_SUBTYPE_BITS = {
+    "PCM_S8": 8,
+    "PCM_U8": 8,
+    "PCM_16": 16,
+    "PCM_24": 24,
+    "PCM_32": 32,
+    "FLOAT": 32,
+    "DOUBLE": 64,
+    "ALAW": 8,
+    "ULAW": 8,
+}
+
+
+@dataclass(frozen=True)
+class AudioInfo:
+    duration: float  # 초
+    sample_rate: int
+    channels: int
+    frames: int
+    bit_depth: Optional[int] = None  # 압축 포맷(OGG 등)은 None
+    format: Optional[str] = None  # WAV, FLAC, OGG ...
+    subtype: Optional[str] = None  # PCM_16, VORBIS ...
+
+    def to_dict(self) -> dict:
+        return {
+            "duration": self.duration,
+            "sample_rate": self.sample_rate,
+            "channels": self.channels,
+            "frames": self.frames,
+            "bit_depth": self.bit_depth,
+            "format": self.format,
+            "subtype": self.subtype,
+        }
+
+
+def _probe_soundfile(path: str) -> AudioInfo:
+    info = sf.info(path)
+    return AudioInfo(
+        duration=info.frames / info.samplerate if info.samplerate else 0.0,
+        sample_rate=int(info.samplerate),
+        channels=int(info.channels),
+        frames=int(info.frames),
+        bit_depth=_SUBTYPE_BITS.get(info.subtype),
+        format=info.format,
+        subtype=info.subtype,
+    )
+
+
+def _probe_wave(path: str) -> AudioInfo:
+    with wave.open(path, "rb") as wav_file:
+        frames = wav_file.getnframes()
+        sample_rate = wav_file.getframerate()
+        return AudioInfo(
+            duration=frames / sample_rate if sample_rate else 0.0,
+            sample_rate=sample_rate,
+            channels=wav_file.getnchannels(),
+            frames=frames,
+            bit_depth=wav_file.getsampwidth() * 8,
+            format="WAV",
+        )
+
+
+def _probe_decode(path: str) -> AudioInfo:
+    """헤더로 알 수 없는 포맷(MP3 등 libsndfile 미지원)은 디코딩해서 계산"""
+    import librosa
+
+    audio, sample_rate = librosa.load(path, sr=None, mono=False)
+    channels = 1 if audio.ndim == 1 else audio.shape[0]
+    frames = audio.shape[-1]
+    return AudioInfo(
+        duration=frames / sample_rate,
+        sample_rate=int(sample_rate),
+        channels=channels,
+        frames=frames,
+        format=Path(path).suffix.lstrip(".").upper() or None,
+    )
+
+
+def probe_audio(path: Union[str, Path], allow_decode: bool = True) -> AudioInfo:
+    """오디오 파일 메타데이터 조회
+
+    Args:
+        allow_decode: 헤더로 읽지 못하면 디코딩으로 계산할지 여부
+
+    Raises:
+        ValueError: 오디오 파일로 인식할 수 없는 경우
+    """
+    path = str(path)
+    errors = []
+    probes = [_probe_soundfile, _probe_wave]
+    if allow_decode:
+        probes.append(_probe_decode)
+
+    for probe in probes:
+        try:
+            return probe(path)
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            errors.append(f"{probe.__name__}: {e}")
+
+    raise ValueError(f"오디오 정보를 읽을 수 없습니다: {path} ({'; '.join(errors)})")
+
+
+def get_duration(path: Union[str, Path], default: Optional[float] = None) -> Optional[float]:
+    """오디오 길이(초). 읽을 수 없으면 default"""
+    try:
+        return probe_audio(path).duration
+    except Exception as e:
+        logger.warning(f"오디오 길이 확인 실패: {path}: {e}")
+        return default
@@ -0,0 +1,287 @@
+"""
+음성 샘플 일괄 전처리 작업
+
+성우 한 명의 샘플 목록을 오디오 프로세스 풀에 나눠 병렬로 전처리하고, 파일별 결과/진행률을 작업 상태로 노출한다.
+
+- 동시 실행 수는 풀 워커 수로 제한한다 (한 작업이 대기열을 모두 차지해 다른 사용자의 요청이 429가 되지 않도록)
+- 파일 하나가 끝날 때마다 출력 디렉토리의 preprocessing_results.json을 갱신한다
+- resume 모드: 기록된 결과와 입력 해시가 같고 출력 파일 해시도 기록과 같으면(또는 입력 파일이 이미
+  기록된 출력 자체이면) 다시 처리하지 않는다
+- 작업 상태는 API 프로세스 메모리에 보관하며, 최근 MAX_JOBS개만 유지한다
+"""
+import asyncio
+import json
+import logging
+import os
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.services.fish_speech.reference_cache import file_sha256
+
+from .audio_executor import AudioPoolBusyError, AudioProcessPool
+
+logger = logging.getLogger(__name__)
+
+RESULTS_FILE_NAME = "preprocessing_results.json"
+MAX_JOBS = 100
+BUSY_RETRY_SECONDS = 2.0
+
+# 원본을 전처리 결과로 교체한 뒤 호출 (참조 토큰 캐시 무효화/예열 등)
+ReplacedCallback = Callable[[str], Awaitable[None]]
+
+
+class BatchPreprocessJob:
+    """일괄 전처리 작업 상태"""
+
+    def __init__(
+        self,
+        voice_actor_id: uuid.UUID,
+        user_id: uuid.UUID,
+        input_files: List[str],
+        output_dir: Path,
+        replace_originals: bool = False,
+        resume: bool = True,
+    ):
+        self.id = uuid.uuid4()
+        self.voice_actor_id = voice_actor_id
+        self.user_id = user_id
+        self.output_dir = output_dir
+        self.replace_originals = replace_originals
+        self.resume = resume
+        self.status = "pending"  # pending, running, completed, failed
+        self.error: Optional[str] = None
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.files: Dict[str, Dict[str, Any]] = {
+            path: {"input_file": path, "status": "pending"} for path in input_files
+        }
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def results_path(self) -> Path:
+        return self.output_dir / RESULTS_FILE_NAME
+
+    def counts(self) -> Dict[str, int]:
+        counts = {"total": len(self.files), "pending": 0, "processing": 0, "completed": 0, "skipped": 0, "failed": 0}
+        for entry in self.files.values():
+            counts[entry["status"]] += 1
+        return counts
+
+    def to_dict(self) -> Dict[str, Any]:
+        counts = self.counts()
+        finished = counts["completed"] + counts["skipped"] + counts["failed"]
+        improvements = [
+            entry["quality_improvement"]
+            for entry in self.files.values()
+            if entry["status"] == "completed" and entry.get("quality_improvement") is not None
+        ]
+        return {
+            "job_id": str(self.id),
+            "voice_actor_id": str(self.voice_actor_id),
+            "status": self.status,
+            "error": self.error,
+            "progress": round(finished / counts["total"] * 100, 1) if counts["total"] else 100.0,
+            "counts": counts,
+            "average_quality_improvement": (
+                round(sum(improvements) / len(improvements), 1) if improvements else 0.0
+            ),
+            "files_replaced": self.replace_originals,
+            "resume": self.resume,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "files": list(self.files.values()),
+        }
+
+
+def _load_results(results_path: Path) -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(results_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data.get("files", {}) if isinstance(data, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"⚠️ 전처리 결과 파일을 읽을 수 없어 처음부터 처리합니다: {results_path}: {e}")
+        return {}
+
+
+def _write_results(results_path: Path, records: Dict[str, Dict[str, Any]]) -> None:
+    """결과 파일 원자적 갱신 (중간에 중단돼도 마지막으로 기록된 상태가 남도록)"""
+    tmp_path = results_path.with_suffix(f".{uuid.uuid4().hex[:8]}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"updated_at": datetime.now().isoformat(), "files": records},
+            f,
+            indent=2,
+            ensure_ascii=False,
+        )
+    os.replace(tmp_path, results_path)
+
+
+def _already_processed(record: Optional[Dict[str, Any]], input_hash: str) -> bool:
+    if not record or not record.get("output_hash"):
+        return False
+    # 원본을 전처리 결과로 교체한 경우: 입력 파일 자체가 기록된 출력
+    if record["output_hash"] == input_hash:
+        return True
+    output_file = record.get("output_file")
+    return (
+        record.get("input_hash") == input_hash
+        and bool(output_file)
+        and Path(output_file).exists()
+        and file_sha256(output_file) == record["output_hash"]
+    )
+
+
+class BatchPreprocessRunner:
+    """BatchPreprocessJob 실행"""
+
+    def __init__(
+        self,
+        job: BatchPreprocessJob,
+        pool: AudioProcessPool,
+        on_replaced: Optional[ReplacedCallback] = None,
+    ):
+        self.job = job
+        self.pool = pool
+        self.on_replaced = on_replaced
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._records_lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(pool.max_workers)
+
+    async def run(self) -> None:
+        job = self.job
+        job.status = "running"
+        job.started_at = datetime.now()
+        try:
+            job.output_dir.mkdir(parents=True, exist_ok=True)
+            self._records = await asyncio.to_thread(_load_results, job.results_path) if job.resume else {}
+            await asyncio.gather(*(self._process_file(path) for path in job.files))
+            job.status = "completed"
+            counts = job.counts()
+            logger.info(
+                f"✅ 일괄 전처리 완료 {job.id}: 처리 {counts['completed']}, "
+                f"건너뜀 {counts['skipped']}, 실패 {counts['failed']}"
+            )
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            logger.error(f"❌ 일괄 전처리 작업 실패 {job.id}: {e}")
+        finally:
+            job.finished_at = datetime.now()
+
+    async def _process_file(self, input_file: str) -> None:
+        entry = self.job.files[input_file]
+        try:
+            input_hash = await asyncio.to_thread(file_sha256, input_file)
+            record = self._records.get(input_file)
+            if self.job.resume and await asyncio.to_thread(_already_processed, record, input_hash):
+                entry.update(record)
+                entry["status"] = "skipped"
+                # 이전에 교체 없이 처리했던 파일은 기존 결과로 원본만 교체
+                if self.job.replace_originals and record["output_hash"] != input_hash:
+                    await self._replace_original(input_file, record["output_file"])
+                    entry["output_file"] = input_file
+                    entry["replaced"] = True
+                    await self._record(input_file, entry)
+                return
+
+            async with self._semaphore:
+                entry["status"] = "processing"
+                output_file = str(self.job.output_dir / f"{Path(input_file).stem}_processed.wav")
+                _, info = await self._run_with_retry(input_file, output_file)
+
+            output_hash = await asyncio.to_thread(file_sha256, output_file)
+            original_quality = info["original_analysis"]["quality_score"]
+            processed_quality = info["processed_analysis"]["quality_score"]
+            entry.update(
+                {
+                    "output_file": output_file,
+                    "input_hash": input_hash,
+                    "output_hash": output_hash,
+                    "original_quality": original_quality,
+                    "processed_quality": processed_quality,
+                    "quality_improvement": round(processed_quality - original_quality, 1),
+                    "applied_processes": info["applied_processes"],
+                    "duration": info["duration"],
+                    "processed_at": datetime.now().isoformat(),
+                }
+            )
+
+            if self.job.replace_originals:
+                await self._replace_original(input_file, output_file)
+                entry["output_file"] = input_file
+                entry["replaced"] = True
+
+            entry["status"] = "completed"
+            await self._record(input_file, entry)
+        except Exception as e:
+            logger.error(f"Preprocessing failed for {input_file}: {e}")
+            entry["status"] = "failed"
+            entry["error"] = str(e)
+
+    async def _run_with_retry(self, input_file: str, output_file: str):
+        """풀이 다른 요청으로 포화 상태면 잠시 후 다시 제출"""
+        while True:
+            try:
+                return await self.pool.run(
+                    "preprocess_for_voice_cloning",
+                    input_file,
+                    apply_all=True,
+                    output_path=output_file,
+                )
+            except AudioPoolBusyError:
+                await asyncio.sleep(BUSY_RETRY_SECONDS)
+
+    async def _replace_original(self, input_file: str, output_file: str) -> None:
+        # 백업 생성 후 전처리된 파일로 교체
+        input_path = Path(input_file)
+        await asyncio.to_thread(input_path.rename, input_path.with_suffix(".bak"))
+        await asyncio.to_thread(Path(output_file).rename, input_path)
+        logger.info(f"Replaced original file: {input_file}")
+        if self.on_replaced:
+            await self.on_replaced(input_file)
+
+    async def _record(self, input_file: str, entry: Dict[str, Any]) -> None:
+        async with self._records_lock:
+            self._records[input_file] = {
+                key: value for key, value in entry.items() if key not in ("status", "error")
+            }
+            await asyncio.to_thread(_write_results, self.job.results_path, dict(self._records))
+
+
+_jobs: "OrderedDict[uuid.UUID, BatchPreprocessJob]" = OrderedDict()
+
+
+def start_batch_job(
+    job: BatchPreprocessJob,
+    pool: AudioProcessPool,
+    on_replaced: Optional[ReplacedCallback] = None,
+) -> BatchPreprocessJob:
+    """작업을 등록하고 백그라운드로 실행"""
+    _jobs[job.id] = job
+    while len(_jobs) > MAX_JOBS:
+        oldest_id, oldest = next(iter(_jobs.items()))
+        if oldest.status in ("pending", "running"):
+            break
+        _jobs.pop(oldest_id)
+
+    job.task = asyncio.create_task(BatchPreprocessRunner(job, pool, on_replaced).run())
+    return job
+
+
+def get_batch_job(job_id: uuid.UUID) -> Optional[BatchPreprocessJob]:
+    return _jobs.get(job_id)
+
+
+def find_active_job(voice_actor_id: uuid.UUID) -> Optional[BatchPreprocessJob]:
+    """같은 성우에 대해 진행 중인 작업 (결과 파일/원본 교체가 겹치지 않도록 하나만 허용)"""
+    for job in _jobs.values():
+        if job.voice_actor_id == voice_actor_id and job.status in ("pending", "running"):
+            return job
+    return None
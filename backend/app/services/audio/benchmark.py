@@ -0,0 +1,113 @@
+"""
+전처리 단계별 비용 마이크로 벤치마크
+
+합성 음성 신호로 각 단계를 반복 실행해 오디오 1초당 처리 시간(ms)을 출력한다.
+`legacy:` 항목은 필터 체인 도입 전 구현(매번 butter 설계 + lfilter 2회, savgol 압축, 항상 HPSS)과의 비교용이다.
+
+    python -m app.services.audio.benchmark --seconds 30 --repeat 5
+"""
+import argparse
+import statistics
+import time
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+
+def _synthetic_voice(seconds: float, sr: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * sr)) / sr
+    pitch = 180 + 40 * np.sin(2 * np.pi * 3 * t)
+    voiced = np.sin(2 * np.pi * np.cumsum(pitch) / sr) + 0.3 * np.sin(4 * np.pi * np.cumsum(pitch) / sr)
+    envelope = (np.sin(2 * np.pi * 0.25 * t) > -0.3).astype(np.float32)
+    return (0.3 * voiced * envelope + 0.01 * rng.standard_normal(len(t))).astype(np.float32)
+
+
+def _legacy_filter(audio: np.ndarray, sr: int, low: float, high: float) -> np.ndarray:
+    from scipy.signal import butter, lfilter
+
+    b, a = butter(4, [low / (sr / 2), high / (sr / 2)], btype="band")
+    filtered = lfilter(b, a, audio)
+    return lfilter(b, a, filtered[::-1])[::-1]
+
+
+def _legacy_compression(audio: np.ndarray, ratio: float = 0.8) -> np.ndarray:
+    import librosa
+    from scipy.signal import savgol_filter
+
+    rms = librosa.feature.rms(y=audio, frame_length=2048, hop_length=512)[0]
+    rms_smooth = savgol_filter(rms, 31, 3)
+    threshold = np.percentile(rms_smooth, 70)
+    gain = np.ones_like(rms_smooth)
+    above = rms_smooth > threshold
+    gain[above] = (threshold / rms_smooth[above]) ** (1 - ratio)
+    return audio * np.interp(np.arange(len(audio)), np.arange(len(gain)) * 512, gain)
+
+
+def _stages(preprocessor, audio: np.ndarray, source: np.ndarray, source_sr: int) -> List[Tuple[str, Callable]]:
+    import librosa
+
+    from .audio_analysis import compute_metrics
+    from .filter_chain import FilterChain, SosFilter, design_sos
+
+    sr = preprocessor.target_sr
+    block = int(sr * 10)
+
+    def streamed_filter():
+        chain = FilterChain([SosFilter(design_sos(sr, 80, 8000))])
+        for start in range(0, len(audio), block):
+            chain.process(audio[start:start + block])
+        chain.flush()
+
+    return [
+        ("resample", lambda: librosa.resample(source, orig_sr=source_sr, target_sr=sr)),
+        ("denoise", lambda: preprocessor._denoise_audio(audio, sr, 0.7)),
+        ("trim_silence", lambda: preprocessor._trim_silence(audio, sr, -40)),
+        ("band_filter", lambda: preprocessor._apply_frequency_filter(audio, sr, 80, 8000)),
+        ("band_filter (blocks)", streamed_filter),
+        ("legacy: band_filter", lambda: _legacy_filter(audio, sr, 80, 8000)),
+        ("compression", lambda: preprocessor._apply_compression(audio, 0.8, sr)),
+        ("legacy: compression", lambda: _legacy_compression(audio)),
+        ("clarity", lambda: preprocessor._enhance_clarity(audio, sr)),
+        ("clarity + hpss", lambda: preprocessor._enhance_clarity(audio, sr, harmonic=True)),
+        ("normalize_loudness", lambda: preprocessor._normalize_loudness(audio, sr)),
+        ("analysis", lambda: compute_metrics(audio, sr, preprocessor._meter_for(sr))),
+    ]
+
+
+def run(seconds: float = 30.0, repeat: int = 5, source_sr: int = 44100) -> List[Tuple[str, float, float]]:
+    """단계별 (이름, 오디오 1초당 중앙값 ms, 최소 ms) 목록"""
+    from .audio_preprocessor import AudioPreprocessor
+
+    preprocessor = AudioPreprocessor()
+    source = _synthetic_voice(seconds, source_sr)
+    audio = _synthetic_voice(seconds, preprocessor.target_sr)
+
+    results = []
+    for name, stage in _stages(preprocessor, audio, source, source_sr):
+        stage()  # 워밍업 (import, 필터 설계 캐시, FFT 플랜)
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            stage()
+            timings.append((time.perf_counter() - started) * 1000 / seconds)
+        results.append((name, statistics.median(timings), min(timings)))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="오디오 전처리 단계별 비용 측정")
+    parser.add_argument("--seconds", type=float, default=30.0, help="테스트 신호 길이 (초)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--source-sr", type=int, default=44100, help="리샘플링 단계 입력 샘플레이트")
+    args = parser.parse_args()
+
+    results = run(args.seconds, args.repeat, args.source_sr)
+    width = max(len(name) for name, _, _ in results)
+    print(f"{'stage':<{width}}  {'ms/s (median)':>14}  {'ms/s (min)':>11}")
+    for name, median, best in results:
+        print(f"{name:<{width}}  {median:>14.2f}  {best:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+전처리 필터 체인
+
+- Butterworth 설계는 (샘플레이트, 차단 주파수, 차수)별로 한 번만 계산해 second-order sections로 캐시한다
+- 필터는 sosfilt 상태를 유지하므로 블록 단위(스트리밍)로 나눠 넣어도 한 번에 넣은 것과 같은 결과가 나온다
+- 압축기는 프레임 RMS에 원폴 엔벨로프 팔로워(lfilter)를 적용해 프레임 루프 없이 게인을 계산한다
+
+메모리 전처리(AudioPreprocessor)와 블록 스트리밍 전처리가 같은 구현을 사용한다.
+"""
+from functools import lru_cache
+from typing import List, Optional
+
+import numpy as np
+from scipy.signal import butter, lfilter, sosfilt, sosfilt_zi, sosfiltfilt
+
+LEVEL_HOP = 512  # 압축 엔벨로프 프레임 단위
+COMPRESSOR_SMOOTH_S = 0.35  # 엔벨로프 시정수
+CLARITY_BAND = (2000, 4000)  # 포먼트 강조 대역
+CLARITY_BLEND = 0.3
+
+
+@lru_cache(maxsize=64)
+def design_sos(sr: int, low: Optional[float], high: Optional[float], order: int = 4) -> Optional[np.ndarray]:
+    """밴드패스/하이패스/로우패스 SOS 설계 (캐시된 배열을 공유하므로 수정하지 말 것)"""
+    nyquist = sr / 2
+    if low and high:
+        sos = butter(order, [low / nyquist, high / nyquist], btype="band", output="sos")
+    elif low:
+        sos = butter(order, low / nyquist, btype="high", output="sos")
+    elif high:
+        sos = butter(order, high / nyquist, btype="low", output="sos")
+    else:
+        return None
+    return sos
+
+
+def zero_phase_filter(audio: np.ndarray, sr: int, low: Optional[float], high: Optional[float]) -> np.ndarray:
+    """전체 버퍼용 영위상(정방향 + 역방향) 필터"""
+    sos = design_sos(sr, low, high)
+    if sos is None:
+        return audio
+    return sosfiltfilt(sos, audio).astype(np.float32)
+
+
+class SosFilter:
+    """상태를 이어가는 SOS 필터 (정방향)"""
+
+    def __init__(self, sos: np.ndarray):
+        self.sos = sos
+        self._zi = sosfilt_zi(sos) * 0.0
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        if len(block) == 0:
+            return block
+        filtered, self._zi = sosfilt(self.sos, block, zi=self._zi)
+        return filtered.astype(np.float32)
+
+    def flush(self) -> np.ndarray:
+        return np.zeros(0, dtype=np.float32)
+
+
+class ClarityEnhancer:
+    """포먼트 대역(2-4kHz)을 원본에 섞어 명료도 향상"""
+
+    def __init__(self, sr: int):
+        self._band = SosFilter(design_sos(sr, *CLARITY_BAND))
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        return block * (1 - CLARITY_BLEND) + self._band.process(block) * CLARITY_BLEND
+
+    def flush(self) -> np.ndarray:
+        return np.zeros(0, dtype=np.float32)
+
+
+def _frame_rms(audio: np.ndarray) -> np.ndarray:
+    n_frames = -(-len(audio) // LEVEL_HOP)
+    padded = np.zeros(n_frames * LEVEL_HOP, dtype=np.float32)
+    padded[: len(audio)] = audio
+    return np.sqrt(np.mean(padded.reshape(n_frames, LEVEL_HOP) ** 2, axis=1))
+
+
+class EnvelopeCompressor:
+    """LEVEL_HOP 단위 RMS 엔벨로프 기반 다이나믹 레인지 압축
+
+    엔벨로프가 threshold를 넘는 구간에 (threshold / envelope) ** (1 - ratio) 게인을 적용하고,
+    게인은 프레임 중심 사이를 선형 보간한다. 블록 단위로 넣으면 LEVEL_HOP에 못 미치는 끝부분은 다음 블록으로 넘긴다.
+    """
+
+    def __init__(self, ratio: float, sr: int, threshold: Optional[float] = None):
+        self.ratio = ratio
+        self.threshold = threshold
+        self._coef = float(np.exp(-LEVEL_HOP / (COMPRESSOR_SMOOTH_S * sr)))
+        self._zi: Optional[np.ndarray] = None
+        self._carry = np.zeros(0, dtype=np.float32)
+        self._last_gain = 1.0
+
+    def _envelope(self, rms: np.ndarray) -> np.ndarray:
+        if self._zi is None:
+            self._zi = np.array([rms[0] * self._coef])
+        envelope, self._zi = lfilter([1.0 - self._coef], [1.0, -self._coef], rms, zi=self._zi)
+        return envelope
+
+    def _apply(self, audio: np.ndarray, envelope: np.ndarray) -> np.ndarray:
+        gain = np.ones_like(envelope)
+        above = envelope > self.threshold
+        gain[above] = (self.threshold / envelope[above]) ** (1 - self.ratio)
+
+        centers = np.arange(len(envelope)) * LEVEL_HOP + LEVEL_HOP / 2
+        sample_gain = np.interp(
+            np.arange(len(audio)),
+            np.concatenate([[-LEVEL_HOP / 2], centers]),
+            np.concatenate([[self._last_gain], gain]),
+        )
+        self._last_gain = float(gain[-1])
+        return (audio * sample_gain).astype(np.float32)
+
+    def compress(self, audio: np.ndarray, threshold_percentile: float = 70) -> np.ndarray:
+        """전체 버퍼 압축 (threshold가 없으면 엔벨로프의 퍼센타일로 정함)"""
+        if len(audio) == 0:
+            return audio
+        envelope = self._envelope(_frame_rms(audio))
+        if self.threshold is None:
+            self.threshold = float(np.percentile(envelope, threshold_percentile))
+        return self._apply(audio, envelope)
+
+    def _compress_blocks(self, buffer: np.ndarray, final: bool) -> np.ndarray:
+        n_frames = len(buffer) // LEVEL_HOP
+        if final and len(buffer) % LEVEL_HOP:
+            n_frames += 1
+        if n_frames == 0:
+            self._carry = buffer
+            return np.zeros(0, dtype=np.float32)
+        usable = buffer[: n_frames * LEVEL_HOP]
+        self._carry = buffer[n_frames * LEVEL_HOP:]
+        return self._apply(usable, self._envelope(_frame_rms(usable)))
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        return self._compress_blocks(np.concatenate([self._carry, block]), final=False)
+
+    def flush(self) -> np.ndarray:
+        return self._compress_blocks(self._carry, final=True)
+
+
+class FilterChain:
+    """process(block)/flush()를 가진 단계들을 순서대로 연결"""
+
+    def __init__(self, stages: Optional[List] = None):
+        self.stages = list(stages or [])
+
+    def append(self, stage) -> None:
+        self.stages.append(stage)
+
+    def __bool__(self) -> bool:
+        return bool(self.stages)
+
+    @staticmethod
+    def _run(stages, block: np.ndarray) -> np.ndarray:
+        for stage in stages:
+            block = stage.process(block)
+        return block
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        return self._run(self.stages, block)
+
+    def flush(self) -> np.ndarray:
+        """앞 단계에서 남은 샘플을 뒤 단계로 흘려보내며 순서대로 비움"""
+        outputs = [
+            self._run(self.stages[index + 1:], np.asarray(stage.flush(), dtype=np.float32))
+            for index, stage in enumerate(self.stages)
+        ]
+        return np.concatenate(outputs) if outputs else np.zeros(0, dtype=np.float32)
@@ -0,0 +1,381 @@
+"""
+긴 녹음용 블록 스트리밍 전처리
+
+process_audio는 파일 전체를 메모리에 올린 뒤 단계마다 전체 길이 복사본을 만들기 때문에
+한 시간짜리 스튜디오 녹음은 워커 메모리를 모두 사용한다. 이 모듈은 soundfile.blocks로 블록 단위로 읽고,
+각 단계가 블록 경계를 넘는 상태(필터 상태, STFT 겹침 구간, 엔벨로프)만 들고 다니며 결과를 바로 파일에 쓴다.
+메모리 사용량은 녹음 길이가 아니라 블록 크기에 비례한다.
+
+전체 신호 통계가 필요한 값은 앞 단계 패스에서 미리 구한다.
+  1패스: 원본 분석, 리샘플링 → 임시 파일, 노이즈 프로파일(주파수별 dB 평균/표준편차), 침묵 판단 기준(최대 프레임 RMS)
+  2패스: 노이즈 제거(스펙트럴 게이팅 + overlap-add) → 클릭 제거 → 침묵 제거 → 대역 필터 → 임시 파일, 압축 기준 레벨
+  3패스: 다이나믹 레인지 압축 → 명료도 향상 → 임시 파일, 라우드니스/피크 측정
+  4패스: 라우드니스 정규화 + 클리핑 방지 → 출력 파일(PCM_16), 결과 분석
+
+메모리 전처리와의 차이:
+- 대역 필터는 정방향(인과) 필터만 적용한다 (역방향 필터링은 전체 신호가 필요)
+- 노이즈 마스크의 시간 방향 스무딩은 원폴 필터로 대신한다
+- HPSS 하모닉 강조(harmonic_enhance)는 지원하지 않는다
+"""
+import logging
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import soundfile as sf
+import soxr
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.ndimage import convolve1d
+from scipy.signal import lfilter
+
+from .audio_analysis import FrameBuffer, LevelHistogram, StreamingLoudness, StreamingMetrics, to_mono
+from .audio_probe import probe_audio
+from .filter_chain import LEVEL_HOP, ClarityEnhancer, EnvelopeCompressor, FilterChain, SosFilter, design_sos
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BLOCK_SECONDS = 10.0
+
+# 스펙트럴 게이팅 (noisereduce stationary 기본값과 같은 구성)
+GATE_N_FFT = 1024
+GATE_HOP = GATE_N_FFT // 4
+GATE_N_STD = 1.5
+GATE_FREQ_SMOOTH_HZ = 500
+GATE_TIME_SMOOTH_MS = 50
+
+SILENCE_GAP_S = 0.1  # 제거한 침묵 구간 대신 넣는 짧은 침묵
+
+
+def _read_blocks(path: str, block_frames: int):
+    for block in sf.blocks(path, blocksize=block_frames, dtype="float32", always_2d=True):
+        yield to_mono(block.T)
+
+
+def _amp_to_db(magnitude: np.ndarray) -> np.ndarray:
+    return 20 * np.log10(np.maximum(magnitude, 1e-10))
+
+
+class _Resampler:
+    def __init__(self, orig_sr: int, target_sr: int):
+        self._stream = (
+            soxr.ResampleStream(orig_sr, target_sr, 1, dtype="float32", quality="HQ")
+            if orig_sr != target_sr
+            else None
+        )
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        return self._stream.resample_chunk(block) if self._stream else block
+
+    def flush(self) -> np.ndarray:
+        if self._stream is None:
+            return np.zeros(0, dtype=np.float32)
+        return self._stream.resample_chunk(np.zeros(0, dtype=np.float32), last=True)
+
+
+class _NoiseProfile:
+    """주파수별 dB 평균/표준편차 누적 (전체 녹음을 노이즈 추정 구간으로 사용 - noisereduce stationary와 동일)"""
+
+    def __init__(self):
+        self._frames = FrameBuffer(GATE_N_FFT, GATE_HOP)
+        self._window = np.hanning(GATE_N_FFT + 1)[:-1].astype(np.float32)
+        self._sum = np.zeros(GATE_N_FFT // 2 + 1)
+        self._sum_squares = np.zeros(GATE_N_FFT // 2 + 1)
+        self._count = 0
+
+    def push(self, block: np.ndarray) -> None:
+        frames = self._frames.push(block)
+        if len(frames):
+            spectrum_db = _amp_to_db(np.abs(np.fft.rfft(frames * self._window, axis=1)))
+            self._sum += spectrum_db.sum(axis=0)
+            self._sum_squares += (spectrum_db ** 2).sum(axis=0)
+            self._count += len(frames)
+
+    def threshold(self) -> Optional[np.ndarray]:
+        if self._count == 0:
+            return None
+        mean = self._sum / self._count
+        std = np.sqrt(np.maximum(self._sum_squares / self._count - mean ** 2, 0.0))
+        return mean + std * GATE_N_STD
+
+
+class _SpectralGate:
+    """STFT 마스킹 노이즈 제거 (overlap-add 스트리밍)
+
+    출력은 입력보다 (n_fft - hop) 샘플 늦게 나오며, 첫 구간을 버려 정렬한다.
+    """
+
+    def __init__(self, threshold_db: np.ndarray, sr: int, prop_decrease: float):
+        self.threshold_db = threshold_db
+        self.prop_decrease = prop_decrease
+        self._window = np.hanning(GATE_N_FFT + 1)[:-1].astype(np.float32)
+        # hann 창, 75% 겹침에서 분석·합성 창 제곱합은 1.5로 일정
+        self._norm = float((self._window ** 2).sum() / GATE_HOP)
+        self._latency = GATE_N_FFT - GATE_HOP
+        self._input = np.zeros(self._latency, dtype=np.float32)
+        self._overlap = np.zeros(GATE_N_FFT - GATE_HOP, dtype=np.float32)
+        self._to_drop = self._latency
+        self._received = 0
+        self._emitted = 0
+
+        bin_hz = sr / GATE_N_FFT
+        half = max(1, int(GATE_FREQ_SMOOTH_HZ / bin_hz))
+        kernel = np.concatenate([np.linspace(0, 1, half + 1, endpoint=False)[1:], np.linspace(1, 0, half + 2)[:-1]])
+        self._freq_kernel = kernel / kernel.sum()
+        frames_per_constant = max(1.0, GATE_TIME_SMOOTH_MS / 1000 * sr / GATE_HOP)
+        self._time_coef = float(np.exp(-1.0 / frames_per_constant))
+        self._time_state: Optional[np.ndarray] = None
+
+    def _mask(self, spectrum: np.ndarray) -> np.ndarray:
+        mask = (_amp_to_db(np.abs(spectrum)) > self.threshold_db).astype(np.float32)
+        mask = mask * self.prop_decrease + (1.0 - self.prop_decrease)
+        mask = convolve1d(mask, self._freq_kernel, axis=1, mode="nearest")
+        if self._time_state is None:
+            self._time_state = mask[0] * self._time_coef
+        smoothed, zi = lfilter([1.0 - self._time_coef], [1.0, -self._time_coef], mask, axis=0, zi=self._time_state[None, :])
+        self._time_state = zi[0]
+        return smoothed
+
+    def _run(self, block: np.ndarray) -> np.ndarray:
+        buffer = np.concatenate([self._input, block])
+        if len(buffer) < GATE_N_FFT:
+            self._input = buffer
+            return np.zeros(0, dtype=np.float32)
+
+        n_frames = 1 + (len(buffer) - GATE_N_FFT) // GATE_HOP
+        frames = sliding_window_view(buffer, GATE_N_FFT)[::GATE_HOP][:n_frames] * self._window
+        spectrum = np.fft.rfft(frames, axis=1)
+        processed = np.fft.irfft(spectrum * self._mask(spectrum), n=GATE_N_FFT, axis=1) * self._window
+
+        # overlap-add: 프레임 i는 i*hop 위치에 더해짐
+        output = np.zeros((n_frames - 1) * GATE_HOP + GATE_N_FFT, dtype=np.float32)
+        output[: len(self._overlap)] += self._overlap
+        for offset in range(GATE_N_FFT // GATE_HOP):
+            segment = processed[:, offset * GATE_HOP:(offset + 1) * GATE_HOP].reshape(-1)
+            output[offset * GATE_HOP: offset * GATE_HOP + len(segment)] += segment
+        output /= self._norm
+
+        ready = n_frames * GATE_HOP
+        self._overlap = output[ready:]
+        self._input = buffer[ready:]
+        return output[:ready]
+
+    def _emit(self, audio: np.ndarray) -> np.ndarray:
+        if self._to_drop:
+            dropped = min(self._to_drop, len(audio))
+            audio = audio[dropped:]
+            self._to_drop -= dropped
+        audio = audio[: max(0, self._received - self._emitted)]
+        self._emitted += len(audio)
+        return audio
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        self._received += len(block)
+        return self._emit(self._run(block))
+
+    def flush(self) -> np.ndarray:
+        return self._emit(self._run(np.zeros(GATE_N_FFT + self._latency, dtype=np.float32)))
+
+
+class _ClickFilter:
+    """크기 3 미디언 필터 (1샘플 지연)"""
+
+    def __init__(self):
+        self._history: Optional[np.ndarray] = None
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        if len(block) == 0:
+            return block
+        if self._history is None:
+            self._history = np.repeat(block[:1], 2)
+        buffer = np.concatenate([self._history, block])
+        self._history = buffer[-2:]
+        return np.median(sliding_window_view(buffer, 3), axis=1).astype(np.float32)
+
+    def flush(self) -> np.ndarray:
+        if self._history is None:
+            return np.zeros(0, dtype=np.float32)
+        return np.median(np.concatenate([self._history[-2:], self._history[-1:]])[None, :], axis=1).astype(np.float32)
+
+
+class _SilenceTrimmer:
+    """LEVEL_HOP 단위로 침묵을 판단해 앞뒤 침묵은 버리고, 소리 구간 사이 침묵은 SILENCE_GAP_S 길이로 줄임"""
+
+    def __init__(self, threshold_rms: float, sr: int):
+        self.threshold_rms = threshold_rms
+        self._gap = np.zeros(int(SILENCE_GAP_S * sr), dtype=np.float32)
+        self._carry = np.zeros(0, dtype=np.float32)
+        self._started = False  # 소리 구간을 한 번이라도 내보냈는지
+        self._pending_gap = False  # 마지막 소리 구간 뒤에 침묵이 있었는지
+
+    def _trim(self, buffer: np.ndarray, final: bool) -> np.ndarray:
+        n_chunks = len(buffer) // LEVEL_HOP
+        if final and len(buffer) % LEVEL_HOP:
+            n_chunks += 1
+        if n_chunks == 0:
+            self._carry = buffer
+            return np.zeros(0, dtype=np.float32)
+
+        usable = buffer[: n_chunks * LEVEL_HOP]
+        self._carry = buffer[n_chunks * LEVEL_HOP:]
+        padded = np.zeros(n_chunks * LEVEL_HOP, dtype=np.float32)
+        padded[: len(usable)] = usable
+        loud = np.sqrt(np.mean(padded.reshape(n_chunks, LEVEL_HOP) ** 2, axis=1)) >= self.threshold_rms
+
+        edges = np.diff(np.concatenate([[0], loud.astype(np.int8), [0]]))
+        pieces = []
+        for start, end in zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)):
+            if self._started and (start > 0 or self._pending_gap):
+                pieces.append(self._gap)
+            pieces.append(usable[start * LEVEL_HOP:end * LEVEL_HOP])
+            self._started = True
+            self._pending_gap = False
+        if not loud[-1]:
+            self._pending_gap = True
+        return np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.float32)
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        return self._trim(np.concatenate([self._carry, block]), final=False)
+
+    def flush(self) -> np.ndarray:
+        return self._trim(self._carry, final=True)
+
+
+def process_streaming(
+    preprocessor,
+    input_path: str,
+    output_path: str,
+    config: Dict[str, Any],
+    block_seconds: float = DEFAULT_BLOCK_SECONDS,
+) -> Dict[str, Any]:
+    """AudioPreprocessor.process_audio와 같은 형식의 결과를 블록 스트리밍으로 생성
+
+    Args:
+        preprocessor: 목표 샘플레이트/라우드니스, 라우드니스 미터, 결과 요약 형식을 제공하는 AudioPreprocessor
+    """
+    info = probe_audio(input_path, allow_decode=False)
+    orig_sr = info.sample_rate
+    sr = preprocessor.target_sr
+    block_frames = max(GATE_N_FFT, int(block_seconds * orig_sr))
+    output_dir = Path(output_path).parent
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(dir=output_dir, prefix=".stream_preprocess_") as work_dir:
+        resampled_path = str(Path(work_dir) / "resampled.wav")
+        cleaned_path = str(Path(work_dir) / "cleaned.wav")
+        shaped_path = str(Path(work_dir) / "shaped.wav")
+
+        # 1패스: 원본 분석 + 리샘플링 + 노이즈 프로파일 + 침묵 기준
+        original_metrics = StreamingMetrics(orig_sr, preprocessor._meter_for(orig_sr))
+        noise_profile = _NoiseProfile() if config["denoise"] else None
+        level_frames = FrameBuffer(2048, LEVEL_HOP)
+        max_frame_rms = 0.0
+        resampler = _Resampler(orig_sr, sr)
+
+        def analyze_resampled(audio: np.ndarray) -> None:
+            nonlocal max_frame_rms
+            if noise_profile:
+                noise_profile.push(audio)
+            frames = level_frames.push(audio)
+            if len(frames):
+                max_frame_rms = max(max_frame_rms, float(np.sqrt(np.mean(frames ** 2, axis=1)).max()))
+            writer.write(audio)
+
+        with sf.SoundFile(resampled_path, "w", samplerate=sr, channels=1, subtype="FLOAT") as writer:
+            for block in _read_blocks(input_path, block_frames):
+                original_metrics.push(block)
+                analyze_resampled(resampler.process(block))
+            analyze_resampled(resampler.flush())
+        logger.info(f"스트리밍 전처리 1패스 완료: {info.duration:.1f}초, {orig_sr}Hz → {sr}Hz")
+
+        # 2패스: 노이즈 제거 → 침묵 제거 → 대역 필터
+        chain = FilterChain()
+        noise_threshold = noise_profile.threshold() if noise_profile else None
+        if noise_threshold is not None:
+            chain.append(_SpectralGate(noise_threshold, sr, config["denoise_strength"]))
+            chain.append(_ClickFilter())
+        if config["trim_silence"] and max_frame_rms > 0:
+            chain.append(_SilenceTrimmer(max_frame_rms * 10 ** (config["silence_threshold"] / 20), sr))
+        band_sos = design_sos(
+            sr,
+            config["low_freq_cutoff"] if config["remove_low_freq"] else None,
+            config["high_freq_cutoff"] if config["remove_high_freq"] else None,
+        )
+        if band_sos is not None:
+            chain.append(SosFilter(band_sos))
+
+        rms_histogram = LevelHistogram()
+        rms_carry = np.zeros(0, dtype=np.float32)
+
+        def write_cleaned(audio: np.ndarray) -> None:
+            nonlocal rms_carry
+            buffer = np.concatenate([rms_carry, audio])
+            n_chunks = len(buffer) // LEVEL_HOP
+            if n_chunks:
+                chunks = buffer[: n_chunks * LEVEL_HOP].reshape(n_chunks, LEVEL_HOP)
+                rms_histogram.add(np.sqrt(np.mean(chunks ** 2, axis=1)))
+            rms_carry = buffer[n_chunks * LEVEL_HOP:]
+            writer.write(audio)
+
+        with sf.SoundFile(cleaned_path, "w", samplerate=sr, channels=1, subtype="FLOAT") as writer:
+            for block in _read_blocks(resampled_path, int(block_seconds * sr)):
+                write_cleaned(chain.process(block))
+            write_cleaned(chain.flush())
+        Path(resampled_path).unlink()
+
+        # 3패스: 압축 → 명료도 향상 (라우드니스/피크 측정)
+        chain = FilterChain()
+        if config["apply_compression"]:
+            chain.append(
+                EnvelopeCompressor(config["compression_ratio"], sr, threshold=rms_histogram.percentile(70))
+            )
+        if config["enhance_clarity"]:
+            chain.append(ClarityEnhancer(sr))
+
+        loudness = StreamingLoudness(preprocessor._meter_for(sr))
+        peak = 0.0
+
+        def write_shaped(audio: np.ndarray) -> None:
+            nonlocal peak
+            if len(audio):
+                loudness.push(audio)
+                peak = max(peak, float(np.abs(audio).max()))
+                writer.write(audio)
+
+        with sf.SoundFile(shaped_path, "w", samplerate=sr, channels=1, subtype="FLOAT") as writer:
+            for block in _read_blocks(cleaned_path, int(block_seconds * sr)):
+                write_shaped(chain.process(block))
+            write_shaped(chain.flush())
+        Path(cleaned_path).unlink()
+
+        # 4패스: 라우드니스 정규화 + 클리핑 방지 → 출력
+        gain = 1.0
+        if config["normalize"]:
+            gain = 10.0 ** ((preprocessor.target_lufs - loudness.integrated_loudness()) / 20.0)
+        max_level = 10 ** (-0.3 / 20.0)
+        if peak * gain > max_level:
+            gain = max_level / peak
+
+        processed_metrics = StreamingMetrics(sr, preprocessor._meter_for(sr))
+        with sf.SoundFile(output_path, "w", samplerate=sr, channels=1, subtype="PCM_16") as writer:
+            for block in _read_blocks(shaped_path, int(block_seconds * sr)):
+                # 소프트 리미터 (_prevent_clipping과 동일)
+                block = np.tanh(block * gain * 0.8) / 0.8
+                processed_metrics.push(block)
+                writer.write(block)
+    logger.info(f"스트리밍 전처리 결과 저장 완료: {output_path}")
+
+    metrics = processed_metrics.result()
+    result = preprocessor._summarize_metrics(metrics)
+    result["original_analysis"] = preprocessor._analysis_from_metrics(
+        original_metrics.result(),
+        channels=info.channels,
+        bit_depth=info.bit_depth,
+        audio_format=info.format,
+        duration=info.duration,
+    )
+    result["processed_analysis"] = preprocessor._analysis_from_metrics(
+        metrics, channels=1, bit_depth=16, audio_format="WAV"
+    )
+    result["streaming"] = True
+    return result
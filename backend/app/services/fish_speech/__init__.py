@@ -0,0 +1,6 @@
+"""Fish-Speech 상주 추론 워커 및 클라이언트"""
+
+from .client import FishSpeechWorkerClient, WorkerUnavailableError
+from .protocol import WorkerError
+
+__all__ = ["FishSpeechWorkerClient", "WorkerUnavailableError", "WorkerError"]
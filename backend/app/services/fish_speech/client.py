@@ -0,0 +1,199 @@
+"""
+Fish-Speech 상주 추론 워커 클라이언트 (asyncio)
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Set
+
+from .protocol import (
+    DEFAULT_PORT,
+    MAX_MESSAGE_BYTES,
+    OP_CANCEL,
+    OP_DECODE,
+    OP_DECODE_BATCH,
+    OP_ENCODE,
+    OP_GENERATE,
+    OP_GENERATE_BATCH,
+    OP_PING,
+    OP_SHUTDOWN,
+    WorkerError,
+    decode_message,
+    encode_message,
+    make_request,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerUnavailableError(Exception):
+    """워커에 연결할 수 없는 경우"""
+
+
+class FishSpeechWorkerClient:
+    """상주 추론 워커에 요청을 보내는 클라이언트
+
+    요청마다 연결을 새로 열기 때문에 여러 생성 작업이 동시에 호출해도 안전하다.
+    (연결 비용은 로컬 소켓 기준 1ms 미만으로, 모델 로드 비용과 비교할 수준이 아님)
+    호출한 작업이 취소되면(CancelledError) 워커에 cancel을 보내 처리 중인 요청도 중단시킨다.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = DEFAULT_PORT,
+        timeout: float = 180,
+        connect_timeout: float = 3,
+    ):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self._abort_tasks: Set[asyncio.Task] = set()
+
+    async def call(self, op: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """워커에 연산을 요청하고 결과를 반환"""
+        request = make_request(op, params)
+
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port, limit=MAX_MESSAGE_BYTES),
+                timeout=self.connect_timeout,
+            )
+        except (OSError, asyncio.TimeoutError) as e:
+            raise WorkerUnavailableError(
+                f"추론 워커에 연결할 수 없습니다 ({self.host}:{self.port}): {e}"
+            )
+
+        try:
+            writer.write(encode_message(request))
+            await writer.drain()
+            line = await asyncio.wait_for(reader.readline(), timeout=timeout or self.timeout)
+        except asyncio.TimeoutError:
+            self._abort(op, request["id"])
+            raise Exception(f"추론 워커 응답 시간 초과 ({op}, {timeout or self.timeout}초)")
+        except asyncio.CancelledError:
+            self._abort(op, request["id"])
+            raise
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+        if not line:
+            raise WorkerUnavailableError(f"추론 워커가 응답 없이 연결을 종료했습니다 ({op})")
+
+        response = decode_message(line)
+        if response.get("id") != request["id"]:
+            raise WorkerError(f"요청/응답 ID 불일치: {request['id']} != {response.get('id')}")
+        if not response.get("ok"):
+            raise WorkerError(response.get("error", "알 수 없는 워커 오류"), response.get("error_type"))
+
+        return response.get("result") or {}
+
+    def _abort(self, op: str, request_id: str) -> None:
+        """응답을 더 기다리지 않는 요청을 워커에서도 중단 (GPU 시간 반환, 결과를 기다리지 않음)"""
+        if op in (OP_PING, OP_CANCEL, OP_SHUTDOWN):
+            return
+        task = asyncio.ensure_future(self.cancel(request_id))
+        self._abort_tasks.add(task)
+        task.add_done_callback(self._abort_tasks.discard)
+
+    async def cancel(self, request_id: str) -> bool:
+        """처리 중인 요청 중단 (cancel을 지원하지 않는 이전 워커면 False)"""
+        try:
+            result = await self.call(OP_CANCEL, {"request_id": request_id}, timeout=5)
+            return bool(result.get("cancelled"))
+        except Exception as e:
+            logger.debug(f"추론 워커 요청 취소 실패: {request_id}: {e}")
+            return False
+
+    async def ping(self, timeout: float = 5) -> Dict[str, Any]:
+        return await self.call(OP_PING, timeout=timeout)
+
+    async def is_alive(self) -> bool:
+        try:
+            await self.ping()
+            return True
+        except Exception:
+            return False
+
+    async def encode(self, audio_path: str, output_path: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """참조 오디오 → 프롬프트 토큰(.npy)"""
+        return await self.call(
+            OP_ENCODE, {"audio_path": audio_path, "output_path": output_path}, timeout=timeout
+        )
+
+    async def generate(
+        self,
+        text: str,
+        output_dir: str,
+        prompt_text: Optional[List[str]] = None,
+        prompt_tokens: Optional[List[str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """텍스트 → 시맨틱 토큰(codes_N.npy)"""
+        return await self.call(
+            OP_GENERATE,
+            {
+                "text": text,
+                "output_dir": output_dir,
+                "prompt_text": prompt_text,
+                "prompt_tokens": prompt_tokens,
+                "params": params or {},
+            },
+            timeout=timeout,
+        )
+
+    async def decode(self, codes_path: str, output_path: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """시맨틱 토큰 → 오디오(.wav)"""
+        return await self.call(
+            OP_DECODE, {"codes_path": codes_path, "output_path": output_path}, timeout=timeout
+        )
+
+    async def generate_batch(
+        self,
+        items: List[Dict[str, str]],
+        prompt_text: Optional[List[str]] = None,
+        prompt_tokens: Optional[List[str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """같은 프롬프트/파라미터의 여러 텍스트 → 텍스트별 시맨틱 토큰
+
+        Args:
+            items: [{"text": ..., "output_dir": ...}, ...]
+
+        Returns:
+            {"results": [{"codes_paths": [...]} 또는 {"error": "..."}, ...]} (items 순서)
+        """
+        return await self.call(
+            OP_GENERATE_BATCH,
+            {
+                "items": items,
+                "prompt_text": prompt_text,
+                "prompt_tokens": prompt_tokens,
+                "params": params or {},
+            },
+            timeout=timeout,
+        )
+
+    async def decode_batch(
+        self, items: List[Dict[str, str]], batch_size: int = 8, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """여러 시맨틱 토큰 → 오디오 (batch_size개씩 한 번의 DAC 디코딩)
+
+        Args:
+            items: [{"codes_path": ..., "output_path": ...}, ...]
+
+        Returns:
+            {"results": [{"output_path", "duration"} 또는 {"error": "..."}, ...]} (items 순서)
+        """
+        return await self.call(
+            OP_DECODE_BATCH, {"items": items, "batch_size": batch_size}, timeout=timeout
+        )
+
+    async def shutdown(self) -> Dict[str, Any]:
+        return await self.call(OP_SHUTDOWN, timeout=5)
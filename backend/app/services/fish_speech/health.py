@@ -0,0 +1,114 @@
+"""
+Fish-Speech 실행 환경 상태 캐시
+
+컨테이너 실행 상태, 체크포인트 디렉토리, codec.pth 확인은 docker exec 한 번에 100~300ms가 들기 때문에
+생성 작업마다 반복하지 않고 결과를 TTL 동안 재사용한다.
+
+- TTL의 REFRESH_FRACTION이 지나면 요청은 캐시된 결과로 바로 진행하고, 확인은 백그라운드에서 다시 실행한다
+- 확인이 실패하면 FAILURE_TTL 동안 실패 결과를 돌려준다 (컨테이너가 내려간 동안 대기 작업마다 확인을 반복하지 않도록)
+- 생성 실패나 컨테이너 재시작(StartedAt 변경)이 감지되면 무효화되어 다음 요청에서 다시 확인한다
+- 동시에 여러 요청이 확인을 기다려도 확인은 한 번만 실행한다
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+REFRESH_FRACTION = 0.8
+
+# 확인 함수: 성공 시 상태 정보(dict) 반환, 실패 시 예외
+CheckFn = Callable[[], Awaitable[Dict[str, Any]]]
+
+
+class EnvironmentUnhealthyError(Exception):
+    """캐시된(또는 방금 실행한) 환경 확인이 실패한 경우"""
+
+
+class EnvironmentHealthCache:
+    """TTL 기반 환경 상태 캐시"""
+
+    def __init__(self, check: CheckFn, ttl: float = 300, failure_ttl: float = 10):
+        self._check = check
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self._status: Optional[Dict[str, Any]] = None
+        self._checked_at: Optional[float] = None  # monotonic
+        self._refresh_task: Optional[asyncio.Task] = None
+        # invalidate()마다 증가 - 무효화 전에 시작한 확인 결과는 캐시에 넣지 않음
+        self._epoch = 0
+        self.checks_run = 0
+
+    @property
+    def age(self) -> Optional[float]:
+        if self._checked_at is None:
+            return None
+        return time.monotonic() - self._checked_at
+
+    def _is_fresh(self) -> bool:
+        if self._status is None:
+            return False
+        ttl = self.ttl if self._status["healthy"] else self.failure_ttl
+        return self.age < ttl
+
+    async def _run_check(self) -> Dict[str, Any]:
+        epoch = self._epoch
+        started = time.perf_counter()
+        self.checks_run += 1
+        try:
+            details = await self._check()
+            status = {"healthy": True, "error": None, **details}
+        except Exception as e:
+            logger.warning(f"⚠️ Fish-Speech 환경 확인 실패: {e}")
+            status = {"healthy": False, "error": str(e)}
+        status["checked_at"] = datetime.now().isoformat()
+        status["check_seconds"] = round(time.perf_counter() - started, 3)
+        if epoch == self._epoch:
+            self._status = status
+            self._checked_at = time.monotonic()
+        return status
+
+    def refresh(self) -> "asyncio.Task":
+        """확인을 시작하거나, 이미 실행 중인 확인을 반환 (single-flight)"""
+        stale_task = self._refresh_task is not None and getattr(self._refresh_task, "epoch", None) != self._epoch
+        if self._refresh_task is None or self._refresh_task.done() or stale_task:
+            self._refresh_task = asyncio.create_task(self._run_check())
+            self._refresh_task.epoch = self._epoch
+        return self._refresh_task
+
+    async def get(self) -> Dict[str, Any]:
+        """상태 반환 (만료됐으면 확인 완료까지 대기, 만료가 가까우면 백그라운드 갱신)"""
+        if not self._is_fresh():
+            # 여러 요청이 같은 태스크를 기다리므로 한 요청이 취소돼도 확인은 계속되도록 shield
+            return await asyncio.shield(self.refresh())
+        if self._status["healthy"] and self.age > self.ttl * REFRESH_FRACTION:
+            self.refresh()
+        return self._status
+
+    async def ensure(self) -> Dict[str, Any]:
+        """환경이 정상이면 상태를, 아니면 EnvironmentUnhealthyError"""
+        status = await self.get()
+        if not status["healthy"]:
+            raise EnvironmentUnhealthyError(status["error"])
+        return status
+
+    def invalidate(self, reason: str = "") -> None:
+        """다음 요청에서 다시 확인하도록 캐시 제거 (이미 실행 중인 확인의 결과는 버림)"""
+        if self._status is not None:
+            logger.info(f"🔄 Fish-Speech 환경 상태 캐시 무효화{f': {reason}' if reason else ''}")
+        self._epoch += 1
+        self._status = None
+        self._checked_at = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """확인을 실행하지 않고 현재 캐시 상태 반환 (상태 조회 API용)"""
+        age = self.age
+        return {
+            **(self._status or {"healthy": None}),
+            "cached": self._status is not None,
+            "age_seconds": round(age, 1) if age is not None else None,
+            "ttl_seconds": self.ttl,
+            "checks_run": self.checks_run,
+        }
@@ -0,0 +1,733 @@
+"""
+Fish-Speech 상주 추론 워커
+
+codec.pth(DAC)와 text2semantic 모델을 한 번만 로드한 뒤 TCP 소켓으로 요청을 처리한다.
+기존처럼 단계마다 `python fish_speech/.../inference.py` 프로세스를 새로 띄우면
+매 생성마다 체크포인트 로드와 torch.compile 비용을 다시 치러야 한다.
+
+Fish-Speech 컨테이너 안에서 실행 (서비스가 자동으로 복사/기동):
+    cd /opt/fish-speech && python ment_worker/inference_worker.py \\
+        --checkpoint-dir checkpoints/openaudio-s1-mini --port 8765 --compile
+
+GPU 없이 프로토콜/서비스를 확인하기 위한 스텁 워커:
+    python -m app.services.fish_speech.inference_worker --engine stub --port 8765
+
+이 파일은 컨테이너에 단독으로 복사되므로 app 패키지를 import 하지 않는다.
+"""
+import argparse
+import hashlib
+import heapq
+import itertools
+import logging
+import os
+import socketserver
+import sys
+import threading
+import time
+import wave
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    from .protocol import (
+        DEFAULT_PORT,
+        OP_CANCEL,
+        OP_DECODE,
+        OP_DECODE_BATCH,
+        OP_ENCODE,
+        OP_GENERATE,
+        OP_GENERATE_BATCH,
+        OP_PING,
+        OP_SHUTDOWN,
+        PROTOCOL_VERSION,
+        ProtocolError,
+        decode_message,
+        encode_message,
+        make_error,
+        make_response,
+    )
+except ImportError:  # 컨테이너에서 스크립트로 직접 실행하는 경우
+    from protocol import (  # type: ignore[no-redef]
+        DEFAULT_PORT,
+        OP_CANCEL,
+        OP_DECODE,
+        OP_DECODE_BATCH,
+        OP_ENCODE,
+        OP_GENERATE,
+        OP_GENERATE_BATCH,
+        OP_PING,
+        OP_SHUTDOWN,
+        PROTOCOL_VERSION,
+        ProtocolError,
+        decode_message,
+        encode_message,
+        make_error,
+        make_response,
+    )
+
+logger = logging.getLogger("fish_speech_worker")
+
+# 요청 params["priority"] → 잠금 대기 순서 (작을수록 먼저). "high"는 기존 테스트 생성 요청 값
+PRIORITY_LEVELS = {"interactive": 0, "high": 0, "batch": 1, "background": 2}
+DEFAULT_PRIORITY_LEVEL = 1
+
+
+class RequestCancelled(Exception):
+    """클라이언트가 cancel 연산으로 중단을 요청한 요청"""
+
+
+# 요청을 처리하는 스레드마다 현재 요청의 취소 이벤트 (InferenceWorkerServer.dispatch에서 설정)
+_request_state = threading.local()
+
+
+def current_cancel_event() -> Optional[threading.Event]:
+    return getattr(_request_state, "cancel_event", None)
+
+
+def check_cancelled():
+    """현재 요청이 취소되었으면 RequestCancelled - 단계/항목/세그먼트 사이에서 호출"""
+    event = current_cancel_event()
+    if event is not None and event.is_set():
+        raise RequestCancelled("요청이 취소되었습니다")
+
+
+def priority_level(params: Optional[Dict[str, Any]]) -> int:
+    return PRIORITY_LEVELS.get(str((params or {}).get("priority", "")), DEFAULT_PRIORITY_LEVEL)
+
+
+class PriorityLock:
+    """대기 중인 요청 중 우선순위가 높은 요청이 먼저 잡는 잠금 (같은 우선순위는 도착 순)
+
+    일괄 생성이 GPU를 쓰는 동안 들어온 에디터 요청이 뒤에 쌓인 다른 일괄 요청보다 먼저 실행되게 한다.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._locked = False
+        self._waiters: List[tuple] = []  # (우선순위, 순번) 힙
+        self._seq = itertools.count()
+
+    def _acquire(self, ticket: tuple):
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+            while self._locked or self._waiters[0] != ticket:
+                # 기다리는 동안 취소되면 대기열에서 빠짐
+                self._cond.wait(timeout=0.2)
+                try:
+                    check_cancelled()
+                except RequestCancelled:
+                    self._waiters.remove(ticket)
+                    heapq.heapify(self._waiters)
+                    self._cond.notify_all()
+                    raise
+            heapq.heappop(self._waiters)
+            self._locked = True
+
+    def _release(self):
+        with self._cond:
+            self._locked = False
+            self._cond.notify_all()
+
+    @contextmanager
+    def hold(self, priority: int = DEFAULT_PRIORITY_LEVEL):
+        self._acquire((priority, next(self._seq)))
+        try:
+            yield
+        finally:
+            self._release()
+
+    def yield_to_higher(self, priority: int):
+        """잠금을 잡은 채로 호출: 더 높은 우선순위 요청이 기다리면 먼저 실행시키고 다시 잡는다"""
+        with self._cond:
+            if not self._waiters or self._waiters[0][0] >= priority:
+                return
+        self._release()
+        # 같은 우선순위 대기자보다는 앞에 서도록 음수 순번 사용
+        self._acquire((priority, -next(self._seq)))
+
+
+class FishSpeechEngine:
+    """실제 Fish-Speech 모델을 메모리에 상주시켜 추론하는 엔진"""
+
+    name = "fish-speech"
+
+    def __init__(
+        self,
+        checkpoint_dir: str,
+        device: str = "cuda",
+        half: bool = False,
+        compile: bool = False,
+        codec_config: str = "modded_dac_vq",
+        prompt_cache_size: int = 16,
+    ):
+        self.checkpoint_dir = checkpoint_dir
+        self.codec_path = os.path.join(checkpoint_dir, "codec.pth")
+        self.device = device
+        self.half = half
+        self.compile = compile
+        self.codec_config = codec_config
+
+        # 모델별 잠금: 서로 다른 작업의 인코딩/생성/디코딩 단계는 겹쳐서 실행될 수 있다
+        self._codec_lock = threading.Lock()
+        # text2semantic은 우선순위 잠금: 대화형 요청이 대기 중인 일괄 요청보다 먼저 실행
+        self._semantic_lock = PriorityLock()
+
+        self.codec_model = None
+        self.semantic_model = None
+        self.decode_one_token = None
+        self.sample_rate: Optional[int] = None
+        self.load_seconds: Optional[float] = None
+        self.codec_id: Optional[str] = None
+
+        # 참조 토큰 텐서 LRU: 같은 성우 작업이 이어지면 .npy를 다시 읽지 않는다 (성우 친화 스케줄링의 warm 상태)
+        self.prompt_cache_size = max(0, prompt_cache_size)
+        self._prompt_cache: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._prompt_cache_lock = threading.Lock()
+        self.prompt_cache_hits = 0
+        self.prompt_cache_misses = 0
+
+    def load(self):
+        import torch
+        from fish_speech.models.dac.inference import load_model as load_codec_model
+        from fish_speech.models.text2semantic.inference import init_model
+
+        started = time.perf_counter()
+        precision = torch.half if self.half else torch.bfloat16
+
+        logger.info(f"codec 모델 로드: {self.codec_path}")
+        self.codec_model = load_codec_model(self.codec_config, self.codec_path, device=self.device)
+        self.sample_rate = int(self.codec_model.sample_rate)
+        # 체크포인트가 교체되면 참조 토큰 캐시 키가 달라지도록 파일 크기/수정시각을 식별자에 포함
+        codec_stat = os.stat(self.codec_path)
+        self.codec_id = f"{self.codec_config}:{self.codec_path}:{codec_stat.st_size}:{int(codec_stat.st_mtime)}"
+
+        logger.info(f"text2semantic 모델 로드: {self.checkpoint_dir} (compile={self.compile})")
+        self.semantic_model, self.decode_one_token = init_model(
+            self.checkpoint_dir, self.device, precision, compile=self.compile
+        )
+        with torch.device(self.device):
+            self.semantic_model.setup_caches(
+                max_batch_size=1,
+                max_seq_len=self.semantic_model.config.max_seq_len,
+                dtype=next(self.semantic_model.parameters()).dtype,
+            )
+
+        self.load_seconds = time.perf_counter() - started
+        logger.info(f"모델 로드 완료: {self.load_seconds:.1f}초")
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "engine": self.name,
+            "checkpoint_dir": self.checkpoint_dir,
+            "codec_path": self.codec_path,
+            "codec_id": self.codec_id,
+            "device": self.device,
+            "compile": self.compile,
+            "sample_rate": self.sample_rate,
+            "loaded": self.codec_model is not None and self.semantic_model is not None,
+            "load_seconds": self.load_seconds,
+            "prompt_cache": {
+                "size": len(self._prompt_cache),
+                "capacity": self.prompt_cache_size,
+                "hits": self.prompt_cache_hits,
+                "misses": self.prompt_cache_misses,
+            },
+        }
+
+    def encode(self, audio_path: str, output_path: str) -> Dict[str, Any]:
+        import numpy as np
+        import torch
+        import torchaudio
+
+        with self._codec_lock, torch.no_grad():
+            audio, sr = torchaudio.load(audio_path)
+            if audio.shape[0] > 1:
+                audio = audio.mean(0, keepdim=True)
+            audio = torchaudio.functional.resample(audio, sr, self.sample_rate)
+            audios = audio[None].to(self.device)
+            audio_lengths = torch.tensor([audios.shape[2]], device=self.device, dtype=torch.long)
+            indices, _ = self.codec_model.encode(audios, audio_lengths)
+            if indices.ndim == 3:
+                indices = indices[0]
+            tokens = indices.cpu().numpy()
+
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        np.save(output_path, tokens)
+        return {"output_path": output_path, "frames": int(tokens.shape[-1])}
+
+    def _generate_locked(
+        self,
+        text: str,
+        output_dir: str,
+        prompt_text: Optional[List[str]],
+        loaded_prompts: List[Any],
+        params: Dict[str, Any],
+    ) -> List[str]:
+        """text2semantic 한 번 실행 (호출 측에서 _semantic_lock을 잡고 있어야 함)"""
+        import numpy as np
+        import torch
+        from fish_speech.models.text2semantic.inference import generate_long
+
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        codes_paths = []
+        generator = generate_long(
+            model=self.semantic_model,
+            device=self.device,
+            decode_one_token=self.decode_one_token,
+            text=text,
+            num_samples=1,
+            max_new_tokens=int(params.get("max_new_tokens", 0)),
+            top_p=float(params.get("top_p", 0.8)),
+            repetition_penalty=float(params.get("repetition_penalty", 1.1)),
+            temperature=float(params.get("temperature", 0.8)),
+            compile=self.compile,
+            iterative_prompt=True,
+            chunk_length=int(params.get("chunk_length", 300)),
+            prompt_text=prompt_text or None,
+            prompt_tokens=loaded_prompts or None,
+        )
+
+        codes = []
+        for response in generator:
+            # 세그먼트마다 취소 확인 (취소되면 남은 토큰 생성을 건너뜀)
+            check_cancelled()
+            if response.action == "sample":
+                codes.append(response.codes)
+            elif response.action == "next":
+                if codes:
+                    codes_path = os.path.join(output_dir, f"codes_{len(codes_paths)}.npy")
+                    np.save(codes_path, torch.cat(codes, dim=1).cpu().numpy())
+                    codes_paths.append(codes_path)
+                codes = []
+
+        if not codes_paths:
+            raise RuntimeError("시맨틱 토큰이 생성되지 않았습니다")
+        return codes_paths
+
+    def _load_prompts(self, prompt_tokens: Optional[List[str]]) -> List[Any]:
+        import numpy as np
+        import torch
+
+        loaded = []
+        for path in prompt_tokens or []:
+            # 참조 토큰 파일이 다시 만들어지면 (샘플 변경) 수정 시각이 바뀌어 새로 읽는다
+            key = (path, os.stat(path).st_mtime_ns)
+            with self._prompt_cache_lock:
+                tokens = self._prompt_cache.get(key)
+                if tokens is not None:
+                    self._prompt_cache.move_to_end(key)
+                    self.prompt_cache_hits += 1
+            if tokens is None:
+                tokens = torch.from_numpy(np.load(path))
+                with self._prompt_cache_lock:
+                    self.prompt_cache_misses += 1
+                    if self.prompt_cache_size:
+                        self._prompt_cache[key] = tokens
+                        while len(self._prompt_cache) > self.prompt_cache_size:
+                            self._prompt_cache.popitem(last=False)
+            loaded.append(tokens)
+        return loaded
+
+    def generate(
+        self,
+        text: str,
+        output_dir: str,
+        prompt_text: Optional[List[str]] = None,
+        prompt_tokens: Optional[List[str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        loaded_prompts = self._load_prompts(prompt_tokens)
+        with self._semantic_lock.hold(priority_level(params)):
+            codes_paths = self._generate_locked(text, output_dir, prompt_text, loaded_prompts, params or {})
+        return {"codes_paths": codes_paths}
+
+    def generate_batch(
+        self,
+        items: List[Dict[str, str]],
+        prompt_text: Optional[List[str]] = None,
+        prompt_tokens: Optional[List[str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """같은 프롬프트의 여러 텍스트를 한 번의 호출로 처리
+
+        generate_long은 한 시퀀스씩 생성하므로 텍스트는 순서대로 실행하지만, 프롬프트 토큰 로드와
+        모델 잠금은 한 번만 하고 다른 작업이 사이에 끼어들지 않아 KV 캐시/컴파일된 그래프가 계속 재사용된다.
+        단, 더 높은 우선순위(대화형) 요청이 기다리면 항목 사이에서 먼저 실행시킨다.
+        항목별 실패는 결과에 error로 담고 나머지 항목은 계속 처리한다.
+        """
+        loaded_prompts = self._load_prompts(prompt_tokens)
+        results: List[Dict[str, Any]] = []
+        priority = priority_level(params)
+        with self._semantic_lock.hold(priority):
+            for index, item in enumerate(items):
+                if index:
+                    self._semantic_lock.yield_to_higher(priority)
+                try:
+                    codes_paths = self._generate_locked(
+                        item["text"], item["output_dir"], prompt_text, loaded_prompts, params or {}
+                    )
+                    results.append({"codes_paths": codes_paths})
+                except RequestCancelled:
+                    raise
+                except Exception as e:
+                    logger.exception("배치 항목 생성 실패")
+                    results.append({"error": str(e), "error_type": type(e).__name__})
+        return {"results": results}
+
+    def decode(self, codes_path: str, output_path: str) -> Dict[str, Any]:
+        import numpy as np
+        import soundfile as sf
+        import torch
+
+        with self._codec_lock, torch.no_grad():
+            indices = torch.from_numpy(np.load(codes_path)).to(self.device).long()
+            indices_lens = torch.tensor([indices.shape[1]], device=self.device, dtype=torch.long)
+            fake_audios, _ = self.codec_model.decode(indices, indices_lens)
+            fake_audio = fake_audios[0, 0].float().cpu().numpy()
+
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        sf.write(output_path, fake_audio, self.sample_rate)
+        return {"output_path": output_path, "duration": len(fake_audio) / self.sample_rate}
+
+    def decode_batch(self, items: List[Dict[str, str]], batch_size: int = 8) -> Dict[str, Any]:
+        """여러 시맨틱 토큰을 batch_size개씩 묶어 DAC 한 번에 디코딩
+
+        길이가 비슷한 항목끼리 묶이도록 프레임 수로 정렬한 뒤 0으로 패딩하고,
+        디코딩 결과는 항목별 audio_lengths만큼 잘라 저장한다.
+        """
+        import numpy as np
+        import soundfile as sf
+        import torch
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        loaded = []
+        for index, item in enumerate(items):
+            try:
+                loaded.append((index, np.load(item["codes_path"])))
+            except Exception as e:
+                results[index] = {"error": str(e), "error_type": type(e).__name__}
+        loaded.sort(key=lambda entry: entry[1].shape[-1])
+
+        for start in range(0, len(loaded), max(1, batch_size)):
+            check_cancelled()
+            group = loaded[start:start + max(1, batch_size)]
+            max_frames = max(codes.shape[-1] for _, codes in group)
+            padded = np.zeros((len(group), group[0][1].shape[0], max_frames), dtype=np.int64)
+            for row, (_, codes) in enumerate(group):
+                padded[row, :, : codes.shape[-1]] = codes
+
+            try:
+                with self._codec_lock, torch.no_grad():
+                    indices = torch.from_numpy(padded).to(self.device).long()
+                    indices_lens = torch.tensor(
+                        [codes.shape[-1] for _, codes in group], device=self.device, dtype=torch.long
+                    )
+                    fake_audios, audio_lengths = self.codec_model.decode(indices, indices_lens)
+                    audios = [
+                        fake_audios[row, 0, : int(audio_lengths[row])].float().cpu().numpy()
+                        for row in range(len(group))
+                    ]
+            except Exception as e:
+                logger.exception("배치 디코딩 실패")
+                for index, _ in group:
+                    results[index] = {"error": str(e), "error_type": type(e).__name__}
+                continue
+
+            for (index, _), audio in zip(group, audios):
+                output_path = items[index]["output_path"]
+                Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+                sf.write(output_path, audio, self.sample_rate)
+                results[index] = {"output_path": output_path, "duration": len(audio) / self.sample_rate}
+
+        return {"results": results}
+
+
+class StubFishSpeechEngine:
+    """GPU 없이 프로토콜과 서비스를 검증하기 위한 결정적(deterministic) 스텁 엔진
+
+    실제 모델 대신 입력 해시로부터 토큰을 만들고, 텍스트 길이에 비례하는 사인파 WAV를 쓴다.
+    `latency_scale`을 주면 단계별로 실제와 비슷한 지연을 흉내낸다.
+    """
+
+    name = "stub"
+
+    NUM_CODEBOOKS = 10
+    FRAMES_PER_CHAR = 4  # 약 21.5 frame/s 기준 한 글자당 ~0.19초
+    FRAME_RATE = 21.5
+
+    def __init__(self, sample_rate: int = 44100, latency_scale: float = 0.0):
+        self.sample_rate = sample_rate
+        self.latency_scale = latency_scale
+        self.checkpoint_dir = "stub"
+        self.codec_path = "stub/codec.pth"
+
+    def load(self):
+        self._sleep(0.5)
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "engine": self.name,
+            "checkpoint_dir": self.checkpoint_dir,
+            "codec_path": self.codec_path,
+            "codec_id": "stub",
+            "device": "cpu",
+            "compile": False,
+            "sample_rate": self.sample_rate,
+            "loaded": True,
+            "load_seconds": 0.0,
+        }
+
+    def _sleep(self, seconds: float):
+        check_cancelled()
+        if self.latency_scale > 0:
+            event = current_cancel_event()
+            if event is None:
+                time.sleep(seconds * self.latency_scale)
+            elif event.wait(seconds * self.latency_scale):
+                raise RequestCancelled("요청이 취소되었습니다")
+
+    @staticmethod
+    def _seed(data: bytes) -> int:
+        return int.from_bytes(hashlib.sha256(data).digest()[:4], "big")
+
+    def _write_tokens(self, path: str, frames: int, seed: int):
+        import numpy as np
+
+        rng = np.random.default_rng(seed)
+        tokens = rng.integers(0, 1024, size=(self.NUM_CODEBOOKS, max(1, frames)), dtype=np.int64)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        np.save(path, tokens)
+
+    def encode(self, audio_path: str, output_path: str) -> Dict[str, Any]:
+        data = Path(audio_path).read_bytes()
+        frames = max(1, len(data) // 4096)
+        self._sleep(0.2)
+        self._write_tokens(output_path, frames, self._seed(data))
+        return {"output_path": output_path, "frames": frames}
+
+    def generate(
+        self,
+        text: str,
+        output_dir: str,
+        prompt_text: Optional[List[str]] = None,
+        prompt_tokens: Optional[List[str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        if not text.strip():
+            raise ValueError("텍스트가 비어 있습니다")
+        frames = len(text) * self.FRAMES_PER_CHAR
+        self._sleep(0.05 * len(text))
+        codes_path = os.path.join(output_dir, "codes_0.npy")
+        seed_source = text + "|" + "|".join(prompt_tokens or [])
+        self._write_tokens(codes_path, frames, self._seed(seed_source.encode("utf-8")))
+        return {"codes_paths": [codes_path]}
+
+    def generate_batch(
+        self,
+        items: List[Dict[str, str]],
+        prompt_text: Optional[List[str]] = None,
+        prompt_tokens: Optional[List[str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        results: List[Dict[str, Any]] = []
+        for item in items:
+            try:
+                results.append(self.generate(item["text"], item["output_dir"], prompt_text, prompt_tokens, params))
+            except RequestCancelled:
+                raise
+            except Exception as e:
+                results.append({"error": str(e), "error_type": type(e).__name__})
+        return {"results": results}
+
+    def decode(self, codes_path: str, output_path: str) -> Dict[str, Any]:
+        import numpy as np
+
+        tokens = np.load(codes_path)
+        duration = tokens.shape[-1] / self.FRAME_RATE
+        self._sleep(0.1 * duration)
+
+        frequency = 180 + int(tokens[0, 0]) % 120
+        t = np.arange(int(duration * self.sample_rate)) / self.sample_rate
+        samples = (8000 * np.sin(2 * np.pi * frequency * t)).astype("<i2")
+
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        with wave.open(output_path, "wb") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(self.sample_rate)
+            wav_file.writeframes(samples.tobytes())
+        return {"output_path": output_path, "duration": duration}
+
+    def decode_batch(self, items: List[Dict[str, str]], batch_size: int = 8) -> Dict[str, Any]:
+        results: List[Dict[str, Any]] = []
+        for item in items:
+            try:
+                results.append(self.decode(item["codes_path"], item["output_path"]))
+            except RequestCancelled:
+                raise
+            except Exception as e:
+                results.append({"error": str(e), "error_type": type(e).__name__})
+        return {"results": results}
+
+
+class WorkerRequestHandler(socketserver.StreamRequestHandler):
+    """연결 하나에서 여러 요청을 순차 처리 (연결마다 스레드)"""
+
+    def handle(self):
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            if not line.strip():
+                continue
+
+            request_id = None
+            try:
+                message = decode_message(line)
+                request_id = message.get("id")
+                response = make_response(request_id, self.server.dispatch(message))
+            except Exception as e:
+                if isinstance(e, RequestCancelled):
+                    logger.info(f"⏹️ 요청 취소됨: {request_id}")
+                elif not isinstance(e, ProtocolError):
+                    logger.exception(f"요청 처리 실패: {request_id}")
+                response = make_error(request_id, e)
+
+            self.wfile.write(encode_message(response))
+            self.wfile.flush()
+
+
+class InferenceWorkerServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, engine):
+        super().__init__(address, WorkerRequestHandler)
+        self.engine = engine
+        self.started_at = time.time()
+        self.requests_served = 0
+        self._counter_lock = threading.Lock()
+        # 처리 중인 요청 ID → 취소 이벤트
+        self._inflight: Dict[str, threading.Event] = {}
+
+    def cancel(self, request_id: str) -> bool:
+        with self._counter_lock:
+            event = self._inflight.get(request_id)
+        if event is None:
+            return False
+        event.set()
+        logger.info(f"요청 취소: {request_id}")
+        return True
+
+    def dispatch(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        if message.get("op") == OP_CANCEL:
+            return {"cancelled": self.cancel(str((message.get("params") or {}).get("request_id")))}
+
+        request_id = str(message.get("id"))
+        event = threading.Event()
+        with self._counter_lock:
+            self.requests_served += 1
+            self._inflight[request_id] = event
+        _request_state.cancel_event = event
+        try:
+            return self._dispatch(message)
+        finally:
+            _request_state.cancel_event = None
+            with self._counter_lock:
+                self._inflight.pop(request_id, None)
+
+    def _dispatch(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        op = message.get("op")
+        params = message.get("params") or {}
+
+        started = time.perf_counter()
+        if op == OP_PING:
+            result = {
+                **self.engine.info(),
+                "protocol_version": PROTOCOL_VERSION,
+                "pid": os.getpid(),
+                "uptime": time.time() - self.started_at,
+                "requests_served": self.requests_served,
+            }
+        elif op == OP_ENCODE:
+            result = self.engine.encode(params["audio_path"], params["output_path"])
+        elif op == OP_GENERATE:
+            result = self.engine.generate(
+                text=params["text"],
+                output_dir=params["output_dir"],
+                prompt_text=params.get("prompt_text"),
+                prompt_tokens=params.get("prompt_tokens"),
+                params=params.get("params"),
+            )
+        elif op == OP_DECODE:
+            result = self.engine.decode(params["codes_path"], params["output_path"])
+        elif op == OP_GENERATE_BATCH:
+            result = self.engine.generate_batch(
+                items=params["items"],
+                prompt_text=params.get("prompt_text"),
+                prompt_tokens=params.get("prompt_tokens"),
+                params=params.get("params"),
+            )
+        elif op == OP_DECODE_BATCH:
+            result = self.engine.decode_batch(params["items"], int(params.get("batch_size") or 8))
+        elif op == OP_SHUTDOWN:
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            result = {"shutting_down": True}
+        else:
+            raise ProtocolError(f"지원하지 않는 연산: {op}")
+
+        result["elapsed"] = time.perf_counter() - started
+        return result
+
+
+def create_engine(args) -> Any:
+    if args.engine == "stub":
+        return StubFishSpeechEngine(sample_rate=args.sample_rate, latency_scale=args.latency_scale)
+    return FishSpeechEngine(
+        checkpoint_dir=args.checkpoint_dir,
+        device=args.device,
+        half=args.half,
+        compile=args.compile,
+        prompt_cache_size=args.prompt_cache_size,
+    )
+
+
+def serve(engine, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> InferenceWorkerServer:
+    """엔진을 로드하고 서버 객체를 반환 (serve_forever는 호출 측에서)"""
+    engine.load()
+    server = InferenceWorkerServer((host, port), engine)
+    logger.info(f"🐟 추론 워커 대기 중: {host}:{server.server_address[1]} (engine={engine.name})")
+    return server
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Fish-Speech 상주 추론 워커")
+    parser.add_argument("--engine", choices=["fish-speech", "stub"], default="fish-speech")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--checkpoint-dir", default="checkpoints/openaudio-s1-mini")
+    parser.add_argument("--fish-speech-dir", default="/opt/fish-speech")
+    parser.add_argument("--device", default="cuda")
+    parser.add_argument("--half", action="store_true")
+    parser.add_argument("--compile", action="store_true")
+    parser.add_argument("--prompt-cache-size", type=int, default=16, help="메모리에 유지할 참조 토큰 파일 수")
+    parser.add_argument("--sample-rate", type=int, default=44100, help="스텁 엔진 출력 샘플레이트")
+    parser.add_argument("--latency-scale", type=float, default=0.0, help="스텁 엔진 지연 시뮬레이션 배율")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.engine == "fish-speech" and args.fish_speech_dir not in sys.path:
+        sys.path.insert(0, args.fish_speech_dir)
+
+    server = serve(create_engine(args), args.host, args.port)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Fish-Speech 추론 워커 통신 프로토콜
+
+백엔드와 상주 추론 워커가 TCP 소켓 위에서 주고받는 줄 단위 JSON 메시지 정의.
+워커 컨테이너에도 그대로 복사되어 실행되므로 표준 라이브러리만 사용한다.
+
+요청:  {"id": "...", "op": "encode", "params": {...}}\\n
+응답:  {"id": "...", "ok": true, "result": {...}}\\n
+       {"id": "...", "ok": false, "error": "...", "error_type": "..."}\\n
+"""
+import json
+import uuid
+from typing import Any, Dict, Optional
+
+PROTOCOL_VERSION = 3  # 2: generate_batch / decode_batch 추가, 3: cancel 추가
+DEFAULT_PORT = 8765
+
+# 한 줄(메시지)의 최대 크기 - 경로/텍스트만 주고받으므로 넉넉하게 4MB
+MAX_MESSAGE_BYTES = 4 * 1024 * 1024
+
+# 지원 연산
+OP_PING = "ping"  # 워커 상태 및 로드된 모델 정보
+OP_ENCODE = "encode"  # 참조 오디오 → 프롬프트 토큰(.npy)
+OP_GENERATE = "generate"  # 텍스트 (+ 프롬프트 토큰) → 시맨틱 토큰(codes_N.npy)
+OP_DECODE = "decode"  # 시맨틱 토큰 → 오디오(.wav)
+OP_GENERATE_BATCH = "generate_batch"  # 같은 프롬프트의 여러 텍스트 → 텍스트별 시맨틱 토큰 (한 번의 호출)
+OP_DECODE_BATCH = "decode_batch"  # 여러 시맨틱 토큰 → 오디오 (DAC 배치 디코딩)
+OP_CANCEL = "cancel"  # 처리 중인 요청 중단 (params: request_id)
+OP_SHUTDOWN = "shutdown"  # 워커 종료
+
+SUPPORTED_OPS = (
+    OP_PING,
+    OP_ENCODE,
+    OP_GENERATE,
+    OP_DECODE,
+    OP_GENERATE_BATCH,
+    OP_DECODE_BATCH,
+    OP_CANCEL,
+    OP_SHUTDOWN,
+)
+
+
+class ProtocolError(Exception):
+    """잘못된 형식의 메시지"""
+
+
+class WorkerError(Exception):
+    """워커가 연산 수행 중 실패를 보고한 경우"""
+
+    def __init__(self, message: str, error_type: Optional[str] = None):
+        super().__init__(message)
+        self.error_type = error_type
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    """메시지를 한 줄의 UTF-8 JSON으로 직렬화"""
+    data = json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if len(data) > MAX_MESSAGE_BYTES:
+        raise ProtocolError(f"메시지가 너무 큽니다: {len(data)} bytes")
+    return data + b"\n"
+
+
+def decode_message(line: bytes) -> Dict[str, Any]:
+    """한 줄의 JSON을 메시지로 역직렬화"""
+    if len(line) > MAX_MESSAGE_BYTES:
+        raise ProtocolError(f"메시지가 너무 큽니다: {len(line)} bytes")
+    try:
+        message = json.loads(line.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ProtocolError(f"잘못된 메시지 형식: {e}")
+    if not isinstance(message, dict):
+        raise ProtocolError("메시지는 JSON 객체여야 합니다")
+    return message
+
+
+def make_request(op: str, params: Optional[Dict[str, Any]] = None, request_id: Optional[str] = None) -> Dict[str, Any]:
+    if op not in SUPPORTED_OPS:
+        raise ProtocolError(f"지원하지 않는 연산: {op}")
+    return {"id": request_id or new_request_id(), "op": op, "params": params or {}}
+
+
+def make_response(request_id: Optional[str], result: Dict[str, Any]) -> Dict[str, Any]:
+    return {"id": request_id, "ok": True, "result": result}
+
+
+def make_error(request_id: Optional[str], error: BaseException) -> Dict[str, Any]:
+    return {
+        "id": request_id,
+        "ok": False,
+        "error": str(error),
+        "error_type": type(error).__name__,
+    }
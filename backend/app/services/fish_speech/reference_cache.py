@@ -0,0 +1,192 @@
+"""
+참조 음성 프롬프트 토큰 캐시
+
+Voice Cloning 1단계(참조 오디오 → DAC 토큰)의 결과는 참조 파일 내용이 바뀌지 않는 한 동일하므로
+(파일 해시, codec 체크포인트, 샘플레이트)를 키로 하는 콘텐츠 주소 캐시에 `.npy`로 보관한다.
+캐시 디렉토리는 voice_samples/ 아래에 두어 Fish-Speech 컨테이너에서도 같은 파일을 볼 수 있게 한다.
+참조 파일 → 키 인덱스(index.json)는 API 프로세스(업로드 직후 예열)와 큐 워커가 함께 갱신하므로
+index.lock 파일 잠금(fcntl.flock)으로 읽기-수정-쓰기를 프로세스 간에 직렬화한다.
+"""
+import asyncio
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_NAME = "_prompt_tokens"
+
+# (호스트 참조 오디오 경로, 호스트 출력 .npy 경로) → 인코딩 수행
+EncodeFn = Callable[[str, str], Awaitable[object]]
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ReferenceTokenCache:
+    """참조 음성 → 프롬프트 토큰(.npy) 콘텐츠 주소 캐시"""
+
+    def __init__(self, voice_samples_dir: Path):
+        self.cache_dir = Path(voice_samples_dir) / CACHE_DIR_NAME
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.cache_dir / "index.json"
+        self.index_lock_path = self.cache_dir / "index.lock"
+
+        # 파일 해시 메모: 경로 → (mtime_ns, size, sha256) - 매 생성마다 다시 해시하지 않도록
+        self._hash_memo: Dict[str, Tuple[int, int, str]] = {}
+        # 같은 키를 동시에 인코딩하지 않도록 키별 잠금
+        self._key_locks: Dict[str, asyncio.Lock] = {}
+        self._index_lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(path: str) -> str:
+        return str(Path(path).resolve())
+
+    def content_hash(self, audio_path: str) -> str:
+        """참조 파일 내용 해시 (mtime/size가 같으면 메모 사용)"""
+        normalized = self._normalize(audio_path)
+        stat = os.stat(normalized)
+        memo = self._hash_memo.get(normalized)
+        if memo and memo[0] == stat.st_mtime_ns and memo[1] == stat.st_size:
+            return memo[2]
+
+        digest = file_sha256(normalized)
+        self._hash_memo[normalized] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+    @staticmethod
+    def make_key(content_hash: str, codec_id: str, sample_rate: Optional[int]) -> str:
+        source = f"{content_hash}|{codec_id}|{sample_rate or 0}"
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()[:40]
+
+    def path_for_key(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npy"
+
+    def lookup(self, audio_path: str, codec_id: str, sample_rate: Optional[int]) -> Optional[Path]:
+        key = self.make_key(self.content_hash(audio_path), codec_id, sample_rate)
+        cached = self.path_for_key(key)
+        return cached if cached.exists() else None
+
+    async def get_or_encode(
+        self,
+        audio_path: str,
+        codec_id: str,
+        sample_rate: Optional[int],
+        encode: EncodeFn,
+    ) -> Tuple[str, bool]:
+        """캐시된 프롬프트 토큰 경로를 반환하고, 없으면 인코딩 후 저장
+
+        Returns:
+            (호스트 .npy 경로, 캐시 적중 여부)
+        """
+        content_hash = await asyncio.to_thread(self.content_hash, audio_path)
+        key = self.make_key(content_hash, codec_id, sample_rate)
+        cached = self.path_for_key(key)
+
+        lock = self._key_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if cached.exists():
+                self.hits += 1
+                logger.info(f"♻️ 참조 토큰 캐시 적중: {Path(audio_path).name} → {cached.name}")
+                return str(cached), True
+
+            self.misses += 1
+            logger.info(f"🔄 참조 토큰 캐시 미스, 인코딩 수행: {Path(audio_path).name}")
+
+            # 임시 파일에 쓴 뒤 원자적으로 교체 (부분 파일이 캐시로 보이지 않도록)
+            tmp_path = self.cache_dir / f"{key}.{uuid.uuid4().hex[:8]}.tmp.npy"
+            try:
+                await encode(audio_path, str(tmp_path))
+                os.replace(tmp_path, cached)
+            finally:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+
+            await asyncio.to_thread(self._record, audio_path, key)
+            return str(cached), False
+
+    def invalidate(self, audio_path: str) -> int:
+        """참조 파일이 교체/삭제되었을 때 해당 경로의 캐시 항목 제거
+
+        같은 내용을 가진 다른 샘플이 아직 참조하는 토큰 파일은 남겨둔다.
+        Returns:
+            삭제한 토큰 파일 수
+        """
+        normalized = self._normalize(audio_path)
+        self._hash_memo.pop(normalized, None)
+
+        removed = 0
+        with self._locked_index():
+            index = self._load_index()
+            keys = index.pop(normalized, [])
+            still_used = {k for other_keys in index.values() for k in other_keys}
+            for key in keys:
+                if key in still_used:
+                    continue
+                cached = self.path_for_key(key)
+                if cached.exists():
+                    cached.unlink()
+                    removed += 1
+            self._save_index(index)
+
+        if keys:
+            logger.info(f"🗑️ 참조 토큰 캐시 무효화: {Path(audio_path).name} ({removed}개 삭제)")
+        return removed
+
+    def stats(self) -> Dict[str, object]:
+        """디스크 기준 통계 (hits/misses는 프로세스별 카운터라 워커 하트비트로 따로 집계)"""
+        entries = list(self.cache_dir.glob("*.npy"))
+        return {
+            "entries": len([p for p in entries if not p.name.endswith(".tmp.npy")]),
+            "total_bytes": sum(p.stat().st_size for p in entries),
+        }
+
+    def _record(self, audio_path: str, key: str):
+        normalized = self._normalize(audio_path)
+        with self._locked_index():
+            index = self._load_index()
+            keys: List[str] = index.setdefault(normalized, [])
+            if key not in keys:
+                keys.append(key)
+            self._save_index(index)
+
+    @contextmanager
+    def _locked_index(self):
+        """인덱스 읽기-수정-쓰기 구간 잠금 (같은 프로세스의 스레드 + 다른 프로세스)"""
+        with self._index_lock, open(self.index_lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load_index(self) -> Dict[str, List[str]]:
+        if not self.index_path.exists():
+            return {}
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"⚠️ 참조 토큰 캐시 인덱스 읽기 실패, 새로 만듭니다: {e}")
+            return {}
+
+    def _save_index(self, index: Dict[str, List[str]]):
+        tmp_path = self.index_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.index_path)
@@ -0,0 +1,511 @@
+"""
+TTS 생성 파이프라인 벤치마크
+
+GPU/Docker 없이 결정적 스텁 추론 워커(StubFishSpeechEngine)를 프로세스 안에서 띄우고,
+임시 디렉토리 + SQLite DB 위에서 실제 큐 획득 → execute_generation 경로를 그대로 실행한다.
+(큐 워커와 같이 비동기 세션을 사용하므로 aiosqlite 필요)
+
+- 단계별 지연: 큐 획득, 체크포인트 확인, 컨테이너 명령, 참조 음성 조회, 참조 인코딩,
+  text2semantic, 디코딩, 길이 확인, 품질 점수, DB commit (p50/p95/p99)
+- 동시 실행 수 1..N 별 처리량과 요청 지연
+- 메모리 최고치 (ru_maxrss, --trace-memory 사용 시 tracemalloc peak)
+- --batch-size N이면 배치 생성(batch_mode) 작업으로 등록하고 claim_batch → execute_generation_batch 경로를 측정
+- 결과를 JSON으로 저장하고 --baseline 결과와 비교 (--max-regression 초과 시 종료 코드 1)
+
+"컨테이너"는 로컬 파일 시스템으로 대체되며(docker exec 대신 같은 명령을 로컬에서 실행), 스텁 워커도
+같은 프로세스의 스레드에서 돌기 때문에 메모리 수치에는 워커 몫이 포함된다.
+
+    python -m app.services.tts_benchmark --requests 20 --concurrency 1,2,4 --output tts_benchmark.json
+    python -m app.services.tts_benchmark --baseline tts_benchmark.json --max-regression 0.2
+"""
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import resource
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import wave
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.services.fish_speech import FishSpeechWorkerClient
+from app.services.fish_speech.inference_worker import StubFishSpeechEngine, serve
+from app.services.tts_service import FishSpeechTTSService
+from app.services.tts_timing import aggregate, summarize
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 22050
+
+# 길이가 다른 멘트 (TTS_CHUNK_MAX_CHARS보다 긴 문장은 청크 분할 경로를 탄다)
+TEXT_CORPUS = (
+    "안녕하세요. 고객센터입니다.",
+    "잠시만 기다려 주시면 상담원을 연결해 드리겠습니다.",
+    "요금 조회는 1번, 분실 신고는 2번, 상담원 연결은 0번을 눌러 주세요.",
+    "지금은 통화량이 많아 연결이 지연되고 있습니다. 잠시 후 다시 걸어 주시거나 "
+    "홈페이지의 채팅 상담을 이용해 주시면 더 빠르게 도와드리겠습니다.",
+    "고객님의 소중한 의견은 서비스 개선에 반영하겠습니다. 오늘도 좋은 하루 보내세요. "
+    "상담 품질 향상을 위해 통화 내용이 녹음될 수 있음을 알려 드립니다.",
+)
+
+WORKER_STAGES = {
+    "encode": "reference_encode",
+    "generate": "text2semantic",
+    "decode": "decode",
+    "generate_batch": "text2semantic",
+    "decode_batch": "decode",
+    "ping": "worker_ping",
+}
+
+
+class StageRecorder:
+    """단계 이름별 소요 시간 수집 (동시에 여러 작업이 기록해도 되도록 이벤트 루프 안에서만 사용)"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.samples[stage].append(seconds)
+
+    @asynccontextmanager
+    async def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def reset(self) -> None:
+        self.samples = defaultdict(list)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        return {name: summarize(values) for name, values in sorted(self.samples.items())}
+
+
+class TimedWorkerClient(FishSpeechWorkerClient):
+    """워커 연산(encode/generate/decode)별 왕복 시간 기록"""
+
+    def __init__(self, recorder: StageRecorder, **kwargs):
+        super().__init__(**kwargs)
+        self.recorder = recorder
+
+    async def call(self, op, params=None, timeout=None):
+        async with self.recorder.stage(WORKER_STAGES.get(op, op)):
+            return await super().call(op, params, timeout)
+
+
+class BenchmarkTTSService(FishSpeechTTSService):
+    """로컬 작업 공간에서 실행하는 Fish-Speech 서비스 (단계별 시간 기록)
+
+    워커와 백엔드가 같은 디렉토리를 보므로 작업 공간 경로가 호스트 경로와 같고,
+    docker exec로 실행하던 확인 명령은 같은 명령을 로컬에서 실행해 프로세스 생성 비용까지 측정한다.
+    """
+
+    def __init__(self, root: Path, db_engine, worker_client: TimedWorkerClient):
+        super().__init__(host_root=root, db_engine=db_engine, worker_client=worker_client)
+        self.recorder = worker_client.recorder
+        self.workspace_dir = str(root)
+        self.checkpoint_dir = str(root / "checkpoints" / "stub")
+        self.fish_speech_dir = str(root)
+        self._started_at = datetime.now().isoformat()
+
+    async def _inspect_container(self):
+        # 로컬 실행이므로 컨테이너는 항상 "실행 중"이고 재시작되지 않음
+        return {"name": "local", "id": "local", "started_at": self._started_at}
+
+    async def _check_environment(self):
+        async with self.recorder.stage("environment_check"):
+            return await super()._check_environment()
+
+    async def _run_docker_command(self, cmd, timeout=60):
+        async with self.recorder.stage("container_exec"):
+            return await self._run_command(cmd, timeout)
+
+    async def _verify_checkpoint_paths(self):
+        async with self.recorder.stage("checkpoint_verify"):
+            return await super()._verify_checkpoint_paths()
+
+    async def _get_reference_wavs(self, voice_actor, session):
+        async with self.recorder.stage("reference_lookup"):
+            return await super()._get_reference_wavs(voice_actor, session)
+
+    async def _get_audio_duration(self, audio_file_path):
+        async with self.recorder.stage("duration_probe"):
+            return await super()._get_audio_duration(audio_file_path)
+
+    async def _calculate_quality_score(self, *args, **kwargs):
+        async with self.recorder.stage("quality_score"):
+            return await super()._calculate_quality_score(*args, **kwargs)
+
+
+class _CommitTimer:
+    """벤치마크 DB 세션의 commit 시간 기록 (flush 포함)"""
+
+    def __init__(self, db_engine, recorder: StageRecorder):
+        self.db_engine = db_engine
+        self.recorder = recorder
+
+    def _before(self, session):
+        if session.bind is self.db_engine:
+            session.info["benchmark_commit_started"] = time.perf_counter()
+
+    def _after(self, session):
+        started = session.info.pop("benchmark_commit_started", None)
+        if started is not None:
+            self.recorder.add("db_commit", time.perf_counter() - started)
+
+    def __enter__(self):
+        event.listen(Session, "before_commit", self._before)
+        event.listen(Session, "after_commit", self._after)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(Session, "before_commit", self._before)
+        event.remove(Session, "after_commit", self._after)
+
+
+def _write_reference_wav(path: Path, seconds: float, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    audio = 0.3 * np.sin(2 * np.pi * (150 + 10 * seed) * t) + 0.01 * rng.standard_normal(len(t))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(SAMPLE_RATE)
+        wav_file.writeframes((audio * 32767).astype("<i2").tobytes())
+
+
+def _rss_peak_mb() -> float:
+    # Linux는 KB, macOS는 bytes 단위
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class PipelineBenchmark:
+    """임시 작업 공간/DB/스텁 워커를 준비하고 동시 실행 수별로 생성 파이프라인을 측정"""
+
+    def __init__(
+        self,
+        root: Path,
+        requests: int = 20,
+        concurrency_levels: Iterable[int] = (1, 2, 4),
+        references: int = 2,
+        encode_repeat: int = 5,
+        latency_scale: float = 0.0,
+        trace_memory: bool = False,
+        batch_size: int = 1,
+    ):
+        self.root = root
+        self.requests = requests
+        self.concurrency_levels = list(concurrency_levels)
+        self.references = references
+        self.encode_repeat = encode_repeat
+        self.latency_scale = latency_scale
+        self.trace_memory = trace_memory
+        self.batch_size = max(1, batch_size)
+        self.recorder = StageRecorder()
+        self._text_index = 0
+
+    def _setup(self) -> None:
+        from app.models import AgeRangeType, GenderType, User, VoiceActor, VoiceSample
+
+        (self.root / "checkpoints" / "stub").mkdir(parents=True, exist_ok=True)
+        (self.root / "checkpoints" / "stub" / "codec.pth").touch()
+
+        self.server = serve(
+            StubFishSpeechEngine(latency_scale=self.latency_scale), host="127.0.0.1", port=0
+        )
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        host, port = self.server.server_address[:2]
+
+        # 준비/등록은 동기 엔진, 큐 획득과 생성 파이프라인은 운영과 같이 비동기 엔진 사용
+        self.db_engine = create_engine(f"sqlite:///{self.root / 'benchmark.db'}")
+        SQLModel.metadata.create_all(self.db_engine)
+        self.async_engine = create_async_engine(f"sqlite+aiosqlite:///{self.root / 'benchmark.db'}")
+
+        client = TimedWorkerClient(self.recorder, host=host, port=port, timeout=120)
+        self.service = BenchmarkTTSService(self.root, self.async_engine, client)
+
+        with Session(self.db_engine) as session:
+            user = User(email="benchmark@example.com", hashed_password="-")
+            actor = VoiceActor(
+                name="benchmark", gender=GenderType.FEMALE, age_range=AgeRangeType.THIRTIES, created_by=user.id
+            )
+            session.add(user)
+            session.add(actor)
+            self.reference_paths = []
+            for i in range(self.references):
+                path = self.service.reference_audio_dir / str(actor.id) / f"sample_{i}.wav"
+                _write_reference_wav(path, seconds=1.5, seed=i)
+                self.reference_paths.append(str(path))
+                session.add(
+                    VoiceSample(
+                        voice_actor_id=actor.id,
+                        text_content="참조 음성",
+                        audio_file_path=str(path),
+                        uploaded_by=user.id,
+                    )
+                )
+            session.commit()
+            self.user_id = user.id
+            self.voice_actor_id = actor.id
+
+    async def _teardown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        await self.async_engine.dispose()
+        self.db_engine.dispose()
+
+    def _enqueue(self, count: int) -> None:
+        from app.models import TTSGeneration, TTSPriority, TTSScript
+        from app.services.tts_queue import enqueue_generation
+
+        with Session(self.db_engine) as session:
+            for _ in range(count):
+                # 텍스트마다 번호를 붙여 캐시 적중 없이 매번 합성하게 함
+                text = f"{TEXT_CORPUS[self._text_index % len(TEXT_CORPUS)]} ({self._text_index})"
+                self._text_index += 1
+                script = TTSScript(
+                    text_content=text, voice_actor_id=self.voice_actor_id, created_by=self.user_id
+                )
+                session.add(script)
+                enqueue_generation(
+                    session,
+                    TTSGeneration(
+                        script_id=script.id,
+                        requested_by=self.user_id,
+                        priority=TTSPriority.BATCH if self.batch_size > 1 else TTSPriority.INTERACTIVE,
+                        generation_params={"use_cache": False, "batch_mode": self.batch_size > 1},
+                    ),
+                )
+
+    async def _consume(self, worker_id: str, latencies: List[float], processed: List) -> None:
+        from app.services.tts_queue import claim_batch
+
+        while True:
+            started = time.perf_counter()
+            async with self.recorder.stage("queue_claim"):
+                async with AsyncSession(self.async_engine) as session:
+                    generation_ids = await session.run_sync(claim_batch, worker_id, self.batch_size)
+            if not generation_ids:
+                return
+            if len(generation_ids) == 1:
+                await self.service.execute_generation(generation_ids[0], worker_id)
+            else:
+                outcomes = await self.service.execute_generation_batch(generation_ids, worker_id)
+                failed = [str(i) for i, error in outcomes.items() if error is not None]
+                if failed:
+                    raise RuntimeError(f"배치 항목 실패: {failed}")
+            # 배치로 처리된 작업은 배치가 끝난 시점을 각자의 완료 시각으로 봄
+            elapsed = time.perf_counter() - started
+            latencies.extend([elapsed] * len(generation_ids))
+            processed.extend(generation_ids)
+
+    async def _run_level(self, concurrency: int, count: int) -> Dict[str, Any]:
+        self._enqueue(count)
+        self.service._job_semaphore = asyncio.Semaphore(concurrency)
+        self.recorder.reset()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        rss_before = _rss_peak_mb()
+
+        latencies: List[float] = []
+        processed: List = []
+        started = time.perf_counter()
+        with _CommitTimer(self.async_engine.sync_engine, self.recorder):
+            await asyncio.gather(
+                *(self._consume(f"bench-{concurrency}-{i}", latencies, processed) for i in range(concurrency))
+            )
+        wall = time.perf_counter() - started
+
+        rss_after = _rss_peak_mb()
+        memory: Dict[str, Any] = {"rss_peak_mb": rss_after, "rss_peak_growth_mb": round(rss_after - rss_before, 1)}
+        if self.trace_memory:
+            memory["tracemalloc_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+
+        return {
+            "concurrency": concurrency,
+            "requests": len(latencies),
+            "wall_seconds": round(wall, 3),
+            "throughput_rps": round(len(latencies) / wall, 3) if wall > 0 else None,
+            "latency": summarize(latencies),
+            "stages": self.recorder.summary(),
+            # 생성 작업이 직접 기록한 TTSGeneration.stage_timings 집계 (운영 대시보드와 같은 기준)
+            "recorded_stages": self._recorded_stages(processed),
+            "memory": memory,
+        }
+
+    def _recorded_stages(self, generation_ids: List) -> Dict[str, Any]:
+        from app.models import TTSGeneration
+        from sqlmodel import select
+
+        with Session(self.db_engine) as session:
+            rows = session.exec(
+                select(TTSGeneration.stage_timings).where(TTSGeneration.id.in_(generation_ids))
+            ).all()
+        return aggregate(rows)
+
+    async def _measure_reference_encode(self) -> Dict[str, Any]:
+        """캐시를 비운 상태에서 참조 음성 토큰 인코딩 (파일 해시 + 워커 encode 포함)"""
+        self.recorder.reset()
+        totals = []
+        for _ in range(self.encode_repeat):
+            for path in self.reference_paths:
+                self.service.invalidate_reference_tokens(path)
+                started = time.perf_counter()
+                await self.service._get_reference_tokens(path)
+                totals.append(time.perf_counter() - started)
+        # 이후 생성 작업은 캐시된 토큰을 사용 (운영 환경의 정상 상태)
+        return {"total": summarize(totals), "stages": self.recorder.summary()}
+
+    async def run(self) -> Dict[str, Any]:
+        if self.trace_memory:
+            tracemalloc.start()
+        self._setup()
+        try:
+            await self.service.initialize_tts_model()
+            reference_encode = await self._measure_reference_encode()
+
+            # 워밍업 (import, 소켓, 첫 commit 비용 제외)
+            await self._run_level(1, 2)
+
+            levels = [await self._run_level(c, self.requests) for c in self.concurrency_levels]
+        finally:
+            await self._teardown()
+            if self.trace_memory:
+                tracemalloc.stop()
+
+        return {
+            "meta": {
+                "created_at": datetime.now().isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "engine": "stub",
+                "latency_scale": self.latency_scale,
+                "batch_size": self.batch_size,
+                "requests_per_level": self.requests,
+                "references": self.references,
+                "chunk_max_chars": settings.TTS_CHUNK_MAX_CHARS,
+                "chunk_concurrency": settings.TTS_CHUNK_CONCURRENCY,
+            },
+            "reference_encode": reference_encode,
+            "levels": levels,
+        }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], max_regression: Optional[float] = None) -> List[str]:
+    """동시 실행 수별 p95 지연/처리량/단계별 p95를 기준 결과와 비교해 출력 줄 목록 반환
+
+    요청 p95 지연과 처리량이 max_regression(예: 0.2 = 20%)을 넘게 나빠지면 "REGRESSION"으로 표시한다.
+    단계별 수치는 1ms 미만 단계의 흔들림이 커서 참고용으로만 출력한다.
+    """
+    lines = []
+    baseline_levels = {level["concurrency"]: level for level in baseline.get("levels", [])}
+    for level in current["levels"]:
+        before = baseline_levels.get(level["concurrency"])
+        if not before:
+            continue
+        # (이름, 기준값, 현재값, 클수록 좋은지, 회귀 판정 대상인지)
+        checks = [
+            ("latency p95", before["latency"].get("p95_ms"), level["latency"].get("p95_ms"), False, True),
+            ("throughput", before.get("throughput_rps"), level.get("throughput_rps"), True, True),
+        ]
+        for stage, summary in level["stages"].items():
+            old = before["stages"].get(stage, {}).get("p95_ms")
+            checks.append((f"{stage} p95", old, summary.get("p95_ms"), False, False))
+
+        for name, old, new, higher_is_better, gated in checks:
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            regression = -change if higher_is_better else change
+            flag = " REGRESSION" if gated and max_regression is not None and regression > max_regression else ""
+            lines.append(f"c={level['concurrency']:<3} {name:<28} {old:>10.2f} → {new:>10.2f} ({change:+.1%}){flag}")
+    return lines
+
+
+def format_report(result: Dict[str, Any]) -> str:
+    lines = []
+    encode = result["reference_encode"]["total"]
+    lines.append(f"reference encode (cold): p50 {encode.get('p50_ms', 0):.2f}ms p95 {encode.get('p95_ms', 0):.2f}ms")
+    for level in result["levels"]:
+        latency = level["latency"]
+        lines.append("")
+        lines.append(
+            f"concurrency {level['concurrency']}: {level['requests']} req, {level['throughput_rps']} req/s, "
+            f"p50 {latency.get('p50_ms', 0):.1f}ms p95 {latency.get('p95_ms', 0):.1f}ms "
+            f"p99 {latency.get('p99_ms', 0):.1f}ms, rss peak {level['memory']['rss_peak_mb']}MB"
+        )
+        width = max((len(name) for name in level["stages"]), default=0)
+        for name, summary in level["stages"].items():
+            lines.append(
+                f"  {name:<{width}}  n={summary['count']:<4} p50 {summary['p50_ms']:>9.2f}  "
+                f"p95 {summary['p95_ms']:>9.2f}  p99 {summary['p99_ms']:>9.2f} ms"
+            )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="TTS 생성 파이프라인 벤치마크 (스텁 추론 워커)")
+    parser.add_argument("--requests", type=int, default=20, help="동시 실행 수 단계별 생성 요청 수")
+    parser.add_argument("--concurrency", default="1,2,4", help="쉼표로 구분한 동시 실행 수 목록")
+    parser.add_argument("--references", type=int, default=2, help="성우 참조 음성 개수")
+    parser.add_argument("--encode-repeat", type=int, default=5)
+    parser.add_argument("--latency-scale", type=float, default=0.0, help="스텁 엔진 지연 시뮬레이션 배율")
+    parser.add_argument("--trace-memory", action="store_true", help="tracemalloc peak 측정 (느려짐)")
+    parser.add_argument("--batch-size", type=int, default=1, help="배치 생성으로 묶을 최대 작업 수 (1이면 단건 처리)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--max-regression", type=float, help="허용 악화 비율 (예: 0.2), 초과 시 종료 코드 1")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+
+    with tempfile.TemporaryDirectory(prefix="tts_benchmark_") as tmp:
+        benchmark = PipelineBenchmark(
+            Path(tmp),
+            requests=args.requests,
+            concurrency_levels=[int(c) for c in args.concurrency.split(",") if c.strip()],
+            references=args.references,
+            encode_repeat=args.encode_repeat,
+            latency_scale=args.latency_scale,
+            trace_memory=args.trace_memory,
+            batch_size=args.batch_size,
+        )
+        result = asyncio.run(benchmark.run())
+
+    print(format_report(result))
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\n결과 저장: {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        lines = compare(result, baseline, args.max_regression)
+        print("\n기준 결과 대비:")
+        print("\n".join(lines) if lines else "  비교할 항목 없음")
+        if any(line.endswith("REGRESSION") for line in lines):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
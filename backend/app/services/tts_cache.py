@@ -0,0 +1,370 @@
+"""
+TTS 합성 결과 캐시
+
+ARS 멘트는 같은 문구("잠시만 기다려 주십시오" 등)를 여러 시나리오에서 반복해서 생성하므로
+(정규화 텍스트, 성우, 성우 샘플 구성, 생성 파라미터, 모델 체크포인트)를 키로 결과 음성을 재사용한다.
+
+- 캐시 원본은 audio_files/tts_cache/<key>.wav 에 두고, 생성 작업/라이브러리 아이템에는 하드링크를 만들어 준다.
+  (생성 결과를 삭제해도 캐시는 남고, 캐시를 제거해도 이미 완료된 작업의 파일은 남는다)
+- 캐시 크기가 TTS_CACHE_MAX_BYTES를 넘으면 마지막 사용 시각이 오래된 항목부터 제거한다 (LRU).
+- 적중/미스는 TTSGeneration.cache_hit / cache_key로 집계하므로 API와 워커 프로세스가 달라도 정확하다.
+  처리 중인 작업에 합류해 완료된 작업(coalesced_into)은 미스가 아니라 coalesced로 따로 센다.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import unicodedata
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func, update
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.models.tts import (
+    GenerationStatus,
+    TTSAudioCache,
+    TTSGeneration,
+    TTSLibrary,
+    TTSScript,
+)
+from app.models.voice_actor import VoiceSample
+from app.services import tts_stats
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_NAME = "tts_cache"
+LIBRARY_DIR_NAME = "library"
+
+# 한국어 최적화 기본 생성 파라미터 (generate_tts 기본값, 라이브러리 아이템 캐시 키에도 사용)
+DEFAULT_GENERATION_PARAMS: Dict[str, Any] = {
+    "temperature": 0.65,
+    "top_k": 40,
+    "top_p": 0.85,
+    "repetition_penalty": 1.1,
+    "do_sample": True,
+}
+
+# 합성 결과에 영향을 주지 않는 파라미터 (캐시 키에서 제외)
+NON_SYNTHESIS_PARAMS = {"batch_mode", "engine", "test_mode", "quality", "priority", "use_cache"}
+
+
+def _audio_files_dir() -> Path:
+    return Path(settings.AUDIO_FILES_DIR)
+
+
+def cache_dir() -> Path:
+    path = _audio_files_dir() / CACHE_DIR_NAME
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def normalize_text(text: str) -> str:
+    """캐시 키용 텍스트 정규화 (유니코드 NFC, 공백 정리)"""
+    text = unicodedata.normalize("NFC", text or "")
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def sample_set_fingerprint(session: Session, voice_actor_id: Optional[uuid.UUID]) -> str:
+    """성우 샘플 구성 지문 - 샘플이 추가/교체/삭제되면 값이 바뀜
+
+    파일 내용을 매번 해시하지 않고 (경로, 크기, 수정 시각)만 사용한다.
+    """
+    if not voice_actor_id:
+        return "default"
+
+    samples = session.exec(
+        select(VoiceSample.audio_file_path)
+        .where(VoiceSample.voice_actor_id == voice_actor_id)
+        .order_by(VoiceSample.audio_file_path)
+    ).all()
+
+    digest = hashlib.sha256()
+    for audio_file_path in samples:
+        try:
+            stat = os.stat(audio_file_path)
+            digest.update(f"{audio_file_path}|{stat.st_size}|{stat.st_mtime_ns}\n".encode("utf-8"))
+        except OSError:
+            # 파일이 없는 샘플은 Voice Cloning에 쓰이지 않으므로 경로만 반영
+            digest.update(f"{audio_file_path}|missing\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def synthesis_params(params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """합성 결과에 영향을 주는 파라미터만 (캐시 키, 배치 묶음 기준)"""
+    return {k: v for k, v in (params or {}).items() if k not in NON_SYNTHESIS_PARAMS}
+
+
+def compute_cache_key(
+    session: Session,
+    text: str,
+    voice_actor_id: Optional[uuid.UUID],
+    params: Optional[Dict[str, Any]],
+) -> str:
+    source = json.dumps(
+        {
+            "text": normalize_text(text),
+            "voice_actor_id": str(voice_actor_id) if voice_actor_id else None,
+            "samples": sample_set_fingerprint(session, voice_actor_id),
+            "params": synthesis_params(params),
+            "model": settings.FISH_SPEECH_MODEL_PATH,
+            "chunking": [settings.TTS_CHUNK_MAX_CHARS, settings.TTS_CHUNK_CROSSFADE_MS],
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def cache_key_for_generation(session: Session, generation: TTSGeneration) -> Optional[str]:
+    script = session.get(TTSScript, generation.script_id)
+    if not script:
+        return None
+    return compute_cache_key(
+        session, script.text_content, script.voice_actor_id, generation.generation_params
+    )
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    """하드링크 생성 (다른 파일시스템이면 복사)"""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f".{dst.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+
+
+def share_audio(source_path: str) -> Path:
+    """다른 생성 작업용 이름으로 음성 파일을 하드링크해 경로 반환 (한쪽을 삭제해도 다른 쪽은 남음)"""
+    output_path = _audio_files_dir() / f"fish_tts_{uuid.uuid4().hex[:8]}.wav"
+    _link_or_copy(Path(source_path), output_path)
+    return output_path
+
+
+def lookup(session: Session, cache_key: str) -> Optional[TTSAudioCache]:
+    """캐시 항목 조회 (파일이 사라진 항목은 제거하고 None)"""
+    entry = session.get(TTSAudioCache, cache_key)
+    if entry and not Path(entry.audio_file_path).exists():
+        logger.warning(f"⚠️ 캐시 파일이 없어 항목 제거: {entry.audio_file_path}")
+        session.delete(entry)
+        session.commit()
+        return None
+    return entry
+
+
+def _touch(session: Session, cache_key: str) -> None:
+    session.execute(
+        update(TTSAudioCache)
+        .where(TTSAudioCache.cache_key == cache_key)
+        .values(hit_count=TTSAudioCache.hit_count + 1, last_used_at=datetime.now())
+    )
+
+
+def find_entry(session: Session, generation: TTSGeneration) -> Optional[TTSAudioCache]:
+    """생성 작업에 쓸 수 있는 캐시 항목 (generation.cache_key를 채움, use_cache=False면 None)"""
+    if generation.cache_key is None:
+        generation.cache_key = cache_key_for_generation(session, generation)
+
+    params = generation.generation_params or {}
+    if not settings.TTS_CACHE_ENABLED or params.get("use_cache") is False or not generation.cache_key:
+        return None
+    return lookup(session, generation.cache_key)
+
+
+def complete_from_cache(
+    session: Session, generation: TTSGeneration, entry: Optional[TTSAudioCache] = None
+) -> bool:
+    """같은 합성 결과가 캐시에 있으면 생성 작업을 즉시 완료 처리 (commit은 호출하는 쪽에서)
+
+    generation.cache_key는 적중 여부와 관계없이 채운다.
+    generation_params에 use_cache=False가 있으면 캐시를 조회하지 않는다 (강제 재생성).
+    """
+    entry = entry or find_entry(session, generation)
+    if not entry:
+        return False
+
+    try:
+        output_path = share_audio(entry.audio_file_path)
+    except OSError as e:
+        logger.warning(f"⚠️ 캐시 파일 연결 실패, 새로 생성합니다: {e}")
+        return False
+
+    now = datetime.now()
+    generation.audio_file_path = str(output_path)
+    generation.file_size = entry.file_size
+    generation.duration = entry.duration
+    generation.quality_score = entry.quality_score
+    generation.status = GenerationStatus.COMPLETED
+    generation.error_message = None
+    generation.cache_hit = True
+    generation.started_at = generation.started_at or now
+    generation.completed_at = now
+    session.add(generation)
+    _touch(session, entry.cache_key)
+    tts_stats.record_completion(session, generation)
+
+    logger.info(f"♻️ TTS 캐시 적중: {generation.id} ← {entry.cache_key[:12]} ({entry.text_preview})")
+    return True
+
+
+def store(session: Session, generation: TTSGeneration, text: str) -> Optional[TTSAudioCache]:
+    """완료된 생성 결과를 캐시에 등록하고, 같은 키를 기다리는 라이브러리 아이템에 연결 (commit은 호출하는 쪽에서)"""
+    if not settings.TTS_CACHE_ENABLED or not generation.cache_key or not generation.audio_file_path:
+        return None
+
+    source = Path(generation.audio_file_path)
+    if not source.exists():
+        return None
+
+    cached_path = cache_dir() / f"{generation.cache_key}.wav"
+    try:
+        _link_or_copy(source, cached_path)
+    except OSError as e:
+        logger.warning(f"⚠️ TTS 캐시 저장 실패: {e}")
+        return None
+
+    script = session.get(TTSScript, generation.script_id)
+    entry = session.get(TTSAudioCache, generation.cache_key) or TTSAudioCache(
+        cache_key=generation.cache_key, audio_file_path=str(cached_path)
+    )
+    entry.audio_file_path = str(cached_path)
+    entry.file_size = generation.file_size or cached_path.stat().st_size
+    entry.duration = generation.duration
+    entry.quality_score = generation.quality_score
+    entry.voice_actor_id = script.voice_actor_id if script else None
+    entry.text_preview = normalize_text(text)[:200]
+    entry.source_generation_id = generation.id
+    entry.last_used_at = datetime.now()
+    session.add(entry)
+
+    _fill_library_items(session, entry)
+    logger.info(f"💾 TTS 캐시 저장: {generation.cache_key[:12]} ({entry.file_size:,} bytes)")
+    return entry
+
+
+def link_library_audio(session: Session, library_item: TTSLibrary) -> bool:
+    """라이브러리 아이템의 캐시 키를 갱신하고, 캐시에 같은 음성이 있으면 연결 (commit은 호출하는 쪽에서)"""
+    library_item.cache_key = compute_cache_key(
+        session, library_item.text_content, library_item.voice_actor_id, DEFAULT_GENERATION_PARAMS
+    )
+    session.add(library_item)
+
+    if not settings.TTS_CACHE_ENABLED:
+        return False
+    entry = lookup(session, library_item.cache_key)
+    if not entry:
+        return False
+
+    _link_library_item(library_item, entry)
+    session.add(library_item)
+    _touch(session, entry.cache_key)
+    return True
+
+
+def _link_library_item(library_item: TTSLibrary, entry: TTSAudioCache) -> None:
+    target = _audio_files_dir() / LIBRARY_DIR_NAME / f"{library_item.id}.wav"
+    _link_or_copy(Path(entry.audio_file_path), target)
+    library_item.audio_file_path = str(target)
+    library_item.updated_at = datetime.now()
+
+
+def _fill_library_items(session: Session, entry: TTSAudioCache) -> None:
+    items = session.exec(
+        select(TTSLibrary).where(
+            TTSLibrary.cache_key == entry.cache_key,
+            TTSLibrary.audio_file_path.is_(None),
+        )
+    ).all()
+    for item in items:
+        try:
+            _link_library_item(item, entry)
+            session.add(item)
+            logger.info(f"📚 라이브러리 아이템에 캐시 음성 연결: {item.name}")
+        except OSError as e:
+            logger.warning(f"⚠️ 라이브러리 음성 연결 실패 ({item.id}): {e}")
+
+
+def evict(session: Session, max_bytes: Optional[int] = None) -> int:
+    """캐시 전체 크기가 한도를 넘으면 가장 오래 사용되지 않은 항목부터 제거
+
+    Returns:
+        제거한 항목 수
+    """
+    max_bytes = settings.TTS_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    total_bytes = session.exec(select(func.coalesce(func.sum(TTSAudioCache.file_size), 0))).one()
+    if total_bytes <= max_bytes:
+        return 0
+
+    removed = 0
+    entries = session.exec(select(TTSAudioCache).order_by(TTSAudioCache.last_used_at)).all()
+    for entry in entries:
+        if total_bytes <= max_bytes:
+            break
+        Path(entry.audio_file_path).unlink(missing_ok=True)
+        total_bytes -= entry.file_size
+        session.delete(entry)
+        removed += 1
+
+    session.commit()
+    logger.info(f"🧹 TTS 캐시 LRU 제거: {removed}개 (현재 {total_bytes:,} / {max_bytes:,} bytes)")
+    return removed
+
+
+def get_stats(session: Session) -> Dict[str, Any]:
+    entries, total_bytes = session.exec(
+        select(func.count(), func.coalesce(func.sum(TTSAudioCache.file_size), 0)).select_from(TTSAudioCache)
+    ).one()
+    hits = session.exec(
+        select(func.count()).select_from(TTSGeneration).where(TTSGeneration.cache_hit == True)  # noqa: E712
+    ).one()
+    misses = session.exec(
+        select(func.count())
+        .select_from(TTSGeneration)
+        .where(
+            TTSGeneration.cache_key.isnot(None),
+            TTSGeneration.cache_hit == False,  # noqa: E712
+            TTSGeneration.status == GenerationStatus.COMPLETED,
+            TTSGeneration.coalesced_into.is_(None),
+        )
+    ).one()
+    # 처리 중인 같은 작업에 합류해 완료된 작업 (합성하지 않았으므로 미스로 세지 않음, tts_queue.coalesce)
+    coalesced = session.exec(
+        select(func.count())
+        .select_from(TTSGeneration)
+        .where(
+            TTSGeneration.coalesced_into.isnot(None),
+            TTSGeneration.status == GenerationStatus.COMPLETED,
+        )
+    ).one()
+    top_entries = session.exec(
+        select(TTSAudioCache).order_by(TTSAudioCache.hit_count.desc()).limit(5)
+    ).all()
+
+    lookups = hits + misses
+    return {
+        "enabled": settings.TTS_CACHE_ENABLED,
+        "entries": entries,
+        "total_bytes": total_bytes,
+        "max_bytes": settings.TTS_CACHE_MAX_BYTES,
+        "hits": hits,
+        "misses": misses,
+        "coalesced": coalesced,
+        "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        "top_entries": [
+            {
+                "cache_key": entry.cache_key,
+                "text_preview": entry.text_preview,
+                "hit_count": entry.hit_count,
+                "last_used_at": entry.last_used_at.isoformat(),
+            }
+            for entry in top_entries
+        ],
+    }
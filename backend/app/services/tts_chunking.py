@@ -0,0 +1,153 @@
+"""
+한국어 문장 단위 분할 및 청크 오디오 이어붙이기
+
+긴 ARS 멘트를 한 번에 text2semantic에 넣으면 지연이 텍스트 길이에 비례하고 전체가 끝나야 재생할 수 있으므로,
+문장/절 단위로 나눠 병렬 합성한 뒤 크로스페이드로 잇는다.
+"""
+import re
+import struct
+from typing import List, Optional
+
+import numpy as np
+
+# 문장 끝: 마침표/물음표/느낌표/말줄임표 뒤 공백, 또는 줄바꿈
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?。！？…])\s+|\n+")
+# 절 경계: 쉼표/세미콜론/콜론 뒤
+_CLAUSE_BOUNDARY = re.compile(r"(?<=[,，;；:、])\s*")
+
+
+def _split_long(sentence: str, max_chars: int) -> List[str]:
+    """max_chars보다 긴 문장을 절 → 어절 순으로 나눔"""
+    if len(sentence) <= max_chars:
+        return [sentence]
+
+    pieces: List[str] = []
+    current = ""
+    for clause in filter(None, _CLAUSE_BOUNDARY.split(sentence)):
+        candidate = f"{current} {clause}".strip() if current else clause
+        if len(candidate) <= max_chars:
+            current = candidate
+            continue
+        if current:
+            pieces.append(current)
+        if len(clause) <= max_chars:
+            current = clause
+            continue
+
+        # 쉼표 없이 긴 절은 어절(공백) 단위로 자름
+        current = ""
+        for word in clause.split(" "):
+            candidate = f"{current} {word}".strip() if current else word
+            if len(candidate) <= max_chars or not current:
+                current = candidate
+            else:
+                pieces.append(current)
+                current = word
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_text(
+    text: str,
+    max_chars: int = 80,
+    first_max_chars: Optional[int] = None,
+    min_chars: int = 8,
+) -> List[str]:
+    """합성용 청크로 분할
+
+    Args:
+        max_chars: 청크 최대 글자 수
+        first_max_chars: 첫 청크 최대 글자 수 (작을수록 첫 음성이 빨리 나옴)
+        min_chars: 이보다 짧은 조각은 이웃과 합쳐 운율이 끊기지 않게 함
+    """
+    text = re.sub(r"[ \t]+", " ", (text or "").strip())
+    if not text:
+        return []
+
+    sentences = [s.strip() for s in _SENTENCE_BOUNDARY.split(text) if s and s.strip()]
+
+    chunks: List[str] = []
+    for sentence in sentences:
+        limit = first_max_chars if (first_max_chars and not chunks) else max_chars
+        pieces = _split_long(sentence, limit)
+        # 첫 청크만 짧게 자르고 나머지는 일반 길이로 다시 묶음
+        if limit != max_chars and len(pieces) > 1:
+            pieces = [pieces[0]] + _split_long(" ".join(pieces[1:]), max_chars)
+
+        for piece in pieces:
+            merge_limit = first_max_chars if (first_max_chars and len(chunks) == 1) else max_chars
+            if chunks and (len(piece) < min_chars or len(chunks[-1]) < min_chars) \
+                    and len(chunks[-1]) + len(piece) + 1 <= merge_limit:
+                chunks[-1] = f"{chunks[-1]} {piece}"
+            else:
+                chunks.append(piece)
+    return chunks
+
+
+def _fade_curves(length: int):
+    """등전력(equal-power) 크로스페이드 곡선"""
+    t = np.linspace(0.0, np.pi / 2, length, dtype=np.float32)
+    return np.cos(t), np.sin(t)
+
+
+def crossfade_concat(segments: List[np.ndarray], sample_rate: int, crossfade_ms: float = 40) -> np.ndarray:
+    """청크 오디오를 크로스페이드로 이어붙임 (모노 float32)"""
+    segments = [np.asarray(s, dtype=np.float32) for s in segments if len(s)]
+    if not segments:
+        return np.zeros(0, dtype=np.float32)
+
+    fader = StreamingCrossfader(sample_rate, crossfade_ms)
+    parts = [fader.push(segment) for segment in segments]
+    parts.append(fader.flush())
+    return np.concatenate(parts)
+
+
+class StreamingCrossfader:
+    """청크를 받는 즉시 내보내되, 다음 청크와 겹칠 마지막 구간만 보류하는 크로스페이더"""
+
+    def __init__(self, sample_rate: int, crossfade_ms: float = 40):
+        self.overlap = max(0, int(sample_rate * crossfade_ms / 1000))
+        self._tail: Optional[np.ndarray] = None
+
+    def push(self, audio: np.ndarray) -> np.ndarray:
+        audio = np.asarray(audio, dtype=np.float32)
+        if self._tail is not None and self.overlap:
+            n = min(len(self._tail), len(audio), self.overlap)
+            if n:
+                fade_out, fade_in = _fade_curves(n)
+                blended = self._tail[-n:] * fade_out + audio[:n] * fade_in
+                head = np.concatenate([self._tail[:-n], blended])
+                audio = audio[n:]
+            else:
+                head = self._tail
+        else:
+            head = self._tail if self._tail is not None else np.zeros(0, dtype=np.float32)
+
+        if self.overlap and len(audio) > self.overlap:
+            self._tail = audio[-self.overlap:]
+            return np.concatenate([head, audio[:-self.overlap]])
+
+        self._tail = audio
+        return head
+
+    def flush(self) -> np.ndarray:
+        tail = self._tail if self._tail is not None else np.zeros(0, dtype=np.float32)
+        self._tail = None
+        return tail
+
+
+def wav_stream_header(sample_rate: int, channels: int = 1, bits_per_sample: int = 16) -> bytes:
+    """길이를 모르는 스트리밍용 WAV 헤더 (RIFF/data 크기를 최대값으로 채움)"""
+    byte_rate = sample_rate * channels * bits_per_sample // 8
+    block_align = channels * bits_per_sample // 8
+    return (
+        b"RIFF" + struct.pack("<I", 0xFFFFFFFF) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, channels, sample_rate, byte_rate, block_align, bits_per_sample)
+        + b"data" + struct.pack("<I", 0xFFFFFFFF)
+    )
+
+
+def to_pcm16(audio: np.ndarray) -> bytes:
+    audio = np.clip(np.asarray(audio, dtype=np.float32), -1.0, 1.0)
+    return (audio * 32767.0).astype("<i2").tobytes()
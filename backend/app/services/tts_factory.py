@@ -5,10 +5,14 @@ TTS 서비스 팩토리
 
 import os
 import logging
+import statistics
+import time
 from typing import Union, Optional
 from enum import Enum
 
+from app.services import tts_service as tts_service_module
 from app.services.tts_service import TTSService
+from app.services.tts_timing import summarize
 
 logger = logging.getLogger(__name__)
 
@@ -59,7 +63,8 @@ class TTSServiceFactory:
         logger.info(f"TTS 서비스 생성: {target_engine}")
         
         if target_engine == TTSEngine.COQUI:
-            self._current_service = TTSService()
+            # 큐 워커(app/worker.py)와 같은 인스턴스를 써야 처리 중 작업 취소/동시 처리 제한이 공유됨
+            self._current_service = tts_service_module.get_tts_service()
             logger.info("✅ Coqui TTS 서비스 로드")
         else:
             raise ValueError(f"지원되지 않는 TTS 엔진: {target_engine}")
@@ -110,8 +115,12 @@ class TTSServiceFactory:
                 "error": str(e)
             }
     
-    async def benchmark_engines(self) -> dict:
-        """모든 TTS 엔진 성능 비교"""
+    async def benchmark_engines(self, repeats: int = 3) -> dict:
+        """모든 TTS 엔진 성능 비교 (엔진별 테스트 합성을 repeats회 반복 측정)
+
+        performance_score는 가장 빠른 엔진의 실시간 배율(생성 시간 / 음성 길이)을 100점으로 한 상대 점수다.
+        파이프라인 단계별 지연/동시 처리량은 app/services/tts_benchmark.py로 측정한다.
+        """
         logger.info("TTS 엔진 성능 비교 시작")
         
         results = {}
@@ -120,20 +129,35 @@ class TTSServiceFactory:
             logger.info(f"벤치마크 실행: {engine}")
             
             try:
-                import time
-                start_time = time.time()
-                
-                test_result = await self.test_engine(engine)
-                
-                end_time = time.time()
-                generation_time = end_time - start_time
-                
+                timings = []
+                durations = []
+                test_result = {}
+                for _ in range(max(1, repeats)):
+                    start_time = time.perf_counter()
+                    test_result = await self.test_engine(engine)
+                    if not test_result.get("success", False):
+                        break
+                    timings.append(time.perf_counter() - start_time)
+                    duration = (test_result.get("default_voice") or {}).get("duration")
+                    if duration:
+                        durations.append(duration)
+
+                if not timings:
+                    results[engine.value] = {
+                        **test_result,
+                        "generation_time": None,
+                        "real_time_factor": None,
+                    }
+                    continue
+
+                generation_time = statistics.median(timings)
+                audio_duration = statistics.median(durations) if durations else None
                 results[engine.value] = {
                     **test_result,
+                    "runs": len(timings),
                     "generation_time": generation_time,
-                    "performance_score": self._calculate_performance_score(
-                        test_result, generation_time
-                    )
+                    "latency": summarize(timings),
+                    "real_time_factor": generation_time / audio_duration if audio_duration else None,
                 }
                 
             except Exception as e:
@@ -141,8 +165,10 @@ class TTSServiceFactory:
                     "success": False,
                     "error": str(e),
                     "generation_time": None,
-                    "performance_score": 0
+                    "real_time_factor": None,
                 }
+
+        self._assign_performance_scores(results)
         
         # 최고 성능 엔진 추천
         best_engine = max(
@@ -158,30 +184,20 @@ class TTSServiceFactory:
         logger.info(f"성능 비교 완료. 추천 엔진: {best_engine}")
         return results
     
-    def _calculate_performance_score(self, test_result: dict, generation_time: float) -> float:
-        """성능 점수 계산"""
-        if not test_result.get("success", False):
-            return 0.0
-        
-        base_score = 50.0
-        
-        # 생성 시간 점수 (빠를수록 높음)
-        if generation_time:
-            if generation_time < 5:
-                time_score = 30
-            elif generation_time < 10:
-                time_score = 20
-            elif generation_time < 20:
-                time_score = 10
+    @staticmethod
+    def _assign_performance_scores(results: dict) -> None:
+        """측정된 실시간 배율로 상대 점수 계산 (가장 빠른 엔진 = 100점, 실패 = 0점)"""
+        factors = [
+            result["real_time_factor"] for result in results.values()
+            if result.get("success") and result.get("real_time_factor")
+        ]
+        best = min(factors) if factors else None
+        for result in results.values():
+            factor = result.get("real_time_factor")
+            if best and result.get("success") and factor:
+                result["performance_score"] = round(100.0 * best / factor, 1)
             else:
-                time_score = 5
-        else:
-            time_score = 0
-        
-        # 품질 점수
-        quality_score = test_result.get("quality_estimated", 85) * 0.2
-        
-        return min(100.0, base_score + time_score + quality_score)
+                result["performance_score"] = 0.0
     
     def _get_recommendation_reason(self, result: dict) -> str:
         """추천 이유 생성"""
@@ -189,16 +205,20 @@ class TTSServiceFactory:
             return "사용 불가"
         
         performance_score = result.get("performance_score", 0)
-        generation_time = result.get("generation_time", 0)
+        generation_time = result.get("generation_time") or 0
+        real_time_factor = result.get("real_time_factor")
+        detail = f"{performance_score:.1f}점, 중앙값 {generation_time:.1f}초"
+        if real_time_factor:
+            detail += f", 실시간 배율 {real_time_factor:.2f}"
         
         if performance_score > 90:
-            return f"최고 성능 ({performance_score:.1f}점, {generation_time:.1f}초)"
+            return f"최고 성능 ({detail})"
         elif performance_score > 80:
-            return f"우수한 성능 ({performance_score:.1f}점, {generation_time:.1f}초)"
+            return f"우수한 성능 ({detail})"
         elif performance_score > 70:
-            return f"양호한 성능 ({performance_score:.1f}점, {generation_time:.1f}초)"
+            return f"양호한 성능 ({detail})"
         else:
-            return f"기본 성능 ({performance_score:.1f}점, {generation_time:.1f}초)"
+            return f"기본 성능 ({detail})"
 
 # 글로벌 TTS 서비스 팩토리 인스턴스
 tts_factory = TTSServiceFactory()
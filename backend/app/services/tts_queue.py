@@ -0,0 +1,853 @@
+"""
+DB 기반 TTS 작업 큐
+
+별도 브로커 없이 TTSGeneration 행 자체를 큐로 사용한다.
+- 대기: status=PENDING 이고 next_attempt_at이 없거나 지난 행
+- 획득: Postgres에서는 SELECT ... FOR UPDATE SKIP LOCKED로 후보를 잠그고,
+  조건부 UPDATE(status=PENDING일 때만)로 한 번 더 확인한다.
+  SQLite처럼 FOR UPDATE를 지원하지 않는 DB에서는 조건부 UPDATE만으로 중복 획득을 막는다.
+- 임대(lease): 처리 중인 워커는 주기적으로 lease_expires_at을 연장하고,
+  워커가 죽어 임대가 만료되면 recover_expired_leases()가 작업을 다시 대기 상태로 돌린다.
+- 재시도: 실패 시 attempts < max_attempts이면 지수 백오프 후 다시 대기, 아니면 FAILED
+- 배치 획득: 배치 생성(batch_mode) 작업은 같은 성우 + 같은 합성 파라미터끼리 묶어 한 번에 획득한다 (claim_batch)
+- 성우 친화: 워커가 여러 개면 해시 링에서 자기 담당인 성우의 작업을 먼저 획득한다 (tts_scheduler)
+- 우선순위/공정성: 요청자+우선순위 클래스(interactive/batch/background)를 하나의 흐름으로 보고 가중 공정 큐잉(WFQ)
+  태그를 등록 시 매긴다. 흐름의 다음 작업은 max(현재 가상 시각, 흐름의 마지막 종료 태그)에서 시작해
+  비용/가중치만큼 뒤에 끝나며, 워커는 종료 태그(virtual_finish)가 작은 작업부터 가져간다.
+  한 사용자의 20개 일괄 생성이 대기 중이어도 다른 사용자/대화형 요청은 그 뒤에 줄 서지 않는다.
+- 중복 합류(single-flight): 같은 합성 결과(cache_key)를 만드는 작업이 이미 대기/처리 중이면 새 작업은
+  coalesced_into로 그 대표 작업에 합류해 획득 대상에서 빠지고, 대표 작업이 완료될 때 같은 음성으로 함께 완료된다.
+  대표 작업이 취소/최종 실패/삭제되면 가장 앞선 합류 작업이 대표를 넘겨받는다.
+"""
+import logging
+import math
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import func, or_, update
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.models.tts import (
+    GenerationStatus,
+    TTSGeneration,
+    TTSGenerationPublic,
+    TTSPriority,
+    TTSScript,
+)
+from app.services import tts_cache, tts_scheduler, tts_stats
+from app.services.tts_scheduler import HashRing, voice_key
+
+logger = logging.getLogger(__name__)
+
+
+class PermanentJobError(Exception):
+    """재시도해도 결과가 같은 오류 (스크립트 없음 등) - 즉시 FAILED 처리"""
+
+
+def retry_delay(attempts: int) -> float:
+    """attempts번째 시도 실패 후 다음 시도까지 대기 시간 (초, 지터 포함)"""
+    base = settings.TTS_QUEUE_RETRY_BACKOFF_SECONDS * (2 ** max(0, attempts - 1))
+    delay = min(base, settings.TTS_QUEUE_RETRY_BACKOFF_MAX)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def priority_weight(priority: TTSPriority) -> float:
+    weights = {
+        TTSPriority.INTERACTIVE: settings.TTS_QUEUE_WEIGHT_INTERACTIVE,
+        TTSPriority.BATCH: settings.TTS_QUEUE_WEIGHT_BATCH,
+        TTSPriority.BACKGROUND: settings.TTS_QUEUE_WEIGHT_BACKGROUND,
+    }
+    return max(weights.get(priority, settings.TTS_QUEUE_WEIGHT_BATCH), 0.001)
+
+
+def _job_cost(text: str) -> float:
+    """작업 비용 = 합성할 청크 수 (긴 멘트일수록 흐름의 다음 차례가 늦어짐)"""
+    return float(max(1, math.ceil(len(text or "") / max(settings.TTS_CHUNK_MAX_CHARS, 1))))
+
+
+def assign_fair_tags(session: Session, generation: TTSGeneration) -> None:
+    """가중 공정 큐잉 태그 계산 (commit은 호출하는 쪽에서)
+
+    현재 가상 시각은 대기 중인 작업의 가장 작은 시작 태그이며, 대기 작업이 없으면 처리 중인 작업의 가장 큰 시작 태그다.
+    """
+    now = datetime.now()
+    others = TTSGeneration.id != generation.id
+    virtual_now = session.exec(
+        select(func.min(TTSGeneration.virtual_start)).where(*_ready(now), others)
+    ).one()
+    if virtual_now is None:
+        virtual_now = session.exec(
+            select(func.max(TTSGeneration.virtual_start)).where(
+                TTSGeneration.status == GenerationStatus.PROCESSING
+            )
+        ).one()
+
+    # 같은 흐름(요청자 + 우선순위)에서 아직 끝나지 않은 작업의 마지막 종료 태그
+    flow_finish = session.exec(
+        select(func.max(TTSGeneration.virtual_finish)).where(
+            TTSGeneration.requested_by == generation.requested_by,
+            TTSGeneration.priority == generation.priority,
+            TTSGeneration.status.in_([GenerationStatus.PENDING, GenerationStatus.PROCESSING]),
+            TTSGeneration.coalesced_into.is_(None),
+            others,
+        )
+    ).one()
+
+    script = session.get(TTSScript, generation.script_id)
+    cost = _job_cost(script.text_content if script else "")
+    generation.virtual_start = max(virtual_now or 0.0, flow_finish or 0.0)
+    generation.virtual_finish = generation.virtual_start + cost / priority_weight(generation.priority)
+
+
+def enqueue_generation(session: Session, generation: TTSGeneration) -> TTSGeneration:
+    """생성 작업을 큐에 등록 (PENDING 상태로 저장하면 워커가 가져감)
+
+    같은 합성 결과가 캐시에 있으면 큐를 거치지 않고 즉시 완료 처리하고,
+    같은 합성 결과를 만드는 작업이 대기/처리 중이면 그 작업에 합류한다 (coalesce).
+    큐 순서는 generation.priority 클래스의 가중치와 요청자별 공정성으로 정해진다.
+    """
+    generation.max_attempts = settings.TTS_QUEUE_MAX_ATTEMPTS
+    if tts_cache.complete_from_cache(session, generation):
+        sync_scenario_tts(session, generation)
+        session.commit()
+        session.refresh(generation)
+        return generation
+
+    generation.status = GenerationStatus.PENDING
+    generation.next_attempt_at = None
+    generation.claimed_by = None
+    generation.lease_expires_at = None
+    generation.coalesced_into = None
+    assign_fair_tags(session, generation)
+    coalesce(session, generation)
+    session.add(generation)
+    session.commit()
+    session.refresh(generation)
+    if generation.coalesced_into:
+        logger.info(f"🔗 TTS 작업 합류: {generation.id} → {generation.coalesced_into} ({generation.priority.value})")
+    else:
+        logger.info(f"📥 TTS 작업 큐 등록: {generation.id} ({generation.priority.value})")
+    return generation
+
+
+def coalesce(session: Session, generation: TTSGeneration) -> Optional[TTSGeneration]:
+    """같은 합성 결과(cache_key)를 만드는 대기/처리 중인 대표 작업에 합류 (commit은 호출하는 쪽에서)
+
+    합류한 작업이 대표 작업보다 앞 순서(더 높은 우선순위 등)면 아직 대기 중인 대표 작업을 그 순서로 당긴다.
+    동시에 등록된 요청끼리는 서로를 보지 못해 각자 합성할 수 있다 (정확성에는 영향 없음).
+
+    Returns:
+        합류한 대표 작업 (없으면 None)
+    """
+    if not settings.TTS_COALESCE_ENABLED or not generation.cache_key:
+        return None
+
+    leader = session.exec(
+        select(TTSGeneration)
+        .where(
+            TTSGeneration.cache_key == generation.cache_key,
+            TTSGeneration.status.in_([GenerationStatus.PENDING, GenerationStatus.PROCESSING]),
+            TTSGeneration.coalesced_into.is_(None),
+            TTSGeneration.id != generation.id,
+        )
+        .order_by(TTSGeneration.created_at)
+        .limit(1)
+    ).first()
+    if not leader:
+        return None
+
+    generation.coalesced_into = leader.id
+    if leader.status == GenerationStatus.PENDING and generation.virtual_finish < leader.virtual_finish:
+        leader.priority = generation.priority
+        leader.virtual_start = generation.virtual_start
+        leader.virtual_finish = generation.virtual_finish
+        session.add(leader)
+    return leader
+
+
+def followers_of(session: Session, leader_id: uuid.UUID) -> List[TTSGeneration]:
+    """대표 작업에 합류해 결과를 기다리는 작업 (큐 순서)"""
+    return list(
+        session.exec(
+            select(TTSGeneration)
+            .where(
+                TTSGeneration.coalesced_into == leader_id,
+                TTSGeneration.status == GenerationStatus.PENDING,
+            )
+            .order_by(*_queue_order())
+        ).all()
+    )
+
+
+def complete_coalesced(session: Session, leader: TTSGeneration) -> int:
+    """완료된 대표 작업의 음성으로 합류한 작업과 연결된 ScenarioTTS를 함께 완료 (commit은 호출하는 쪽에서)
+
+    합류한 작업마다 음성 파일을 하드링크해 따로 두므로 한 작업을 삭제해도 다른 작업의 파일은 남는다.
+
+    Returns:
+        함께 완료한 작업 수
+    """
+    if not leader.audio_file_path:
+        return 0
+
+    completed = 0
+    now = datetime.now()
+    for follower in followers_of(session, leader.id):
+        # 음성 파일을 먼저 연결하고, 연결된 경우에만 작업을 완료로 전환
+        try:
+            output_path = tts_cache.share_audio(leader.audio_file_path)
+        except OSError as e:
+            # 대표 작업 결과를 공유하지 못하면 직접 합성하도록 합류를 풀고 대기 상태로 둠
+            logger.warning(f"⚠️ 합류 작업에 음성 연결 실패, 따로 합성합니다: {follower.id}: {e}")
+            follower.coalesced_into = None
+            session.add(follower)
+            continue
+
+        # 그 사이 취소된 작업은 건너뜀 (compare-and-set)
+        result = session.execute(
+            update(TTSGeneration)
+            .where(
+                TTSGeneration.id == follower.id,
+                TTSGeneration.status == GenerationStatus.PENDING,
+                TTSGeneration.coalesced_into == leader.id,
+            )
+            .values(status=GenerationStatus.COMPLETED)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            output_path.unlink(missing_ok=True)
+            continue
+
+        follower.audio_file_path = str(output_path)
+        follower.file_size = leader.file_size
+        follower.duration = leader.duration
+        follower.quality_score = leader.quality_score
+        follower.status = GenerationStatus.COMPLETED
+        follower.error_message = None
+        follower.started_at = follower.started_at or leader.started_at
+        follower.completed_at = now
+        session.add(follower)
+        tts_stats.record_completion(session, follower)
+        sync_scenario_tts(session, follower)
+        completed += 1
+
+    if completed:
+        logger.info(f"🔗 합류한 TTS 작업 {completed}개 함께 완료: {leader.id}")
+    return completed
+
+
+def hand_off_followers(session: Session, leader_id: uuid.UUID) -> Optional[uuid.UUID]:
+    """대표 작업이 결과 없이 끝났을 때 가장 앞선 합류 작업을 새 대표로 지정 (commit은 호출하는 쪽에서)
+
+    Returns:
+        새 대표 작업 ID (합류한 작업이 없으면 None)
+    """
+    followers = followers_of(session, leader_id)
+    if not followers:
+        return None
+
+    new_leader, rest = followers[0], followers[1:]
+    new_leader.coalesced_into = None
+    session.add(new_leader)
+    for follower in rest:
+        follower.coalesced_into = new_leader.id
+        session.add(follower)
+    logger.info(f"🔗 TTS 대표 작업 교체: {leader_id} → {new_leader.id} (합류 {len(rest)}개)")
+    return new_leader.id
+
+
+def release_orphaned_followers(session: Session) -> int:
+    """대표 작업이 사라졌거나(삭제) 더 이상 대기/처리 중이 아닌 합류 작업을 다시 큐에 올림 (commit은 호출하는 쪽에서)
+
+    대표 작업 완료 직후에 합류한 작업처럼 complete_coalesced/hand_off_followers가 놓친 경우를 정리한다.
+    """
+    leader = aliased(TTSGeneration)
+    leader_ids = session.exec(
+        select(TTSGeneration.coalesced_into)
+        .where(
+            TTSGeneration.status == GenerationStatus.PENDING,
+            TTSGeneration.coalesced_into.is_not(None),
+            ~select(leader.id)
+            .where(
+                leader.id == TTSGeneration.coalesced_into,
+                leader.status.in_([GenerationStatus.PENDING, GenerationStatus.PROCESSING]),
+            )
+            .exists(),
+        )
+        .distinct()
+    ).all()
+    for leader_id in leader_ids:
+        hand_off_followers(session, leader_id)
+    return len(leader_ids)
+
+
+def _ready(now: datetime):
+    """지금 획득할 수 있는 대기 작업 조건"""
+    return (
+        TTSGeneration.status == GenerationStatus.PENDING,
+        TTSGeneration.coalesced_into.is_(None),
+        or_(
+            TTSGeneration.next_attempt_at.is_(None),
+            TTSGeneration.next_attempt_at <= now,
+        ),
+    )
+
+
+def _claim_values(worker_id: str, now: datetime) -> dict:
+    return {
+        "status": GenerationStatus.PROCESSING,
+        "claimed_by": worker_id,
+        "lease_expires_at": now + timedelta(seconds=settings.TTS_QUEUE_LEASE_SECONDS),
+        "attempts": TTSGeneration.attempts + 1,
+        "started_at": now,
+        "next_attempt_at": None,
+    }
+
+
+def _queue_order():
+    return (TTSGeneration.virtual_finish, TTSGeneration.created_at)
+
+
+def _affinity_candidate(
+    session: Session, worker_id: str, ring: HashRing, idle: bool, now: datetime, filters: tuple
+) -> Optional[uuid.UUID]:
+    """해시 링에서 이 워커가 담당하는 성우의 다음 차례 작업, 없으면 훔쳐올 작업
+
+    후보는 잠그지 않는다: 여러 워커가 같은 후보 창을 보고 각자 담당 작업을 고를 수 있어야 하며,
+    중복 획득은 claim_next의 조건부 UPDATE가 막는다.
+    대화형(interactive) 작업은 지연이 warm 상태보다 중요하므로 담당 워커를 기다리지 않는다.
+    """
+    candidates = session.exec(
+        select(
+            TTSGeneration.id,
+            TTSGeneration.created_at,
+            TTSGeneration.priority,
+            TTSScript.voice_actor_id,
+        )
+        .join(TTSScript, TTSGeneration.script_id == TTSScript.id)
+        .where(*_ready(now), *filters)
+        .order_by(*_queue_order())
+        .limit(settings.TTS_AFFINITY_SCAN_LIMIT)
+    ).all()
+    if not candidates:
+        return None
+
+    for generation_id, _, priority, voice_actor_id in candidates:
+        if priority == TTSPriority.INTERACTIVE or ring.owner(voice_key(voice_actor_id)) == worker_id:
+            return generation_id
+
+    # 담당 성우 작업이 없음: 유휴 워커는 다음 차례 작업을 가져오고 (work stealing),
+    # 일부 처리 중인 워커는 담당 워커가 오래 처리하지 못한 작업만 가져온다
+    generation_id, created_at, _, _ = candidates[0]
+    if idle or created_at <= now - timedelta(seconds=settings.TTS_AFFINITY_STEAL_AFTER_SECONDS):
+        return generation_id
+    return None
+
+
+def claim_next(
+    session: Session,
+    worker_id: str,
+    ring: Optional[HashRing] = None,
+    idle: bool = True,
+    interactive_only: bool = False,
+) -> Optional[uuid.UUID]:
+    """다음 차례(가중 공정 큐잉 종료 태그가 가장 작은) 작업 하나를 획득하고 PROCESSING으로 변경
+
+    ring에 워커가 둘 이상이면 이 워커가 담당하는 성우의 작업을 우선한다.
+    idle은 이 워커가 처리 중인 작업이 없는지 여부 (다른 워커 담당 작업을 바로 가져올지 결정).
+    interactive_only면 대화형 작업만 가져온다 (대화형 전용 슬롯).
+
+    Returns:
+        획득한 생성 작업 ID (없으면 None)
+    """
+    now = datetime.now()
+    filters = (TTSGeneration.priority == TTSPriority.INTERACTIVE,) if interactive_only else ()
+    if ring is not None and len(ring) > 1:
+        candidate_id = _affinity_candidate(session, worker_id, ring, idle, now, filters)
+    else:
+        candidate_id = session.exec(
+            select(TTSGeneration.id)
+            .where(*_ready(now), *filters)
+            .order_by(*_queue_order())
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        ).first()
+
+    if candidate_id is None:
+        session.rollback()
+        return None
+
+    result = session.execute(
+        update(TTSGeneration)
+        .where(
+            TTSGeneration.id == candidate_id,
+            TTSGeneration.status == GenerationStatus.PENDING,
+        )
+        .values(**_claim_values(worker_id, now))
+    )
+    session.commit()
+
+    if result.rowcount != 1:
+        # 다른 워커가 먼저 가져감
+        return None
+
+    logger.info(f"📤 TTS 작업 획득: {candidate_id} (worker={worker_id})")
+    return candidate_id
+
+
+def claim_batch(
+    session: Session,
+    worker_id: str,
+    limit: int,
+    ring: Optional[HashRing] = None,
+    idle: bool = True,
+    interactive_only: bool = False,
+) -> List[uuid.UUID]:
+    """다음 차례 작업을 획득하고, 그 작업과 한 번에 합성할 수 있는 대기 작업을 limit개까지 함께 획득
+
+    선두 작업이 배치 생성(batch_mode)일 때만 묶으며, 같은 성우(참조 음성), 같은 우선순위, 같은 합성 파라미터의
+    batch_mode 작업만 포함한다. 대화형 요청은 항상 혼자 처리된다.
+
+    선두 작업은 claim_next와 같이 우선순위/성우 친화(ring, idle, interactive_only)를 따른다.
+
+    Returns:
+        획득한 생성 작업 ID 목록 (선두 작업이 처음, 없으면 빈 목록)
+    """
+    lead_id = claim_next(session, worker_id, ring, idle, interactive_only)
+    if lead_id is None:
+        return []
+    if limit <= 1:
+        return [lead_id]
+
+    lead = session.get(TTSGeneration, lead_id)
+    script = session.get(TTSScript, lead.script_id) if lead else None
+    if not script or not (lead.generation_params or {}).get("batch_mode"):
+        return [lead_id]
+
+    now = datetime.now()
+    same_voice = (
+        TTSScript.voice_actor_id == script.voice_actor_id
+        if script.voice_actor_id
+        else TTSScript.voice_actor_id.is_(None)
+    )
+    # 파라미터(JSON) 비교는 DB마다 달라 후보를 넉넉히 가져와 Python에서 거름
+    candidates = session.exec(
+        select(TTSGeneration.id, TTSGeneration.generation_params)
+        .join(TTSScript, TTSGeneration.script_id == TTSScript.id)
+        .where(*_ready(now), same_voice, TTSGeneration.priority == lead.priority)
+        .order_by(*_queue_order())
+        .limit(limit * 4)
+        .with_for_update(skip_locked=True, of=TTSGeneration)
+    ).all()
+
+    wanted = tts_cache.synthesis_params(lead.generation_params)
+    peer_ids = [
+        generation_id
+        for generation_id, params in candidates
+        if (params or {}).get("batch_mode") and tts_cache.synthesis_params(params) == wanted
+    ][: limit - 1]
+    if not peer_ids:
+        session.rollback()
+        return [lead_id]
+
+    session.execute(
+        update(TTSGeneration)
+        .where(
+            TTSGeneration.id.in_(peer_ids),
+            TTSGeneration.status == GenerationStatus.PENDING,
+        )
+        .values(**_claim_values(worker_id, now))
+    )
+    session.commit()
+
+    # 다른 워커가 먼저 가져간 작업은 제외
+    claimed = set(
+        session.exec(
+            select(TTSGeneration.id).where(
+                TTSGeneration.id.in_(peer_ids),
+                TTSGeneration.claimed_by == worker_id,
+                TTSGeneration.started_at == now,
+            )
+        ).all()
+    )
+    batch = [lead_id] + [generation_id for generation_id in peer_ids if generation_id in claimed]
+    if len(batch) > 1:
+        logger.info(f"📦 TTS 배치 획득: {len(batch)}개 (성우 {script.voice_actor_id or '기본'}, worker={worker_id})")
+    return batch
+
+
+def extend_lease(session: Session, generation_id: uuid.UUID, worker_id: str) -> bool:
+    """처리 중인 작업의 임대 연장 (하트비트)
+
+    Returns:
+        False면 임대를 잃은 것 (취소되었거나 만료되어 다른 워커가 회수함)
+    """
+    result = session.execute(
+        update(TTSGeneration)
+        .where(
+            TTSGeneration.id == generation_id,
+            TTSGeneration.status == GenerationStatus.PROCESSING,
+            TTSGeneration.claimed_by == worker_id,
+        )
+        .values(
+            lease_expires_at=datetime.now()
+            + timedelta(seconds=settings.TTS_QUEUE_LEASE_SECONDS)
+        )
+    )
+    session.commit()
+    return result.rowcount == 1
+
+
+def cancel_generation(session: Session, generation_id: uuid.UUID) -> bool:
+    """대기/처리 중인 작업을 취소 상태로 변경 (compare-and-set)
+
+    이미 완료/실패한 작업은 바꾸지 않는다. 처리 중인 워커는 취소를 감지해 작업을 중단하고(cancelled_among),
+    완료 시에도 mark_completed가 실패해 결과를 버린다.
+
+    Returns:
+        취소했으면 True
+    """
+    result = session.execute(
+        update(TTSGeneration)
+        .where(
+            TTSGeneration.id == generation_id,
+            TTSGeneration.status.in_([GenerationStatus.PENDING, GenerationStatus.PROCESSING]),
+        )
+        .values(
+            status=GenerationStatus.CANCELLED,
+            completed_at=datetime.now(),
+            claimed_by=None,
+            lease_expires_at=None,
+            next_attempt_at=None,
+        )
+    )
+    if result.rowcount == 1:
+        hand_off_followers(session, generation_id)
+    session.commit()
+    return result.rowcount == 1
+
+
+def mark_completed(session: Session, generation_id: uuid.UUID, worker_id: Optional[str]) -> bool:
+    """처리 중인 작업을 완료로 전환 (compare-and-set, commit은 호출하는 쪽에서)
+
+    취소되었거나 다른 워커가 회수한 작업은 바꾸지 않는다. Postgres에서는 이 UPDATE가 행을 잠가
+    같은 트랜잭션이 commit될 때까지 들어온 취소 요청은 완료된 상태를 보고 아무것도 바꾸지 않는다.
+
+    Returns:
+        완료로 전환했으면 True (False면 결과를 버려야 함)
+    """
+    conditions = [TTSGeneration.id == generation_id]
+    if worker_id:
+        conditions += [
+            TTSGeneration.status == GenerationStatus.PROCESSING,
+            TTSGeneration.claimed_by == worker_id,
+        ]
+    else:
+        conditions.append(
+            TTSGeneration.status.in_([GenerationStatus.PENDING, GenerationStatus.PROCESSING])
+        )
+    result = session.execute(
+        update(TTSGeneration)
+        .where(*conditions)
+        .values(status=GenerationStatus.COMPLETED)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def complete_claimed_from_cache(
+    session: Session,
+    generation: TTSGeneration,
+    worker_id: Optional[str],
+    stage_timings: Optional[Dict[str, float]] = None,
+) -> bool:
+    """획득한 작업을 캐시된 음성으로 완료 (mark_completed와 같은 compare-and-set, commit 포함)
+
+    대기 중에 같은 내용의 다른 작업이 먼저 완료된 경우에 사용한다. 그 사이 취소/회수된 작업은 바꾸지 않는다.
+
+    Returns:
+        캐시로 완료했거나 취소/회수되어 더 처리할 필요가 없으면 True, 캐시가 없으면 False
+    """
+    entry = tts_cache.find_entry(session, generation)
+    if entry is None:
+        return False
+
+    if not mark_completed(session, generation.id, worker_id):
+        session.commit()
+        logger.info(f"⏹️ 취소/회수된 작업은 캐시로 완료하지 않음: {generation.id}")
+        return True
+
+    if not tts_cache.complete_from_cache(session, generation, entry):
+        # 캐시 파일 연결 실패: 처리 중 상태로 되돌리고 새로 합성
+        session.execute(
+            update(TTSGeneration)
+            .where(TTSGeneration.id == generation.id)
+            .values(status=GenerationStatus.PROCESSING)
+            .execution_options(synchronize_session=False)
+        )
+        return False
+
+    release_claim(generation)
+    sync_scenario_tts(session, generation)
+    complete_coalesced(session, generation)
+    generation.stage_timings = stage_timings
+    session.add(generation)
+    session.commit()
+    return True
+
+
+def cancelled_among(session: Session, generation_ids: List[uuid.UUID]) -> List[uuid.UUID]:
+    """처리 중인 작업 중 취소된 작업 ID"""
+    if not generation_ids:
+        return []
+    cancelled = session.exec(
+        select(TTSGeneration.id).where(
+            TTSGeneration.id.in_(generation_ids),
+            TTSGeneration.status == GenerationStatus.CANCELLED,
+        )
+    ).all()
+    return list(cancelled)
+
+
+def sync_scenario_tts(session: Session, generation: TTSGeneration) -> None:
+    """완료된 생성 결과를 연결된 ScenarioTTS에 반영 (commit은 호출하는 쪽에서)"""
+    # 순환 import 방지를 위해 동적 import 사용
+    from app.models.scenario_tts import ScenarioTTS
+
+    scenario_tts_list = session.exec(
+        select(ScenarioTTS).where(ScenarioTTS.tts_generation_id == generation.id)
+    ).all()
+    for scenario_tts in scenario_tts_list:
+        scenario_tts.audio_file_path = generation.audio_file_path
+        scenario_tts.updated_at = datetime.now()
+        session.add(scenario_tts)
+        logger.info(f"ScenarioTTS {scenario_tts.id} updated with audio file")
+
+
+def release_claim(generation: TTSGeneration) -> None:
+    """작업 종료 시 워커 점유 정보 제거 (commit은 호출하는 쪽에서)"""
+    generation.claimed_by = None
+    generation.lease_expires_at = None
+    generation.next_attempt_at = None
+
+
+def fail_or_retry(
+    session: Session, generation_id: uuid.UUID, worker_id: str, error: Exception
+) -> Optional[GenerationStatus]:
+    """처리 실패 기록: 시도 횟수가 남았으면 백오프 후 재시도, 아니면 FAILED
+
+    Returns:
+        변경된 상태 (임대를 이미 잃었거나 취소된 작업이면 None)
+    """
+    generation = session.get(TTSGeneration, generation_id)
+    if (
+        not generation
+        or generation.status != GenerationStatus.PROCESSING
+        or generation.claimed_by != worker_id
+    ):
+        return None
+
+    release_claim(generation)
+    generation.error_message = str(error)
+
+    if not isinstance(error, PermanentJobError) and generation.attempts < generation.max_attempts:
+        delay = retry_delay(generation.attempts)
+        generation.status = GenerationStatus.PENDING
+        generation.next_attempt_at = datetime.now() + timedelta(seconds=delay)
+        logger.warning(
+            f"🔁 TTS 작업 재시도 예정: {generation_id} "
+            f"({generation.attempts}/{generation.max_attempts}회, {delay:.0f}초 후): {error}"
+        )
+    else:
+        generation.status = GenerationStatus.FAILED
+        generation.completed_at = datetime.now()
+        tts_stats.record_failure(session, generation)
+        hand_off_followers(session, generation_id)
+        logger.error(
+            f"❌ TTS 작업 최종 실패: {generation_id} "
+            f"({generation.attempts}/{generation.max_attempts}회): {error}"
+        )
+
+    session.add(generation)
+    session.commit()
+    return generation.status
+
+
+def recover_expired_leases(session: Session) -> List[uuid.UUID]:
+    """임대가 만료된 PROCESSING 작업(워커 크래시/재시작)을 대기 상태로 되돌림 (대표를 잃은 합류 작업도 정리)
+
+    큐 도입 전 API 프로세스 안에서 처리되다 멈춘 작업(lease_expires_at 없음)도
+    started_at 기준으로 같은 시간이 지나면 회수한다.
+    """
+    now = datetime.now()
+    stale_before = now - timedelta(seconds=settings.TTS_QUEUE_LEASE_SECONDS)
+    expired = session.exec(
+        select(TTSGeneration)
+        .where(
+            TTSGeneration.status == GenerationStatus.PROCESSING,
+            or_(
+                TTSGeneration.lease_expires_at < now,
+                (TTSGeneration.lease_expires_at.is_(None))
+                & (or_(TTSGeneration.started_at.is_(None), TTSGeneration.started_at < stale_before)),
+            ),
+        )
+        .with_for_update(skip_locked=True)
+    ).all()
+
+    recovered = []
+    for generation in expired:
+        previous_worker = generation.claimed_by
+        release_claim(generation)
+        if generation.attempts < generation.max_attempts:
+            generation.status = GenerationStatus.PENDING
+            generation.next_attempt_at = now
+            generation.error_message = f"작업자 응답 없음 ({previous_worker or '알 수 없음'}), 재시도 대기"
+        else:
+            generation.status = GenerationStatus.FAILED
+            generation.completed_at = now
+            tts_stats.record_failure(session, generation)
+            hand_off_followers(session, generation.id)
+            generation.error_message = f"작업자 응답 없음 ({previous_worker or '알 수 없음'}), 재시도 횟수 초과"
+        session.add(generation)
+        recovered.append(generation.id)
+
+    release_orphaned_followers(session)
+    session.commit()
+
+    if recovered:
+        logger.warning(f"♻️ 임대 만료 작업 {len(recovered)}개 회수: {[str(i) for i in recovered]}")
+    return recovered
+
+
+DEFAULT_JOB_SECONDS = 10.0  # 완료 이력이 없을 때 작업 하나의 예상 처리 시간
+
+
+def _average_job_seconds(session: Session, samples: int = 50) -> float:
+    """최근 완료 작업의 평균 처리 시간 (캐시 적중 제외)"""
+    rows = session.exec(
+        select(TTSGeneration.started_at, TTSGeneration.completed_at)
+        .where(
+            TTSGeneration.status == GenerationStatus.COMPLETED,
+            TTSGeneration.cache_hit == False,  # noqa: E712
+            TTSGeneration.coalesced_into.is_(None),
+            TTSGeneration.started_at.is_not(None),
+            TTSGeneration.completed_at.is_not(None),
+        )
+        .order_by(TTSGeneration.completed_at.desc())
+        .limit(samples)
+    ).all()
+    durations = [
+        (completed_at - started_at).total_seconds()
+        for started_at, completed_at in rows
+        if completed_at >= started_at
+    ]
+    return sum(durations) / len(durations) if durations else DEFAULT_JOB_SECONDS
+
+
+def _queue_positions(session: Session, generation_ids: Set[uuid.UUID]) -> Dict[uuid.UUID, int]:
+    """대기 작업의 큐 순번 (1이면 다음 차례, 획득 순서와 같은 정렬로 한 번에 계산)"""
+    if not generation_ids:
+        return {}
+    ranked = (
+        select(
+            TTSGeneration.id.label("id"),
+            func.row_number().over(order_by=_queue_order()).label("position"),
+        )
+        .where(
+            TTSGeneration.status == GenerationStatus.PENDING,
+            TTSGeneration.coalesced_into.is_(None),
+        )
+        .subquery()
+    )
+    rows = session.exec(
+        select(ranked.c.id, ranked.c.position).where(ranked.c.id.in_(generation_ids))
+    ).all()
+    return {generation_id: position for generation_id, position in rows}
+
+
+def queue_estimates(
+    session: Session, generations: List[TTSGeneration]
+) -> Dict[uuid.UUID, Dict[str, Any]]:
+    """대기/처리 중인 작업의 큐 순번과 예상 완료까지 남은 시간 (초)
+
+    순번은 지금 큐 순서(virtual_finish) 기준이며, 이후 들어오는 대화형 요청이 앞에 설 수 있어 추정치다.
+    대표 작업에 합류한 작업은 대표 작업의 순번/시간을 따른다.
+    """
+    active = [
+        generation
+        for generation in generations
+        if generation.status in (GenerationStatus.PENDING, GenerationStatus.PROCESSING)
+    ]
+    if not active:
+        return {}
+
+    now = datetime.now()
+    job_seconds = _average_job_seconds(session)
+    capacity = tts_scheduler.live_capacity(session) or settings.TTS_MAX_CONCURRENT_JOBS
+    processing = session.exec(
+        select(func.count()).select_from(TTSGeneration).where(
+            TTSGeneration.status == GenerationStatus.PROCESSING
+        )
+    ).one()
+
+    leader_ids = {
+        generation.coalesced_into
+        for generation in active
+        if generation.status == GenerationStatus.PENDING and generation.coalesced_into
+    }
+    leaders = {
+        leader.id: leader
+        for leader in (
+            session.exec(select(TTSGeneration).where(TTSGeneration.id.in_(leader_ids))).all()
+            if leader_ids
+            else []
+        )
+    }
+    targets = {
+        generation.id: (
+            leaders.get(generation.coalesced_into, generation)
+            if generation.status == GenerationStatus.PENDING and generation.coalesced_into
+            else generation
+        )
+        for generation in active
+    }
+    positions = _queue_positions(
+        session,
+        {target.id for target in targets.values() if target.status == GenerationStatus.PENDING},
+    )
+
+    estimates = {}
+    for generation in active:
+        target = targets[generation.id]
+        if target.status == GenerationStatus.PROCESSING:
+            elapsed = (now - target.started_at).total_seconds() if target.started_at else 0.0
+            estimates[generation.id] = {
+                "queue_position": 0,
+                "eta_seconds": round(max(job_seconds - elapsed, 0.0), 1),
+            }
+            continue
+
+        position = positions.get(target.id)
+        if position is None:
+            # 대표 작업이 막 끝나 아직 정리되지 않은 합류 작업 등
+            continue
+        # 앞선 작업 + 처리 중인 작업을 워커 슬롯 수만큼씩 처리한 뒤 이 작업을 처리
+        rounds = (position - 1 + processing) // max(capacity, 1) + 1
+        eta = rounds * job_seconds
+        if target.next_attempt_at and target.next_attempt_at > now:
+            eta += (target.next_attempt_at - now).total_seconds()
+        estimates[generation.id] = {"queue_position": position, "eta_seconds": round(eta, 1)}
+    return estimates
+
+
+def to_public(session: Session, generations: List[TTSGeneration]) -> List[TTSGenerationPublic]:
+    """응답용 변환 (대기/처리 중인 작업은 큐 순번과 예상 시간 포함)"""
+    estimates = queue_estimates(session, generations)
+    return [
+        TTSGenerationPublic.model_validate(generation, update=estimates.get(generation.id, {}))
+        for generation in generations
+    ]
@@ -0,0 +1,199 @@
+"""
+성우 친화(voice affinity) TTS 작업 스케줄링
+
+워커가 여러 개일 때 같은 성우의 작업이 같은 워커로 가도록 한다. 워커(와 그 워커가 사용하는 추론 워커)는
+최근에 쓴 성우의 참조 토큰을 메모리에 들고 있으므로, 성우가 섞이면 작업마다 참조 상태를 다시 올려야 한다.
+
+- 해시 링: 살아 있는 워커(TTSWorker.last_heartbeat 기준)로 일관 해시 링을 만들고 voice_actor_id로 담당 워커를 정한다.
+  워커가 추가/제거되어도 대부분의 성우는 담당 워커가 바뀌지 않는다.
+- 작업 훔치기: 담당 성우의 대기 작업이 없는 워커는 유휴 상태면 가장 오래된 작업을,
+  일부 처리 중이면 TTS_AFFINITY_STEAL_AFTER_SECONDS 이상 기다린 작업을 가져온다 (tts_queue.claim_next).
+- warm 적중률: 워커별로 최근 처리한 성우 LRU(WarmContext)를 두고, 작업 획득 시 이미 warm 상태였는지 집계해
+  하트비트마다 TTSWorker 행에 기록한다 (대시보드 /dashboard/tts-workers).
+"""
+import bisect
+import hashlib
+import logging
+import socket
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, func
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.models.tts import TTSGeneration, TTSScript, TTSWorker
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VOICE_KEY = "default"  # 성우 없이 기본 음성으로 생성하는 작업
+VIRTUAL_NODES = 64  # 워커당 링 위치 수 (많을수록 성우가 고르게 분산)
+STALE_WORKER_RETENTION = timedelta(days=1)  # 정상 종료하지 못한 워커 행 보관 기간
+
+
+def voice_key(voice_actor_id: Optional[uuid.UUID]) -> str:
+    return str(voice_actor_id) if voice_actor_id else DEFAULT_VOICE_KEY
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    """워커 ID로 만든 일관 해시 링 (성우 키 → 담당 워커 ID)"""
+
+    def __init__(self, nodes: Iterable[str], replicas: int = VIRTUAL_NODES):
+        self.nodes = sorted(set(nodes))
+        points = sorted(
+            (_hash(f"{node}#{replica}"), node) for node in self.nodes for replica in range(replicas)
+        )
+        self._hashes = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def owner(self, key: str) -> Optional[str]:
+        if not self._hashes:
+            return None
+        index = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._owners[index]
+
+
+class WarmContext:
+    """워커 프로세스가 최근 처리한 성우 LRU와 warm 적중 집계"""
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self.voices: "OrderedDict[str, None]" = OrderedDict()
+        self.jobs_claimed = 0
+        self.hits = 0
+        self.misses = 0
+        self.stolen = 0
+
+    def touch(self, key: str, jobs: int = 1, stolen: bool = False) -> bool:
+        """성우 key의 작업 jobs개를 처리 시작. 이미 warm 상태였으면 True"""
+        hit = key in self.voices
+        self.voices[key] = None
+        self.voices.move_to_end(key)
+        while len(self.voices) > self.capacity:
+            self.voices.popitem(last=False)
+
+        self.jobs_claimed += jobs
+        if hit:
+            self.hits += jobs
+        else:
+            # 배치의 첫 작업만 참조 토큰을 올리고 나머지는 warm 상태에서 처리된다
+            self.misses += 1
+            self.hits += jobs - 1
+        if stolen:
+            self.stolen += jobs
+        return hit
+
+
+def heartbeat_worker(
+    session: Session,
+    worker_id: str,
+    capacity: int,
+    running: int,
+    warm: WarmContext,
+    reference_hits: int = 0,
+    reference_misses: int = 0,
+) -> None:
+    """워커 등록/하트비트 (없으면 생성)와 warm 적중/참조 토큰 캐시 집계 기록"""
+    now = datetime.now()
+    worker = session.get(TTSWorker, worker_id)
+    if worker is None:
+        worker = TTSWorker(id=worker_id, hostname=socket.gethostname(), started_at=now)
+        logger.info(f"📇 TTS 워커 등록: {worker_id}")
+
+    worker.capacity = capacity
+    worker.running = running
+    worker.warm_voices = list(reversed(warm.voices))  # 최근 사용 순
+    worker.jobs_claimed = warm.jobs_claimed
+    worker.warm_hits = warm.hits
+    worker.warm_misses = warm.misses
+    worker.stolen_jobs = warm.stolen
+    worker.reference_token_hits = reference_hits
+    worker.reference_token_misses = reference_misses
+    worker.last_heartbeat = now
+    session.add(worker)
+
+    # 크래시 등으로 정리되지 않은 오래된 워커 행 제거
+    session.execute(delete(TTSWorker).where(TTSWorker.last_heartbeat < now - STALE_WORKER_RETENTION))
+    session.commit()
+
+
+def unregister_worker(session: Session, worker_id: str) -> None:
+    """정상 종료 시 해시 링에서 즉시 빠지도록 워커 행 삭제"""
+    session.execute(delete(TTSWorker).where(TTSWorker.id == worker_id))
+    session.commit()
+
+
+def _live_since() -> datetime:
+    # 하트비트를 세 번 연속 놓치면 죽은 워커로 보고 링에서 제외
+    return datetime.now() - timedelta(seconds=settings.TTS_QUEUE_HEARTBEAT_SECONDS * 3)
+
+
+def live_worker_ids(session: Session) -> List[str]:
+    return list(session.exec(select(TTSWorker.id).where(TTSWorker.last_heartbeat >= _live_since())).all())
+
+
+def live_capacity(session: Session) -> int:
+    """살아 있는 워커들의 동시 처리 수 합 (등록된 워커가 없으면 0)"""
+    capacities = session.exec(
+        select(TTSWorker.capacity).where(TTSWorker.last_heartbeat >= _live_since())
+    ).all()
+    return sum(capacities)
+
+
+def voice_keys(session: Session, generation_ids: List[uuid.UUID]) -> Dict[uuid.UUID, str]:
+    """생성 작업별 성우 키"""
+    if not generation_ids:
+        return {}
+    rows = session.exec(
+        select(TTSGeneration.id, TTSScript.voice_actor_id)
+        .join(TTSScript, TTSGeneration.script_id == TTSScript.id)
+        .where(TTSGeneration.id.in_(generation_ids))
+    ).all()
+    return {generation_id: voice_key(voice_actor_id) for generation_id, voice_actor_id in rows}
+
+
+def reference_token_counts(session: Session) -> Dict[str, int]:
+    """등록된 큐 워커들의 참조 토큰 캐시 적중/미스 합 (워커 재시작 시 그 워커 몫은 0부터 다시 셈)"""
+    hits, misses = session.exec(
+        select(
+            func.coalesce(func.sum(TTSWorker.reference_token_hits), 0),
+            func.coalesce(func.sum(TTSWorker.reference_token_misses), 0),
+        )
+    ).one()
+    return {"hits": int(hits), "misses": int(misses)}
+
+
+def worker_stats(session: Session) -> List[Dict[str, Any]]:
+    """워커별 상태와 warm 적중률 (최근 하트비트 순)"""
+    live_since = _live_since()
+    workers = session.exec(select(TTSWorker).order_by(TTSWorker.last_heartbeat.desc())).all()
+    stats = []
+    for worker in workers:
+        judged = worker.warm_hits + worker.warm_misses
+        stats.append({
+            "worker_id": worker.id,
+            "hostname": worker.hostname,
+            "alive": worker.last_heartbeat >= live_since,
+            "capacity": worker.capacity,
+            "running": worker.running,
+            "warm_voices": worker.warm_voices or [],
+            "jobs_claimed": worker.jobs_claimed,
+            "warm_hits": worker.warm_hits,
+            "warm_misses": worker.warm_misses,
+            "warm_hit_rate": round(worker.warm_hits / judged, 3) if judged else None,
+            "stolen_jobs": worker.stolen_jobs,
+            "reference_token_hits": worker.reference_token_hits,
+            "reference_token_misses": worker.reference_token_misses,
+            "started_at": worker.started_at,
+            "last_heartbeat": worker.last_heartbeat,
+        })
+    return stats
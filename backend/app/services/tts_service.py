@@ -2,90 +2,183 @@ import os
 import uuid
 import asyncio
 import logging
+import shutil
 import subprocess
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
 from datetime import datetime
 
-from sqlmodel import Session, select
-from app.core.db import engine
-from app.models.tts import TTSGeneration, TTSScript, GenerationStatus
+import numpy as np
+import soundfile as sf
+from sqlalchemy import update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.config import settings
+from app.core.db import async_engine
+from app.models.tts import TTSGeneration, TTSScript, GenerationStatus, TTSPriority
 from app.models.voice_actor import VoiceActor, VoiceSample
+from app.services.fish_speech import FishSpeechWorkerClient
+from app.services.fish_speech.health import EnvironmentHealthCache
+from app.services.fish_speech.reference_cache import ReferenceTokenCache
+from app.services import tts_cache, tts_stats
+from app.services.tts_timing import StageTimer, activate, timed_stage
+from app.services.audio.audio_probe import probe_audio
+from app.services.tts_chunking import (
+    StreamingCrossfader,
+    crossfade_concat,
+    split_text,
+    to_pcm16,
+    wav_stream_header,
+)
+from app.services import tts_queue
+from app.services.tts_queue import (
+    PermanentJobError,
+    enqueue_generation,
+    release_claim,
+    sync_scenario_tts,
+)
 
 logger = logging.getLogger(__name__)
 
+# 백엔드와 Fish-Speech 컨테이너가 함께 마운트하는 디렉토리 (FISH_SPEECH_WORKSPACE_DIR 아래)
+WORKSPACE_ROOTS = ("audio_files", "voice_samples", "temp_processing")
+
 
 
 
 class FishSpeechTTSService:
     """Fish-Speech 기반 TTS 생성 및 관리를 담당하는 서비스 클래스"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        host_root: Optional[Path] = None,
+        db_engine=None,
+        worker_client: Optional[FishSpeechWorkerClient] = None,
+    ):
+        """인자는 벤치마크처럼 앱 밖에서 파이프라인을 실행할 때만 지정한다.
+
+        Args:
+            host_root: audio_files/voice_samples/temp_processing 상위 디렉토리 (기본: /app)
+            db_engine: 생성 작업 조회/갱신에 사용할 비동기 DB 엔진 (기본: 앱 DB)
+            worker_client: 추론 워커 클라이언트 (기본: 설정의 워커 주소)
+        """
         # Use absolute paths for Docker container
-        self.audio_files_dir = Path("/app/audio_files")
-        self.reference_audio_dir = Path("/app/voice_samples")
+        root = Path(host_root) if host_root else Path("/app")
+        self.audio_files_dir = root / "audio_files"
+        self.reference_audio_dir = root / "voice_samples"
+        self.db_engine = db_engine if db_engine is not None else async_engine
         
         # Create directories with parents
         self.audio_files_dir.mkdir(parents=True, exist_ok=True)
         self.reference_audio_dir.mkdir(parents=True, exist_ok=True)
         self.model_loaded = False
-        self.docker_container_name = "fish-speech-tts"
+        self.docker_container_name = settings.FISH_SPEECH_CONTAINER_NAME
         self.docker_image_name = "openaudio-s1-mini"
         
         # Fish-Speech 디렉토리 경로 (Docker 컨테이너 내부 경로)
-        self.fish_speech_dir = "/opt/fish-speech"
-        self.checkpoint_dir = "/opt/fish-speech/checkpoints/openaudio-s1-mini"
+        self.fish_speech_dir = settings.FISH_SPEECH_DIR
+        self.checkpoint_dir = settings.FISH_SPEECH_MODEL_PATH
+        self.workspace_dir = settings.FISH_SPEECH_WORKSPACE_DIR
+
+        # 상주 추론 워커 (모델을 한 번만 로드하고 소켓으로 요청 처리)
+        self.worker_client = worker_client or FishSpeechWorkerClient(
+            host=settings.FISH_SPEECH_WORKER_HOST,
+            port=settings.FISH_SPEECH_WORKER_PORT,
+            timeout=settings.FISH_SPEECH_WORKER_TIMEOUT,
+        )
+        self._worker_start_lock = asyncio.Lock()
+        self._worker_info: Optional[dict] = None
+
+        # 생성 작업별 임시 작업 디렉토리 (워커에서는 {workspace}/temp_processing/tts_jobs/<id>)
+        temp_dir = root / "temp_processing" if host_root else Path(settings.TTS_TEMP_DIR)
+        self.jobs_dir = temp_dir / "tts_jobs"
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        # 동시에 처리할 생성 작업 수 제한 (대기 중인 작업은 PENDING 상태 유지)
+        self._job_semaphore = asyncio.Semaphore(max(1, settings.TTS_MAX_CONCURRENT_JOBS))
+        # 큐 워커가 대화형 전용 슬롯(TTS_QUEUE_INTERACTIVE_SLOTS)으로 가져온 작업은 일반 슬롯을 기다리지 않음
+        self._reserved_semaphore = asyncio.Semaphore(max(1, settings.TTS_QUEUE_INTERACTIVE_SLOTS))
+
+        # 분할 합성 시 추론 워커에 동시에 보내는 청크 수 (생성 작업/스트리밍 요청 공용)
+        self._chunk_semaphore = asyncio.Semaphore(max(1, settings.TTS_CHUNK_CONCURRENCY))
+
+        # 참조 음성 → 프롬프트 토큰 캐시 (voice_samples 아래에 두어 워커도 같은 파일을 읽음)
+        self.reference_cache = ReferenceTokenCache(self.reference_audio_dir)
+
+        # 컨테이너/체크포인트 확인 결과 캐시 (생성 실패나 컨테이너 재시작 시 무효화)
+        self._container_started_at: Optional[str] = None
+        self.environment = EnvironmentHealthCache(
+            self._check_environment,
+            ttl=settings.FISH_SPEECH_HEALTH_TTL,
+            failure_ttl=settings.FISH_SPEECH_HEALTH_FAILURE_TTL,
+        )
 
-    async def initialize_tts_model(self):
-        """Fish-Speech Docker 컨테이너 상태 확인 (컨테이너는 미리 실행되어 있다고 가정)"""
-        if self.model_loaded:
-            return
+        # 이 프로세스에서 처리 중인 생성 작업: ID → (처리 태스크, 같은 태스크에서 아직 취소되지 않은 작업 ID들)
+        # 배치는 여러 작업이 태스크 하나를 공유하므로 모두 취소되었을 때만 태스크를 중단한다
+        self._inflight: Dict[uuid.UUID, Tuple[asyncio.Task, Set[uuid.UUID]]] = {}
 
-        logger.info("🐟 Fish-Speech TTS 시스템 초기화 시작...")
+    async def initialize_tts_model(self):
+        """Fish-Speech 실행 환경 확인 (컨테이너는 미리 실행되어 있다고 가정)
 
+        컨테이너/체크포인트/codec.pth 확인 결과는 self.environment가 TTL 동안 캐시하므로
+        생성 작업마다 호출해도 docker exec를 반복하지 않는다.
+        """
         try:
-            # 1. Docker 가용성 확인
-            if not await self._check_docker_available():
-                raise Exception("Docker가 설치되지 않았거나 실행 중이지 않습니다.")
-
-            # 2. 실행 중인 컨테이너 확인
-            await self._check_container_running()
+            # 1. 컨테이너 및 모델 체크포인트 확인 (캐시)
+            await self.environment.ensure()
 
-            # 3. 모델 및 체크포인트 확인
-            await self._verify_model_files()
-
-            self.model_loaded = True
-            logger.info("✅ Fish-Speech TTS 시스템 초기화 완료")
+            # 2. 상주 추론 워커 확인 (없으면 컨테이너 안에서 기동)
+            if not self.model_loaded:
+                logger.info("🐟 Fish-Speech TTS 시스템 초기화 시작...")
+                await self._ensure_inference_worker()
+                self.model_loaded = True
+                logger.info("✅ Fish-Speech TTS 시스템 초기화 완료")
 
         except Exception as e:
+            self.model_loaded = False
             logger.error(f"❌ Fish-Speech TTS 초기화 실패: {e}")
             raise Exception(f"TTS 시스템 초기화에 실패했습니다: {str(e)}")
 
-    async def _check_docker_available(self) -> bool:
-        """Docker 가용성 확인"""
-        try:
-            result = await self._run_command(["docker", "--version"])
-            logger.info(f"Docker 확인됨: {result.stdout.strip()}")
-            return True
-        except Exception as e:
-            logger.error(f"Docker 확인 실패: {e}")
-            return False
+    async def _check_environment(self) -> dict:
+        """컨테이너 실행 상태 + 체크포인트 디렉토리/codec.pth 확인 (EnvironmentHealthCache의 확인 함수)"""
+        container = await self._inspect_container()
+
+        if self._container_started_at != container["started_at"]:
+            if self._container_started_at is not None:
+                # 재시작된 컨테이너에는 이전 워커 프로세스가 없음
+                logger.warning(f"🔄 Fish-Speech 컨테이너 재시작 감지 (StartedAt {container['started_at']})")
+                self._worker_info = None
+                self.model_loaded = False
+            # 컨테이너 내부 디렉토리는 (재)시작 후 한 번만 확인
+            await self._verify_container_directories()
+            self._container_started_at = container["started_at"]
+
+        await self._verify_checkpoint_paths()
+        logger.info(f"✅ 모델 체크포인트 확인됨: {self.checkpoint_dir}")
 
-    async def _check_container_running(self):
-        """Fish-Speech Docker 컨테이너가 실행 중인지 확인"""
+        return {
+            "container": container,
+            "checkpoint_dir": self.checkpoint_dir,
+            "codec_path": f"{self.checkpoint_dir}/codec.pth",
+        }
+
+    async def _inspect_container(self) -> dict:
+        """Fish-Speech 컨테이너 상태 조회 (docker inspect 한 번, exec 없음)"""
         try:
-            # 실행 중인 컨테이너 확인
             result = await self._run_command(
-                ["docker", "ps", "-q", "-f", f"name={self.docker_container_name}"]
+                [
+                    "docker", "inspect", "-f",
+                    "{{.Id}} {{.State.Running}} {{.State.StartedAt}}",
+                    self.docker_container_name,
+                ],
+                timeout=10,
             )
-            
-            if not result.stdout.strip():
+            if result.returncode != 0:
+                raise Exception(result.stderr.strip() or "컨테이너를 찾을 수 없습니다")
+
+            container_id, running, started_at = result.stdout.split()
+            if running != "true":
                 raise Exception(f"Fish-Speech 컨테이너 '{self.docker_container_name}'가 실행되지 않고 있습니다.")
-            
-            logger.info(f"✅ Docker 컨테이너 '{self.docker_container_name}' 실행 중 확인됨")
-            
-            # 컨테이너 내부 디렉토리 확인
-            await self._verify_container_directories()
 
         except Exception as e:
             logger.error(f"컨테이너 상태 확인 실패: {e}")
@@ -94,6 +187,12 @@ class FishSpeechTTSService:
             logger.error("2. 또는 docker-compose -f docker-compose.fish-speech.yml up -d")
             raise Exception(f"Fish-Speech 컨테이너가 실행되지 않고 있습니다: {str(e)}")
 
+        return {
+            "name": self.docker_container_name,
+            "id": container_id[:12],
+            "started_at": started_at,
+        }
+
     async def _verify_container_directories(self):
         """컨테이너 내부 디렉토리 구조 확인"""
         try:
@@ -122,19 +221,9 @@ class FishSpeechTTSService:
         except Exception as e:
             logger.warning(f"⚠️ 컨테이너 디렉토리 확인 실패: {e}")
 
-    async def _verify_model_files(self):
-        """모델 파일 및 체크포인트 확인"""
-        try:
-            # 새로운 체크포인트 검증 메서드 사용
-            await self._verify_checkpoint_paths()
-            logger.info(f"✅ 모델 체크포인트 확인됨: {self.checkpoint_dir}")
-            
-        except Exception as e:
-            logger.error(f"모델 파일 확인 실패: {e}")
-            raise Exception(f"모델 파일 확인에 실패했습니다: {str(e)}")
-
     async def _run_command(self, cmd: List[str], timeout: int = 30) -> subprocess.CompletedProcess:
-        """비동기 명령어 실행"""
+        """비동기 명령어 실행 (시간 초과/작업 취소 시 프로세스 종료)"""
+        process = None
         try:
             process = await asyncio.create_subprocess_exec(
                 *cmd,
@@ -149,13 +238,27 @@ class FishSpeechTTSService:
             return subprocess.CompletedProcess(
                 cmd, process.returncode or 0, stdout.decode(), stderr.decode()
             )
+        except asyncio.CancelledError:
+            await self._kill_process(process)
+            raise
         except asyncio.TimeoutError:
             logger.error(f"명령어 타임아웃: {' '.join(cmd)}")
+            await self._kill_process(process)
             raise Exception(f"명령어 실행 시간 초과 ({timeout}초)")
         except Exception as e:
             logger.error(f"명령어 실행 실패: {' '.join(cmd)} - {e}")
             raise
 
+    @staticmethod
+    async def _kill_process(process: Optional[asyncio.subprocess.Process]) -> None:
+        if process is None or process.returncode is not None:
+            return
+        try:
+            process.kill()
+            await asyncio.wait_for(process.wait(), timeout=5)
+        except (ProcessLookupError, asyncio.TimeoutError):
+            pass
+
     async def _run_docker_command(self, cmd: List[str], timeout: int = 60) -> subprocess.CompletedProcess:
         """Docker 컨테이너 내에서 명령어 실행"""
         docker_cmd = [
@@ -164,139 +267,632 @@ class FishSpeechTTSService:
         
         return await self._run_command(docker_cmd, timeout)
 
-    async def process_tts_generation(self, generation_id: uuid.UUID) -> None:
-        """백그라운드에서 TTS 생성 작업을 처리"""
-        try:
-            logger.info(f"🚀 Fish-Speech 백그라운드 TTS 생성 작업 시작: {generation_id}")
+    async def _ensure_inference_worker(self):
+        """상주 추론 워커가 응답하는지 확인하고, 없으면 기동"""
+        if await self.worker_client.is_alive():
+            return
 
-            with Session(engine) as session:
-                # 생성 작업 조회
-                generation = session.get(TTSGeneration, generation_id)
-                if not generation:
-                    logger.error(f"❌ Generation {generation_id} not found in database")
-                    return
+        async with self._worker_start_lock:
+            # 잠금을 기다리는 동안 다른 작업이 기동했을 수 있음
+            if await self.worker_client.is_alive():
+                return
 
-                logger.info(f"✅ Generation 레코드 확인됨: {generation_id}")
+            # 워커가 사라졌다면 컨테이너가 재시작됐을 수 있으므로 환경을 다시 확인
+            self.environment.invalidate("추론 워커 응답 없음")
+            await self.environment.ensure()
 
-                try:
-                    # 상태를 처리중으로 변경
-                    generation.status = GenerationStatus.PROCESSING
-                    generation.started_at = datetime.now()
-                    session.add(generation)
-                    session.commit()
+            if not settings.FISH_SPEECH_WORKER_AUTOSTART:
+                raise Exception(
+                    f"Fish-Speech 추론 워커가 응답하지 않습니다: "
+                    f"{settings.FISH_SPEECH_WORKER_HOST}:{settings.FISH_SPEECH_WORKER_PORT}"
+                )
 
-                    # TTS 스크립트 조회
-                    script = session.get(TTSScript, generation.script_id)
-                    if not script:
-                        raise ValueError("TTS script not found")
+            await self._start_inference_worker()
+
+    async def _start_inference_worker(self):
+        """컨테이너에 워커 스크립트를 복사하고 백그라운드로 기동한 뒤 준비될 때까지 대기"""
+        logger.info("🚀 Fish-Speech 상주 추론 워커 기동 중...")
+        self._worker_info = None
+
+        worker_src_dir = Path(__file__).parent / "fish_speech"
+        worker_dst_dir = f"{self.fish_speech_dir}/ment_worker"
+
+        result = await self._run_docker_command(["mkdir", "-p", worker_dst_dir], timeout=10)
+        if result.returncode != 0:
+            raise Exception(f"워커 디렉토리 생성 실패: {result.stderr}")
+
+        for filename in ("protocol.py", "inference_worker.py"):
+            result = await self._run_command(
+                ["docker", "cp", str(worker_src_dir / filename),
+                 f"{self.docker_container_name}:{worker_dst_dir}/{filename}"],
+                timeout=10,
+            )
+            if result.returncode != 0:
+                raise Exception(f"워커 스크립트 복사 실패 ({filename}): {result.stderr}")
+
+        worker_cmd = (
+            f"cd {self.fish_speech_dir} && python ment_worker/inference_worker.py "
+            f"--host 0.0.0.0 --port {settings.FISH_SPEECH_WORKER_PORT} "
+            f"--checkpoint-dir {self.checkpoint_dir} "
+            f"--fish-speech-dir {self.fish_speech_dir} "
+            f"--device {settings.FISH_SPEECH_DEVICE}"
+            f"{' --compile' if settings.FISH_SPEECH_WORKER_COMPILE else ''}"
+            f" >> /tmp/ment_worker.log 2>&1"
+        )
+        result = await self._run_command(
+            ["docker", "exec", "-d", self.docker_container_name, "bash", "-c", worker_cmd],
+            timeout=10,
+        )
+        if result.returncode != 0:
+            raise Exception(f"추론 워커 기동 실패: {result.stderr}")
+
+        # 모델 로드 (+ compile) 완료까지 대기
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.FISH_SPEECH_WORKER_STARTUP_TIMEOUT
+        while loop.time() < deadline:
+            try:
+                info = await self.worker_client.ping()
+                self._worker_info = info
+                logger.info(
+                    f"✅ 추론 워커 준비 완료: engine={info.get('engine')}, "
+                    f"모델 로드 {info.get('load_seconds') or 0:.1f}초"
+                )
+                return
+            except Exception:
+                await asyncio.sleep(2)
 
-                    # 성우 정보 조회
-                    voice_actor = None
-                    if script.voice_actor_id:
-                        voice_actor = session.get(VoiceActor, script.voice_actor_id)
+        raise Exception(
+            f"추론 워커가 {settings.FISH_SPEECH_WORKER_STARTUP_TIMEOUT}초 안에 준비되지 않았습니다 "
+            f"(컨테이너 로그: /tmp/ment_worker.log)"
+        )
+
+    async def _get_worker_info(self) -> dict:
+        """워커 모델 정보 (codec 식별자, 샘플레이트) - 워커가 재기동되면 다시 조회"""
+        if self._worker_info is None:
+            self._worker_info = await self.worker_client.ping()
+        return self._worker_info
+
+    async def _get_reference_tokens(self, reference_audio: str):
+        """참조 음성의 프롬프트 토큰(.npy) 호스트 경로를 반환 (캐시 미스 시 워커로 인코딩)
+
+        Returns:
+            (호스트 .npy 경로, 캐시 적중 여부)
+        """
+        info = await self._get_worker_info()
+        codec_id = info.get("codec_id") or info.get("codec_path") or "unknown"
+
+        async def encode(audio_path: str, output_path: str):
+            return await self.worker_client.encode(
+                self._to_worker_path(audio_path, "voice_samples"),
+                self._to_worker_path(output_path, "voice_samples"),
+                timeout=60,
+            )
 
-                    logger.info(f"🐟 Fish-Speech TTS 생성 시작 - ID: {generation_id}")
-                    logger.info(f"텍스트: '{script.text_content[:50]}...'")
-                    logger.info(f"성우: {voice_actor.name if voice_actor else '기본 음성'}")
+        return await self.reference_cache.get_or_encode(
+            reference_audio, codec_id, info.get("sample_rate"), encode
+        )
+
+    async def warm_reference_tokens(self, reference_audio: str) -> bool:
+        """업로드 직후 참조 토큰을 미리 만들어 첫 생성의 인코딩 비용을 없앰 (백그라운드 작업용)"""
+        try:
+            await self.initialize_tts_model()
+            _, cache_hit = await self._get_reference_tokens(reference_audio)
+            logger.info(f"🔥 참조 토큰 예열 완료: {Path(reference_audio).name} (캐시 {'적중' if cache_hit else '생성'})")
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ 참조 토큰 예열 실패 (생성 시 다시 시도): {reference_audio}: {e}")
+            return False
+
+    def invalidate_reference_tokens(self, reference_audio: str) -> int:
+        """참조 음성 파일이 교체/삭제되었을 때 캐시된 토큰 제거"""
+        try:
+            return self.reference_cache.invalidate(reference_audio)
+        except Exception as e:
+            logger.warning(f"⚠️ 참조 토큰 캐시 무효화 실패: {reference_audio}: {e}")
+            return 0
+
+    def _to_worker_path(self, host_path: str, root: Optional[str] = None) -> str:
+        """호스트(백엔드) 경로를 워커가 보는 작업 공간 경로로 변환
+
+        예: voice_samples/<actor>/sample.wav → /workspace/voice_samples/<actor>/sample.wav
+        root를 생략하면 경로에 포함된 작업 공간 디렉토리(audio_files 등)로 판단한다.
+        """
+        host_path = str(host_path)
+        if root is None:
+            root = next(
+                (r for r in WORKSPACE_ROOTS if f"{r}/" in host_path), "audio_files"
+            )
+        if f"{root}/" in host_path:
+            relative_path = host_path.split(f"{root}/")[-1]
+        else:
+            relative_path = Path(host_path).name
+        return f"{self.workspace_dir}/{root}/{relative_path}"
+
+    async def execute_generation(
+        self, generation_id: uuid.UUID, worker_id: Optional[str] = None, reserved: bool = False
+    ) -> None:
+        """큐 워커가 획득(PROCESSING)한 TTS 생성 작업을 처리
+
+        실패 시 예외를 그대로 올려 보내고, 재시도/실패 처리는 호출한 큐 워커가 결정한다.
+        (app/services/tts_queue.py 참조)
+        reserved면 대화형 전용 슬롯으로 가져온 작업이라 일반 동시 처리 수 제한 대신 전용 슬롯 수 제한을 따른다.
+        """
+        with self._track_inflight([generation_id]):
+            async with self._job_slot(reserved):
+                await self._execute_generation(generation_id, worker_id)
+
+    def _job_slot(self, reserved: bool) -> asyncio.Semaphore:
+        return self._reserved_semaphore if reserved else self._job_semaphore
+
+    @contextmanager
+    def _track_inflight(self, generation_ids: List[uuid.UUID]):
+        """처리 중인 작업 등록 (abort_generation으로 중단할 수 있게)"""
+        task = asyncio.current_task()
+        live = set(generation_ids)
+        for generation_id in generation_ids:
+            self._inflight[generation_id] = (task, live)
+        try:
+            yield live
+        finally:
+            for generation_id in generation_ids:
+                if self._inflight.get(generation_id, (None,))[0] is task:
+                    del self._inflight[generation_id]
+
+    def inflight_generation_ids(self) -> List[uuid.UUID]:
+        return list(self._inflight)
+
+    def abort_generation(self, generation_id: uuid.UUID) -> bool:
+        """이 프로세스에서 처리 중인 작업 중단
+
+        처리 태스크를 취소하면 진행 중인 추론 워커 요청에 cancel이 전달되고(남은 토큰 생성/디코딩 중단),
+        이후 단계는 실행되지 않으며 작업 디렉토리/출력 파일은 정리된다.
+        배치 작업은 같은 배치의 다른 작업이 남아 있으면 태스크는 계속 돌고 이 작업의 결과만 버려진다.
+
+        Returns:
+            이 프로세스에서 처리 중이던 작업이면 True
+        """
+        entry = self._inflight.pop(generation_id, None)
+        if entry is None:
+            return False
+        task, live = entry
+        live.discard(generation_id)
+        if not live and not task.done():
+            task.cancel()
+            logger.info(f"⏹️ 처리 중인 TTS 작업 중단: {generation_id}")
+        else:
+            logger.info(f"⏹️ 배치 중 취소된 작업은 결과를 버림: {generation_id}")
+        return True
+
+    @staticmethod
+    def _job_params(generation: TTSGeneration) -> dict:
+        """추론 워커로 보낼 파라미터 (우선순위 포함: 워커가 대화형 요청을 먼저 처리)"""
+        return {**(generation.generation_params or {}), "priority": generation.priority.value}
+
+    async def _execute_generation(self, generation_id: uuid.UUID, worker_id: Optional[str]) -> None:
+        logger.info(f"🚀 Fish-Speech TTS 생성 작업 시작: {generation_id}")
+        timer = StageTimer()
+
+        # DB 작업은 비동기 세션으로 처리해 합성 중인 다른 작업/요청을 막지 않음
+        # (큐/캐시/통계 헬퍼는 동기 Session용이므로 run_sync로 같은 연결에서 실행)
+        async with AsyncSession(self.db_engine, expire_on_commit=False) as session:
+            job = await self._load_job(session, generation_id, worker_id, timer)
+            if job is None:
+                return
+            generation, script, voice_actor = job
 
-                    # TTS 생성 수행
+            try:
+                # TTS 생성 수행 (setup ~ decode 단계는 파이프라인 안에서 timer에 기록)
+                with activate(timer):
                     audio_file_path = await self._generate_tts_audio(
                         text=script.text_content,
                         voice_actor=voice_actor,
-                        generation_params=generation.generation_params or {},
+                        generation_params=self._job_params(generation),
                         session=session,
+                        job_id=str(generation_id),
                     )
 
-                    # 오디오 파일 정보 업데이트
-                    audio_path = Path(audio_file_path)
-                    file_size = audio_path.stat().st_size if audio_path.exists() else 0
+                await self._complete_job(
+                    session, generation, script, voice_actor, audio_file_path, timer, worker_id
+                )
 
-                    # 오디오 길이 계산
-                    duration = await self._get_audio_duration(audio_file_path)
+            except Exception as e:
+                logger.error(f"❌ Fish-Speech TTS 생성 실패 - ID: {generation_id}: {type(e).__name__}: {e}")
+
+                # 스택 트레이스 로깅
+                import traceback
+                logger.error(f"❌ 스택 트레이스:\n{traceback.format_exc()}")
+                raise
+
+    async def _load_job(
+        self, session: AsyncSession, generation_id: uuid.UUID, worker_id: Optional[str], timer: StageTimer
+    ) -> Optional[Tuple[TTSGeneration, TTSScript, Optional[VoiceActor]]]:
+        """생성 작업/스크립트/성우 조회
+
+        취소되었거나 대기 중에 같은 내용의 다른 작업이 먼저 완료되어 캐시로 처리했으면 None.
+        """
+        # 생성 작업 조회
+        generation = await session.get(TTSGeneration, generation_id)
+        if not generation:
+            raise PermanentJobError(f"Generation {generation_id} not found in database")
+        timer.record_span("queue_wait", generation.created_at, generation.started_at)
+
+        if generation.status == GenerationStatus.CANCELLED:
+            logger.info(f"⏹️ 취소된 작업은 건너뜀: {generation_id}")
+            return None
+
+        # 대기 중에 같은 내용의 다른 작업이 먼저 완료되었으면 그 결과를 재사용 (그 사이 취소되었으면 건너뜀)
+        if await session.run_sync(
+            tts_queue.complete_claimed_from_cache, generation, worker_id, timer.to_dict()
+        ):
+            return None
+
+        # TTS 스크립트 조회
+        script = await session.get(TTSScript, generation.script_id)
+        if not script:
+            raise PermanentJobError("TTS script not found")
+
+        # 성우 정보 조회
+        voice_actor = None
+        if script.voice_actor_id:
+            voice_actor = await session.get(VoiceActor, script.voice_actor_id)
+
+        logger.info(f"🐟 Fish-Speech TTS 생성 시작 - ID: {generation_id} (시도 {generation.attempts}회)")
+        logger.info(f"텍스트: '{script.text_content[:50]}...'")
+        logger.info(f"성우: {voice_actor.name if voice_actor else '기본 음성'}")
+        return generation, script, voice_actor
+
+    async def _complete_job(
+        self,
+        session: AsyncSession,
+        generation: TTSGeneration,
+        script: TTSScript,
+        voice_actor: Optional[VoiceActor],
+        audio_file_path: str,
+        timer: StageTimer,
+        worker_id: Optional[str],
+    ) -> None:
+        """합성된 오디오를 생성 작업에 반영 (길이/품질 계산, 통계/시나리오/캐시 갱신 후 commit)"""
+        generation_id = generation.id
+
+        # 생성 중 취소되었거나 임대를 잃었으면(다른 워커가 회수) 결과를 버림
+        await session.refresh(generation)
+        if generation.status == GenerationStatus.CANCELLED or (
+            worker_id and generation.claimed_by != worker_id
+        ):
+            Path(audio_file_path).unlink(missing_ok=True)
+            logger.info(f"⏹️ 취소/회수된 작업의 결과 폐기: {generation_id}")
+            return
 
-                    # 품질 점수 계산 (다중 참조 정보 포함)
-                    reference_count = 0
-                    if voice_actor:
-                        # 사용된 참조 음성 개수 추적
-                        reference_wavs = await self._get_reference_wavs(voice_actor, session)
-                        reference_count = len(reference_wavs)
-                    
-                    quality_score = await self._calculate_quality_score(
-                        audio_file_path, script.text_content, 
-                        is_voice_cloning=(voice_actor is not None), 
-                        reference_count=reference_count
-                    )
+        with timer.stage("file_probe"):
+            # 오디오 파일 정보 업데이트
+            audio_path = Path(audio_file_path)
+            file_size = audio_path.stat().st_size if audio_path.exists() else 0
 
-                    # 결과 업데이트
-                    generation.audio_file_path = str(audio_file_path)
-                    generation.file_size = file_size
-                    generation.duration = duration
-                    generation.quality_score = quality_score
-                    generation.status = GenerationStatus.COMPLETED
-                    generation.completed_at = datetime.now()
+            # 오디오 길이 계산
+            duration = await self._get_audio_duration(audio_file_path)
 
-                    session.add(generation)
-                    session.commit()
+        with timer.stage("quality_score"):
+            # 품질 점수 계산 (다중 참조 정보 포함)
+            reference_count = 0
+            if voice_actor:
+                # 사용된 참조 음성 개수 추적
+                reference_wavs = await self._get_reference_wavs(voice_actor, session)
+                reference_count = len(reference_wavs)
 
-                    logger.info(f"✅ Fish-Speech TTS 생성 완료 - ID: {generation_id}")
-                    logger.info(f"   파일: {audio_file_path}")
-                    logger.info(f"   크기: {file_size:,} bytes")
-                    logger.info(f"   길이: {duration:.2f}초")
-                    logger.info(f"   품질: {quality_score:.1f}점")
+            quality_score = await self._calculate_quality_score(
+                audio_file_path, script.text_content,
+                is_voice_cloning=(voice_actor is not None),
+                reference_count=reference_count,
+                duration=duration,
+            )
 
-                except Exception as e:
-                    logger.error(f"❌ Fish-Speech TTS 생성 실패 - ID: {generation_id}: {e}")
-                    logger.error(f"❌ 에러 유형: {type(e).__name__}")
-                    logger.error(f"❌ 상세 에러: {str(e)}")
+        # DB 갱신은 flush까지 측정하고, 결과를 같은 트랜잭션에 기록한 뒤 commit
+        with timer.stage("db_commit"):
+            # 그 사이 취소되었으면 완료로 되돌리지 않음 (처리 중 상태일 때만 완료로 전환)
+            if not await session.run_sync(tts_queue.mark_completed, generation_id, worker_id):
+                Path(audio_file_path).unlink(missing_ok=True)
+                logger.info(f"⏹️ 완료 직전 취소/회수된 작업의 결과 폐기: {generation_id}")
+                return
+
+            # 결과 업데이트
+            generation.audio_file_path = str(audio_file_path)
+            generation.file_size = file_size
+            generation.duration = duration
+            generation.quality_score = quality_score
+            generation.status = GenerationStatus.COMPLETED
+            generation.error_message = None
+            generation.completed_at = datetime.now()
+            release_claim(generation)
+            session.add(generation)
+
+            def record_result(sync_session):
+                tts_stats.record_completion(sync_session, generation)
+
+                # 시나리오 노드에 연결된 TTS가 있으면 함께 반영
+                sync_scenario_tts(sync_session, generation)
+
+                # 처리 중에 같은 합성 결과를 요청해 합류한 작업도 같은 음성으로 완료
+                tts_queue.complete_coalesced(sync_session, generation)
+
+                # 같은 요청이 다시 오면 재사용하도록 캐시에 등록
+                tts_cache.store(sync_session, generation, script.text_content)
+                sync_session.flush()
+
+            await session.run_sync(record_result)
+
+        timer.record_span("total", generation.started_at, datetime.now())
+        generation.stage_timings = timer.to_dict()
+        await session.commit()
+        await session.run_sync(tts_cache.evict)
+
+        logger.info(f"✅ Fish-Speech TTS 생성 완료 - ID: {generation_id}")
+        logger.info(f"   파일: {audio_file_path}")
+        logger.info(f"   크기: {file_size:,} bytes")
+        logger.info(f"   길이: {duration:.2f}초")
+        logger.info(f"   품질: {quality_score:.1f}점")
+
+    async def execute_generation_batch(
+        self, generation_ids: List[uuid.UUID], worker_id: Optional[str] = None, reserved: bool = False
+    ) -> Dict[uuid.UUID, Optional[Exception]]:
+        """큐 워커가 함께 획득한 배치 작업들(같은 성우/파라미터, tts_queue.claim_batch)을 한 번에 처리
+
+        참조 음성 조회/인코딩은 한 번만 하고, text2semantic과 DAC 디코딩은 워커 호출 한 번씩으로
+        모든 작업(의 청크)을 처리한 뒤 결과를 각 TTSGeneration에 나눠 반영한다.
+        작업별 실패는 예외를 올리지 않고 반환값에 담아, 큐 워커가 작업별로 재시도/실패 처리한다.
+
+        Returns:
+            {생성 작업 ID: 실패 예외 (성공/건너뜀이면 None)}
+        """
+        with self._track_inflight(generation_ids) as live:
+            async with self._job_slot(reserved):
+                return await self._execute_generation_batch(generation_ids, worker_id, live)
+
+    async def _execute_generation_batch(
+        self, generation_ids: List[uuid.UUID], worker_id: Optional[str], live: Set[uuid.UUID]
+    ) -> Dict[uuid.UUID, Optional[Exception]]:
+        outcomes: Dict[uuid.UUID, Optional[Exception]] = {generation_id: None for generation_id in generation_ids}
+
+        group_timer = StageTimer()
+        try:
+            with activate(group_timer), timed_stage("setup"):
+                await self.initialize_tts_model()
+                info = await self._get_worker_info()
+        except Exception as e:
+            return {generation_id: e for generation_id in generation_ids}
 
-                    # 스택 트레이스 로깅
-                    import traceback
-                    logger.error(f"❌ 스택 트레이스:\n{traceback.format_exc()}")
+        # 배치 연산이 없는 이전 워커면 작업별로 처리
+        if int(info.get("protocol_version") or 1) < 2 or len(generation_ids) == 1:
+            for generation_id in generation_ids:
+                if generation_id not in live:
+                    continue
+                try:
+                    await self._execute_generation(generation_id, worker_id)
+                except Exception as e:
+                    outcomes[generation_id] = e
+            return outcomes
+
+        logger.info(f"📦 Fish-Speech 배치 생성 시작: {len(generation_ids)}개")
+        jobs = []
+        async with AsyncSession(self.db_engine, expire_on_commit=False) as session:
+            for generation_id in generation_ids:
+                timer = StageTimer()
+                try:
+                    job = await self._load_job(session, generation_id, worker_id, timer)
+                except Exception as e:
+                    outcomes[generation_id] = e
+                    continue
+                if job is not None:
+                    jobs.append((*job, timer))
+            if not jobs:
+                return outcomes
+
+            # 같은 성우/파라미터로 묶인 작업이므로 첫 작업 기준으로 참조 음성/파라미터 결정
+            voice_actor = jobs[0][2]
+            params = self._job_params(jobs[0][0])
+
+            with self._job_workspace(f"batch_{generation_ids[0]}") as work_dir:
+                try:
+                    with activate(group_timer):
+                        results = await self._synthesize_batch(
+                            [script.text_content for _, script, _, _ in jobs],
+                            voice_actor, params, session, work_dir,
+                        )
+                except Exception as e:
+                    # 배치 호출 자체가 실패하면(GPU 메모리 부족 등) 작업별 경로로 다시 시도
+                    logger.warning(f"⚠️ 배치 합성 실패, 작업별로 다시 처리: {e}")
+                    results = [None] * len(jobs)
 
-                    # 실패 상태로 업데이트
-                    generation.status = GenerationStatus.FAILED
-                    generation.error_message = str(e)
-                    generation.completed_at = datetime.now()
+        # 공통 단계(준비/참조/시맨틱/디코딩) 시간은 작업 수로 나눠 각 작업에 기록
+        shared = {stage: seconds / len(jobs) for stage, seconds in group_timer.durations.items()}
 
+        # 결과 반영은 작업마다 세션을 따로 열어, 한 작업의 rollback이 다른 작업에 영향을 주지 않게 함
+        settled = 0
+        try:
+            for (generation, script, job_voice_actor, timer), result in zip(jobs, results):
+                settled += 1
+                # 배치 도중 취소된 작업은 남은 단계(단독 재시도/품질 계산/DB 반영)를 건너뜀
+                if generation.id not in live:
+                    if isinstance(result, str):
+                        Path(result).unlink(missing_ok=True)
+                    logger.info(f"⏹️ 배치 중 취소된 작업 건너뜀: {generation.id}")
+                    continue
+                for stage, seconds in shared.items():
+                    timer.add(stage, seconds)
+                async with AsyncSession(self.db_engine, expire_on_commit=False) as session:
                     session.add(generation)
-                    session.commit()
+                    try:
+                        if not isinstance(result, str):
+                            if result is not None:
+                                logger.warning(f"⚠️ 배치 항목 실패, 단독 재시도: {generation.id}: {result}")
+                            with activate(timer):
+                                result = await self._generate_tts_audio(
+                                    text=script.text_content,
+                                    voice_actor=job_voice_actor,
+                                    generation_params=self._job_params(generation),
+                                    session=session,
+                                    job_id=str(generation.id),
+                                )
+                        await self._complete_job(
+                            session, generation, script, job_voice_actor, result, timer, worker_id
+                        )
+                    except Exception as e:
+                        logger.error(f"❌ Fish-Speech 배치 항목 실패 - ID: {generation.id}: {type(e).__name__}: {e}")
+                        outcomes[generation.id] = e
+        except asyncio.CancelledError:
+            # 배치 전체가 취소됨: 아직 반영하지 않은 작업의 결과 파일 정리
+            for result in results[settled:]:
+                if isinstance(result, str):
+                    Path(result).unlink(missing_ok=True)
+            raise
 
-        except Exception as outer_e:
-            # 최상위 예외 처리
-            logger.error(f"🚨 Fish-Speech 백그라운드 TTS 작업 완전 실패 - ID: {generation_id}")
-            logger.error(f"🚨 최상위 에러 유형: {type(outer_e).__name__}")
-            logger.error(f"🚨 최상위 에러 메시지: {str(outer_e)}")
+        completed = sum(1 for error in outcomes.values() if error is None)
+        logger.info(f"📦 Fish-Speech 배치 생성 완료: {completed}/{len(generation_ids)}개")
+        return outcomes
 
-            import traceback
-            logger.error(f"🚨 전체 스택 트레이스:\n{traceback.format_exc()}")
+    async def _synthesize_batch(
+        self,
+        texts: List[str],
+        voice_actor: Optional[VoiceActor],
+        params: dict,
+        session: AsyncSession,
+        work_dir: Path,
+    ) -> List[object]:
+        """여러 텍스트를 같은 참조 음성/파라미터로 한 번에 합성
+
+        텍스트를 청크로 나눈 뒤 모든 청크를 generate_batch 한 번, decode_batch 한 번으로 처리하고
+        텍스트별로 청크를 크로스페이드로 이어 audio_files에 저장한다.
+
+        Returns:
+            텍스트 순서대로 출력 파일 경로 또는 해당 텍스트의 실패 예외
+        """
+        prompt_text = None
+        prompt_tokens = None
+        if voice_actor:
+            with timed_stage("reference_lookup"):
+                reference_wavs = await self._get_reference_wavs(voice_actor, session)
+            if reference_wavs:
+                with timed_stage("reference_encode"):
+                    host_tokens_path, _ = await self._get_reference_tokens(reference_wavs[0])
+                prompt_text = ["[AUTO]"]
+                prompt_tokens = [self._to_worker_path(host_tokens_path, "voice_samples")]
+
+        # (텍스트 번호, 청크 번호, 청크 텍스트)
+        chunks = [
+            (text_index, chunk_index, chunk)
+            for text_index, text in enumerate(texts)
+            for chunk_index, chunk in enumerate(split_text(text, settings.TTS_CHUNK_MAX_CHARS) or [text])
+        ]
+        logger.info(f"📦 배치 합성: 텍스트 {len(texts)}개, 청크 {len(chunks)}개")
+
+        with timed_stage("text2semantic"):
+            generated = await self.worker_client.generate_batch(
+                [
+                    {
+                        "text": chunk,
+                        "output_dir": self._to_worker_path(
+                            str(work_dir / f"{text_index}_{chunk_index}"), "temp_processing"
+                        ),
+                    }
+                    for text_index, chunk_index, chunk in chunks
+                ],
+                prompt_text=prompt_text,
+                prompt_tokens=prompt_tokens,
+                params=params,
+                timeout=120 * len(chunks),
+            )
 
-            # DB 접근이 가능한 경우 실패 상태 기록 시도
-            try:
-                with Session(engine) as session:
-                    generation = session.get(TTSGeneration, generation_id)
-                    if generation:
-                        generation.status = GenerationStatus.FAILED
-                        generation.error_message = f"백그라운드 작업 실패: {str(outer_e)}"
-                        generation.completed_at = datetime.now()
-                        session.add(generation)
-                        session.commit()
-                        logger.info(f"📝 실패 상태를 DB에 기록했습니다: {generation_id}")
-            except Exception as db_error:
-                logger.error(f"💾 DB 실패 상태 기록 실패: {db_error}")
+        errors: Dict[int, Exception] = {}
+        decode_items = []
+        decoded_chunks = []
+        for (text_index, chunk_index, _), result in zip(chunks, generated["results"]):
+            if "error" in result:
+                errors.setdefault(text_index, Exception(f"2단계 실패: {result['error']}"))
+                continue
+            chunk_path = work_dir / f"{text_index}_{chunk_index}.wav"
+            decode_items.append(
+                {
+                    "codes_path": result["codes_paths"][0],
+                    "output_path": self._to_worker_path(str(chunk_path), "temp_processing"),
+                }
+            )
+            decoded_chunks.append((text_index, chunk_index, chunk_path))
 
-            logger.error(f"🏁 Fish-Speech 백그라운드 TTS 작업 종료: {generation_id} (실패)")
+        with timed_stage("decode"):
+            decoded = await self.worker_client.decode_batch(
+                decode_items,
+                batch_size=settings.TTS_BATCH_DECODE_SIZE,
+                timeout=60 * max(1, len(decode_items)),
+            )
 
+        segments: Dict[int, List[Tuple[int, Path]]] = {}
+        for (text_index, chunk_index, chunk_path), result in zip(decoded_chunks, decoded["results"]):
+            if "error" in result:
+                errors.setdefault(text_index, Exception(f"3단계 실패: {result['error']}"))
+                continue
+            segments.setdefault(text_index, []).append((chunk_index, chunk_path))
+
+        outputs: List[object] = []
+        with timed_stage("chunk_merge"), self._discard_on_cancel(outputs):
+            for text_index in range(len(texts)):
+                if text_index in errors:
+                    outputs.append(errors[text_index])
+                    continue
+                output_path = self.audio_files_dir / f"fish_tts_{uuid.uuid4().hex[:8]}.wav"
+                try:
+                    paths = [path for _, path in sorted(segments[text_index])]
+                    if len(paths) == 1:
+                        shutil.move(str(paths[0]), output_path)
+                    else:
+                        loaded = [await asyncio.to_thread(sf.read, str(path), dtype="float32") for path in paths]
+                        sample_rate = loaded[0][1]
+                        audio = crossfade_concat(
+                            [a.mean(axis=1) if a.ndim > 1 else a for a, _ in loaded],
+                            sample_rate,
+                            settings.TTS_CHUNK_CROSSFADE_MS,
+                        )
+                        await asyncio.to_thread(sf.write, str(output_path), audio, sample_rate, subtype="PCM_16")
+                    outputs.append(str(output_path))
+                except Exception as e:
+                    outputs.append(Exception(f"최종 오디오 파일 생성 실패: {e}"))
+        return outputs
+
+    @staticmethod
+    @contextmanager
+    def _discard_on_cancel(outputs: List[object]):
+        """작업이 취소되면 이미 만든 출력 파일(outputs 중 경로)을 지움"""
+        try:
+            yield
+        except asyncio.CancelledError:
+            for output in outputs:
+                if isinstance(output, str):
+                    Path(output).unlink(missing_ok=True)
+            raise
 
     async def _generate_tts_audio(
         self,
         text: str,
         voice_actor: Optional[VoiceActor],
         generation_params: dict,
-        session: Session,
+        session: AsyncSession,
+        job_id: Optional[str] = None,
     ) -> str:
         """실제 Fish-Speech TTS 오디오 생성 (단일 버전)"""
-        await self.initialize_tts_model()
+        with timed_stage("setup"):
+            await self.initialize_tts_model()
+
+        with self._job_workspace(job_id) as work_dir:
+            return await self._generate_tts_audio_in(
+                text, voice_actor, generation_params, session, work_dir
+            )
 
+    async def _generate_tts_audio_in(
+        self,
+        text: str,
+        voice_actor: Optional[VoiceActor],
+        generation_params: dict,
+        session: AsyncSession,
+        work_dir: Path,
+    ) -> str:
         # 출력 파일 경로 생성
         output_filename = f"fish_tts_{uuid.uuid4().hex[:8]}.wav"
         output_path = self.audio_files_dir / output_filename
@@ -307,13 +903,14 @@ class FishSpeechTTSService:
             if voice_actor and session:
                 # Voice Cloning 사용
                 logger.info(f"🎭 Voice Cloning 모드: {voice_actor.name}")
-                reference_wavs = await self._get_reference_wavs(voice_actor, session)
+                with timed_stage("reference_lookup"):
+                    reference_wavs = await self._get_reference_wavs(voice_actor, session)
 
                 if reference_wavs:
                     logger.info(f"📂 참조 음성 파일: {len(reference_wavs)}개 사용")
                     try:
-                        await self._generate_with_voice_cloning(
-                            text, reference_wavs, str(output_path), generation_params
+                        await self._synthesize(
+                            text, reference_wavs, str(output_path), generation_params, work_dir
                         )
                         logger.info(f"✅ Voice Cloning 성공: {output_path}")
                     except Exception as voice_cloning_error:
@@ -324,45 +921,183 @@ class FishSpeechTTSService:
                         if "CUDA out of memory" in error_msg and len(reference_wavs) > 1:
                             logger.info(f"🔄 GPU 메모리 부족으로 참조 음성 개수 축소 후 재시도: {len(reference_wavs)} → 1개")
                             try:
-                                await self._generate_with_voice_cloning(
-                                    text, reference_wavs[:1], str(output_path), generation_params
+                                await self._synthesize(
+                                    text, reference_wavs[:1], str(output_path), generation_params, work_dir
                                 )
                                 logger.info(f"✅ Voice Cloning 재시도 성공: {output_path}")
                             except Exception as retry_error:
                                 logger.warning(f"⚠️ Voice Cloning 재시도도 실패, 기본 음성으로 fallback: {retry_error}")
-                                await self._generate_with_default_voice(
-                                    text, str(output_path), generation_params
+                                await self._synthesize(
+                                    text, None, str(output_path), generation_params, work_dir
                                 )
                                 logger.info(f"✅ 기본 음성 fallback 성공: {output_path}")
                         else:
                             # 다른 오류이거나 단일 참조에서도 실패한 경우 기본 음성 사용
                             logger.warning(f"⚠️ 기본 음성으로 fallback: {voice_cloning_error}")
-                            await self._generate_with_default_voice(
-                                text, str(output_path), generation_params
+                            await self._synthesize(
+                                text, None, str(output_path), generation_params, work_dir
                             )
                             logger.info(f"✅ 기본 음성 fallback 성공: {output_path}")
                 else:
                     logger.warning(f"⚠️ {voice_actor.name}의 적합한 참조 음성이 없습니다. 기본 음성 사용")
-                    await self._generate_with_default_voice(
-                        text, str(output_path), generation_params
+                    await self._synthesize(
+                        text, None, str(output_path), generation_params, work_dir
                     )
             else:
                 # 기본 음성 사용
                 logger.info("🔤 기본 음성으로 생성")
-                await self._generate_with_default_voice(
-                    text, str(output_path), generation_params
+                await self._synthesize(
+                    text, None, str(output_path), generation_params, work_dir
                 )
 
             logger.info(f"✅ Fish-Speech TTS 생성 완료: {output_path}")
 
+        except asyncio.CancelledError:
+            # 작업 취소: 쓰다 만 출력 파일 정리 (작업 디렉토리는 _job_workspace가 정리)
+            output_path.unlink(missing_ok=True)
+            raise
         except Exception as e:
             logger.error(f"❌ Fish-Speech TTS 생성 실패: {type(e).__name__}: {str(e)}")
+            output_path.unlink(missing_ok=True)
             raise Exception(f"Fish-Speech TTS 음성 생성에 실패했습니다: {str(e)}")
 
         return str(output_path)
 
 
-    async def _get_reference_wavs(self, voice_actor: VoiceActor, session: Session) -> List[str]:
+    async def _synthesize_one(
+        self,
+        text: str,
+        reference_wavs: Optional[List[str]],
+        output_path: str,
+        params: dict,
+        work_dir: Path,
+    ):
+        """텍스트 하나를 한 번에 합성 (참조 음성이 있으면 Voice Cloning)"""
+        if reference_wavs:
+            await self._generate_with_voice_cloning(text, reference_wavs, output_path, params, work_dir)
+        else:
+            await self._generate_with_default_voice(text, output_path, params, work_dir)
+
+    async def _synthesize_chunk(
+        self,
+        index: int,
+        text: str,
+        reference_wavs: Optional[List[str]],
+        params: dict,
+        work_dir: Path,
+    ) -> Tuple[np.ndarray, int]:
+        """청크 하나를 합성해 (모노 float32 오디오, 샘플레이트) 반환"""
+        chunk_dir = work_dir / f"chunk_{index}"
+        chunk_dir.mkdir(parents=True, exist_ok=True)
+        chunk_path = work_dir / f"chunk_{index}.wav"
+
+        async with self._chunk_semaphore:
+            await self._synthesize_one(text, reference_wavs, str(chunk_path), params, chunk_dir)
+
+        with timed_stage("chunk_merge"):
+            audio, sample_rate = await asyncio.to_thread(sf.read, str(chunk_path), dtype="float32")
+        if audio.ndim > 1:
+            audio = audio.mean(axis=1)
+        return audio, sample_rate
+
+    async def _synthesize(
+        self,
+        text: str,
+        reference_wavs: Optional[List[str]],
+        output_path: str,
+        params: dict,
+        work_dir: Path,
+    ):
+        """문장 단위로 나눠 병렬 합성한 뒤 크로스페이드로 이어 output_path에 저장
+
+        text2semantic 시간은 텍스트 길이에 비례하므로, 청크를 동시에 요청하면
+        한 청크의 디코딩과 다음 청크의 시맨틱 토큰 생성이 겹쳐 전체 시간이 줄어든다.
+        """
+        chunks = split_text(text, settings.TTS_CHUNK_MAX_CHARS)
+        if len(chunks) <= 1:
+            await self._synthesize_one(text, reference_wavs, output_path, params, work_dir)
+            return
+
+        logger.info(f"✂️ 문장 단위 분할 합성: {len(chunks)}개 청크")
+        tasks = [
+            asyncio.create_task(self._synthesize_chunk(i, chunk, reference_wavs, params, work_dir))
+            for i, chunk in enumerate(chunks)
+        ]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        sample_rate = results[0][1]
+        with timed_stage("chunk_merge"):
+            audio = crossfade_concat(
+                [segment for segment, _ in results], sample_rate, settings.TTS_CHUNK_CROSSFADE_MS
+            )
+            await asyncio.to_thread(sf.write, output_path, audio, sample_rate, subtype="PCM_16")
+        logger.info(f"🔗 청크 {len(chunks)}개 연결 완료: {output_path}")
+
+    async def open_stream(
+        self,
+        text: str,
+        voice_actor: Optional[VoiceActor],
+        session: AsyncSession,
+        params: dict,
+    ) -> AsyncIterator[bytes]:
+        """스트리밍 재생 준비 (참조 음성 선택, 워커 확인) 후 WAV 바이트 스트림 반환
+
+        준비 단계의 오류는 응답 헤더를 보내기 전에 발생하므로 라우터에서 HTTP 오류로 돌려줄 수 있다.
+        """
+        await self.initialize_tts_model()
+        await self._ensure_inference_worker()
+        info = await self._get_worker_info()
+        sample_rate = int(info.get("sample_rate") or 44100)
+
+        reference_wavs: List[str] = []
+        if voice_actor and session:
+            reference_wavs = await self._get_reference_wavs(voice_actor, session)
+
+        return self._stream_wav(text, reference_wavs, params, sample_rate)
+
+    async def _stream_wav(
+        self, text: str, reference_wavs: List[str], params: dict, sample_rate: int
+    ) -> AsyncIterator[bytes]:
+        """첫 청크가 합성되는 즉시 재생할 수 있도록 WAV(PCM16)를 순서대로 흘려보냄
+
+        첫 청크는 TTS_CHUNK_FIRST_MAX_CHARS로 짧게 잘라 첫 음성까지의 지연을 줄이고,
+        나머지 청크는 뒤에서 병렬로 합성된다. 클라이언트가 연결을 끊으면 남은 청크 합성을 취소한다.
+        """
+        chunks = split_text(
+            text, settings.TTS_CHUNK_MAX_CHARS, first_max_chars=settings.TTS_CHUNK_FIRST_MAX_CHARS
+        )
+        logger.info(f"📡 TTS 스트리밍 시작: {len(chunks)}개 청크")
+
+        with self._job_workspace() as work_dir:
+            tasks = [
+                asyncio.create_task(self._synthesize_chunk(i, chunk, reference_wavs, params, work_dir))
+                for i, chunk in enumerate(chunks)
+            ]
+            try:
+                yield wav_stream_header(sample_rate)
+                fader = StreamingCrossfader(sample_rate, settings.TTS_CHUNK_CROSSFADE_MS)
+                for task in tasks:
+                    audio, chunk_rate = await task
+                    if chunk_rate != sample_rate:
+                        raise Exception(f"청크 샘플레이트 불일치: {chunk_rate} != {sample_rate}")
+                    yield to_pcm16(fader.push(audio))
+                yield to_pcm16(fader.flush())
+                logger.info("✅ TTS 스트리밍 완료")
+            except Exception as e:
+                # 헤더를 이미 보냈으므로 상태 코드를 바꿀 수 없음 - 로그만 남기고 스트림 종료
+                logger.error(f"❌ TTS 스트리밍 실패: {e}")
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _get_reference_wavs(self, voice_actor: VoiceActor, session: AsyncSession) -> List[str]:
         """성우의 참조 음성 파일들을 가져오기 (개선된 다중 참조 로직)"""
         statement = (
             select(VoiceSample)
@@ -370,7 +1105,7 @@ class FishSpeechTTSService:
             .limit(10)  # 더 많은 샘플을 조회하여 선택권 증대
         )
 
-        samples = session.exec(statement).all()
+        samples = (await session.exec(statement)).all()
         reference_wavs = []
 
         # 파일 크기별로 정렬하여 적절한 크기의 파일들 우선 선택
@@ -425,24 +1160,19 @@ class FishSpeechTTSService:
 
         return reference_wavs
 
-    async def _setup_working_directory(self):
-        """Fish-Speech 작업 디렉토리 설정"""
+    @contextmanager
+    def _job_workspace(self, job_id: Optional[str] = None):
+        """생성 작업 전용 임시 디렉토리 (토큰/중간 산출물)
+
+        작업마다 디렉토리를 분리해 동시에 실행되는 생성이 서로의 codes_N.npy를 덮어쓰지 않게 하고,
+        성공/실패/취소(CancelledError 포함) 모두 끝나면 디렉토리를 삭제한다.
+        """
+        work_dir = self.jobs_dir / (job_id or uuid.uuid4().hex)
+        work_dir.mkdir(parents=True, exist_ok=True)
         try:
-            # Docker 컨테이너 내부에서 작업 디렉토리 확인 및 생성
-            setup_cmd = [
-                "bash", "-c", 
-                "cd /workspace && mkdir -p temp_processing && cd temp_processing"
-            ]
-            
-            result = await self._run_docker_command(setup_cmd, timeout=10)
-            if result.returncode != 0:
-                raise Exception(f"작업 디렉토리 설정 실패: {result.stderr}")
-            
-            logger.info("✅ Fish-Speech 작업 디렉토리 설정 완료")
-            
-        except Exception as e:
-            logger.error(f"❌ 작업 디렉토리 설정 실패: {e}")
-            raise
+            yield work_dir
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
 
     async def _check_gpu_available(self) -> bool:
         """GPU 사용 가능 여부 확인"""
@@ -497,15 +1227,12 @@ class FishSpeechTTSService:
             raise
 
     async def _generate_with_voice_cloning(
-        self, text: str, reference_wavs: List[str], output_path: str, params: dict
+        self, text: str, reference_wavs: List[str], output_path: str, params: dict, work_dir: Path
     ):
         """Fish-Speech 3단계 파이프라인을 사용한 Voice Cloning TTS 생성"""
         try:
             logger.info(f"🎭 Fish-Speech Voice Cloning 시작: {len(reference_wavs)}개 참조 음성 사용")
             
-            # 작업 디렉토리 설정
-            await self._setup_working_directory()
-            
             # 첫 번째 참조 음성 파일 사용
             reference_audio = reference_wavs[0]
             logger.info(f"📂 참조 음성 파일: {reference_audio}")
@@ -517,74 +1244,55 @@ class FishSpeechTTSService:
             
             # Docker 컨테이너 내부 경로 (실제 마운트된 경로 사용)
             # host_ref_path가 voice_samples/subdir/file.wav 형태라면 subdir도 포함해야 함
-            if "voice_samples" in str(host_ref_path):
-                # voice_samples 이후의 상대 경로 추출
-                relative_path = str(host_ref_path).split("voice_samples/")[-1]
-                container_ref_audio = f"/workspace/voice_samples/{relative_path}"
-            else:
-                container_ref_audio = f"/workspace/voice_samples/{host_ref_path.name}"
-            
-            container_output = f"/workspace/audio_files/{Path(output_path).name}"
-            
-            # 컨테이너 내부에서 파일 존재 확인
-            check_file_cmd = ["test", "-f", container_ref_audio]
-            check_result = await self._run_docker_command(check_file_cmd, timeout=5)
-            if check_result.returncode != 0:
-                raise Exception(f"컨테이너 내부에서 참조 음성 파일을 찾을 수 없습니다: {container_ref_audio}")
+            container_ref_audio = self._to_worker_path(str(host_ref_path), "voice_samples")
+            container_output = self._to_worker_path(output_path)
             
-            # 체크포인트 경로 확인
-            await self._verify_checkpoint_paths()
+            # 컨테이너/체크포인트는 initialize_tts_model의 환경 캐시로 확인됨
+            # (참조 파일은 공유 마운트라 위의 호스트 확인으로 충분)
+            with timed_stage("setup"):
+                # 상주 워커 확인 (모델은 워커 기동 시 한 번만 로드됨)
+                await self._ensure_inference_worker()
+
+            # 중간 산출물은 작업 전용 디렉토리에 기록
+            worker_work_dir = self._to_worker_path(str(work_dir), "temp_processing")
             
-            # 작업 디렉토리를 Fish-Speech 디렉토리로 변경하여 실행
-            work_dir_prefix = f"cd {self.fish_speech_dir} &&"
-            
-            # 1단계: 참조 오디오를 토큰으로 변환
+            # 1단계: 참조 오디오를 토큰으로 변환 (같은 참조 파일은 캐시된 토큰 재사용)
             logger.info("🔄 1단계: 참조 오디오 → 토큰 변환")
-            step1_cmd = [
-                "bash", "-c",
-                f"{work_dir_prefix} python fish_speech/models/dac/inference.py "
-                f"-i {container_ref_audio} "
-                f"--checkpoint-path {self.checkpoint_dir}/codec.pth"
-            ]
-            
-            result1 = await self._run_docker_command(step1_cmd, timeout=60)
-            if result1.returncode != 0:
-                raise Exception(f"1단계 실패: {result1.stderr}")
+            try:
+                with timed_stage("reference_encode"):
+                    host_tokens_path, cache_hit = await self._get_reference_tokens(str(host_ref_path))
+            except Exception as e:
+                raise Exception(f"1단계 실패: {e}")
+            prompt_tokens_path = self._to_worker_path(host_tokens_path, "voice_samples")
             
-            logger.info("✅ 1단계 완료: 참조 오디오 토큰 생성")
+            logger.info(f"✅ 1단계 완료: 참조 오디오 토큰 {'캐시 사용' if cache_hit else '생성'}")
             
             # 2단계: 텍스트를 시맨틱 토큰으로 변환
             logger.info("🔄 2단계: 텍스트 → 시맨틱 토큰 변환")
-            step2_cmd = [
-                "bash", "-c",
-                f"{work_dir_prefix} python fish_speech/models/text2semantic/inference.py "
-                f"--text '{text}' "
-                f"--prompt-text '[AUTO]' "
-                f"--prompt-tokens 'fake.npy' "
-                f"--checkpoint-path {self.checkpoint_dir} "
-                f"--output-dir . "
-                f"--compile"
-            ]
-            
-            result2 = await self._run_docker_command(step2_cmd, timeout=120)
-            if result2.returncode != 0:
-                raise Exception(f"2단계 실패: {result2.stderr}")
+            try:
+                with timed_stage("text2semantic"):
+                    semantic_result = await self.worker_client.generate(
+                        text=text,
+                        output_dir=worker_work_dir,
+                        prompt_text=["[AUTO]"],
+                        prompt_tokens=[prompt_tokens_path],
+                        params=params,
+                        timeout=120,
+                    )
+            except Exception as e:
+                raise Exception(f"2단계 실패: {e}")
             
             logger.info("✅ 2단계 완료: 시맨틱 토큰 생성")
             
             # 3단계: 토큰을 최종 오디오로 변환
             logger.info("🔄 3단계: 토큰 → 최종 오디오 변환")
-            step3_cmd = [
-                "bash", "-c",
-                f"{work_dir_prefix} python fish_speech/models/dac/inference.py "
-                f"-i 'codes_0.npy' "
-                f"--output-path {container_output} "
-                f"--checkpoint-path {self.checkpoint_dir}/codec.pth"
-            ]
-            
-            result3 = await self._run_docker_command(step3_cmd, timeout=60)
-            if result3.returncode != 0:
-                raise Exception(f"3단계 실패: {result3.stderr}")
+            try:
+                with timed_stage("decode"):
+                    await self.worker_client.decode(
+                        semantic_result["codes_paths"][0], container_output, timeout=60
+                    )
+            except Exception as e:
+                raise Exception(f"3단계 실패: {e}")
             
             logger.info("✅ 3단계 완료: 최종 오디오 생성")
             
@@ -596,60 +1304,46 @@ class FishSpeechTTSService:
 
         except Exception as e:
             logger.error(f"❌ Fish-Speech Voice Cloning 실패: {e}")
+            self.environment.invalidate("Voice Cloning 실패")
             raise Exception(f"Fish-Speech Voice Cloning 실패: {str(e)}")
 
-    async def _generate_with_default_voice(self, text: str, output_path: str, params: dict):
+    async def _generate_with_default_voice(
+        self, text: str, output_path: str, params: dict, work_dir: Path
+    ):
         """Fish-Speech를 사용한 기본 음성 TTS 생성 (참조 음성 없이)"""
         try:
             logger.info("🔤 Fish-Speech 기본 음성으로 TTS 생성")
             
-            # 작업 디렉토리 설정
-            await self._setup_working_directory()
-            
-            # 체크포인트 경로 확인
-            await self._verify_checkpoint_paths()
-            
+            with timed_stage("setup"):
+                # 상주 워커 확인 (모델은 워커 기동 시 한 번만 로드됨)
+                await self._ensure_inference_worker()
+
             # Docker 컨테이너 내부 경로
-            container_output = f"/workspace/audio_files/{Path(output_path).name}"
-            
-            # 작업 디렉토리를 Fish-Speech 디렉토리로 변경하여 실행
-            work_dir_prefix = f"cd {self.fish_speech_dir} &&"
+            container_output = self._to_worker_path(output_path)
+            worker_work_dir = self._to_worker_path(str(work_dir), "temp_processing")
             
             # 기본 음성의 경우 2단계부터 시작 (참조 음성 없이)
             logger.info("🔄 텍스트 → 시맨틱 토큰 변환 (기본 음성)")
-            step2_cmd = [
-                "bash", "-c",
-                f"{work_dir_prefix} python fish_speech/models/text2semantic/inference.py "
-                f"--text '{text}' "
-                f"--checkpoint-path {self.checkpoint_dir} "
-                f"--output-dir . "
-                f"--compile"
-            ]
-            
-            result2 = await self._run_docker_command(step2_cmd, timeout=120)
-            if result2.returncode != 0:
-                raise Exception(f"텍스트 변환 실패: {result2.stderr}")
+            try:
+                with timed_stage("text2semantic"):
+                    semantic_result = await self.worker_client.generate(
+                        text=text, output_dir=worker_work_dir, params=params, timeout=120
+                    )
+            except Exception as e:
+                raise Exception(f"텍스트 변환 실패: {e}")
             
             logger.info("✅ 텍스트 → 시맨틱 토큰 변환 완료")
-            
-            # codes_0.npy 파일 존재 확인
-            codes_check_cmd = ["bash", "-c", f"{work_dir_prefix} ls -la codes_*.npy || echo 'No codes files found'"]
-            codes_result = await self._run_docker_command(codes_check_cmd, timeout=10)
-            logger.info(f"🔍 codes 파일 확인: {codes_result.stdout.strip()}")
+            logger.info(f"🔍 codes 파일 확인: {semantic_result['codes_paths']}")
             
             # 3단계: 토큰을 최종 오디오로 변환
             logger.info("🔄 토큰 → 최종 오디오 변환")
-            step3_cmd = [
-                "bash", "-c",
-                f"{work_dir_prefix} python fish_speech/models/dac/inference.py "
-                f"-i codes_0.npy "
-                f"--output-path {container_output} "
-                f"--checkpoint-path {self.checkpoint_dir}/codec.pth"
-            ]
-            
-            result3 = await self._run_docker_command(step3_cmd, timeout=60)
-            if result3.returncode != 0:
-                raise Exception(f"오디오 생성 실패: {result3.stderr}")
+            try:
+                with timed_stage("decode"):
+                    await self.worker_client.decode(
+                        semantic_result["codes_paths"][0], container_output, timeout=60
+                    )
+            except Exception as e:
+                raise Exception(f"오디오 생성 실패: {e}")
             
             logger.info("✅ 최종 오디오 생성 완료")
             
@@ -661,30 +1355,13 @@ class FishSpeechTTSService:
 
         except Exception as e:
             logger.error(f"❌ Fish-Speech 기본 TTS 실패: {e}")
+            self.environment.invalidate("기본 음성 TTS 실패")
             raise Exception(f"Fish-Speech 기본 TTS 실패: {str(e)}")
 
     async def _get_audio_duration(self, audio_file_path: str) -> float:
-        """오디오 파일의 정확한 길이를 계산"""
+        """오디오 파일 길이 (헤더만 읽어 계산, 디코딩하지 않음)"""
         try:
-            # librosa를 사용한 정확한 duration 계산
-            try:
-                import librosa
-                y, sr = librosa.load(audio_file_path)
-                duration = len(y) / sr
-                logger.debug(f"librosa로 계산된 길이: {duration:.2f}초")
-                return duration
-            except ImportError:
-                logger.debug("librosa가 없어 wave 모듈 사용")
-
-            # wave 모듈을 사용한 duration 계산
-            import wave
-            with wave.open(audio_file_path, "rb") as wav_file:
-                frames = wav_file.getnframes()
-                sample_rate = wav_file.getframerate()
-                duration = frames / sample_rate
-                logger.debug(f"wave 모듈로 계산된 길이: {duration:.2f}초")
-                return duration
-
+            return probe_audio(audio_file_path).duration
         except Exception as e:
             logger.warning(f"오디오 길이 계산 실패: {e}")
             # 파일 크기 기반 추정
@@ -697,15 +1374,24 @@ class FishSpeechTTSService:
                 return 3.0  # 기본값
 
     async def _calculate_quality_score(
-        self, audio_file_path: str, text: str, is_voice_cloning: bool = False, reference_count: int = 0
+        self,
+        audio_file_path: str,
+        text: str,
+        is_voice_cloning: bool = False,
+        reference_count: int = 0,
+        duration: Optional[float] = None,
     ) -> float:
-        """TTS 품질 점수 계산 (다중 참조 Voice Cloning 개선)"""
+        """TTS 품질 점수 계산 (다중 참조 Voice Cloning 개선)
+
+        duration을 넘기면 파일을 다시 읽지 않는다.
+        """
         try:
             if not Path(audio_file_path).exists():
                 return 0.0
 
             file_size = Path(audio_file_path).stat().st_size
-            duration = await self._get_audio_duration(audio_file_path)
+            if duration is None:
+                duration = await self._get_audio_duration(audio_file_path)
 
             # 기본 점수 계산 (Fish-Speech는 고품질)
             base_score = 90.0  # Fish-Speech는 90점부터 시작
@@ -768,55 +1454,35 @@ class FishSpeechTTSService:
             return 90.0  # Fish-Speech 기본 점수
 
     async def cancel_generation(self, generation_id: uuid.UUID) -> bool:
-        """TTS 생성 작업 취소"""
-        with Session(engine) as session:
-            generation = session.get(TTSGeneration, generation_id)
-            if not generation:
+        """TTS 생성 작업 취소
+
+        DB 상태를 먼저 CANCELLED로 바꾸고(완료된 작업은 그대로), 이 프로세스에서 처리 중이면 바로 중단한다.
+        다른 프로세스(큐 워커)에서 처리 중인 작업은 그 워커가 취소를 감지해 중단한다.
+        """
+        async with AsyncSession(self.db_engine, expire_on_commit=False) as session:
+            if not await session.run_sync(tts_queue.cancel_generation, generation_id):
                 return False
 
-            if generation.status in [GenerationStatus.PENDING, GenerationStatus.PROCESSING]:
-                generation.status = GenerationStatus.CANCELLED
-                generation.completed_at = datetime.now()
-                session.add(generation)
-                session.commit()
-                logger.info(f"Fish-Speech TTS 생성 취소됨: {generation_id}")
-                return True
+        self.abort_generation(generation_id)
 
-            return False
+        # 진행 중이던 작업의 중간 산출물 정리 (중단된 작업도 작업 디렉토리를 지우지만 다른 프로세스일 수 있음)
+        shutil.rmtree(self.jobs_dir / str(generation_id), ignore_errors=True)
+        logger.info(f"Fish-Speech TTS 생성 취소됨: {generation_id}")
+        return True
 
     async def get_generation_status(self, generation_id: uuid.UUID) -> Optional[TTSGeneration]:
         """TTS 생성 상태 조회"""
-        with Session(engine) as session:
-            return session.get(TTSGeneration, generation_id)
-
-    async def process_scenario_tts_generation(
-        self, generation_id: uuid.UUID, scenario_tts_id: uuid.UUID
-    ) -> None:
-        """시나리오 TTS 생성 작업 처리"""
-        with Session(engine) as session:
-            # 일반 TTS 생성 처리
-            await self.process_tts_generation(generation_id)
-
-            # 생성 결과를 ScenarioTTS에 반영
-            generation = session.get(TTSGeneration, generation_id)
-            if generation and generation.status == GenerationStatus.COMPLETED:
-                # ScenarioTTS 업데이트를 위해 동적 import 사용
-                from app.models.scenario_tts import ScenarioTTS
-
-                scenario_tts = session.get(ScenarioTTS, scenario_tts_id)
-                if scenario_tts:
-                    scenario_tts.audio_file_path = generation.audio_file_path
-                    scenario_tts.updated_at = datetime.now()
-                    session.add(scenario_tts)
-                    session.commit()
-
-                    logger.info(f"ScenarioTTS {scenario_tts_id} updated with audio file")
+        async with AsyncSession(self.db_engine, expire_on_commit=False) as session:
+            return await session.get(TTSGeneration, generation_id)
 
     async def batch_generate_tts(
-        self, script_ids: List[uuid.UUID], force_regenerate: bool = False
+        self,
+        script_ids: List[uuid.UUID],
+        force_regenerate: bool = False,
+        priority: TTSPriority = TTSPriority.BATCH,
     ) -> dict:
-        """여러 TTS 스크립트를 한 번에 생성"""
-        with Session(engine) as session:
+        """여러 TTS 스크립트를 한 번에 생성 (priority: batch 또는 background 사전 렌더링)"""
+        async with AsyncSession(self.db_engine, expire_on_commit=False) as session:
             results = {
                 "total_scripts": len(script_ids),
                 "generated": 0,
@@ -827,16 +1493,18 @@ class FishSpeechTTSService:
 
             for script_id in script_ids:
                 try:
-                    script = session.get(TTSScript, script_id)
+                    script = await session.get(TTSScript, script_id)
                     if not script:
                         results["failed"] += 1
                         continue
 
                     # 기존 생성 확인
-                    existing_generation = session.exec(
-                        select(TTSGeneration).where(
-                            TTSGeneration.script_id == script_id,
-                            TTSGeneration.status == GenerationStatus.COMPLETED,
+                    existing_generation = (
+                        await session.exec(
+                            select(TTSGeneration).where(
+                                TTSGeneration.script_id == script_id,
+                                TTSGeneration.status == GenerationStatus.COMPLETED,
+                            )
                         )
                     ).first()
 
@@ -848,19 +1516,21 @@ class FishSpeechTTSService:
                     generation = TTSGeneration(
                         script_id=script_id,
                         requested_by=script.created_by,
-                        generation_params={"batch_mode": True, "engine": "fish-speech"},
+                        priority=priority,
+                        generation_params={
+                            "batch_mode": True,
+                            "engine": "fish-speech",
+                            # 강제 재생성이면 캐시된 음성을 쓰지 않고 새로 합성
+                            "use_cache": not force_regenerate,
+                        },
                     )
 
-                    session.add(generation)
-                    session.commit()
-                    session.refresh(generation)
+                    # 작업 큐에 등록 (큐 워커가 처리)
+                    await session.run_sync(enqueue_generation, generation)
 
                     results["generation_ids"].append(str(generation.id))
                     results["generated"] += 1
 
-                    # 백그라운드에서 처리
-                    asyncio.create_task(self.process_tts_generation(generation.id))
-
                 except Exception as e:
                     logger.error(f"Failed to create batch Fish-Speech TTS for script {script_id}: {e}")
                     results["failed"] += 1
@@ -878,7 +1548,8 @@ class FishSpeechTTSService:
             
             # 기본 음성 테스트
             default_test_file = self.audio_files_dir / "test_fish_speech_default.wav"
-            await self._generate_with_default_voice(test_text, str(default_test_file), {})
+            with self._job_workspace() as work_dir:
+                await self._generate_with_default_voice(test_text, str(default_test_file), {}, work_dir)
 
             # Voice Cloning 테스트 (참조 음성이 있는 경우)
             voice_cloning_result = None
@@ -894,9 +1565,10 @@ class FishSpeechTTSService:
             if reference_wavs:
                 try:
                     voice_cloning_test_file = self.audio_files_dir / "test_fish_speech_voice_cloning.wav"
-                    await self._generate_with_voice_cloning(
-                        test_text, reference_wavs, str(voice_cloning_test_file), {}
-                    )
+                    with self._job_workspace() as work_dir:
+                        await self._generate_with_voice_cloning(
+                            test_text, reference_wavs, str(voice_cloning_test_file), {}, work_dir
+                        )
                     
                     if voice_cloning_test_file.exists():
                         vc_file_size = voice_cloning_test_file.stat().st_size
@@ -919,7 +1591,8 @@ class FishSpeechTTSService:
                 file_size = default_test_file.stat().st_size
                 duration = await self._get_audio_duration(str(default_test_file))
                 quality_score = await self._calculate_quality_score(
-                    str(default_test_file), test_text, is_voice_cloning=False, reference_count=0
+                    str(default_test_file), test_text, is_voice_cloning=False, reference_count=0,
+                    duration=duration,
                 )
 
                 result = {
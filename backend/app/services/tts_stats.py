@@ -0,0 +1,98 @@
+"""
+TTS 일별 집계 (TTSDailyStats)
+
+대시보드가 ttsgeneration 전체를 매번 날짜별로 집계하지 않도록,
+생성 작업이 완료/최종 실패하는 시점에 해당 날짜 행을 증분 갱신한다.
+갱신은 상태 변경과 같은 트랜잭션에서 실행되므로 commit은 호출하는 쪽에서 한다.
+과거 데이터는 마이그레이션에서 한 번 채운다.
+"""
+import logging
+from datetime import date, datetime
+from typing import Dict
+
+from sqlalchemy import update
+from sqlmodel import Session, select
+
+from app.models.tts import TTSDailyStats, TTSGeneration
+
+logger = logging.getLogger(__name__)
+
+COUNTER_COLUMNS = (
+    "completed_count",
+    "failed_count",
+    "cache_hit_count",
+    "quality_sum",
+    "quality_count",
+    "duration_sum",
+)
+
+
+def _insert_for(session: Session):
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert
+
+
+def _increment(session: Session, day: date, **increments) -> None:
+    """day 행의 카운터를 원자적으로 증가 (행이 없으면 생성)"""
+    now = datetime.now()
+    table = TTSDailyStats.__table__
+    insert = _insert_for(session)
+
+    if insert is not None:
+        values = {column: 0 for column in COUNTER_COLUMNS}
+        values.update(increments)
+        statement = insert(table).values(day=day, updated_at=now, **values)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.day],
+            set_={
+                **{column: table.c[column] + statement.excluded[column] for column in increments},
+                "updated_at": now,
+            },
+        )
+        session.execute(statement)
+        return
+
+    result = session.execute(
+        update(TTSDailyStats)
+        .where(TTSDailyStats.day == day)
+        .values(
+            updated_at=now,
+            **{column: getattr(TTSDailyStats, column) + value for column, value in increments.items()},
+        )
+    )
+    if result.rowcount == 0:
+        session.add(TTSDailyStats(day=day, updated_at=now, **increments))
+        session.flush()
+
+
+def record_completion(session: Session, generation: TTSGeneration) -> None:
+    """생성 완료 반영 (캐시 적중으로 즉시 완료된 경우 포함)"""
+    increments = {"completed_count": 1}
+    if generation.cache_hit:
+        increments["cache_hit_count"] = 1
+    if generation.quality_score is not None:
+        increments["quality_sum"] = float(generation.quality_score)
+        increments["quality_count"] = 1
+    if generation.duration:
+        increments["duration_sum"] = float(generation.duration)
+
+    _increment(session, (generation.completed_at or datetime.now()).date(), **increments)
+
+
+def record_failure(session: Session, generation: TTSGeneration) -> None:
+    """최종 실패 반영 (재시도 예정인 실패는 제외)"""
+    _increment(session, (generation.completed_at or datetime.now()).date(), failed_count=1)
+
+
+def get_daily_stats(session: Session, start: date, end: date) -> Dict[date, TTSDailyStats]:
+    """[start, end] 기간의 일별 집계 (집계가 없는 날은 포함되지 않음)"""
+    rows = session.exec(
+        select(TTSDailyStats).where(TTSDailyStats.day >= start, TTSDailyStats.day <= end)
+    ).all()
+    return {row.day: row for row in rows}
@@ -0,0 +1,108 @@
+"""
+TTS 생성 단계별 소요 시간 (TTSGeneration.stage_timings)
+
+생성 작업 하나를 처리하는 동안 StageTimer를 컨텍스트 변수에 올려 두고, 파이프라인 곳곳에서
+`timed_stage("decode")`처럼 감싸 기록한다. 타이머가 없으면(스트리밍 미리듣기, 기능 테스트 등) 아무 일도 하지 않는다.
+
+- 같은 단계가 여러 번 실행되면(분할 합성의 청크별 text2semantic/decode) 소요 시간을 합산한다.
+  청크는 병렬로 합성되므로 단계 합계가 전체 처리 시간보다 클 수 있다
+- 값은 초 단위이며, queue_wait(등록 → 획득)와 total(획득 → 완료)도 함께 저장한다
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+# 파이프라인 단계 (표시 순서)
+STAGES = (
+    "queue_wait",
+    "setup",
+    "reference_lookup",
+    "reference_encode",
+    "text2semantic",
+    "decode",
+    "chunk_merge",
+    "file_probe",
+    "quality_score",
+    "db_commit",
+    "total",
+)
+
+PERCENTILES = (50, 95, 99)
+
+_current_timer: ContextVar[Optional["StageTimer"]] = ContextVar("tts_stage_timer", default=None)
+
+
+class StageTimer:
+    """단계 이름별 누적 소요 시간"""
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.durations[stage] = self.durations.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def record_span(self, stage: str, start: Optional[datetime], end: Optional[datetime]) -> None:
+        """DB에 기록된 시각 사이의 구간 (queue_wait 등)"""
+        if start and end:
+            self.add(stage, max(0.0, (end - start).total_seconds()))
+
+    def to_dict(self) -> Dict[str, float]:
+        return {name: round(seconds, 4) for name, seconds in self.durations.items()}
+
+
+@contextmanager
+def activate(timer: StageTimer):
+    """현재 작업(과 이 안에서 만든 asyncio 태스크)에서 timed_stage가 timer에 기록하도록 설정"""
+    token = _current_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        _current_timer.reset(token)
+
+
+@contextmanager
+def timed_stage(name: str):
+    """활성 타이머가 있으면 감싼 구간의 시간을 name 단계에 더함"""
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    with timer.stage(name):
+        yield
+
+
+def summarize(values: Iterable[float]) -> Dict[str, Any]:
+    """소요 시간 목록(초) → 건수/평균/p50/p95/p99/최대 (ms)"""
+    data = np.asarray(list(values), dtype=np.float64) * 1000
+    if data.size == 0:
+        return {"count": 0}
+    summary: Dict[str, Any] = {"count": int(data.size), "mean_ms": round(float(data.mean()), 3)}
+    for p in PERCENTILES:
+        summary[f"p{p}_ms"] = round(float(np.percentile(data, p)), 3)
+    summary["max_ms"] = round(float(data.max()), 3)
+    return summary
+
+
+def aggregate(stage_timings: Iterable[Optional[Dict[str, float]]]) -> Dict[str, Dict[str, Any]]:
+    """여러 생성 작업의 stage_timings → 단계별 백분위 (기록이 있는 단계만, STAGES 순서)"""
+    values: Dict[str, list] = {}
+    for timings in stage_timings:
+        for stage, seconds in (timings or {}).items():
+            if isinstance(seconds, (int, float)):
+                values.setdefault(stage, []).append(seconds)
+
+    ordered = [stage for stage in STAGES if stage in values]
+    ordered += sorted(stage for stage in values if stage not in STAGES)
+    return {stage: summarize(values[stage]) for stage in ordered}
@@ -0,0 +1,272 @@
+"""
+TTS 작업 큐 워커
+
+API 프로세스와 분리된 프로세스에서 PENDING 상태의 TTSGeneration을 가져와 처리한다.
+
+    python -m app.worker
+
+동시 처리 수는 TTS_MAX_CONCURRENT_JOBS, 임대/재시도 설정은 TTS_QUEUE_* 참조.
+슬롯이 모두 차 있어도 TTS_QUEUE_INTERACTIVE_SLOTS개까지는 대화형(interactive) 작업만 추가로 가져와
+에디터 미리듣기가 일괄 생성 뒤에 밀리지 않게 한다 (전용 슬롯 작업은 일반 동시 처리 제한을 기다리지 않음).
+DB 작업은 비동기 엔진(async_engine)으로 처리해 획득/하트비트가 합성 중인 작업을 막지 않는다.
+배치 생성 작업은 같은 성우/파라미터끼리 TTS_BATCH_MAX_SIZE개까지 묶어 한 번에 합성한다 (동시 처리 1개로 계산).
+워커가 여러 개면 TTSWorker 테이블에 등록된 워커들로 해시 링을 만들어 성우별 담당 워커를 정한다 (TTS_AFFINITY_*).
+취소된 작업은 TTS_QUEUE_CANCEL_POLL_SECONDS마다 확인해 합성 중이어도 즉시 중단한다 (추론 워커에도 cancel 전달).
+GPU마다 추론 워커를 따로 두고 FISH_SPEECH_WORKER_PORT로 큐 워커와 1:1로 연결해야 warm 상태가 유지된다.
+"""
+import asyncio
+import logging
+import os
+import signal
+import socket
+import uuid
+from typing import Dict, List, Optional, Set
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.db import async_engine
+from app.services import tts_queue, tts_scheduler
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class TTSQueueWorker:
+    """DB 큐에서 작업을 획득해 처리하는 워커 (프로세스당 하나)"""
+
+    def __init__(self, worker_id: Optional[str] = None, concurrency: Optional[int] = None):
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.concurrency = max(1, concurrency or settings.TTS_MAX_CONCURRENT_JOBS)
+        self._running: Dict[uuid.UUID, asyncio.Task] = {}
+        self._reserved: Set[uuid.UUID] = set()  # 대화형 전용 슬롯으로 처리 중인 작업
+        self._stopping = asyncio.Event()
+        self.warm = tts_scheduler.WarmContext(settings.TTS_AFFINITY_WARM_VOICES)
+        self.ring: Optional[tts_scheduler.HashRing] = None
+
+    def stop(self) -> None:
+        """새 작업 획득을 멈춤 (처리 중인 작업은 끝까지 진행)"""
+        if not self._stopping.is_set():
+            logger.info(f"🛑 TTS 큐 워커 종료 요청: {self.worker_id}")
+            self._stopping.set()
+
+    async def run(self) -> None:
+        logger.info(f"👷 TTS 큐 워커 시작: {self.worker_id} (동시 처리 {self.concurrency}개)")
+        last_recovery = 0.0
+        loop = asyncio.get_running_loop()
+        cancel_watch = asyncio.create_task(self._watch_cancellations())
+
+        try:
+            while not self._stopping.is_set():
+                # 크래시한 워커가 남긴 작업 회수 + 워커 등록 갱신 (하트비트 주기마다)
+                if loop.time() - last_recovery >= settings.TTS_QUEUE_HEARTBEAT_SECONDS:
+                    last_recovery = loop.time()
+                    try:
+                        async with AsyncSession(async_engine) as session:
+                            await session.run_sync(tts_queue.recover_expired_leases)
+                    except Exception as e:
+                        logger.error(f"❌ 임대 만료 작업 회수 실패: {e}")
+                    await self._refresh_registry()
+
+                claimed: List[uuid.UUID] = []
+                # 일반 슬롯이 다 찼으면 대화형 전용 슬롯이 남아 있을 때만 대화형 작업을 가져옴
+                interactive_only = len(self._running) - len(self._reserved) >= self.concurrency
+                if not interactive_only or len(self._reserved) < settings.TTS_QUEUE_INTERACTIVE_SLOTS:
+                    try:
+                        async with AsyncSession(async_engine) as session:
+                            claimed = await session.run_sync(self._claim, interactive_only)
+                    except Exception as e:
+                        logger.error(f"❌ TTS 작업 획득 실패: {e}")
+
+                if claimed:
+                    reserved = interactive_only
+                    if len(claimed) == 1:
+                        job = self._run_job(claimed[0], reserved)
+                    else:
+                        job = self._run_batch(claimed, reserved)
+                    task = asyncio.create_task(job)
+                    self._running[claimed[0]] = task
+                    if reserved:
+                        self._reserved.add(claimed[0])
+                    task.add_done_callback(lambda _, job_id=claimed[0]: self._release_slot(job_id))
+                    continue
+
+                try:
+                    await asyncio.wait_for(
+                        self._stopping.wait(), timeout=settings.TTS_QUEUE_POLL_INTERVAL
+                    )
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if self._running:
+                logger.info(f"⏳ 처리 중인 작업 {len(self._running)}개 완료 대기")
+                await asyncio.gather(*self._running.values(), return_exceptions=True)
+            cancel_watch.cancel()
+            try:
+                async with AsyncSession(async_engine) as session:
+                    await session.run_sync(tts_scheduler.unregister_worker, self.worker_id)
+            except Exception as e:
+                logger.warning(f"⚠️ TTS 워커 등록 해제 실패: {e}")
+            logger.info(f"👋 TTS 큐 워커 종료: {self.worker_id}")
+
+    def _release_slot(self, job_id: uuid.UUID) -> None:
+        self._running.pop(job_id, None)
+        self._reserved.discard(job_id)
+
+    async def _refresh_registry(self) -> None:
+        """워커 하트비트/warm 적중 집계 기록 후 살아 있는 워커로 해시 링 재구성"""
+        from app.services.tts_service import get_tts_service
+
+        reference_cache = get_tts_service().reference_cache
+        try:
+            async with AsyncSession(async_engine) as session:
+                await session.run_sync(
+                    tts_scheduler.heartbeat_worker,
+                    self.worker_id,
+                    self.concurrency,
+                    len(self._running),
+                    self.warm,
+                    reference_cache.hits,
+                    reference_cache.misses,
+                )
+                if settings.TTS_AFFINITY_ENABLED:
+                    worker_ids = await session.run_sync(tts_scheduler.live_worker_ids)
+                    self.ring = tts_scheduler.HashRing(worker_ids + [self.worker_id])
+        except Exception as e:
+            # 링을 갱신하지 못해도 작업 처리는 계속 (이전 링 또는 성우 구분 없이 획득)
+            logger.warning(f"⚠️ TTS 워커 등록 갱신 실패: {e}")
+
+    async def _watch_cancellations(self) -> None:
+        """처리 중인 작업이 API에서 취소되었는지 주기적으로 확인하고 중단
+
+        API 프로세스의 cancel_generation은 행 상태만 바꿀 수 있으므로, 실제 합성 중단은 작업을 가진 워커가 한다.
+        """
+        from app.services.tts_service import get_tts_service
+
+        while True:
+            await asyncio.sleep(settings.TTS_QUEUE_CANCEL_POLL_SECONDS)
+            service = get_tts_service()
+            inflight = service.inflight_generation_ids()
+            if not inflight:
+                continue
+            try:
+                async with AsyncSession(async_engine) as session:
+                    cancelled = await session.run_sync(tts_queue.cancelled_among, inflight)
+            except Exception as e:
+                logger.warning(f"⚠️ 취소된 작업 확인 실패: {e}")
+                continue
+            for generation_id in cancelled:
+                if service.abort_generation(generation_id):
+                    logger.info(f"⏹️ 취소된 TTS 작업 중단: {generation_id}")
+
+    def _claim(self, session, interactive_only: bool = False) -> List[uuid.UUID]:
+        """작업 획득 (동기 세션, run_sync로 실행) 후 warm 적중 집계"""
+        ring = self.ring if settings.TTS_AFFINITY_ENABLED else None
+        claimed = tts_queue.claim_batch(
+            session,
+            self.worker_id,
+            settings.TTS_BATCH_MAX_SIZE,
+            ring,
+            not self._running,
+            interactive_only,
+        )
+        if claimed:
+            # 배치는 모두 같은 성우
+            key = tts_scheduler.voice_keys(session, claimed[:1]).get(claimed[0])
+            if key is not None:
+                stolen = ring is not None and len(ring) > 1 and ring.owner(key) != self.worker_id
+                self.warm.touch(key, jobs=len(claimed), stolen=stolen)
+        return claimed
+
+    async def _run_job(self, generation_id: uuid.UUID, reserved: bool = False) -> None:
+        # 순환 import 방지 (tts_service가 tts_queue를 사용)
+        from app.services.tts_service import get_tts_service
+
+        job = asyncio.create_task(
+            get_tts_service().execute_generation(generation_id, worker_id=self.worker_id, reserved=reserved)
+        )
+        heartbeat = asyncio.create_task(self._heartbeat([generation_id], job))
+        try:
+            await job
+        except asyncio.CancelledError:
+            logger.info(f"⏹️ TTS 작업 중단 (취소 또는 임대 상실): {generation_id}")
+        except Exception as e:
+            await self._record_failure(generation_id, e)
+        finally:
+            heartbeat.cancel()
+
+    async def _run_batch(self, generation_ids: List[uuid.UUID], reserved: bool = False) -> None:
+        from app.services.tts_service import get_tts_service
+
+        job = asyncio.create_task(
+            get_tts_service().execute_generation_batch(
+                generation_ids, worker_id=self.worker_id, reserved=reserved
+            )
+        )
+        heartbeat = asyncio.create_task(self._heartbeat(generation_ids, job))
+        try:
+            outcomes = await job
+        except asyncio.CancelledError:
+            logger.info(f"⏹️ TTS 배치 중단 (모든 작업 취소 또는 임대 상실): {len(generation_ids)}개")
+            return
+        except Exception as e:
+            outcomes = {generation_id: e for generation_id in generation_ids}
+        finally:
+            heartbeat.cancel()
+
+        for generation_id, error in outcomes.items():
+            if error is not None:
+                await self._record_failure(generation_id, error)
+
+    async def _record_failure(self, generation_id: uuid.UUID, error: Exception) -> None:
+        try:
+            async with AsyncSession(async_engine) as session:
+                await session.run_sync(tts_queue.fail_or_retry, generation_id, self.worker_id, error)
+        except Exception as db_error:
+            logger.error(f"💾 TTS 작업 실패 상태 기록 실패: {generation_id}: {db_error}")
+
+    async def _heartbeat(self, generation_ids: List[uuid.UUID], job: asyncio.Task) -> None:
+        """임대 연장. 작업이 모두 취소되었거나 다른 워커가 회수했으면 처리를 중단
+
+        배치에서 일부 작업만 잃은 경우에는 나머지를 계속 처리하고, 잃은 작업의 결과는 완료 시점에 버려진다.
+        """
+        owned = list(generation_ids)
+        while not job.done():
+            await asyncio.sleep(settings.TTS_QUEUE_HEARTBEAT_SECONDS)
+            try:
+                async with AsyncSession(async_engine) as session:
+                    still_owned = [
+                        generation_id
+                        for generation_id in owned
+                        if await session.run_sync(tts_queue.extend_lease, generation_id, self.worker_id)
+                    ]
+            except Exception as e:
+                logger.warning(f"⚠️ 임대 연장 실패 (다음 주기에 재시도): {owned}: {e}")
+                continue
+
+            for generation_id in set(owned) - set(still_owned):
+                logger.warning(f"⚠️ TTS 작업 임대 상실: {generation_id}")
+            owned = still_owned
+            if not owned:
+                logger.warning("⚠️ 처리 중인 작업의 임대를 모두 잃어 처리 중단")
+                job.cancel()
+                return
+
+
+def main() -> None:
+    worker = TTSQueueWorker()
+
+    async def _serve():
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, worker.stop)
+        try:
+            await worker.run()
+        finally:
+            await async_engine.dispose()
+
+    asyncio.run(_serve())
+
+
+if __name__ == "__main__":
+    main()
@@ -59,6 +59,13 @@ interface TTSStatData {
   quality: number
 }
 
+interface TTSStageTiming {
+  stage: string
+  p50: number
+  p95: number
+  p99: number
+}
+
 interface WorkStatus {
   id: string
   type: "진행중" | "완료" | "대기"
@@ -68,6 +75,20 @@ interface WorkStatus {
 
 const COLORS = ['#0088FE', '#00C49F', '#FFBB28', '#FF8042']
 
+const STAGE_LABELS: Record<string, string> = {
+  queue_wait: "대기",
+  setup: "준비",
+  reference_lookup: "참조 조회",
+  reference_encode: "참조 인코딩",
+  text2semantic: "시맨틱 생성",
+  decode: "디코딩",
+  chunk_merge: "청크 연결",
+  file_probe: "파일 확인",
+  quality_score: "품질 점수",
+  db_commit: "DB 반영",
+  total: "전체 처리",
+}
+
 export default function DashboardPage() {
   const [stats, setStats] = useState<DashboardStats>({
     activeScenarios: 0,
@@ -82,6 +103,7 @@ export default function DashboardPage() {
   const [ttsChartData, setTtsChartData] = useState<TTSStatData[]>([])
   const [pieData, setPieData] = useState<any[]>([])
   const [workStatuses, setWorkStatuses] = useState<WorkStatus[]>([])
+  const [stageTimings, setStageTimings] = useState<TTSStageTiming[]>([])
   const [loading, setLoading] = useState(true)
 
   // API 호출 함수들
@@ -209,6 +231,34 @@ export default function DashboardPage() {
     }
   }
 
+  const fetchTtsTimings = async () => {
+    try {
+      const token = localStorage.getItem('token')
+      const response = await fetch(`${process.env.NEXT_PUBLIC_API_BASE_URL}/dashboard/tts-timings`, {
+        headers: {
+          'Authorization': `Bearer ${token}`,
+          'Content-Type': 'application/json',
+        },
+      })
+      if (response.ok) {
+        const data = await response.json()
+        setStageTimings(
+          Object.entries(data.stages || {}).map(([stage, summary]: [string, any]) => ({
+            stage: STAGE_LABELS[stage] || stage,
+            p50: summary.p50_ms ?? 0,
+            p95: summary.p95_ms ?? 0,
+            p99: summary.p99_ms ?? 0,
+          }))
+        )
+      } else {
+        throw new Error(`API 응답 오류: ${response.status}`)
+      }
+    } catch (error) {
+      console.error('TTS 단계별 소요 시간 조회 실패:', error)
+      setStageTimings([])
+    }
+  }
+
   const fetchScenarioDistribution = async () => {
     try {
       const token = localStorage.getItem('token')
@@ -293,6 +343,7 @@ export default function DashboardPage() {
         fetchDashboardStats(),
         fetchRecentScenarios(),
         fetchTtsStats(),
+        fetchTtsTimings(),
         fetchScenarioDistribution(),
         fetchWorkStatuses()
       ])
@@ -598,6 +649,33 @@ export default function DashboardPage() {
           </CardContent>
         </Card>
       </div>
+
+      {/* TTS 단계별 소요 시간 (최근 7일 완료 작업) */}
+      <Card>
+        <CardHeader>
+          <CardTitle className="flex items-center">
+            <Clock className="h-5 w-5 mr-2" />
+            TTS 단계별 소요 시간 (ms)
+          </CardTitle>
+        </CardHeader>
+        <CardContent>
+          {stageTimings.length > 0 ? (
+            <ResponsiveContainer width="100%" height={300}>
+              <BarChart data={stageTimings}>
+                <CartesianGrid strokeDasharray="3 3" />
+                <XAxis dataKey="stage" />
+                <YAxis />
+                <Tooltip />
+                <Bar dataKey="p50" fill={COLORS[0]} name="p50" />
+                <Bar dataKey="p95" fill={COLORS[2]} name="p95" />
+                <Bar dataKey="p99" fill={COLORS[3]} name="p99" />
+              </BarChart>
+            </ResponsiveContainer>
+          ) : (
+            <p className="text-sm text-gray-500">최근 완료된 TTS 생성 기록이 없습니다.</p>
+          )}
+        </CardContent>
+      </Card>
     </div>
   )
 }